@@ -0,0 +1,109 @@
+"""Add price statistics
+
+Revision ID: 9c1e4b7d2a6f
+Revises: 4aa599f6e130
+Create Date: 2026-10-17 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e4b7d2a6f'
+down_revision: Union[str, Sequence[str], None] = '4aa599f6e130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# app.domain.schemas.price.price_statistic ile aynı değerler (migration anındaki)
+RECENT_PRICE_WINDOW = 10
+EWMA_ALPHA = 0.3
+# Bu kadar eski fiyatın EWMA'ya katkısı (0.7^200) ihmal edilir
+EWMA_HORIZON = 200
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'price_statistics',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('mapping_id', sa.Integer(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('price_sum', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('min_price', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('max_price', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('last_price', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column(
+            'recent_prices',
+            postgresql.ARRAY(sa.Numeric(precision=10, scale=2)),
+            nullable=False,
+        ),
+        sa.Column('ewma_price', sa.Numeric(precision=14, scale=4), nullable=True),
+        sa.Column(
+            'created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False
+        ),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ['mapping_id'],
+            ['product_mappings.id'],
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('mapping_id'),
+    )
+
+    # Mevcut geçmişten istatistikleri doldur.
+    # EWMA kapalı formda: en eski fiyat (1-a)^(n-1), diğerleri a*(1-a)^(k) ağırlık alır
+    # (k = fiyatın en yeniye uzaklığı).
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO price_statistics (
+                mapping_id, sample_count, price_sum, min_price, max_price,
+                last_price, recent_prices, ewma_price
+            )
+            SELECT
+                mapping_id,
+                count(*),
+                sum(price),
+                min(price),
+                max(price),
+                (array_agg(price ORDER BY rn))[1],
+                (array_agg(price ORDER BY rn))[1:{window}],
+                round(sum(
+                    CASE
+                        WHEN rn - 1 > {horizon} THEN 0
+                        WHEN rn = cnt THEN price * power(1 - {alpha}, rn - 1)
+                        ELSE price * {alpha} * power(1 - {alpha}, rn - 1)
+                    END
+                ), 4)
+            FROM (
+                SELECT
+                    mapping_id,
+                    price,
+                    row_number() OVER (
+                        PARTITION BY mapping_id ORDER BY created_at DESC, id DESC
+                    ) AS rn,
+                    count(*) OVER (PARTITION BY mapping_id) AS cnt
+                FROM price_histories
+                WHERE mapping_id IS NOT NULL
+            ) ranked
+            GROUP BY mapping_id
+            """.format(
+                window=RECENT_PRICE_WINDOW, alpha=EWMA_ALPHA, horizon=EWMA_HORIZON
+            )
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('price_statistics')
@@ -0,0 +1,64 @@
+"""Add pipeline dead letters
+
+Revision ID: a8d4c2e6f1b9
+Revises: f3a6d1e8b5c7
+Create Date: 2026-10-17 16:21:37.402518
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4c2e6f1b9'
+down_revision: Union[str, Sequence[str], None] = 'f3a6d1e8b5c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'pipeline_dead_letters',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('pipeline', sa.String(length=100), nullable=False),
+        sa.Column('provider_id', sa.Integer(), nullable=True),
+        sa.Column('external_product_code', sa.String(length=255), nullable=True),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('error', sa.Text(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False
+        ),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['provider_id'],
+            ['providers.id'],
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_pipeline_dead_letters_pipeline'),
+        'pipeline_dead_letters',
+        ['pipeline'],
+        unique=False,
+    )
+    op.create_index(
+        op.f('ix_pipeline_dead_letters_provider_id'),
+        'pipeline_dead_letters',
+        ['provider_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_pipeline_dead_letters_provider_id'), table_name='pipeline_dead_letters'
+    )
+    op.drop_index(
+        op.f('ix_pipeline_dead_letters_pipeline'), table_name='pipeline_dead_letters'
+    )
+    op.drop_table('pipeline_dead_letters')
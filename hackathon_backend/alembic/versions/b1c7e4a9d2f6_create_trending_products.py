@@ -0,0 +1,65 @@
+"""Create trending products
+
+Revision ID: b1c7e4a9d2f6
+Revises: c4e9a2f7b3d1
+Create Date: 2026-10-17 19:05:31.482907
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c7e4a9d2f6'
+down_revision: Union[str, Sequence[str], None] = 'c4e9a2f7b3d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabloyu bu migration'ın oluşturduğunu downgrade'e bildirir
+CREATED_BY_MIGRATION = 'created by migration b1c7e4a9d2f6'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tablo daha önce hiçbir migration'da oluşturulmamıştı; create_all ile
+    # kurulmuş veritabanlarında zaten vardır ve olduğu gibi bırakılır.
+    if sa.inspect(op.get_bind()).has_table('trending_products'):
+        return
+    op.create_table(
+        'trending_products',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('trend_score', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('product_id', name='trending_products_product_id_key'),
+        comment=CREATED_BY_MIGRATION,
+    )
+    op.create_index(
+        op.f('ix_trending_products_id'), 'trending_products', ['id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # create_all ile oluşturulmuş tablo bu migration'a ait değildir, silinmez
+    comment = sa.inspect(op.get_bind()).get_table_comment('trending_products')
+    if comment.get('text') != CREATED_BY_MIGRATION:
+        return
+    op.drop_index(op.f('ix_trending_products_id'), table_name='trending_products')
+    op.drop_table('trending_products')
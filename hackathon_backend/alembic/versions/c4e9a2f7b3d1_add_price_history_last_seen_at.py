@@ -0,0 +1,34 @@
+"""Add price history last_seen_at
+
+Revision ID: c4e9a2f7b3d1
+Revises: a8d4c2e6f1b9
+Create Date: 2026-10-17 18:05:12.730194
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e9a2f7b3d1'
+down_revision: Union[str, Sequence[str], None] = 'a8d4c2e6f1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Mevcut satırlar NULL kalır (sadece created_at'te görülmüş sayılır);
+    # default sadece yeni satırlara uygulanır, tablo yeniden yazılmaz.
+    op.add_column(
+        'price_histories',
+        sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.alter_column('price_histories', 'last_seen_at', server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('price_histories', 'last_seen_at')
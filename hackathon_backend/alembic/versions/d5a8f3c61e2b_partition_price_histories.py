@@ -0,0 +1,239 @@
+"""Partition price histories and add rollups
+
+Revision ID: d5a8f3c61e2b
+Revises: 9c1e4b7d2a6f
+Create Date: 2026-10-17 11:40:08.517230
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8f3c61e2b'
+down_revision: Union[str, Sequence[str], None] = '9c1e4b7d2a6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Migration anında bugünden itibaren kaç günlük partition hazırlanacak
+PARTITIONS_AHEAD_DAYS = 7
+
+# Günlük partition oluşturan fonksiyon. Partition adları
+# price_histories_pYYYYMMDD formatındadır, sınırlar UTC gün başlarıdır.
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_price_history_partitions(from_day date, to_day date)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    day date := from_day;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE day <= to_day LOOP
+        partition_name := 'price_histories_p' || to_char(day, 'YYYYMMDD');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF price_histories '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                day::timestamp AT TIME ZONE 'UTC',
+                (day + 1)::timestamp AT TIME ZONE 'UTC'
+            );
+            created := created + 1;
+        END IF;
+        day := day + 1;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+"""
+
+PRICE_HISTORY_COLUMNS = (
+    "id, mapping_id, variant_id, price, original_price, discount_rate, "
+    "currency_id, in_stock, stock_quantity, created_at, updated_at"
+)
+
+
+def _create_rollup_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('mapping_id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('high_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('low_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('close_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False
+        ),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ['mapping_id'],
+            ['product_mappings.id'],
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'mapping_id', 'bucket_start', name=f'uix_{name}_mapping_bucket'
+        ),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 1. Eski tabloyu kenara al. Partitioned tabloda PK partition anahtarını
+    #    içermek zorunda olduğundan price_tiers -> price_histories FK'sı kalkar.
+    op.execute(
+        "ALTER TABLE price_tiers"
+        " DROP CONSTRAINT IF EXISTS price_tiers_price_history_id_fkey"
+    )
+    op.execute("ALTER TABLE price_histories RENAME TO price_histories_legacy")
+    op.execute("ALTER INDEX price_histories_pkey RENAME TO price_histories_legacy_pkey")
+
+    # 2. created_at'e göre range-partitioned yeni tablo (aynı id sequence'ı)
+    op.execute(
+        """
+        CREATE TABLE price_histories (
+            id integer NOT NULL DEFAULT nextval('price_histories_id_seq'),
+            mapping_id integer REFERENCES product_mappings (id),
+            variant_id integer REFERENCES product_variants (id),
+            price numeric(10, 2) NOT NULL,
+            original_price numeric(10, 2),
+            discount_rate integer,
+            currency_id integer NOT NULL REFERENCES currencies (id),
+            in_stock boolean NOT NULL,
+            stock_quantity integer,
+            created_at timestamp with time zone NOT NULL DEFAULT now(),
+            updated_at timestamp without time zone,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE price_histories_id_seq OWNED BY price_histories.id")
+    op.execute(
+        "CREATE INDEX ix_price_histories_mapping_id_created_at "
+        "ON price_histories (mapping_id, created_at)"
+    )
+    op.execute(CREATE_PARTITION_FUNCTION)
+
+    # 3. Eski verinin başından itibaren ileriye dönük partition'ları oluştur
+    op.execute(
+        f"""
+        SELECT create_price_history_partitions(
+            COALESCE(
+                (SELECT min(created_at) FROM price_histories_legacy) AT TIME ZONE 'UTC',
+                now() AT TIME ZONE 'UTC'
+            )::date,
+            (now() AT TIME ZONE 'UTC')::date + {PARTITIONS_AHEAD_DAYS}
+        )
+        """
+    )
+
+    # 4. Veriyi taşı
+    op.execute(
+        f"""
+        INSERT INTO price_histories ({PRICE_HISTORY_COLUMNS})
+        SELECT id, mapping_id, variant_id, price, original_price, discount_rate,
+               currency_id, in_stock, stock_quantity, COALESCE(created_at, now()),
+               updated_at
+        FROM price_histories_legacy
+        """
+    )
+    op.execute("DROP TABLE price_histories_legacy")
+
+    # 5. OHLC rollup tabloları ve mevcut veriden ilk doldurma
+    _create_rollup_table('price_history_hourly')
+    _create_rollup_table('price_history_daily')
+    op.execute(
+        """
+        INSERT INTO price_history_hourly (
+            mapping_id, bucket_start, open_price, high_price, low_price,
+            close_price, sample_count
+        )
+        SELECT
+            mapping_id,
+            date_trunc('hour', created_at, 'UTC'),
+            (array_agg(price ORDER BY created_at, id))[1],
+            max(price),
+            min(price),
+            (array_agg(price ORDER BY created_at DESC, id DESC))[1],
+            count(*)
+        FROM price_histories
+        WHERE mapping_id IS NOT NULL
+        GROUP BY 1, 2
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO price_history_daily (
+            mapping_id, bucket_start, open_price, high_price, low_price,
+            close_price, sample_count
+        )
+        SELECT
+            mapping_id,
+            date_trunc('day', bucket_start, 'UTC'),
+            (array_agg(open_price ORDER BY bucket_start))[1],
+            max(high_price),
+            min(low_price),
+            (array_agg(close_price ORDER BY bucket_start DESC))[1],
+            sum(sample_count)
+        FROM price_history_hourly
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('price_history_daily')
+    op.drop_table('price_history_hourly')
+
+    op.execute("ALTER TABLE price_histories RENAME TO price_histories_partitioned")
+    op.execute(
+        "ALTER INDEX price_histories_pkey RENAME TO price_histories_partitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE price_histories (
+            id integer NOT NULL DEFAULT nextval('price_histories_id_seq'),
+            mapping_id integer REFERENCES product_mappings (id),
+            variant_id integer REFERENCES product_variants (id),
+            price numeric(10, 2) NOT NULL,
+            original_price numeric(10, 2),
+            discount_rate integer,
+            currency_id integer NOT NULL REFERENCES currencies (id),
+            in_stock boolean NOT NULL,
+            stock_quantity integer,
+            created_at timestamp with time zone DEFAULT now(),
+            updated_at timestamp without time zone,
+            CONSTRAINT price_histories_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO price_histories ({PRICE_HISTORY_COLUMNS})
+        SELECT {PRICE_HISTORY_COLUMNS} FROM price_histories_partitioned
+        """
+    )
+    op.execute("ALTER SEQUENCE price_histories_id_seq OWNED BY price_histories.id")
+    op.execute("DROP TABLE price_histories_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS create_price_history_partitions(date, date)")
+    op.execute(
+        "DELETE FROM price_tiers"
+        " WHERE price_history_id NOT IN (SELECT id FROM price_histories)"
+    )
+    op.create_foreign_key(
+        'price_tiers_price_history_id_fkey', 'price_tiers', 'price_histories',
+        ['price_history_id'], ['id'],
+    )
@@ -0,0 +1,49 @@
+"""Trending products rank upsert
+
+Revision ID: e2f8b4c7a9d3
+Revises: b1c7e4a9d2f6
+Create Date: 2026-10-17 19:12:48.215630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f8b4c7a9d3'
+down_revision: Union[str, Sequence[str], None] = 'b1c7e4a9d2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Eski DELETE + INSERT sıralamasından kalan satırlar rank'e göre tekil
+    # olmayabilir. Sıralama bir sonraki trending güncellemesinde yeniden yazılır.
+    op.execute('DELETE FROM trending_products')
+    op.execute(
+        'ALTER TABLE trending_products'
+        ' DROP CONSTRAINT IF EXISTS trending_products_product_id_key'
+    )
+
+    op.create_unique_constraint(
+        'uq_trending_products_rank', 'trending_products', ['rank']
+    )
+    # Ürünler sıra değiştirirken tek statement'ta geçici olarak çakışabilir
+    op.create_unique_constraint(
+        'uq_trending_products_product_id', 'trending_products', ['product_id'],
+        deferrable=True, initially='DEFERRED',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'uq_trending_products_product_id', 'trending_products', type_='unique'
+    )
+    op.drop_constraint(
+        'uq_trending_products_rank', 'trending_products', type_='unique'
+    )
+    op.create_unique_constraint(
+        'trending_products_product_id_key', 'trending_products', ['product_id']
+    )
@@ -0,0 +1,128 @@
+"""Add current offers and product price summary
+
+Revision ID: e7b2c9d4a1f3
+Revises: d5a8f3c61e2b
+Create Date: 2026-10-17 13:48:05.771930
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c9d4a1f3'
+down_revision: Union[str, Sequence[str], None] = 'd5a8f3c61e2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'current_offers',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('mapping_id', sa.Integer(), nullable=False),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('original_price', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('in_stock', sa.Boolean(), nullable=False),
+        sa.Column('stock_quantity', sa.Integer(), nullable=True),
+        sa.Column(
+            'observed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False
+        ),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ['mapping_id'],
+            ['product_mappings.id'],
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('mapping_id'),
+    )
+    op.create_table(
+        'product_price_summary',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('lowest_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('original_price', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('in_stock', sa.Boolean(), nullable=False),
+        sa.Column('offer_count', sa.Integer(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False
+        ),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ['product_id'],
+            ['products.id'],
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('product_id'),
+    )
+    op.create_index(
+        'ix_product_price_summary_lowest_price',
+        'product_price_summary',
+        ['lowest_price'],
+    )
+
+    # Mapping başına son fiyat geçmişi kaydından güncel teklifleri doldur
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO current_offers (
+                mapping_id, price, original_price, in_stock, stock_quantity, observed_at
+            )
+            SELECT DISTINCT ON (mapping_id)
+                mapping_id, price, original_price, in_stock, stock_quantity, created_at
+            FROM price_histories
+            WHERE mapping_id IS NOT NULL AND price IS NOT NULL
+            ORDER BY mapping_id, created_at DESC, id DESC
+            """
+        )
+    )
+
+    # CurrentOfferRepository.refresh_price_summaries ile aynı özet
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO product_price_summary (
+                product_id, lowest_price, original_price, in_stock, offer_count
+            )
+            SELECT
+                pm.product_id,
+                (array_agg(co.price
+                    ORDER BY co.in_stock DESC, co.price, co.mapping_id))[1],
+                (array_agg(co.original_price
+                    ORDER BY co.in_stock DESC, co.price, co.mapping_id))[1],
+                bool_or(co.in_stock),
+                count(*)
+            FROM current_offers co
+            JOIN product_mappings pm ON pm.id = co.mapping_id
+            GROUP BY pm.product_id
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_product_price_summary_lowest_price', table_name='product_price_summary'
+    )
+    op.drop_table('product_price_summary')
+    op.drop_table('current_offers')
@@ -0,0 +1,38 @@
+"""Add keyset pagination indexes
+
+Revision ID: f3a6d1e8b5c7
+Revises: e7b2c9d4a1f3
+Create Date: 2026-10-17 15:02:44.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6d1e8b5c7'
+down_revision: Union[str, Sequence[str], None] = 'e7b2c9d4a1f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_products_name_id', 'products', ['name', 'id'])
+    op.create_index(
+        'ix_conversations_user_id_updated_at_id',
+        'conversations',
+        ['user_id', 'updated_at', 'id'],
+    )
+    op.create_index(
+        'ix_messages_conversation_id_created_at_id',
+        'messages',
+        ['conversation_id', 'created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_conversation_id_created_at_id', table_name='messages')
+    op.drop_index('ix_conversations_user_id_updated_at_id', table_name='conversations')
+    op.drop_index('ix_products_name_id', table_name='products')
@@ -6,7 +6,7 @@ from fastapi.security import OAuth2PasswordBearer
 from app.application.cqrs.commands.user_command import UserCommandService
 from app.application.services.auth_service import AuthService
 from app.application.services.price.currency_service import CurrencyService
-from app.core.infrastructure.cache import cache
+from app.core.infrastructure.tiered_cache import tiered_cache
 from app.core.infrastructure.exchange_rate_provider import ExchangeRateApiProvider
 from app.core.security.auth import decode_access_token
 from app.domain.i_services.i_cache_service import ICacheService
@@ -83,7 +83,7 @@ async def get_auth_service(uow: UnitOfWork = Depends(get_uow)) -> AuthService:
 
 
 async def get_cache_service() -> ICacheService:
-    return cache
+    return tiered_cache
 
 
 async def get_exchange_rate_provider() -> IExchangeRateProvider:
@@ -5,8 +5,11 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.api.deps import get_uow
+from app.api.deps import get_cache_service, get_uow
 from app.application.services.category_service import CategoryService
+from app.core.exceptions import ValidationException
+from app.domain.i_services.i_cache_service import ICacheService
+from app.domain.schemas.pagination import TotalMode
 from app.domain.schemas.products.category import (
     CategoryResponse,
     CategoryWithChildrenResponse,
@@ -17,9 +20,12 @@ from app.infrastructure.unit_of_work import UnitOfWork
 router = APIRouter()
 
 
-def get_category_service(uow: UnitOfWork = Depends(get_uow)) -> CategoryService:
+def get_category_service(
+    uow: UnitOfWork = Depends(get_uow),
+    cache: ICacheService = Depends(get_cache_service),
+) -> CategoryService:
     """Dependency injection for CategoryService."""
-    return CategoryService(uow)
+    return CategoryService(uow, cache)
 
 
 @router.get("/", response_model=List[CategoryResponse])
@@ -57,6 +63,12 @@ async def get_category_with_products(
     max_price: Optional[float] = Query(None, ge=0, description="Maximum fiyat"),
     brand: Optional[str] = Query(None, description="Marka filtresi"),
     in_stock_only: bool = Query(True, description="Sadece stokta olanlar"),
+    cursor: Optional[str] = Query(
+        None, description="Keyset pagination cursor (next_cursor of the previous page)"
+    ),
+    total_mode: Optional[TotalMode] = Query(
+        None, description="Total count: exact, estimated or none"
+    ),
     service: CategoryService = Depends(get_category_service),
 ) -> CategoryWithProductsResponse:
     """
@@ -69,15 +81,22 @@ async def get_category_with_products(
     - /categories/elektronik (by slug)
     - /categories/5 (by ID)
     """
-    result = await service.get_category_with_products(
-        identifier=identifier,
-        page=page,
-        page_size=page_size,
-        min_price=Decimal(str(min_price)) if min_price is not None else None,
-        max_price=Decimal(str(max_price)) if max_price is not None else None,
-        brand=brand,
-        in_stock_only=in_stock_only,
-    )
+    try:
+        result = await service.get_category_with_products(
+            identifier=identifier,
+            page=page,
+            page_size=page_size,
+            min_price=Decimal(str(min_price)) if min_price is not None else None,
+            max_price=Decimal(str(max_price)) if max_price is not None else None,
+            brand=brand,
+            in_stock_only=in_stock_only,
+            cursor=cursor,
+            total_mode=total_mode,
+        )
+    except ValidationException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=e.message
+        ) from e
 
     if result is None:
         raise HTTPException(
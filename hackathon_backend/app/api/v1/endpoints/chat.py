@@ -1,9 +1,12 @@
 """Chat API endpoints."""
 
-from app.domain.schemas.auth import UserContext
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from app.api.deps import get_current_user, get_uow
+from app.core.exceptions import ValidationException
+from app.domain.schemas.auth import UserContext
 from app.domain.schemas.chat.conversation import (
     Conversation,
     ConversationCreate,
@@ -19,6 +22,8 @@ from app.infrastructure.unit_of_work import UnitOfWork
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.post("/conversations", response_model=Conversation, status_code=201)
 async def create_conversation(
@@ -52,12 +57,33 @@ async def create_conversation(
 async def list_conversations(
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
     current_user: UserContext = Depends(get_current_user),
     uow: UnitOfWork = Depends(get_uow),
 ) -> ConversationListResponse:
-    """Kullanıcının tüm konuşmalarını listeler."""
+    """
+    Kullanıcının tüm konuşmalarını listeler.
+
+    İlk sayfa ve cursor ile gelen istekler keyset sayfalama kullanır ve
+    next_cursor döner; offset yalnızca geriye dönük uyumluluk içindir.
+    """
     user_id = int(current_user.user_id)
     async with uow:
+        if cursor or offset == 0:
+            try:
+                page = await uow.conversations.get_page_by_user_id(
+                    user_id, limit=limit, cursor=cursor
+                )
+            except ValidationException as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=e.message
+                ) from e
+            return ConversationListResponse(
+                conversations=page.items,
+                total=len(page.items),
+                next_cursor=page.next_cursor,
+            )
+
         conversations = await uow.conversations.get_by_user_id(
             user_id, limit=limit, offset=offset
         )
@@ -142,12 +168,19 @@ async def send_message(
 )
 async def get_messages(
     conversation_id: int,
+    response: Response,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     current_user: UserContext = Depends(get_current_user),
     uow: UnitOfWork = Depends(get_uow),
 ) -> list[Message]:
-    """Konuşmadaki mesajları getirir."""
+    """
+    Konuşmadaki mesajları getirir.
+
+    İlk sayfa ve cursor ile gelen istekler keyset sayfalama kullanır; sonraki
+    sayfanın cursor'ı X-Next-Cursor header'ında döner.
+    """
     user_id = int(current_user.user_id)
     async with uow:
         # Check access
@@ -158,6 +191,19 @@ async def get_messages(
                 detail="Konuşma bulunamadı",
             )
 
+        if cursor or offset == 0:
+            try:
+                page = await uow.messages.get_page_by_conversation_id(
+                    conversation_id, limit=limit, cursor=cursor
+                )
+            except ValidationException as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=e.message
+                ) from e
+            if page.next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+            return page.items
+
         messages = await uow.messages.get_by_conversation_id(
             conversation_id, limit=limit, offset=offset
         )
@@ -2,9 +2,16 @@
 from typing import Any, Dict
 
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
+from app.application.services.pipeline_metrics import (
+    collect_step_metrics,
+    process_source,
+)
 from app.core.infrastructure.cache import get_cache
 from app.core.infrastructure.circuit_breaker import get_all_circuit_stats
+from app.core.infrastructure.tiered_cache import get_tiered_cache
+from app.core.patterns.instrumentation import render_prometheus, step_metrics
 
 router = APIRouter(prefix="/health", tags=["Health & Monitoring"])
 
@@ -39,8 +46,10 @@ async def detailed_health() -> Dict[str, Any]:
     cache = get_cache()
     redis_status = "unknown"
     try:
-        await cache.set("health_check", "ok", expire=10)
-        result = await cache.get("health_check")
+        async with cache.pipeline() as pipe:
+            pipe.set("health_check", "ok", expire=10)
+            pipe.get("health_check")
+        result = pipe.results[1]
         redis_status = "healthy" if result == "ok" else "degraded"
     except Exception as e:
         redis_status = f"unhealthy: {str(e)}"
@@ -96,20 +105,24 @@ async def cache_status() -> Dict[str, Any]:
     """
     Redis cache durumu.
     
-    TTL kontrolü ve bağlantı durumu.
+    TTL kontrolü, bağlantı durumu, katman bazlı (yerel/Redis) hit/miss sayaçları
+    ve bağlantı havuzu durumu.
     """
     cache = get_cache()
     
     try:
         # Test write with TTL
-        await cache.set("cache_test", {"test": True}, expire=60)
-        test_result = await cache.get("cache_test")
+        async with cache.pipeline() as pipe:
+            pipe.set("cache_test", {"test": True}, expire=60)
+            pipe.get("cache_test")
         
         return {
             "status": "healthy",
             "connection": "ok",
-            "test_write": "success",
+            "test_write": "success" if pipe.results[1] == {"test": True} else "failed",
             "ttl_support": True,
+            "tiers": get_tiered_cache().stats(),
+            "pool": cache.pool_stats(),
         }
     except Exception as e:
         return {
@@ -118,6 +131,26 @@ async def cache_status() -> Dict[str, Any]:
         }
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def pipeline_metrics() -> PlainTextResponse:
+    """
+    Pipeline adım metrikleri (Prometheus text formatı).
+
+    Her (source, pipeline, step) için:
+    - runs/failures, wall/cpu saniye, SQL sorgu sayısı, giren/çıkan item
+    - en uzun çalıştırma ve tracemalloc tepe belleği
+    source: Ölçümü yapan süreç (API veya collector worker'ı).
+    """
+    try:
+        snapshots = await collect_step_metrics(get_cache())
+    except Exception:
+        # Redis yoksa en azından bu sürecin metrikleri döner
+        snapshots = {process_source(): step_metrics.snapshot()}
+    return PlainTextResponse(
+        render_prometheus(snapshots), media_type="text/plain; version=0.0.4"
+    )
+
+
 @router.get("/providers")
 async def provider_status() -> Dict[str, Any]:
     """
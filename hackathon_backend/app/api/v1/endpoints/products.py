@@ -2,12 +2,18 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 
+from app.api.deps import get_cache_service
+from app.application.cqrs.queries.product_query import etag_matches
 from app.application.services.product_search_service import (
     ProductSearchService,
     get_product_search_service,
 )
+from app.core.exceptions import ValidationException
+from app.domain.i_services.i_cache_service import ICacheService
+from app.domain.schemas.pagination import TotalMode
 from app.domain.schemas.products.product_search import (
     ProductSearchRequest,
     ProductSearchResponse,
@@ -28,13 +34,20 @@ async def search_products(
     in_stock_only: bool = Query(True, description="Sadece stokta olanlar"),
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     page_size: int = Query(20, ge=1, le=100, description="Sayfa başına ürün"),
+    cursor: Optional[str] = Query(
+        None, description="Keyset sayfalama cursor'ı (önceki yanıttaki next_cursor)"
+    ),
+    total_mode: Optional[TotalMode] = Query(
+        None, description="Toplam sayı: exact, estimated veya none"
+    ),
     search_service: ProductSearchService = Depends(get_product_search_service),
 ) -> ProductSearchResponse:
     """
     Ürün arama endpoint'i.
 
-    Elasticsearch üzerinden ürün arar ve en düşük fiyatla birlikte döner.
-    Sonuçlar fiyata göre artan sırada sıralanır.
+    PRODUCT_SEARCH_BACKEND=elasticsearch ise BM25 ile arar ve marka/kategori/
+    renk/beden/fiyat aralığı facet'lerini döner; ES erişilemezse (veya cursor
+    verilmişse) PostgreSQL aramasına düşer. Sonuçlar en düşük fiyatla döner.
     """
     from decimal import Decimal
 
@@ -48,9 +61,14 @@ async def search_products(
         in_stock_only=in_stock_only,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        total_mode=total_mode,
     )
 
-    return await search_service.search_products(request)
+    try:
+        return await search_service.search_products(request)
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
 
 
 
@@ -62,11 +80,17 @@ from app.domain.schemas.products.product_full_detail import ProductFullDetailRes
 from app.infrastructure.unit_of_work import UnitOfWork
 
 
-@router.get("/{product_id}", response_model=ProductFullDetailResponse)
+@router.get(
+    "/{product_id}",
+    response_model=ProductFullDetailResponse,
+    responses={304: {"description": "İçerik değişmedi (If-None-Match)"}},
+)
 async def get_product_full_detail(
     product_id: int,
+    if_none_match: Optional[str] = Header(None),
     uow: UnitOfWork = Depends(get_uow),
-) -> ProductFullDetailResponse:
+    cache: ICacheService = Depends(get_cache_service),
+) -> Response:
     """
     Kapsamlı ürün detayı endpoint'i.
     
@@ -75,16 +99,25 @@ async def get_product_full_detail(
     - Tüm satıcı fiyatları (en ucuzdan pahalıya)
     - Fiyat geçmişi (son 30 gün)
     - Varyantlar ve renk/beden seçenekleri
+
+    Yanıt ürün başına cache'lenir ve ETag ile döner; If-None-Match aynıysa
+    gövdesiz 304 döner.
     """
     async with uow:
-        query_service = ProductQueryService(uow.db)
-        product = await query_service.get_product_full_detail(product_id)
+        query_service = ProductQueryService(uow.db, cache)
+        detail = await query_service.get_product_detail_payload(product_id)
         
-        if not product:
+        if not detail:
             raise HTTPException(
                 status_code=404,
                 detail="Ürün bulunamadı"
             )
-        return product
+
+    # Fiyatlar değişebilir: istemci her seferinde ETag ile doğrulamalı
+    headers = {"ETag": detail.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, detail.etag):
+        return Response(status_code=304, headers=headers)
+    # Cache'teki gövde zaten response_model'e göre serialize edildi
+    return JSONResponse(content=detail.body, headers=headers)
 
 
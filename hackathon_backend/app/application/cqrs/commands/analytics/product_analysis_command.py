@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 from app.application.pipelines.analytics.product_analysis_pipeline import (
     ProductAnalysisPipeline,
 )
+from app.core.patterns.offer_batch import OfferBatch
 from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
 from app.domain.i_services.i_currency_service import ICurrencyService
 
@@ -32,8 +33,11 @@ class ProductAnalysisCommandService:
             pipeline = ProductAnalysisPipeline(self.uow, self.currency_service)
             context = await pipeline.execute(data=products)
 
+            normalized = context.result or []
+            if isinstance(normalized, OfferBatch):
+                normalized = normalized.to_records()
             return {
-                "normalized_products": context.result or [],
+                "normalized_products": normalized,
                 "errors": context.errors,
                 "meta": context.meta,
             }
@@ -1,13 +1,18 @@
 """Product Query Service for comprehensive product details."""
 
+import hashlib
+import json
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
-from sqlalchemy import select, desc
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.infrastructure.cache_aside import CacheAside
+from app.domain.i_services.i_cache_service import ICacheService
 from app.domain.schemas.products.product_full_detail import (
     CategoryInfo,
     PriceHistoryPoint,
@@ -15,32 +20,121 @@ from app.domain.schemas.products.product_full_detail import (
     ProviderPrice,
     VariantInfo,
 )
+from app.infrastructure.unit_of_work import UnitOfWork
 from app.persistence.models import (
     Category,
-    PriceHistory,
+    CurrentOffer,
+    PriceHistoryDaily,
     Product,
     ProductMapping,
     ProductVariant,
 )
 from app.persistence.models.providers.provider import Provider
 
+PRODUCT_DETAIL_CACHE_PREFIX = "product:detail:"
+# Safety net only: the data collector invalidates products whose offers changed
+# and price history maintenance those whose chart changed
+PRODUCT_DETAIL_CACHE_TTL = 600
+
+
+def product_detail_cache_key(product_id: int) -> str:
+    return f"{PRODUCT_DETAIL_CACHE_PREFIX}{product_id}"
+
+
+def detail_etag(body: Dict[str, Any]) -> str:
+    """Strong ETag of the serialized response (stable across workers)."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return f'"{hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (comma separated list, weak tags and "*")."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def invalidate_product_details(
+    cache: ICacheService, product_ids: Iterable[int]
+) -> int:
+    """Drops cached detail responses of the given products in one round trip."""
+    keys = [product_detail_cache_key(product_id) for product_id in product_ids]
+    return await cache.delete_many(keys) if keys else 0
+
+
+@dataclass
+class ProductDetailPayload:
+    """Serialized ProductFullDetailResponse with its ETag, as stored in the cache."""
+
+    etag: str
+    body: Dict[str, Any]
+
 
 class ProductQueryService:
     """Service for querying comprehensive product details."""
 
-    def __init__(self, db: AsyncSession) -> None:
+    # Days of price history on the chart (read from daily rollups)
+    CHART_DAYS = 30
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: Optional[ICacheService] = None,
+        uow_factory: Callable[[], UnitOfWork] = UnitOfWork,
+    ) -> None:
         self.db = db
+        self.cache = CacheAside(cache) if cache else None
+        self.uow_factory = uow_factory
 
-    async def get_product_full_detail(
+    async def get_product_detail_payload(
         self, product_id: int
+    ) -> Optional[ProductDetailPayload]:
+        """
+        Serialized product detail with ETag. Cached per product; concurrent
+        misses for the same product share one build (CacheAside).
+        """
+        if self.cache is None:
+            return self._to_payload(await self.get_product_full_detail(product_id))
+
+        async def load() -> Optional[Dict[str, Any]]:
+            # The build is shared with concurrent requests and may outlive the
+            # caller (asyncio.shield), so it must not use the request session.
+            async with self.uow_factory() as uow:
+                detail = await self.get_product_full_detail(product_id, db=uow.db)
+            payload = self._to_payload(detail)
+            return {"etag": payload.etag, "body": payload.body} if payload else None
+
+        cached = await self.cache.get_or_load(
+            product_detail_cache_key(product_id), load, ttl=PRODUCT_DETAIL_CACHE_TTL
+        )
+        return ProductDetailPayload(**cached) if cached else None
+
+    @staticmethod
+    def _to_payload(
+        detail: Optional[ProductFullDetailResponse],
+    ) -> Optional[ProductDetailPayload]:
+        if detail is None:
+            return None
+        body = detail.model_dump(mode="json")
+        return ProductDetailPayload(etag=detail_etag(body), body=body)
+
+    async def get_product_full_detail(
+        self, product_id: int, db: Optional[AsyncSession] = None
     ) -> Optional[ProductFullDetailResponse]:
         """
         Fetch comprehensive product details:
         - Product info
         - All provider prices (current)
-        - Price history (last 30 days)
+        - Price history (last 30 days, daily close per provider)
         - Variants
+        Runs on the service session unless another one is given.
         """
+        if db is None:
+            db = self.db
         # 1. Fetch Product with Category and Variants
         query = (
             select(Product)
@@ -50,42 +144,31 @@ class ProductQueryService:
             )
             .where(Product.id == product_id)
         )
-        result = await self.db.execute(query)
+        result = await db.execute(query)
         product = result.scalars().first()
 
         if not product:
             return None
 
-        # 2. Fetch all ProductMappings with Provider for this product
-        mappings_query = (
-            select(ProductMapping)
+        # 2-3. Fetch all ProductMappings with Provider and their current offer
+        offers_query = (
+            select(ProductMapping, CurrentOffer)
+            .join(CurrentOffer, CurrentOffer.mapping_id == ProductMapping.id)
             .options(selectinload(ProductMapping.provider))
             .where(ProductMapping.product_id == product_id)
         )
-        mappings_result = await self.db.execute(mappings_query)
-        mappings = mappings_result.scalars().all()
+        offers_result = await db.execute(offers_query)
 
-        # 3. For each mapping, get the latest price
         provider_prices: List[ProviderPrice] = []
         best_price: Optional[Decimal] = None
 
-        for mapping in mappings:
-            # Get latest price for this mapping
-            latest_price_query = (
-                select(PriceHistory)
-                .where(PriceHistory.mapping_id == mapping.id)
-                .order_by(desc(PriceHistory.created_at))
-                .limit(1)
-            )
-            price_result = await self.db.execute(latest_price_query)
-            latest_price = price_result.scalars().first()
-
-            if latest_price and mapping.provider:
+        for mapping, offer in offers_result.all():
+            if mapping.provider:
                 provider = mapping.provider
-                current_price = Decimal(str(latest_price.price))
+                current_price = Decimal(str(offer.price))
                 original_price = (
-                    Decimal(str(latest_price.original_price))
-                    if latest_price.original_price
+                    Decimal(str(offer.original_price))
+                    if offer.original_price
                     else None
                 )
 
@@ -107,9 +190,11 @@ class ProductQueryService:
                         current_price=current_price,
                         original_price=original_price,
                         discount_percentage=discount_pct,
-                        in_stock=latest_price.in_stock,
+                        in_stock=offer.in_stock,
                         product_url=mapping.product_url,
-                        last_updated=latest_price.created_at,
+                        # Not observed_at: it moves on every beat, and the cached
+                        # body (and its ETag) must only change with the offer
+                        last_updated=offer.updated_at,
                     )
                 )
 
@@ -120,35 +205,35 @@ class ProductQueryService:
         # Sort by price (cheapest first)
         provider_prices.sort(key=lambda x: x.current_price)
 
-        # 4. Fetch price history (last 30 days)
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+        # 4. Fetch price history (last 30 days) from daily OHLC rollups
+        chart_start = datetime.now(timezone.utc) - timedelta(days=self.CHART_DAYS)
+        chart_start = chart_start.replace(hour=0, minute=0, second=0, microsecond=0)
         history_query = (
-            select(PriceHistory)
-            .join(ProductMapping, PriceHistory.mapping_id == ProductMapping.id)
-            .options(selectinload(PriceHistory.mapping).selectinload(ProductMapping.provider))
+            select(
+                PriceHistoryDaily.bucket_start,
+                PriceHistoryDaily.close_price,
+                ProductMapping.provider_id,
+                Provider.name,
+            )
+            .join(ProductMapping, PriceHistoryDaily.mapping_id == ProductMapping.id)
+            .outerjoin(Provider, ProductMapping.provider_id == Provider.id)
             .where(
                 ProductMapping.product_id == product_id,
-                PriceHistory.created_at >= thirty_days_ago,
+                PriceHistoryDaily.bucket_start >= chart_start,
             )
-            .order_by(PriceHistory.created_at)
+            .order_by(PriceHistoryDaily.bucket_start)
         )
-        history_result = await self.db.execute(history_query)
-        history_records = history_result.scalars().all()
-
-        price_history: List[PriceHistoryPoint] = []
-        for record in history_records:
-            provider_name = None
-            if record.mapping and record.mapping.provider:
-                provider_name = record.mapping.provider.name
-
-            price_history.append(
-                PriceHistoryPoint(
-                    date=record.created_at,
-                    price=Decimal(str(record.price)),
-                    provider_id=record.mapping.provider_id if record.mapping else 0,
-                    provider_name=provider_name,
-                )
+        history_rows = (await db.execute(history_query)).all()
+
+        price_history: List[PriceHistoryPoint] = [
+            PriceHistoryPoint(
+                date=bucket_start,
+                price=Decimal(str(close_price)),
+                provider_id=provider_id or 0,
+                provider_name=provider_name,
             )
+            for bucket_start, close_price, provider_id, provider_name in history_rows
+        ]
 
         # 5. Process Variants
         variants: List[VariantInfo] = []
@@ -201,6 +286,7 @@ class ProductQueryService:
             provider_count=len(provider_prices),
             price_history=price_history,
             variants=variants,
-            available_colors=list(colors),
-            available_sizes=list(sizes),
+            # Sorted so identical data always serializes (and hashes) the same
+            available_colors=sorted(colors),
+            available_sizes=sorted(sizes),
         )
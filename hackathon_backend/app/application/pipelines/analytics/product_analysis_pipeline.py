@@ -1,3 +1,9 @@
+from typing import Optional
+
+from app.application.pipelines.analytics.product_matcher import ProductMatchIndex
+from app.application.pipelines.analytics.steps.collect_search_changes_step import (
+    CollectSearchChangesStep,
+)
 from app.application.pipelines.analytics.steps.find_or_create_mapping_step import (
     FindOrCreateMappingStep,
 )
@@ -7,6 +13,9 @@ from app.application.pipelines.analytics.steps.match_product_step import (
 from app.application.pipelines.analytics.steps.normalize_currency_step import (
     NormalizeCurrencyStep,
 )
+from app.application.pipelines.analytics.steps.provider_reliability_step import (
+    ProviderReliabilityStep,
+)
 from app.application.pipelines.analytics.steps.reliability_weighting_step import (
     ReliabilityWeightingStep,
 )
@@ -16,6 +25,9 @@ from app.application.pipelines.analytics.steps.save_price_history_step import (
 from app.application.pipelines.analytics.steps.trend_analysis_step import (
     TrendAnalysisStep,
 )
+from app.application.pipelines.analytics.steps.update_current_offers_step import (
+    UpdateCurrentOffersStep,
+)
 from app.application.pipelines.analytics.steps.update_trending_step import (
     UpdateTrendingStep,
 )
@@ -29,19 +41,37 @@ class ProductAnalysisPipeline(BasePipeline):
     Harici bir kaynaktan gelen ürün verisini analiz eden, temizleyen,
     zenginleştiren ve veritabanına kaydeden pipeline.
 
-    Adımlar:
-    1. NormalizeCurrencyStep: Fiyatları TRY'ye çevirir
-    2. FindOrCreateMappingStep: Provider mapping'i bulur/oluşturur
-    3. SavePriceHistoryStep: Fiyat geçmişini kaydeder
-    4. TrendAnalysisStep: Fiyat trendini analiz eder
-    5. UpdateTrendingStep: Top 5 trending ürünü kaydeder
+    Adımlar okuma/yazma bildirimlerine göre DAG olarak çalışır (bkz.
+    DagPipelineRunner). Ana session'ı kullanan adımlar sırayla, diğerleri
+    bağımlılıkları biter bitmez eşzamanlı çalışır:
+
+    Normalize ─► Mapping ─┬─► Match ─► SaveHistory ─► CurrentOffers ─► Trend ─┐
+                          │              └─► CollectSearchChanges             │
+                          └─► ProviderReliability ────────────────────────────┤
+                                          Trending, ReliabilityWeighting ◄────┘
+
+    1. NormalizeCurrencyStep: Fiyatları TRY'ye çevirir (bariyer)
+    2. FindOrCreateMappingStep: Provider mapping'i bulur/oluşturur (bariyer)
+    2b. ProviderReliabilityStep: Provider skorlarını ayrı session'da okur
     3. MatchProductStep: Ürün eşleştirmesi yapar
     4. SavePriceHistoryStep: Fiyat geçmişini kaydeder
+    4b. UpdateCurrentOffersStep: current_offers ve product_price_summary'yi günceller
     5. TrendAnalysisStep: Fiyat trendini analiz eder
+    5b. UpdateTrendingStep: Top 5 trending adayını seçer (commit sonrası yazılır)
     6. ReliabilityWeightingStep: Provider güvenilirlik ağırlıklandırması
+    7. CollectSearchChangesStep: Fiyatı değişen ürünleri toplar (index/detay cache)
     """
 
-    def __init__(self, uow: IUnitOfWork, currency_service: ICurrencyService) -> None:
+    def __init__(
+        self,
+        uow: IUnitOfWork,
+        currency_service: ICurrencyService,
+        match_index: Optional[ProductMatchIndex] = None,
+    ) -> None:
+        """
+        match_index: Aynı çalıştırmadaki pipeline'lar arasında paylaşılan
+        eşleştirme index'i.
+        """
         super().__init__(uow)
 
         # Adım 1: Para Birimini ve Fiyatı Normalize Et
@@ -50,19 +80,26 @@ class ProductAnalysisPipeline(BasePipeline):
         # Adım 2: Provider Mapping Bul veya Oluştur
         self.add_step(FindOrCreateMappingStep(uow))
 
+        # Adım 2b: Provider Güvenilirlik Skorları (eşleştirme ve kayıtla eşzamanlı)
+        self.add_step(ProviderReliabilityStep(uow))
+
         # Adım 3: Ürün Eşleştirme (Product Matching)
-        self.add_step(MatchProductStep(uow))
+        self.add_step(MatchProductStep(uow, match_index=match_index))
 
         # Adım 4: Fiyat Geçmişini Kaydet
         self.add_step(SavePriceHistoryStep(uow))
 
+        # Adım 4b: Güncel Teklifleri ve Ürün Fiyat Özetlerini Güncelle
+        self.add_step(UpdateCurrentOffersStep(uow))
+
         # Adım 5: Trend Analizi
         self.add_step(TrendAnalysisStep(uow))
 
-        # Adım 5: Trending Ürünleri Güncelle
-        self.add_step(UpdateTrendingStep(uow))
-
-
+        # Adım 5b: Trending Adaylarını Seç
+        self.add_step(UpdateTrendingStep())
 
         # Adım 6: Güvenilirlik Ağırlıklandırması
         self.add_step(ReliabilityWeightingStep(uow))
+
+        # Adım 7: Arama Index'i İçin Değişen Ürünleri Topla (commit sonrası indexlenir)
+        self.add_step(CollectSearchChangesStep())
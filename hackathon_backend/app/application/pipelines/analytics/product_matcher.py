@@ -0,0 +1,203 @@
+"""
+ProductMatchIndex - Sağlayıcılar arası ürün tekilleştirme için bellek içi
+bulanık (fuzzy) eşleştirme index'i.
+
+Her çalıştırmada mevcut ürünlerden bir kez kurulur; çalıştırma içinde
+oluşturulan ürünler index'e eklenir. Aday üretimi blocking ile yapılır:
+ürünler markaya göre kovalara (bucket), kova içinde kelime trigram'larına
+göre bloklara ayrılır. Bir isim sadece en nadir trigram'larını paylaşan
+ürünlerle karşılaştırılır ve sorgu başına aday sayısı sınırlıdır; böylece
+eşleştirme maliyeti katalog boyutuyla doğrusal büyümez.
+
+Skor pg_trgm'nin similarity() tanımıdır: kelime bazlı trigram kümelerinin
+Jaccard benzerliği (kelime sırası önemsiz). İçinde rakam olan token'lar
+(model numarası, beden, yıl) birebir eşleşmelidir: "air max 90" ile
+"air max 95" asla eşleşmez.
+"""
+
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_THRESHOLD = 0.6
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+# Markasız ürünlerin kovası
+NO_BRAND = ""
+# Tüm ürünleri içeren kova; markası bilinmeyen isimler burada aranır
+ANY_BRAND = "*"
+
+
+def fold(text: Optional[str]) -> str:
+    """Küçük harf + Türkçe/aksan katlama: 'Koşu AYAKKABISI' -> 'kosu ayakkabisi'."""
+    if not text:
+        return ""
+    folded = unicodedata.normalize("NFKD", text.casefold().replace("ı", "i"))
+    return "".join(c for c in folded if not unicodedata.combining(c))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN.findall(fold(text))
+
+
+def trigrams(tokens: Iterable[str]) -> FrozenSet[str]:
+    """pg_trgm gibi: her kelime '  kelime ' şeklinde doldurulup 3'lere bölünür."""
+    grams: Set[str] = set()
+    for token in tokens:
+        padded = f"  {token} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+@dataclass
+class _Entry:
+    product_id: int
+    name: str
+    numbers: FrozenSet[str]
+    grams: FrozenSet[str]
+    removed: bool = False
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    product_id: int
+    name: str
+    score: float
+
+
+class ProductMatchIndex:
+    """
+    Marka kovalı, token/trigram bloklu eşleştirme index'i.
+
+    threshold: Eşleşme için minimum benzerlik (0-1).
+    max_candidates: Sorgu başına skorlanacak en fazla aday (yaklaşık).
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_candidates: int = 500,
+    ) -> None:
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self._entries: List[_Entry] = []
+        self._blocks: Dict[Tuple[str, str], List[int]] = {}
+        self._positions: Dict[int, int] = {}
+        self._brands: Set[str] = set()
+
+    @classmethod
+    def build(
+        cls,
+        products: Iterable[Tuple[int, str, Optional[str]]],
+        **options: Any,
+    ) -> "ProductMatchIndex":
+        """(id, name, brand) satırlarından index kurar."""
+        index = cls(**options)
+        for product_id, name, brand in products:
+            index.add(product_id, name, brand)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _features(
+        tokens: List[str], brand_key: str
+    ) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """(rakamlı token'lar, trigramlar); marka token'ları isimden atılır."""
+        if brand_key:
+            brand_tokens = set(brand_key.split())
+            tokens = [t for t in tokens if t not in brand_tokens] or tokens
+        numbers = frozenset(t for t in tokens if any(c.isdigit() for c in t))
+        return numbers, trigrams(tokens)
+
+    def add(self, product_id: int, name: str, brand: Optional[str] = None) -> None:
+        brand_key = " ".join(tokenize(brand))
+        numbers, grams = self._features(tokenize(name), brand_key)
+        position = len(self._entries)
+        self._entries.append(_Entry(product_id, name, numbers, grams))
+        self._positions[product_id] = position
+        if brand_key:
+            self._brands.add(brand_key)
+        for gram in grams:
+            self._blocks.setdefault((brand_key, gram), []).append(position)
+            self._blocks.setdefault((ANY_BRAND, gram), []).append(position)
+
+    def discard(self, product_ids: Iterable[int]) -> None:
+        """
+        Ürünleri eşleşme adayı olmaktan çıkarır (ör. oluşturuldukları
+        transaction geri alındı).
+        """
+        for product_id in product_ids:
+            position = self._positions.pop(product_id, None)
+            if position is not None:
+                self._entries[position].removed = True
+
+    def _infer_brand(self, tokens: List[str]) -> str:
+        """Marka verilmemişse baştaki bir/iki token bilinen bir markaysa onu döner."""
+        for size in (2, 1):
+            prefix = " ".join(tokens[:size])
+            if len(tokens) > size and prefix in self._brands:
+                return prefix
+        return NO_BRAND
+
+    def match(self, name: str, brand: Optional[str] = None) -> Optional[MatchResult]:
+        """En benzer ürünü döner; eşik altındaysa None."""
+        tokens = tokenize(name)
+        brand_key = " ".join(tokenize(brand)) or self._infer_brand(tokens)
+
+        # Marka kovasında marka token'ları atılmış isimle, markasız ürünlerde
+        # (marka isimde yazıyor olabilir) tam isimle aranır. Marka bilinmiyorsa
+        # tüm ürünlere bakılır.
+        best: Optional[MatchResult] = None
+        if brand_key:
+            searches = [(brand_key, brand_key), (NO_BRAND, NO_BRAND)]
+        else:
+            searches = [(ANY_BRAND, NO_BRAND)]
+        for bucket, strip in searches:
+            numbers, grams = self._features(tokens, strip)
+            if not grams:
+                continue
+            result = self._best_in_bucket(bucket, numbers, grams)
+            if result is not None and (best is None or result.score > best.score):
+                best = result
+        return best
+
+    def _best_in_bucket(
+        self, bucket: str, numbers: FrozenSet[str], grams: FrozenSet[str]
+    ) -> Optional[MatchResult]:
+        # Prefix filtering: Jaccard >= t olan her aday, sorgunun en nadir
+        # |g| - ceil(t * |g|) + 1 trigramından en az birini paylaşmak zorundadır.
+        # Adaylar en küçük bloktan başlayarak bu trigramların bloklarından
+        # toplanır; aday bütçesini aşacak yaygın trigramlarda durulur. Böylece
+        # sorgu maliyeti katalog boyutundan bağımsızdır.
+        size = len(grams)
+        blocks = sorted(
+            (block for gram in grams if (block := self._blocks.get((bucket, gram)))),
+            key=len,
+        )
+        prefix = size - math.ceil(self.threshold * size) + 1
+        candidates: Set[int] = set()
+        for block in blocks[:prefix]:
+            if len(candidates) + len(block) > self.max_candidates:
+                break
+            candidates.update(block)
+
+        # Uzunluk ve model numarası filtresinden geçenler trigram Jaccard ile skorlanır
+        best: Optional[MatchResult] = None
+        min_size, max_size = self.threshold * size, size / self.threshold
+        for position in candidates:
+            entry = self._entries[position]
+            other = len(entry.grams)
+            if other < min_size or other > max_size or entry.numbers != numbers:
+                continue
+            if entry.removed:
+                continue
+            shared = len(grams & entry.grams)
+            score = shared / (size + other - shared)
+            if score >= self.threshold and (best is None or score > best.score):
+                best = MatchResult(entry.product_id, entry.name, score)
+        return best
@@ -0,0 +1,37 @@
+"""
+CollectSearchChangesStep - Arama index'inde güncellenmesi gereken ürünleri toplar.
+Pipeline commit edildikten sonra sadece bu ürünler yeniden indexlenir ve
+detay cache'leri silinir.
+"""
+
+from typing import Any, Dict, List
+
+from app.core.patterns.pipeline import BaseStep, PipelineContext
+
+
+class CollectSearchChangesStep(BaseStep):
+    """
+    Fiyat gözlemi değişen (SavePriceHistoryStep'in yeni kayıt yazdığı) ürün
+    id'lerini context.meta["search_changed_product_ids"] altında tekil ve
+    sıralı olarak toplar. Yeni ürün ve mapping'lerin ilk gözlemi her zaman
+    yazıldığından onlar da dahildir; hiçbir şey değişmeyen bir çalıştırma boş
+    liste üretir. Veritabanına erişmez.
+
+    Input: List of products with product_id, price_changed
+    Output: Same products (unchanged)
+    """
+
+    reads = frozenset({"product_id", "price_changed"})
+    writes: frozenset[str] = frozenset()
+    uses_session = False
+
+    async def process(self, context: PipelineContext) -> None:
+        products: List[Dict[str, Any]] = context.data or []
+
+        context.meta["search_changed_product_ids"] = sorted(
+            {
+                product["product_id"]
+                for product in products
+                if product.get("price_changed") and product.get("product_id")
+            }
+        )
@@ -3,10 +3,12 @@ FindOrCreateMappingStep - Provider ürün eşleştirmesi.
 External product code + provider_id → mapping_id bul veya oluştur.
 """
 
-from typing import Any, Dict, List
+from typing import Dict, List, Optional, Tuple
 
+from app.core.patterns.offer_batch import OfferBatch
 from app.core.patterns.pipeline import BaseStep, PipelineContext
 from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
+from app.domain.schemas.products.product_mapping import ProductMapping
 
 
 class FindOrCreateMappingStep(BaseStep):
@@ -15,24 +17,35 @@ class FindOrCreateMappingStep(BaseStep):
 
     Input: List of products with provider_id ve external_product_code
     Output: Same products with mapping_id added
+
+    Tüm batch tek bir bulk_find_or_create çağrısıyla çözülür; ürün sayısından
+    bağımsız olarak sabit sayıda veritabanı round trip'i yapılır.
     """
 
     def __init__(self, uow: IUnitOfWork) -> None:
         self.uow = uow
 
     async def process(self, context: PipelineContext) -> None:
-        products: List[Dict[str, Any]] = context.data
-
-        if not products:
+        if not context.data:
             return
 
-        enriched_products: List[Dict[str, Any]] = []
+        batch = OfferBatch.coerce(context.data)
         errors: List[str] = []
 
-        for product in products:
-            provider_id = product.get("provider_id")
-            external_code = product.get("external_product_code") or product.get("id")
-            product_url = product.get("product_url")
+        # 1. Validasyon: geçerli satırları ve mapping anahtarlarını topla
+        valid_rows: List[Tuple[int, Tuple[int, str]]] = []
+        keys: List[Tuple[int, str, Optional[str]]] = []
+
+        for index, (provider_id, code, fallback_id, product_url) in enumerate(
+            zip(
+                batch.values("provider_id"),
+                batch.values("external_product_code"),
+                batch.values("id"),
+                batch.values("product_url"),
+                strict=True,
+            )
+        ):
+            external_code = code or fallback_id
 
             # Validation
             if not provider_id:
@@ -45,27 +58,40 @@ class FindOrCreateMappingStep(BaseStep):
                 errors.append("Ürün external_product_code veya id içermiyor.")
                 continue
 
-            try:
-                # Find or create mapping
-                mapping = await self.uow.product_mappings.find_or_create(
-                    provider_id=provider_id,
-                    external_product_code=str(external_code),
-                    product_url=product_url,
-                )
-
-                # Add mapping_id to product
-                enriched = product.copy()
-                enriched["mapping_id"] = mapping.id
-                enriched["existing_product_id"] = mapping.product_id
-                enriched_products.append(enriched)
+            key = (provider_id, str(external_code))
+            valid_rows.append((index, key))
+            keys.append((provider_id, str(external_code), product_url))
 
+        # 2. Tüm batch için mapping'leri tek seferde bul veya oluştur
+        mappings: Dict[Tuple[int, str], ProductMapping] = {}
+        if keys:
+            try:
+                mappings = await self.uow.product_mappings.bulk_find_or_create(keys)
             except Exception as e:
-                errors.append(f"ID {external_code}: Mapping hatası: {e}")
+                errors.append(f"Toplu mapping hatası: {e}")
+                valid_rows = []
+
+        # 3. Mapping bilgilerini sütun olarak ekle (çözülemeyen satırlar çıkarılır)
+        kept: List[int] = []
+        mapping_ids: List[int] = []
+        existing_product_ids: List[Optional[int]] = []
+        for index, key in valid_rows:
+            mapping = mappings.get(key)
+            if mapping is None:
+                errors.append(f"ID {key[1]}: Mapping hatası: kayıt çözümlenemedi.")
+                continue
+            kept.append(index)
+            mapping_ids.append(mapping.id)
+            existing_product_ids.append(mapping.product_id)
+
+        enriched = batch.take(kept)
+        enriched.set_column("mapping_id", mapping_ids)
+        enriched.set_column("existing_product_id", existing_product_ids)
 
-        context.data = enriched_products
-        context.result = enriched_products
+        context.data = enriched
+        context.result = enriched
         context.errors.extend(errors)
 
         # Meta bilgiler
-        context.meta["mappings_processed"] = len(enriched_products)
+        context.meta["mappings_processed"] = len(enriched)
         context.meta["mapping_errors"] = len(errors)
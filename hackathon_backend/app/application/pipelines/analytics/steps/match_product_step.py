@@ -1,9 +1,11 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from app.application.pipelines.analytics.product_matcher import (
+    DEFAULT_THRESHOLD,
+    ProductMatchIndex,
+)
 from app.core.patterns.pipeline import BaseStep, PipelineContext
 from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
-from app.persistence.models.products.product import Product
-from app.persistence.models.products.product_variant import ProductVariant
 
 
 class MatchProductStep(BaseStep):
@@ -14,10 +16,60 @@ class MatchProductStep(BaseStep):
     Heuristic:
     1. İsim normalizasyonu (lowercase, trim).
     2. Exact match.
+    3. Bulanık eşleştirme (ProductMatchIndex): farklı sağlayıcıların aynı ürünü
+       farklı yazması (harf hatası, kelime sırası, Türkçe karakter) yeni ürün
+       oluşturmaz. Index çalıştırma başına bir kez kurulur (veya dışarıdan
+       paylaşılır); oluşturulan ürünler de index'e eklenir.
+
+    Batch başına set-based çalışır (item başına sorgu yok):
+    1. Tüm normalize isimler tek sorguda ürün id'lerine çözülür.
+    2. Eksik ürünler multi-row INSERT ... RETURNING ile eklenir.
+    3. Yeni ürünlerin varyantları tek multi-row INSERT ile eklenir.
+    4. Mapping'lerin product_id'leri tek UPDATE ... FROM (VALUES ...) ile yazılır.
     """
 
-    def __init__(self, uow: IUnitOfWork) -> None:
+    reads = frozenset(
+        {
+            "mapping_id",
+            "existing_product_id",
+            "name",
+            "brand",
+            "description",
+            "colors",
+            "sizes",
+        }
+    )
+    writes = frozenset(
+        {"product_id", "product_name", "db.products", "db.product_mappings"}
+    )
+
+    def __init__(
+        self,
+        uow: IUnitOfWork,
+        fuzzy_threshold: Optional[float] = DEFAULT_THRESHOLD,
+        match_index: Optional[ProductMatchIndex] = None,
+    ) -> None:
+        """
+        fuzzy_threshold=None bulanık eşleştirmeyi kapatır (sadece exact match).
+        match_index: Eşzamanlı pipeline'lar arasında paylaşılan index; verilmezse
+        ilk ihtiyaçta bu step için kurulur.
+        """
         self.uow = uow
+        self.fuzzy_threshold = fuzzy_threshold
+        self._match_index = match_index
+
+    async def _get_match_index(self, threshold: float) -> ProductMatchIndex:
+        """Mevcut ürünlerden index'i ilk ihtiyaçta kurar (çalıştırma başına bir kez)."""
+        if self._match_index is None:
+            self._match_index = ProductMatchIndex.build(
+                await self.uow.products.get_match_candidates(), threshold=threshold
+            )
+        return self._match_index
+
+    async def on_rollback(self, context: PipelineContext) -> None:
+        """Geri alınan ürünler index'te eşleşme adayı olarak kalmasın."""
+        if self._match_index is not None:
+            self._match_index.discard(context.meta.get("created_product_ids", []))
 
     def _normalize_name(self, name: str) -> str:
         """Basit isim temizleme."""
@@ -29,16 +81,49 @@ class MatchProductStep(BaseStep):
         name = " ".join(name.split())
         return name
 
+    @staticmethod
+    def _slug(normalized_name: str) -> str:
+        return normalized_name.replace(" ", "-")
+
+    @staticmethod
+    def _variants(
+        product_id: int, slug: str, item: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Her renk-beden kombinasyonu (beden yoksa her renk) için bir varyant."""
+        colors = item.get("colors") or []
+        sizes = item.get("sizes") or []
+        variants: List[Dict[str, Any]] = []
+        for color in colors:
+            if sizes:
+                for size in sizes:
+                    sku = f"{slug}-{color.lower()[:3]}-{size}"
+                    variants.append(
+                        {
+                            "product_id": product_id,
+                            "sku": sku.replace(" ", "-"),
+                            "attributes": {"color": color, "size": size},
+                        }
+                    )
+            else:
+                variants.append(
+                    {
+                        "product_id": product_id,
+                        "sku": f"{slug}-{color.lower()[:3]}".replace(" ", "-"),
+                        "attributes": {"color": color},
+                    }
+                )
+        return variants
+
     async def process(self, context: PipelineContext) -> None:
         products: List[Dict[str, Any]] = context.data
         if not products:
             return
 
         matched_count = 0
-        created_count = 0
-        variants_created = 0
         errors = []
 
+        # İsim -> eşleştirilecek item'lar (ilk item yeni ürünün kaynağıdır)
+        pending: Dict[str, List[Dict[str, Any]]] = {}
         for item in products:
             mapping_id = item.get("mapping_id")
             existing_product_id = item.get("existing_product_id")
@@ -52,84 +137,111 @@ class MatchProductStep(BaseStep):
             if not mapping_id:
                 continue
 
-            # Eşleştirme Mantığı
             raw_name = item.get("name", "")
             normalized_name = self._normalize_name(raw_name)
-
             if not normalized_name:
                 errors.append(f"Mapping {mapping_id}: Geçersiz isim '{raw_name}'")
                 continue
 
+            pending.setdefault(normalized_name, []).append(item)
+
+        created_count = 0
+        variants_created = 0
+        fuzzy_count = 0
+        created_ids: List[int] = []
+        if pending:
             try:
-                # 1. Mevcut ürünü isme göre ara
-                product = await self.uow.products.get_by_name(normalized_name)
-
-                if not product:
-                    # 2. Yoksa yeni oluştur
-                    slug = normalized_name.replace(" ", "-")
-
-                    product = Product(
-                        name=normalized_name,
-                        slug=slug,
-                        description=item.get("description"),
-                        brand=item.get("brand"),
+                # 1. Mevcut ürünleri isimlere göre tek sorguda çöz
+                product_ids = await self.uow.products.get_ids_by_names(list(pending))
+                canonical_names = {name: name for name in pending}
+
+                # 2. Bulunamayanları bulanık eşleştir; eşleşmeyenler yeni ürün olur.
+                # Yeni ürünler bu batch'e ait ayrı bir index'e geçici (negatif) id
+                # ile eklenir ki aynı batch'teki yakın isimler aynı yeni ürüne
+                # bağlansın.
+                new_names = [name for name in pending if name not in product_ids]
+                if new_names and self.fuzzy_threshold is not None:
+                    index = await self._get_match_index(self.fuzzy_threshold)
+                    batch_index = ProductMatchIndex(threshold=self.fuzzy_threshold)
+                    unmatched = new_names
+                    new_names = []
+                    for name in unmatched:
+                        brand = pending[name][0].get("brand")
+                        match = index.match(name, brand)
+                        if match is None:
+                            match = batch_index.match(name, brand)
+                        if match is None:
+                            new_names.append(name)
+                            batch_index.add(-len(new_names), name, brand)
+                            continue
+                        product_ids[name] = match.product_id
+                        canonical_names[name] = match.name
+                        fuzzy_count += len(pending[name])
+
+                # 3. Olmayanları toplu oluştur
+                if new_names:
+                    created = await self.uow.products.bulk_create(
+                        [
+                            {
+                                "name": name,
+                                "slug": self._slug(name),
+                                "description": pending[name][0].get("description"),
+                                "brand": pending[name][0].get("brand"),
+                            }
+                            for name in new_names
+                        ]
                     )
-                    self.uow.products.db.add(product)
-                    await self.uow.session.flush()  # ID almak için flush
-                    
-                    # 3. Varyantları oluştur (renkler ve bedenler)
-                    colors = item.get("colors", [])
-                    sizes = item.get("sizes", [])
-                    
-                    # Her renk-beden kombinasyonu için varyant oluştur
-                    if colors and sizes:
-                        for color in colors:
-                            for size in sizes:
-                                sku = f"{slug}-{color.lower()[:3]}-{size}".replace(" ", "-")
-                                variant = ProductVariant(
-                                    product_id=product.id,
-                                    sku=sku,
-                                    attributes={"color": color, "size": size}
-                                )
-                                self.uow.session.add(variant)
-                                variants_created += 1
-                    elif colors:
-                        for color in colors:
-                            sku = f"{slug}-{color.lower()[:3]}".replace(" ", "-")
-                            variant = ProductVariant(
-                                product_id=product.id,
-                                sku=sku,
-                                attributes={"color": color}
+                    for name in new_names:
+                        product_ids[name] = created[self._slug(name)]
+                    # Batch içi eşleşmeler: geçici id -> oluşturulan ürün
+                    for name, product_id in product_ids.items():
+                        if product_id < 0:
+                            product_ids[name] = product_ids[new_names[-product_id - 1]]
+                    created_ids = [product_ids[name] for name in new_names]
+                    if self._match_index is not None:
+                        for name in new_names:
+                            self._match_index.add(
+                                product_ids[name], name, pending[name][0].get("brand")
                             )
-                            self.uow.session.add(variant)
-                            variants_created += 1
-                    
-                    created_count += 1
-                else:
-                    matched_count += 1
-
-                # 4. Mapping'i güncelle - product_id ataması (ORM entity gerekli)
-                mapping = await self.uow.product_mappings.get_orm(mapping_id)
-                if mapping:
-                    mapping.product_id = product.id
-                    # SQLAlchemy dirty tracking ile güncellenir, flush yapılacak
-
-                # Context güncelle
-                item["product_id"] = product.id
-                item["product_name"] = product.name
 
+                    # 4. Yeni ürünlerin varyantları
+                    variants = [
+                        variant
+                        for name in new_names
+                        for variant in self._variants(
+                            product_ids[name], self._slug(name), pending[name][0]
+                        )
+                    ]
+                    if variants:
+                        variants_created = await self.uow.products.bulk_create_variants(
+                            variants
+                        )
+                    created_count = len(new_names)
+
+                # 5. Mapping'leri ürünlere bağla
+                assignments: Dict[int, int] = {}
+                for name, items in pending.items():
+                    for item in items:
+                        item["product_id"] = product_ids[name]
+                        item["product_name"] = canonical_names[name]
+                        assignments[item["mapping_id"]] = product_ids[name]
+                await self.uow.product_mappings.assign_products(assignments)
+
+                # Aynı batch'te ikinci kez gelen isimler mevcut ürünle eşleşmiş sayılır
+                matched_count += (
+                    sum(len(items) for items in pending.values()) - created_count
+                )
             except Exception as e:
-                errors.append(f"Mapping {mapping_id}: Eşleştirme hatası: {e}")
-
-        # Tüm mapping güncellemelerini veritabanına yaz
-        try:
-            await self.uow.session.flush()
-        except Exception as e:
-            errors.append(f"Mapping güncellemeleri kaydedilemedi: {e}")
+                # Geri alınacak ürünler eşleşme adayı olarak kalmasın
+                if self._match_index is not None:
+                    self._match_index.discard(created_ids)
+                errors.append(f"Ürün eşleştirme hatası: {e}")
 
         # Meta güncelleme
         context.meta["products_matched_existing"] = matched_count
+        context.meta["products_fuzzy_matched"] = fuzzy_count
         context.meta["products_created"] = created_count
+        context.meta["created_product_ids"] = created_ids
         context.meta["variants_created"] = variants_created
         if errors:
             context.errors.extend(errors)
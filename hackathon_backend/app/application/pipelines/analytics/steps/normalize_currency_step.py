@@ -1,5 +1,6 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+from app.core.patterns.offer_batch import OfferBatch
 from app.core.patterns.pipeline import BaseStep, PipelineContext
 from app.domain.i_services.i_currency_service import ICurrencyService
 
@@ -17,78 +18,79 @@ class NormalizeCurrencyStep(BaseStep):
         self.currency_service = currency_service
 
     async def process(self, context: PipelineContext) -> None:
-        products: List[Dict[str, Any]] = context.data or []
-        
-        if not products:
+        if not context.data:
             context.errors.append("Boş ürün listesi alındı.")
             return
 
+        # Satırlar kopyalanmaz; fiyat sütunları yerinde eklenir/değiştirilir
+        batch = OfferBatch.coerce(context.data)
+
         # 1. Kurları batch başında tek seferde çek (cache'li)
         exchange_rates = await self.currency_service.get_exchange_rates()
 
         # 2. Her ürünü işle
-        normalized_products: List[Dict[str, Any]] = []
+        valid: List[int] = []
+        prices: List[float] = []
+        original_prices: List[float] = []
+        original_currencies: List[Any] = []
         errors: List[str] = []
 
-        for product in products:
-            result = self._normalize_single(product, exchange_rates)
-            if result["success"]:
-                normalized_products.append(result["data"])
-            else:
-                errors.append(result["error"])
-
-        # 3. Sonuçları context'e yaz
-        context.data = normalized_products
-        context.result = normalized_products
+        for index, (external_id, raw_price, raw_currency) in enumerate(
+            zip(
+                batch.values("id", "unknown"),
+                batch.values("price"),
+                batch.values("currency", "TRY"),
+                strict=True,
+            )
+        ):
+            try:
+                price_float, price_in_try = self._normalize_price(
+                    raw_price, raw_currency, exchange_rates
+                )
+            except ValueError as e:
+                errors.append(f"ID {external_id}: {e}")
+                continue
+            valid.append(index)
+            original_prices.append(price_float)
+            original_currencies.append(raw_currency)
+            prices.append(round(price_in_try, 2))
+
+        # 3. Sonuçları context'e yaz (geçersiz satırlar batch'ten çıkarılır)
+        normalized = batch.take(valid)
+        normalized.set_column("original_price", original_prices)
+        normalized.set_column("original_currency", original_currencies)
+        normalized.set_column("price", prices)
+        normalized.set_column("currency", ["TRY"] * len(valid))
+
+        context.data = normalized
+        context.result = normalized
         context.errors.extend(errors)
 
         # Meta bilgi ekle
-        context.meta["total_products"] = len(products)
-        context.meta["normalized_count"] = len(normalized_products)
+        context.meta["total_products"] = len(batch)
+        context.meta["normalized_count"] = len(normalized)
         context.meta["error_count"] = len(errors)
 
-    def _normalize_single(
-        self, product: Dict[str, Any], rates: Dict[str, float]
-    ) -> Dict[str, Any]:
-        """Tek bir ürünün fiyatını normalize eder."""
-        external_id = product.get("id", "unknown")
-        raw_price = product.get("price")
-        raw_currency = product.get("currency", "TRY")
-
+    def _normalize_price(
+        self, raw_price: Any, raw_currency: str, rates: Dict[str, float]
+    ) -> Tuple[float, float]:
+        """Tek bir fiyatı (orijinal, TRY) olarak döndürür; geçersizse ValueError."""
         # Fiyat kontrolü
         if raw_price is None:
-            return {
-                "success": False,
-                "error": f"ID {external_id}: Fiyat bilgisi bulunamadı.",
-            }
+            raise ValueError("Fiyat bilgisi bulunamadı.")
 
         # Fiyat parse
-        try:
-            price_float = self._parse_price(raw_price)
-        except ValueError as e:
-            return {"success": False, "error": f"ID {external_id}: {e}"}
+        price_float = self._parse_price(raw_price)
 
         # Döviz çevirisi
         currency_upper = raw_currency.upper()
         if currency_upper == "TRY":
-            price_in_try = price_float
-        else:
-            rate = rates.get(currency_upper)
-            if not rate:
-                return {
-                    "success": False,
-                    "error": f"ID {external_id}: {currency_upper} için kur bulunamadı.",
-                }
-            price_in_try = price_float * rate
-
-        # Sonucu oluştur
-        normalized = product.copy()
-        normalized["original_price"] = price_float
-        normalized["original_currency"] = raw_currency
-        normalized["price"] = round(price_in_try, 2)
-        normalized["currency"] = "TRY"
-
-        return {"success": True, "data": normalized}
+            return price_float, price_float
+
+        rate = rates.get(currency_upper)
+        if not rate:
+            raise ValueError(f"{currency_upper} için kur bulunamadı.")
+        return price_float, price_float * rate
 
     def _parse_price(self, raw_price: Any) -> float:
         """Fiyat string'ini float'a çevirir."""
@@ -7,6 +7,7 @@ Kaynak güvenilirlik ağırlıklandırması içerir.
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
+from app.core.patterns.offer_batch import MISSING, OfferBatch
 from app.core.patterns.pipeline import BaseStep, PipelineContext
 from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
 
@@ -61,98 +62,159 @@ class ProfitMarginStep(BaseStep):
         return PROVIDER_RELIABILITY_WEIGHTS.get(provider_key, DEFAULT_RELIABILITY_WEIGHT)
 
     async def process(self, context: PipelineContext) -> None:
-        products: List[Dict[str, Any]] = context.data
-
-        if not products:
+        if not context.data:
             return
 
-        enriched_products: List[Dict[str, Any]] = []
+        batch = OfferBatch.coerce(context.data)
         arbitrage_count = 0
         errors: List[str] = []
 
-        for product in products:
-            price = product.get("price")
-            mapping_id = product.get("mapping_id")
-            provider = product.get("provider")
-
-            if price is None:
-                enriched_products.append(product)
-                continue
-
-            try:
-                # Güvenilirlik ağırlığını al
-                reliability_weight = self._get_reliability_weight(provider)
-
-                # 1. Market ortalamasını belirle
-                market_avg = await self._get_market_average(product, mapping_id)
-
-                if market_avg is None or market_avg == 0:
-                    # Market verisi yok, sadece mevcut veriyi geçir
-                    enriched = product.copy()
-                    enriched["has_market_data"] = False
-                    enriched_products.append(enriched)
-                    continue
-
-                # 2. Kar marjı hesapla
-                # Formül: ((market_avg - price) / market_avg) * 100
-                # Pozitif = bu provider daha ucuz (satılırsa kar potansiyeli)
-                # Negatif = bu provider daha pahalı
-                margin_percent = ((market_avg - price) / market_avg) * 100
-
-                # 3. Güvenilirlik ağırlıklı kar marjı
-                weighted_margin = margin_percent * reliability_weight
-
-                # 4. Arbitraj fırsatı kontrolü (ağırlıklı marja göre)
-                is_arbitrage = weighted_margin >= self.arbitrage_threshold
-
-                if is_arbitrage:
-                    arbitrage_count += 1
-
-                # 5. Ürüne metrikleri ekle
-                enriched = product.copy()
-                enriched.update({
-                    "market_avg_price": round(market_avg, 2),
-                    "profit_margin_percent": round(margin_percent, 2),
-                    "weighted_profit_margin": round(weighted_margin, 2),
-                    "reliability_weight": reliability_weight,
-                    "is_arbitrage_opportunity": is_arbitrage,
-                    "has_market_data": True,
-                })
-                enriched_products.append(enriched)
-
-            except Exception as e:
-                errors.append(f"Mapping {mapping_id}: Kar marjı hesaplama hatası: {e}")
-                enriched_products.append(product)
-
-        context.data = enriched_products
-        context.result = enriched_products
+        # avg_price'ı olmayan ürünlerin geçmişini tek sorguda çek
+        histories = await self._preload_histories(batch, errors)
+
+        fields = (
+            "market_avg_price",
+            "profit_margin_percent",
+            "weighted_profit_margin",
+            "reliability_weight",
+            "is_arbitrage_opportunity",
+            "has_market_data",
+        )
+        columns: Dict[str, List[Any]] = {field: [] for field in fields}
+
+        for price, mapping_id, provider, avg_price in zip(
+            batch.values("price"),
+            batch.values("mapping_id"),
+            batch.values("provider"),
+            batch.values("avg_price"),
+            strict=True,
+        ):
+            row: Dict[str, Any] = {}
+            if price is not None:
+                try:
+                    row = self._enrich(
+                        price, mapping_id, provider, avg_price, histories
+                    )
+                except Exception as e:
+                    errors.append(
+                        f"Mapping {mapping_id}: Kar marjı hesaplama hatası: {e}"
+                    )
+            if row.get("is_arbitrage_opportunity"):
+                arbitrage_count += 1
+
+            # Hesaplanamayan satırlar mevcut değerlerini korur
+            for field, column in columns.items():
+                column.append(row.get(field, MISSING))
+
+        for field, column in columns.items():
+            existing = batch.column(field)
+            batch.set_column(
+                field,
+                [
+                    old if new is MISSING else new
+                    for new, old in zip(column, existing, strict=True)
+                ],
+            )
+
+        context.data = batch
+        context.result = batch
         context.errors.extend(errors)
 
         # Meta bilgiler
         context.meta["arbitrage_opportunities"] = arbitrage_count
         context.meta["profit_margin_errors"] = len(errors)
 
-    async def _get_market_average(
-        self, product: Dict[str, Any], mapping_id: Optional[int]
+    def _enrich(
+        self,
+        price: Any,
+        mapping_id: Optional[int],
+        provider: Optional[str],
+        avg_price: Any,
+        histories: Dict[int, List[Decimal]],
+    ) -> Dict[str, Any]:
+        """Tek ürünün kar marjı alanları."""
+        # Güvenilirlik ağırlığını al
+        reliability_weight = self._get_reliability_weight(provider)
+
+        # 1. Market ortalamasını belirle
+        market_avg = self._get_market_average(avg_price, mapping_id, histories)
+
+        if market_avg is None or market_avg == 0:
+            # Market verisi yok, sadece mevcut veriyi geçir
+            return {"has_market_data": False}
+
+        # 2. Kar marjı hesapla
+        # Formül: ((market_avg - price) / market_avg) * 100
+        # Pozitif = bu provider daha ucuz (satılırsa kar potansiyeli)
+        # Negatif = bu provider daha pahalı
+        margin_percent = ((market_avg - price) / market_avg) * 100
+
+        # 3. Güvenilirlik ağırlıklı kar marjı
+        weighted_margin = margin_percent * reliability_weight
+
+        # 4. Arbitraj fırsatı kontrolü (ağırlıklı marja göre)
+        is_arbitrage = weighted_margin >= self.arbitrage_threshold
+
+        # 5. Ürüne metrikleri ekle
+        return {
+            "market_avg_price": round(market_avg, 2),
+            "profit_margin_percent": round(margin_percent, 2),
+            "weighted_profit_margin": round(weighted_margin, 2),
+            "reliability_weight": reliability_weight,
+            "is_arbitrage_opportunity": is_arbitrage,
+            "has_market_data": True,
+        }
+
+    async def _preload_histories(
+        self, batch: OfferBatch, errors: List[str]
+    ) -> Dict[int, List[Decimal]]:
+        """
+        TrendAnalysisStep'ten avg_price gelmeyen ürünlerin fiyat geçmişini
+        tek bir windowed sorguyla yükler.
+        """
+        mapping_ids = [
+            mapping_id
+            for mapping_id, price, avg_price in zip(
+                batch.values("mapping_id"),
+                batch.values("price"),
+                batch.values("avg_price"),
+                strict=True,
+            )
+            if mapping_id and price is not None and avg_price is None
+        ]
+        if not mapping_ids:
+            return {}
+
+        try:
+            return await self.uow.price_histories.get_recent_prices_by_mapping_ids(
+                mapping_ids, limit=self.MARKET_HISTORY_LIMIT
+            )
+        except Exception as e:
+            errors.append(f"Market fiyat geçmişi yüklenemedi: {e}")
+            return {}
+
+    def _get_market_average(
+        self,
+        avg_price: Any,
+        mapping_id: Optional[int],
+        histories: Dict[int, List[Decimal]],
     ) -> Optional[float]:
         """
         Ürün için market ortalamasını hesaplar.
 
         Öncelik:
         1. TrendAnalysisStep'ten gelen avg_price (zaten fiyat geçmişinden hesaplanmış)
-        2. Veritabanından taze hesaplama
+        2. Batch başında toplu yüklenen fiyat geçmişi
         """
         # TrendAnalysis'ten gelen avg_price varsa kullan
-        if product.get("avg_price") is not None:
-            return float(product["avg_price"])
+        if avg_price is not None:
+            return float(avg_price)
 
-        # Yoksa DB'den çek
+        # Yoksa önceden yüklenmiş geçmişi kullan
         if mapping_id:
-            history = await self.uow.price_histories.get_by_mapping_id(
-                mapping_id, limit=self.MARKET_HISTORY_LIMIT
-            )
-            if history and len(history) >= 1:
-                prices = [float(h.price) for h in history]
+            history = histories.get(mapping_id)
+            if history:
+                prices = [float(p) for p in history]
                 return sum(prices) / len(prices)
 
         return None
@@ -0,0 +1,92 @@
+"""
+ProviderReliabilityStep - Provider güvenilirlik skorlarını ürünlere ekler.
+Sadece provider_id'ye ihtiyaç duyar; DAG'da eşleştirme, fiyat kaydı ve
+trend analizi ile eşzamanlı olarak ayrı bir session üzerinde çalışır.
+"""
+
+from typing import Any, Dict, Iterable
+
+from app.core.patterns.offer_batch import MISSING, OfferBatch
+from app.core.patterns.pipeline import BaseStep, PipelineContext
+from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
+
+# Provider bulunamaz veya okunamazsa kullanılan değerler
+DEFAULT_RELIABILITY_SCORE = 1.0
+DEFAULT_DATA_QUALITY_SCORE = 50
+
+
+def confidence_level(reliability: float, data_quality: int) -> float:
+    """reliability_score (0-1) ve data_quality_score (0-100) birleşimi (0-1)."""
+    return (reliability + (data_quality / 100)) / 2
+
+
+async def load_provider_scores(
+    uow: IUnitOfWork, provider_ids: Iterable[int]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Provider skorlarını ayrı bir session'da tek sorguyla okur.
+    Dönen her kayıt reliability_score, data_quality_score ve confidence_level içerir.
+    """
+    ids = sorted(set(provider_ids))
+    if not ids:
+        return {}
+
+    try:
+        async with uow.reader() as reader:
+            rows = await reader.providers.get_reliability_scores(ids)
+    except Exception:
+        # Hata durumunda default değerler kullan
+        rows = {}
+
+    scores: Dict[int, Dict[str, Any]] = {}
+    for provider_id in ids:
+        reliability, data_quality = rows.get(
+            provider_id, (DEFAULT_RELIABILITY_SCORE, None)
+        )
+        data_quality = data_quality or DEFAULT_DATA_QUALITY_SCORE
+        scores[provider_id] = {
+            "reliability_score": round(reliability, 2),
+            "data_quality_score": data_quality,
+            "confidence_level": round(confidence_level(reliability, data_quality), 2),
+        }
+    return scores
+
+
+class ProviderReliabilityStep(BaseStep):
+    """
+    Her ürüne provider'ının güvenilirlik metriklerini ekler.
+
+    Çıktı alanları:
+    - reliability_score: Provider güvenilirlik skoru (0.00-1.00)
+    - data_quality_score: Veri kalitesi skoru (0-100)
+    - confidence_level: Birleşik güven seviyesi (0.00-1.00)
+    """
+
+    reads = frozenset({"provider_id"})
+    writes = frozenset({"reliability_score", "data_quality_score", "confidence_level"})
+    uses_session = False
+
+    def __init__(self, uow: IUnitOfWork) -> None:
+        self.uow = uow
+
+    async def process(self, context: PipelineContext) -> None:
+        if not context.data:
+            return
+
+        batch = OfferBatch.coerce(context.data)
+        provider_ids = batch.values("provider_id")
+        scores = await load_provider_scores(self.uow, (p for p in provider_ids if p))
+
+        # Provider'ı olmayan/bilinmeyen satırlarda alanlar boş kalır
+        for field in self.writes:
+            batch.set_column(
+                field,
+                [
+                    scores[provider_id][field] if provider_id in scores else MISSING
+                    for provider_id in provider_ids
+                ],
+            )
+
+        context.data = batch
+        context.result = batch
+        context.meta["provider_scores_loaded"] = len(scores)
@@ -4,8 +4,13 @@ Provider'ın reliability_score ve data_quality_score değerlerine göre
 trend ve kar marjı hesaplamalarını ağırlıklandırır.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
+from app.application.pipelines.analytics.steps.provider_reliability_step import (
+    confidence_level,
+    load_provider_scores,
+)
+from app.core.patterns.offer_batch import MISSING, OfferBatch
 from app.core.patterns.pipeline import BaseStep, PipelineContext
 from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
 
@@ -16,6 +21,7 @@ class ReliabilityWeightingStep(BaseStep):
 
     Her ürün için:
     1. Provider'ın reliability_score ve data_quality_score değerlerini alır
+       (ProviderReliabilityStep eklediyse item'dan, yoksa ayrı session'dan okur)
     2. Confidence level hesaplar
     3. Trend ve kar marjı değerlerini ağırlıklandırır
 
@@ -27,94 +33,109 @@ class ReliabilityWeightingStep(BaseStep):
     - weighted_profit_margin: Ağırlıklandırılmış kar marjı
     """
 
+    reads = frozenset(
+        {
+            "provider_id",
+            "trend_score",
+            "profit_margin_percent",
+            "reliability_score",
+            "data_quality_score",
+        }
+    )
+    writes = frozenset(
+        {
+            "reliability_score",
+            "data_quality_score",
+            "confidence_level",
+            "weighted_trend_score",
+            "weighted_profit_margin",
+        }
+    )
+    uses_session = False
+
     def __init__(self, uow: IUnitOfWork) -> None:
         self.uow = uow
-        self._provider_cache: Dict[int, Dict[str, Any]] = {}
 
     async def process(self, context: PipelineContext) -> None:
-        products: List[Dict[str, Any]] = context.data
-
-        if not products:
+        if not context.data:
             return
 
-        # Provider verilerini önbelleğe al
-        await self._preload_providers(products)
+        batch = OfferBatch.coerce(context.data)
+        provider_ids = batch.values("provider_id")
+        item_reliability = batch.column("reliability_score")
+        item_quality = batch.column("data_quality_score")
+
+        # Skorları item'da olmayan provider'ları tek sorguda oku
+        provider_scores = await load_provider_scores(
+            self.uow,
+            (
+                provider_id
+                for provider_id, reliability in zip(
+                    provider_ids, item_reliability, strict=True
+                )
+                if provider_id and reliability is MISSING
+            ),
+        )
 
-        weighted_products: List[Dict[str, Any]] = []
+        columns: Dict[str, List[Any]] = {field: [] for field in self.writes}
         errors: List[str] = []
 
-        for product in products:
-            provider_id = product.get("provider_id")
-
-            if not provider_id:
-                weighted_products.append(product)
-                continue
-
-            try:
-                # Provider verilerini al
-                provider_data = self._provider_cache.get(provider_id, {})
-                
-                reliability = float(provider_data.get("reliability_score", 1.0))
-                data_quality = provider_data.get("data_quality_score") or 50  # Default 50
-
-                # Confidence level hesapla (0.0 - 1.0 arası)
-                # reliability_score (0-1) ve data_quality_score (0-100) birleştir
-                confidence_level = (reliability + (data_quality / 100)) / 2
-
-                # Ağırlıklandırılmış değerler hesapla
-                trend_score = product.get("trend_score", 0)
-                profit_margin = product.get("profit_margin_percent", 0)
-
-                weighted_trend = trend_score * reliability
-                weighted_profit = profit_margin * reliability
-
-                # Ürüne metrikleri ekle
-                enriched = product.copy()
-                enriched.update({
-                    "reliability_score": round(reliability, 2),
-                    "data_quality_score": data_quality,
-                    "confidence_level": round(confidence_level, 2),
-                    "weighted_trend_score": round(weighted_trend, 2),
-                    "weighted_profit_margin": round(weighted_profit, 2),
-                })
-                weighted_products.append(enriched)
-
-            except Exception as e:
-                errors.append(f"Provider {provider_id}: Ağırlıklandırma hatası: {e}")
-                weighted_products.append(product)
-
-        context.data = weighted_products
-        context.result = weighted_products
+        for index, (provider_id, trend_score, profit_margin) in enumerate(
+            zip(
+                provider_ids,
+                batch.values("trend_score", 0),
+                batch.values("profit_margin_percent", 0),
+                strict=True,
+            )
+        ):
+            row: Dict[str, Any] = {}
+            if provider_id:
+                try:
+                    # Provider verilerini al
+                    provider_data = provider_scores.get(provider_id) or {
+                        "reliability_score": item_reliability[index],
+                        "data_quality_score": item_quality[index],
+                    }
+                    reliability = float(provider_data["reliability_score"])
+                    data_quality = provider_data["data_quality_score"]
+                    if data_quality is MISSING or not data_quality:
+                        data_quality = 50  # Default 50
+
+                    # Ağırlıklandırılmış değerler hesapla
+                    row = {
+                        "reliability_score": round(reliability, 2),
+                        "data_quality_score": data_quality,
+                        "confidence_level": round(
+                            confidence_level(reliability, data_quality), 2
+                        ),
+                        "weighted_trend_score": round(trend_score * reliability, 2),
+                        "weighted_profit_margin": round(profit_margin * reliability, 2),
+                    }
+                except Exception as e:
+                    errors.append(
+                        f"Provider {provider_id}: Ağırlıklandırma hatası: {e}"
+                    )
+
+            # Ağırlıklandırılamayan satırlar mevcut değerlerini korur
+            for field, column in columns.items():
+                column.append(row.get(field, MISSING))
+
+        for field, column in columns.items():
+            existing = batch.column(field)
+            batch.set_column(
+                field,
+                [
+                    old if new is MISSING else new
+                    for new, old in zip(column, existing, strict=True)
+                ],
+            )
+
+        context.data = batch
+        context.result = batch
         context.errors.extend(errors)
 
         # Meta bilgiler
         context.meta["reliability_weighted_count"] = sum(
-            1 for p in weighted_products if "confidence_level" in p
+            1 for level in batch.column("confidence_level") if level is not MISSING
         )
         context.meta["reliability_weighting_errors"] = len(errors)
-
-    async def _preload_providers(self, products: List[Dict[str, Any]]) -> None:
-        """Provider verilerini tek sorguda önbelleğe al."""
-        provider_ids = set(
-            p.get("provider_id") for p in products if p.get("provider_id")
-        )
-
-        if not provider_ids:
-            return
-
-        # Tüm provider'ları çek
-        for provider_id in provider_ids:
-            if provider_id not in self._provider_cache:
-                try:
-                    provider = await self.uow.providers.get(provider_id)
-                    if provider:
-                        self._provider_cache[provider_id] = {
-                            "reliability_score": float(provider.reliability_score or 1.0),
-                            "data_quality_score": provider.data_quality_score,
-                        }
-                except Exception:
-                    # Hata durumunda default değerler kullan
-                    self._provider_cache[provider_id] = {
-                        "reliability_score": 1.0,
-                        "data_quality_score": 50,
-                    }
@@ -1,14 +1,44 @@
 """
 SavePriceHistoryStep - Fiyat geçmişini veritabanına kaydeder.
-Trend analizi için fiyat verilerini biriktirir.
+Trend analizi için fiyat verilerini biriktirir ve mapping bazlı
+artımlı istatistikleri (price_statistics) aynı transaction'da günceller.
 """
 
+from bisect import bisect_left
 from decimal import Decimal
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from app.core.patterns.pipeline import BaseStep, PipelineContext
 from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
-from app.domain.schemas.price.price_history import PriceHistoryCreate
+from app.domain.schemas.price.price_history import PriceHistoryCreate, PriceObservation
+
+# Stok aralıkları: 0, 1-5, 6-20, 21-100, 100+ (aralık içi değişim yeni kayıt yazdırmaz)
+STOCK_BUCKET_BOUNDS = (0, 5, 20, 100)
+
+ObservationKey = Tuple[Decimal, Optional[Decimal], bool, Optional[int]]
+
+
+def stock_bucket(stock_quantity: Optional[int]) -> Optional[int]:
+    """Stok miktarının aralık indeksi; miktar bilinmiyorsa None."""
+    if stock_quantity is None:
+        return None
+    return bisect_left(STOCK_BUCKET_BOUNDS, stock_quantity)
+
+
+def observation_key(
+    price: Decimal,
+    original_price: Optional[Decimal],
+    in_stock: bool,
+    stock_quantity: Optional[int],
+) -> ObservationKey:
+    """İki gözlem bu anahtarda eşitse fiyat kaydı değişmemiş sayılır."""
+    cent = Decimal("0.01")
+    return (
+        price.quantize(cent),
+        original_price.quantize(cent) if original_price is not None else None,
+        in_stock,
+        stock_bucket(stock_quantity),
+    )
 
 
 class SavePriceHistoryStep(BaseStep):
@@ -16,10 +46,37 @@ class SavePriceHistoryStep(BaseStep):
     Normalize edilmiş ve mapping_id atanmış ürünlerin fiyatlarını
     price_histories tablosuna kaydeder.
 
+    Sadece değişen gözlemler yazılır: fiyat, liste fiyatı, stok durumu veya
+    stok aralığı mapping'in son kaydıyla aynıysa yeni satır yerine o kaydın
+    last_seen_at'i ilerletilir. Böylece her kayıt değişmeyen bir gözlem
+    dizisini (aralık) temsil eder.
+
+    Yazılan fiyatlar price_statistics tablosuna da işlenir; böylece
+    TrendAnalysisStep ham geçmişi tekrar okumak zorunda kalmaz. Değişmeyen
+    gözlemler istatistiklere tekrar eklenmez (bir aralık tek örnektir).
+
+    Yeni kayıt yazılan satırlar price_changed=True ile işaretlenir; detay
+    cache'i ve arama index'i sadece bu ürünler için güncellenir.
+
     Input: List of products with mapping_id, price, original_price, currency
-    Output: Same products (unchanged), saved records in meta
+    Output: Same products with price_changed, saved records in meta
     """
 
+    reads = frozenset(
+        {
+            "mapping_id",
+            "price",
+            "original_price",
+            "discount_rate",
+            "currency",
+            "in_stock",
+            "stock_quantity",
+            "external_product_code",
+            "id",
+        }
+    )
+    writes = frozenset({"price_changed", "db.price_histories", "db.price_statistics"})
+
     def __init__(self, uow: IUnitOfWork) -> None:
         self.uow = uow
         self._currency_cache: Dict[str, int] = {}
@@ -39,6 +96,8 @@ class SavePriceHistoryStep(BaseStep):
             return
 
         price_records: List[PriceHistoryCreate] = []
+        # price_records ile paralel: her kaydın geldiği satır
+        record_rows: List[Dict[str, Any]] = []
         errors: List[str] = []
 
         for product in products:
@@ -76,21 +135,28 @@ class SavePriceHistoryStep(BaseStep):
                     stock_quantity=product.get("stock_quantity"),
                 )
                 price_records.append(record)
+                record_rows.append(product)
             except Exception as e:
                 errors.append(f"Mapping {mapping_id}: Record oluşturma hatası: {e}")
 
-        # Batch insert
+        # Sadece değişen gözlemleri toplu yaz (COPY / multi-row INSERT)
+        context.meta["saved_price_records"] = 0
+        context.meta["unchanged_price_records"] = 0
         if price_records:
+            changed, unchanged = await self._split_unchanged(price_records, errors)
             try:
-                saved = await self.uow.price_histories.create_bulk(
-                    items=price_records, commit=False
-                )
-                context.meta["saved_price_records"] = len(saved)
+                ids = await self.uow.price_histories.insert_many(changed)
+                await self.uow.price_histories.touch_last_seen(unchanged)
+                context.meta["saved_price_records"] = len(ids)
+                skipped = len(price_records) - len(changed)
+                context.meta["unchanged_price_records"] = skipped
+                written = {id(record) for record in changed}
+                for record, product in zip(price_records, record_rows, strict=True):
+                    product["price_changed"] = id(record) in written
+                if changed:
+                    await self._update_statistics(changed, context, errors)
             except Exception as e:
                 errors.append(f"Batch insert hatası: {e}")
-                context.meta["saved_price_records"] = 0
-        else:
-            context.meta["saved_price_records"] = 0
 
         context.errors.extend(errors)
         context.meta["price_save_errors"] = len(errors)
@@ -98,3 +164,65 @@ class SavePriceHistoryStep(BaseStep):
         # Data değişmez, sadece kaydedildi
         context.result = context.data
 
+    async def _split_unchanged(
+        self, records: List[PriceHistoryCreate], errors: List[str]
+    ) -> Tuple[List[PriceHistoryCreate], List[PriceObservation]]:
+        """
+        Kayıtları son gözlemlere göre ayırır: yazılacak (değişen) kayıtlar ve
+        last_seen_at'i ilerletilecek mevcut kayıtlar. Aynı batch'te tekrarlanan
+        gözlemler de bir kez yazılır.
+        """
+        try:
+            latest = await self.uow.price_histories.get_latest_observations(
+                [record.mapping_id for record in records if record.mapping_id]
+            )
+        except Exception as e:
+            # Son durum okunamazsa hepsi yazılır; veri kaybolmaz, sadece tekrar eder
+            errors.append(f"Son fiyat kayıtları okunamadı: {e}")
+            return records, []
+
+        last_keys: Dict[Optional[int], ObservationKey] = {
+            mapping_id: observation_key(
+                o.price, o.original_price, o.in_stock, o.stock_quantity
+            )
+            for mapping_id, o in latest.items()
+        }
+        changed: List[PriceHistoryCreate] = []
+        written: Set[Optional[int]] = set()
+        touched: Dict[int, PriceObservation] = {}
+        for record in records:
+            key = observation_key(
+                record.price,
+                record.original_price,
+                record.in_stock,
+                record.stock_quantity,
+            )
+            if last_keys.get(record.mapping_id) != key:
+                changed.append(record)
+                written.add(record.mapping_id)
+                last_keys[record.mapping_id] = key
+            elif record.mapping_id not in written:
+                # Yeni yazılan kaydın last_seen_at'i zaten şimdi
+                observation = latest[record.mapping_id]
+                touched[observation.id] = observation
+        return changed, list(touched.values())
+
+    async def _update_statistics(
+        self,
+        saved: List[PriceHistoryCreate],
+        context: PipelineContext,
+        errors: List[str],
+    ) -> None:
+        """Kaydedilen fiyatları (eklenme sırasıyla) rolling istatistiklere işler."""
+        samples: Dict[int, List[Decimal]] = {}
+        for record in saved:
+            if record.mapping_id is not None:
+                samples.setdefault(record.mapping_id, []).append(record.price)
+
+        try:
+            updated = await self.uow.price_statistics.apply_samples(samples)
+            context.meta["updated_price_statistics"] = len(updated)
+        except Exception as e:
+            errors.append(f"Fiyat istatistikleri güncellenemedi: {e}")
+            context.meta["updated_price_statistics"] = 0
+
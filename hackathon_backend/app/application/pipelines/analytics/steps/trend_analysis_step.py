@@ -7,8 +7,13 @@ Kaynak güvenilirlik ağırlıklandırması içerir.
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
+from app.application.pipelines.analytics.trend_engine import VectorizedTrendEngine
+from app.core.patterns.offer_batch import MISSING, OfferBatch
 from app.core.patterns.pipeline import BaseStep, PipelineContext
 from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
+from app.domain.schemas.price.price_statistic import RECENT_PRICE_WINDOW
 
 
 # Provider güvenilirlik skorları (0.0 - 1.0)
@@ -40,8 +45,26 @@ class TrendAnalysisStep(BaseStep):
     - max_price: Maksimum fiyat
     """
 
+    # Geçmiş, SavePriceHistoryStep'in aynı transaction'da güncellediği
+    # price_statistics'ten okunur
+    reads = frozenset({"mapping_id", "price", "provider", "db.price_statistics"})
+    writes = frozenset(
+        {
+            "trend_score",
+            "weighted_trend_score",
+            "trend_direction",
+            "price_change_percent",
+            "avg_price",
+            "min_price",
+            "max_price",
+            "has_sufficient_data",
+            "reliability_weight",
+        }
+    )
+
     # Varsayılan config
-    DEFAULT_HISTORY_LIMIT = 10  # Son kaç fiyat noktası
+    # Son kaç fiyat noktası (en fazla price_statistics ring buffer boyutu)
+    DEFAULT_HISTORY_LIMIT = RECENT_PRICE_WINDOW
     STABLE_THRESHOLD = 2.0  # ±%2 içinde stable kabul et
 
     def __init__(
@@ -49,6 +72,7 @@ class TrendAnalysisStep(BaseStep):
     ) -> None:
         self.uow = uow
         self.history_limit = history_limit
+        self.engine = VectorizedTrendEngine(stable_threshold=self.STABLE_THRESHOLD)
 
     def _get_reliability_weight(self, provider: Optional[str]) -> float:
         """Provider için güvenilirlik ağırlığını döndür."""
@@ -60,73 +84,110 @@ class TrendAnalysisStep(BaseStep):
         return PROVIDER_RELIABILITY_WEIGHTS.get(provider_key, DEFAULT_RELIABILITY_WEIGHT)
 
     async def process(self, context: PipelineContext) -> None:
-        products: List[Dict[str, Any]] = context.data
-
-        if not products:
+        if not context.data:
             return
 
-        analyzed_products: List[Dict[str, Any]] = []
+        batch = OfferBatch.coerce(context.data)
         errors: List[str] = []
-        total_reliability_applied = 0
-
-        for product in products:
-            mapping_id = product.get("mapping_id")
-            current_price = product.get("price")
-            provider = product.get("provider")
-
-            if not mapping_id or current_price is None:
-                # Trend analizi yapılamaz, ama ürünü geçir
-                analyzed_products.append(product)
-                continue
 
+        # Analiz edilebilir satırlar: mapping_id ve fiyatı olanlar
+        mapping_ids = batch.values("mapping_id")
+        prices = batch.values("price")
+        providers = batch.values("provider")
+        eligible = [
+            index
+            for index, (mapping_id, price) in enumerate(
+                zip(mapping_ids, prices, strict=True)
+            )
+            if mapping_id and price is not None
+        ]
+
+        # Son N fiyatı rolling istatistik tablosundan tek sorguda çek.
+        # Ham price_histories okunmaz; maliyet geçmiş uzunluğundan bağımsızdır.
+        histories: Dict[int, List[Decimal]] = {}
+        if eligible:
             try:
-                # Güvenilirlik ağırlığını al
-                reliability_weight = self._get_reliability_weight(provider)
-
-                # Fiyat geçmişini çek
-                history = await self.uow.price_histories.get_by_mapping_id(
-                    mapping_id, limit=self.history_limit
-                )
-
-                # Trend analizi hesapla
-                analysis = self._analyze_trend(
-                    current_price, 
-                    history, 
-                    reliability_weight
+                statistics = await self.uow.price_statistics.get_by_mapping_ids(
+                    [mapping_ids[i] for i in eligible]
                 )
+                histories = {
+                    mapping_id: stat.recent_prices[: self.history_limit]
+                    for mapping_id, stat in statistics.items()
+                }
+            except Exception as e:
+                errors.append(f"Fiyat geçmişi yüklenemedi: {e}")
 
-                # Ürüne analiz sonuçlarını ekle
-                enriched = product.copy()
-                enriched.update(analysis)
-                enriched["reliability_weight"] = reliability_weight
-                analyzed_products.append(enriched)
-                
-                if reliability_weight < 1.0:
-                    total_reliability_applied += 1
+        weights = [self._get_reliability_weight(providers[i]) for i in eligible]
 
+        analyses: Dict[str, List[Any]] = {}
+        if eligible:
+            try:
+                analyses = self._analyze_batch(
+                    [prices[i] for i in eligible],
+                    [
+                        [float(price) for price in histories.get(mapping_ids[i], [])]
+                        for i in eligible
+                    ],
+                    weights,
+                )
             except Exception as e:
-                errors.append(f"Mapping {mapping_id}: Trend analizi hatası: {e}")
-                analyzed_products.append(product)
-
-        context.data = analyzed_products
-        context.result = analyzed_products
+                errors.append(f"Trend analizi hatası: {e}")
+
+        # Analiz sonuçlarını sütun olarak ekle; analiz edilemeyen satırlarda
+        # alanlar boş kalır (ürün olduğu gibi geçer)
+        if analyses:
+            analyses["reliability_weight"] = weights
+            for field, values in analyses.items():
+                column = [MISSING] * len(batch)
+                for index, value in zip(eligible, values, strict=True):
+                    column[index] = value
+                batch.set_column(field, column)
+
+        context.data = batch
+        context.result = batch
         context.errors.extend(errors)
 
         # Meta bilgiler
-        analyzed_count = sum(1 for p in analyzed_products if "trend_score" in p)
-        context.meta["trend_analyzed_count"] = analyzed_count
+        analyzed = len(eligible) if analyses else 0
+        context.meta["trend_analyzed_count"] = analyzed
         context.meta["trend_analysis_errors"] = len(errors)
-        context.meta["reliability_weighted_count"] = total_reliability_applied
+        context.meta["reliability_weighted_count"] = (
+            sum(1 for weight in weights if weight < 1.0) if analyzed else 0
+        )
+
+    def _analyze_batch(
+        self,
+        current_prices: List[float],
+        histories: List[List[float]],
+        reliability_weights: List[float],
+    ) -> Dict[str, List[Any]]:
+        """
+        Tüm batch'i VectorizedTrendEngine ile tek seferde analiz eder.
+        Sonuçlar (sütun sütun) _analyze_trend ile bit-bit aynıdır.
+        """
+        matrix, lengths = VectorizedTrendEngine.build_price_matrix(
+            histories, self.history_limit
+        )
+        result = self.engine.analyze(
+            np.asarray(current_prices, dtype=np.float64),
+            matrix,
+            lengths,
+            np.asarray(reliability_weights, dtype=np.float64),
+        )
+        return result.to_columns()
 
     def _analyze_trend(
         self, 
         current_price: float, 
-        history: List[Any],
+        history: List[float],
         reliability_weight: float = 1.0
     ) -> Dict[str, Any]:
         """
-        Fiyat geçmişinden trend metrikleri hesaplar.
+        Fiyat geçmişinden (en yeniden eskiye) trend metrikleri hesaplar.
         Güvenilirlik ağırlığını skora uygular.
+
+        Tek ürünlük skaler referans implementasyon; batch işleme
+        _analyze_batch üzerinden yapılır.
         """
         # Yeterli veri yoksa nötr döndür
         if not history or len(history) < 2:
@@ -141,8 +202,7 @@ class TrendAnalysisStep(BaseStep):
                 "has_sufficient_data": False,
             }
 
-        # Fiyatları çıkar (Decimal -> float)
-        prices = [float(h.price) for h in history]
+        prices = history
 
         # Temel istatistikler
         avg_price = sum(prices) / len(prices)
@@ -0,0 +1,91 @@
+"""
+UpdateCurrentOffersStep - Güncel teklif ve ürün fiyat özetlerini günceller.
+Listeleme ekranları fiyat geçmişini taramak yerine bu tabloları okur.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from app.core.patterns.pipeline import BaseStep, PipelineContext
+from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
+from app.domain.schemas.price.current_offer import CurrentOfferCreate
+
+
+class UpdateCurrentOffersStep(BaseStep):
+    """
+    SavePriceHistoryStep sonrası çalışır.
+
+    1. Her mapping'in son fiyat/stok bilgisini current_offers'a upsert eder.
+    2. Etkilenen ürünlerin product_price_summary satırlarını yeniden hesaplar.
+
+    Her iki işlem de batch başına tek set-based statement'tır ve pipeline
+    transaction'ı içinde çalışır.
+
+    Input: List of products with mapping_id, price, product_id
+    Output: Same products (unchanged)
+    """
+
+    reads = frozenset(
+        {
+            "mapping_id",
+            "price",
+            "original_price",
+            "in_stock",
+            "stock_quantity",
+            "product_id",
+        }
+    )
+    writes = frozenset({"db.current_offers", "db.product_price_summary"})
+
+    def __init__(self, uow: IUnitOfWork) -> None:
+        self.uow = uow
+
+    async def process(self, context: PipelineContext) -> None:
+        products: List[Dict[str, Any]] = context.data
+
+        if not products:
+            return
+
+        offers: List[CurrentOfferCreate] = []
+        product_ids: List[int] = []
+        for product in products:
+            mapping_id = product.get("mapping_id")
+            price = product.get("price")
+            # Eksik veriler SavePriceHistoryStep'te zaten hata olarak raporlanır
+            if not mapping_id or price is None:
+                continue
+
+            offers.append(
+                CurrentOfferCreate(
+                    mapping_id=mapping_id,
+                    price=Decimal(str(price)),
+                    original_price=(
+                        Decimal(str(product["original_price"]))
+                        if product.get("original_price")
+                        else None
+                    ),
+                    in_stock=product.get("in_stock", True),
+                    stock_quantity=product.get("stock_quantity"),
+                )
+            )
+            if product.get("product_id"):
+                product_ids.append(product["product_id"])
+
+        if not offers:
+            context.meta["current_offers_updated"] = 0
+            context.meta["price_summaries_updated"] = 0
+            return
+
+        try:
+            context.meta["current_offers_updated"] = (
+                await self.uow.current_offers.upsert_many(offers)
+            )
+            context.meta["price_summaries_updated"] = (
+                await self.uow.current_offers.refresh_price_summaries(product_ids)
+            )
+        except Exception as e:
+            context.errors.append(f"Güncel teklifler güncellenemedi: {e}")
+            context.meta["current_offers_updated"] = 0
+            context.meta["price_summaries_updated"] = 0
+
+        context.result = context.data
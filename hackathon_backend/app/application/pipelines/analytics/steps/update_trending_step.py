@@ -1,63 +1,67 @@
-"""Pipeline step to update trending products table."""
+"""Pipeline step to pick trending product candidates."""
 
-from typing import Any, Dict, List
+import heapq
+from typing import Dict, Iterable, List, Tuple
 
-from sqlalchemy import delete
-
-from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
-from app.persistence.models.analytics.trending_product import TrendingProduct
 from app.application.pipelines.base import BaseStep, PipelineContext
+from app.core.patterns.offer_batch import OfferBatch
+from app.domain.schemas.analytics.trending_product import TrendingEntry
 
+TOP_N = 5  # Kaç ürün saklanacak
 
-class UpdateTrendingStep(BaseStep):
+
+def top_trending(
+    candidates: Iterable[Tuple[int, float]], n: int = TOP_N
+) -> List[TrendingEntry]:
     """
-    TrendAnalysisStep sonrası çalışır.
-    En yüksek trend_score'a sahip 5 ürünü trending_products tablosuna yazar.
+    (product_id, trend_score) adaylarından en yüksek mutlak skora sahip n ürün.
+    Hem artış hem düşüş trendi "trending" sayılır; aynı ürünün birden fazla
+    teklifi varsa en güçlü trendi kullanılır. Sıralama heapq ile O(k log n).
     """
+    best: Dict[int, float] = {}
+    for product_id, score in candidates:
+        if product_id not in best or abs(score) > abs(best[product_id]):
+            best[product_id] = score
 
-    TOP_N = 5  # Kaç ürün saklanacak
+    top = heapq.nlargest(n, best.items(), key=lambda item: (abs(item[1]), -item[0]))
+    return [
+        TrendingEntry(product_id=product_id, trend_score=round(score))
+        for product_id, score in top
+    ]
 
-    def __init__(self, uow: IUnitOfWork) -> None:
-        self.uow = uow
 
-    async def process(self, context: PipelineContext) -> None:
-        products: List[Dict[str, Any]] = context.data or []
+class UpdateTrendingStep(BaseStep):
+    """
+    TrendAnalysisStep sonrası çalışır.
+    Batch'teki en yüksek trend_score'a sahip 5 ürünü aday olarak seçer.
 
-        if not products:
-            return
+    trending_products tablosu chunk transaction'larında yazılmaz: eşzamanlı
+    chunk'lar aynı rank satırlarını kilitleyip birbirinin sonucunu ezerdi.
+    Adaylar meta["trending_candidates"]'ta toplanır; data collector tüm
+    chunk'lar commit edildikten sonra genel top-N'i tek upsert ile yazar.
+    """
 
-        # Sadece trend_score ve product_id olan ürünleri filtrele
-        scored_products = [
-            p for p in products
-            if p.get("trend_score") is not None and p.get("product_id") is not None
-        ]
+    reads = frozenset({"trend_score", "product_id"})
+    writes = frozenset({"meta.trending_candidates"})
+    uses_session = False
+
+    TOP_N = TOP_N
 
-        if not scored_products:
-            context.meta["trending_updated"] = 0
+    async def process(self, context: PipelineContext) -> None:
+        if not context.data:
             return
 
-        # En yüksek absolute trend score'a göre sırala
-        # (hem artış hem düşüş trendi "trending" sayılır)
-        sorted_products = sorted(
-            scored_products,
-            key=lambda x: abs(x.get("trend_score", 0)),
-            reverse=True
-        )[:self.TOP_N]
-
-        # Mevcut trending kayıtlarını temizle
-        await self.uow.db.execute(delete(TrendingProduct))
-
-        # Yeni trending kayıtlarını ekle
-        trending_records = []
-        for rank, product in enumerate(sorted_products, start=1):
-            trending_records.append(
-                TrendingProduct(
-                    product_id=product["product_id"],
-                    trend_score=product["trend_score"],
-                    rank=rank,
-                )
+        batch = OfferBatch.coerce(context.data)
+        # Sadece trend_score ve product_id olan ürünler
+        scored = (
+            (product_id, score)
+            for product_id, score in zip(
+                batch.values("product_id"), batch.values("trend_score"), strict=True
             )
+            if product_id is not None and score is not None
+        )
+        top = top_trending(scored, self.TOP_N)
 
-        self.uow.db.add_all(trending_records)
-
-        context.meta["trending_updated"] = len(trending_records)
+        context.meta["trending_candidates"] = [
+            [e.product_id, e.trend_score] for e in top
+        ]
@@ -0,0 +1,230 @@
+"""
+VectorizedTrendEngine - NumPy tabanlı toplu trend skoru hesaplama.
+
+TrendAnalysisStep'in skaler (_analyze_trend / _calculate_trend_score)
+mantığının batch versiyonudur. Tüm batch tek bir dolgulu (padded) 2-D fiyat
+matrisi ve uzunluk vektörü olarak işlenir; her metrik vektörel geçişlerle
+hesaplanır.
+
+Skaler kod ile bit-bit aynı sonuç için:
+- Ortalama, Python'un sum() fonksiyonu gibi soldan sağa sütun sütun
+  toplanır (np.sum'un pairwise toplaması son bitlerde farklılaşabilir).
+- Yuvarlama (round) sadece dict'e dönüştürürken Python'un round()'u ile
+  yapılır, np.round kullanılmaz.
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# trend_direction kodları
+DIRECTION_DOWN = -1
+DIRECTION_STABLE = 0
+DIRECTION_UP = 1
+
+_DIRECTION_LABELS = {
+    DIRECTION_DOWN: "down",
+    DIRECTION_STABLE: "stable",
+    DIRECTION_UP: "up",
+}
+
+
+@dataclass
+class TrendBatchResult:
+    """Batch trend analizinin sütunsal (column-wise) sonucu."""
+
+    current_price: np.ndarray
+    trend_score: np.ndarray
+    weighted_trend_score: np.ndarray
+    trend_direction: np.ndarray
+    price_change_percent: np.ndarray
+    avg_price: np.ndarray
+    min_price: np.ndarray
+    max_price: np.ndarray
+    has_sufficient_data: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.trend_score.shape[0])
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """
+        Sonuçları TrendAnalysisStep._analyze_trend alanlarıyla aynı
+        değerlerde sütunlar olarak döndürür (OfferBatch'e doğrudan eklenir).
+        """
+        current = self.current_price.tolist()
+        sufficient = self.has_sufficient_data.tolist()
+
+        def pick(
+            values: List[Any], fallback: List[Any], rounded: bool = False
+        ) -> List[Any]:
+            return [
+                (round(value, 2) if rounded else value) if ok else default
+                for value, default, ok in zip(values, fallback, sufficient, strict=True)
+            ]
+
+        zeros = [0] * len(sufficient)
+        return {
+            "trend_score": pick(self.trend_score.tolist(), zeros),
+            "weighted_trend_score": pick(self.weighted_trend_score.tolist(), zeros),
+            "trend_direction": [
+                _DIRECTION_LABELS[direction] if ok else "stable"
+                for direction, ok in zip(
+                    self.trend_direction.tolist(), sufficient, strict=True
+                )
+            ],
+            "price_change_percent": pick(
+                self.price_change_percent.tolist(),
+                [0.0] * len(sufficient),
+                rounded=True,
+            ),
+            "avg_price": pick(self.avg_price.tolist(), current, rounded=True),
+            "min_price": pick(self.min_price.tolist(), current, rounded=True),
+            "max_price": pick(self.max_price.tolist(), current, rounded=True),
+            "has_sufficient_data": [bool(ok) for ok in sufficient],
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Sonuçları TrendAnalysisStep._analyze_trend ile aynı formatta
+        dict listesine çevirir.
+        """
+        columns = self.to_columns()
+        return [
+            dict(zip(columns, row, strict=True))
+            for row in zip(*columns.values(), strict=True)
+        ]
+
+
+class VectorizedTrendEngine:
+    """
+    Trend metriklerini tüm batch için vektörel olarak hesaplar.
+
+    Kullanım:
+        matrix, lengths = VectorizedTrendEngine.build_price_matrix(histories, 10)
+        result = engine.analyze(current_prices, matrix, lengths, weights)
+        analyses = result.to_dicts()  # veya result.to_columns()
+
+    Fiyat matrisinin her satırı bir mapping'in geçmişidir (en yeniden eskiye),
+    `lengths[i]` satırdaki geçerli fiyat sayısıdır; kalan hücreler dolgudur.
+    """
+
+    STABLE_THRESHOLD = 2.0  # ±%2 içinde stable kabul et
+    MIN_HISTORY = 2  # Trend için gereken minimum fiyat noktası
+    MOMENTUM_WINDOW = 3  # Momentum için bakılan en yeni kayıt sayısı
+
+    def __init__(self, stable_threshold: float = STABLE_THRESHOLD) -> None:
+        self.stable_threshold = stable_threshold
+
+    @staticmethod
+    def build_price_matrix(
+        histories: Sequence[Sequence[float]], width: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Değişken uzunluklu fiyat geçmişlerini dolgulu matris + uzunluk
+        vektörüne çevirir. Her geçmişin ilk `width` elemanı kullanılır.
+        """
+        count = len(histories)
+        lengths = np.fromiter(
+            (min(len(h), width) for h in histories), dtype=np.int64, count=count
+        )
+        matrix = np.zeros((count, width), dtype=np.float64)
+
+        total = int(lengths.sum())
+        if total == 0:
+            return matrix, lengths
+
+        flat = np.fromiter(
+            chain.from_iterable(h[:width] for h in histories),
+            dtype=np.float64,
+            count=total,
+        )
+        rows = np.repeat(np.arange(count), lengths)
+        offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        cols = np.arange(total) - offsets
+        matrix[rows, cols] = flat
+        return matrix, lengths
+
+    def analyze(
+        self,
+        current_prices: np.ndarray,
+        price_matrix: np.ndarray,
+        lengths: np.ndarray,
+        reliability_weights: np.ndarray,
+    ) -> TrendBatchResult:
+        """Batch için tüm trend metriklerini hesaplar."""
+        current = np.asarray(current_prices, dtype=np.float64)
+        matrix = np.asarray(price_matrix, dtype=np.float64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        weights = np.asarray(reliability_weights, dtype=np.float64)
+
+        count, width = matrix.shape
+        mask = np.arange(width)[None, :] < lengths[:, None]
+        sufficient = lengths >= self.MIN_HISTORY
+
+        # Temel istatistikler
+        # Python'daki sum() ile aynı sırada (soldan sağa) topla
+        values = np.where(mask, matrix, 0.0)
+        total = np.zeros(count, dtype=np.float64)
+        for col in range(width):
+            total = total + values[:, col]
+        avg_price = total / np.maximum(lengths, 1)
+
+        if width:
+            min_price = np.where(mask, matrix, np.inf).min(axis=1)
+            max_price = np.where(mask, matrix, -np.inf).max(axis=1)
+        else:
+            min_price = np.full(count, np.inf)
+            max_price = np.full(count, -np.inf)
+
+        # Değişim yüzdesi
+        positive = avg_price > 0
+        safe_avg = np.where(positive, avg_price, 1.0)
+        change_percent = np.where(
+            positive, ((current - safe_avg) / safe_avg) * 100, 0.0
+        )
+
+        # Trend yönü
+        direction = np.where(
+            np.abs(change_percent) <= self.stable_threshold,
+            DIRECTION_STABLE,
+            np.where(change_percent > 0, DIRECTION_UP, DIRECTION_DOWN),
+        ).astype(np.int8)
+
+        # Trend score: değişim yüzdesi + momentum
+        base_score = np.minimum(np.maximum(change_percent * 5, -100), 100)
+        momentum = np.zeros(count, dtype=np.float64)
+        if width >= self.MOMENTUM_WINDOW:
+            p0, p1, p2 = matrix[:, 0], matrix[:, 1], matrix[:, 2]
+            has_window = lengths >= self.MOMENTUM_WINDOW
+            # Yeni → eski sıralı: artan değerler = fiyat düşüşü
+            falling = (p0 <= p1) & (p1 <= p2)
+            rising = (p0 >= p1) & (p1 >= p2)
+            momentum = np.where(
+                has_window,
+                np.where(falling, -10.0, np.where(rising, 10.0, 0.0)),
+                0.0,
+            )
+
+        final_score = np.minimum(np.maximum(base_score + momentum, -100), 100)
+        trend_score = np.trunc(final_score).astype(np.int64)
+        weighted_trend_score = np.trunc(
+            trend_score.astype(np.float64) * weights
+        ).astype(np.int64)
+
+        # Yetersiz veri: nötr sonuç
+        zero_int = np.zeros(count, dtype=np.int64)
+        return TrendBatchResult(
+            current_price=current,
+            trend_score=np.where(sufficient, trend_score, zero_int),
+            weighted_trend_score=np.where(sufficient, weighted_trend_score, zero_int),
+            trend_direction=np.where(sufficient, direction, DIRECTION_STABLE).astype(
+                np.int8
+            ),
+            price_change_percent=np.where(sufficient, change_percent, 0.0),
+            avg_price=np.where(sufficient, avg_price, current),
+            min_price=np.where(sufficient, min_price, current),
+            max_price=np.where(sufficient, max_price, current),
+            has_sufficient_data=sufficient,
+        )
@@ -1,20 +1,47 @@
-from typing import Any, List, Optional
+import copy
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi.encoders import jsonable_encoder
 
 from app.core.exceptions import ValidationException
-from app.core.patterns.pipeline import BaseStep, PipelineContext, PipelineRunner
+from app.core.patterns.instrumentation import StepInstrument
+from app.core.patterns.offer_batch import OfferBatch
+from app.core.patterns.pipeline import BaseStep, DagPipelineRunner, PipelineContext
 from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
+from app.domain.schemas.analytics.pipeline_dead_letter import PipelineDeadLetterCreate
 from app.domain.schemas.auth import UserContext
 
 
+class _ChunkFailed(Exception):
+    """Chunk'ın SAVEPOINT'ini geri almak için içeride fırlatılır."""
+
+
 class BasePipeline:
+    # Bir chunk'taki hatalı item'ları ayıklamak için en fazla SAVEPOINT denemesi
+    max_isolation_attempts = 64
+
     def __init__(self, uow: IUnitOfWork):
         self.uow = uow
         self.steps: List[BaseStep] = []
+        # Adım ölçüm eklentileri; None ise PipelineRunner varsayılanları kullanılır
+        self.instruments: Optional[Sequence[StepInstrument]] = None
+
+    @property
+    def name(self) -> str:
+        """Dead-letter kayıtlarında pipeline'ı tanımlar."""
+        return type(self).__name__
 
     def add_step(self, step: BaseStep) -> "BasePipeline":
         self.steps.append(step)
         return self
 
+    def _runner(self) -> DagPipelineRunner:
+        # Okuma/yazma bildiren bağımsız adımlar eşzamanlı, diğerleri sırayla çalışır
+        return DagPipelineRunner(
+            self.steps, name=self.name, instruments=self.instruments
+        )
+
     async def execute(self, data: Any, user: Optional[UserContext] = None) -> PipelineContext:
         """
         Pipeline'ı çalıştırır ve sonuçları içeren context nesnesini döndürür.
@@ -27,6 +54,198 @@ class BasePipeline:
             PipelineContext: İşlemin sonucunu ve durumunu içeren context nesnesi.
         """
         context = PipelineContext(initial_data=data, user=user)
-        runner = PipelineRunner(self.steps)
+        runner = self._runner()
         await runner.run(context)
         return context
+
+    async def execute_chunked(
+        self,
+        data: Sequence[Any],
+        chunk_size: int,
+        user: Optional[UserContext] = None,
+    ) -> PipelineContext:
+        """
+        Veriyi chunk'lara bölüp her chunk'ı tüm adımlardan bir SAVEPOINT içinde geçirir.
+
+        Hata veren chunk geri alınır ve ikiye bölünerek yeniden denenir; tek
+        başına da başarısız olan item'lar hatalarıyla dead-letter tablosuna
+        yazılır. Böylece birkaç hatalı item yüzünden tüm çalıştırma geri
+        alınmaz. Hiçbir item'ı tek başına geçmeyen chunk'lar (bkz.
+        _run_isolated) çalıştırmayı durdurur.
+        Başarılı chunk'lar transaction'da kalır, commit çağırana aittir.
+
+        Dönen context:
+            result: Başarılı item'ların son hali.
+            meta: Adımların sayısal metrikleri toplanmış, listeleri birleştirilmiş
+                olarak; ayrıca chunks (chunk başına süre), dead_lettered ve item_errors.
+            errors: Chunk seviyesinde hata olduğunda veya dead-letter yazılamadığında
+                dolar (transaction geri alınmalı).
+        """
+        context = PipelineContext(initial_data=data, user=user)
+        context.result = []
+        chunks: List[Dict[str, Any]] = []
+        context.meta.update(chunks=chunks, dead_lettered=0, item_errors=[])
+
+        for index, start in enumerate(range(0, len(data), chunk_size)):
+            chunk = list(data[start : start + chunk_size])
+            started = time.perf_counter()
+            dead_letters: List[PipelineDeadLetterCreate] = []
+            await self._run_isolated(chunk, context, dead_letters)
+
+            if dead_letters:
+                try:
+                    await self.uow.dead_letters.add_many(dead_letters)
+                except Exception as e:
+                    context.errors.append(f"Dead-letter kaydı yazılamadı: {e}")
+                context.meta["dead_lettered"] += len(dead_letters)
+                context.meta["item_errors"].extend(
+                    entry.error for entry in dead_letters
+                )
+
+            chunks.append(
+                {
+                    "index": index,
+                    "size": len(chunk),
+                    "dead_lettered": len(dead_letters),
+                    "seconds": round(time.perf_counter() - started, 4),
+                }
+            )
+            if not context.is_valid:
+                break
+        return context
+
+    async def _run_isolated(
+        self,
+        items: List[Any],
+        context: PipelineContext,
+        dead_letters: List[PipelineDeadLetterCreate],
+    ) -> None:
+        """
+        Item'ları SAVEPOINT'te çalıştırır. Başarısız olursa önce ilk (o da
+        düşerse son) item tek başına denenir, kalanlar ikiye bölünerek ayıklanır;
+        tek başına da düşen item'lar dead-letter'a yazılır. Hiçbir item tek
+        başına geçemiyorsa hata item'lara yüklenemez (DB kesintisi, bozuk adım,
+        lock timeout): item'lar dead-letter'a yazılmaz, chunk başarısız sayılır.
+        Başarılı denemeler item'ların orijinal sırasıyla birleştirilir.
+        """
+        attempt = await self._run_in_savepoint(items, context.user)
+        if attempt.is_valid:
+            self._merge(context, attempt)
+            return
+
+        if len(items) == 1:
+            dead_letters.append(self._dead_letter(items[0], attempt.errors))
+            return
+
+        # (başlangıç index'i, deneme) ve (index, hatalar)
+        passed: List[Tuple[int, PipelineContext]] = []
+        failed: List[Tuple[int, List[str]]] = []
+        first = await self._run_in_savepoint(items[:1], context.user)
+        if first.is_valid:
+            passed.append((0, first))
+            await self._bisect(items, 1, len(items), context, passed, failed)
+        else:
+            failed.append((0, first.errors))
+            last_index = len(items) - 1
+            last = await self._run_in_savepoint(items[last_index:], context.user)
+            if last.is_valid:
+                passed.append((last_index, last))
+            else:
+                failed.append((last_index, last.errors))
+            await self._bisect(items, 1, last_index, context, passed, failed)
+
+        if not passed:
+            context.errors.extend(attempt.errors)
+            return
+        for _, result in sorted(passed, key=lambda entry: entry[0]):
+            self._merge(context, result)
+        dead_letters.extend(
+            self._dead_letter(items[index], errors)
+            for index, errors in sorted(failed, key=lambda entry: entry[0])
+        )
+
+    async def _bisect(
+        self,
+        items: List[Any],
+        start: int,
+        end: int,
+        context: PipelineContext,
+        passed: List[Tuple[int, PipelineContext]],
+        failed: List[Tuple[int, List[str]]],
+    ) -> None:
+        """
+        items[start:end] aralığını dener; başarısız aralık ikiye bölünür, tek
+        başına da başarısız olan item failed'e eklenir. Deneme sayısı
+        max_isolation_attempts ile sınırlıdır; aşılırsa chunk başarısız sayılır.
+        """
+        pending = [(start, end)] if start < end else []
+        attempts = 0
+        while pending:
+            if attempts == self.max_isolation_attempts:
+                context.errors.append(
+                    f"Hatalı item'lar {attempts} denemede ayıklanamadı."
+                )
+                return
+            attempts += 1
+            low, high = pending.pop()
+            attempt = await self._run_in_savepoint(items[low:high], context.user)
+            if attempt.is_valid:
+                passed.append((low, attempt))
+            elif high - low == 1:
+                failed.append((low, attempt.errors))
+            else:
+                # Önce sol yarı denenir
+                middle = (low + high) // 2
+                pending.extend([(middle, high), (low, middle)])
+
+    async def _run_in_savepoint(
+        self, items: List[Any], user: Optional[UserContext]
+    ) -> PipelineContext:
+        # Adımlar item'ları yerinde değiştirir; tekrar denemeler orijinalden başlar
+        attempt = PipelineContext(initial_data=copy.deepcopy(items), user=user)
+        try:
+            async with self.uow.savepoint():
+                await self._runner().run(attempt)
+                if not attempt.is_valid:
+                    raise _ChunkFailed()
+        except _ChunkFailed:
+            pass
+        except Exception as e:
+            attempt.errors.append(f"{type(e).__name__}: {e}")
+
+        if not attempt.is_valid:
+            for step in self.steps:
+                await step.on_rollback(attempt)
+        return attempt
+
+    @staticmethod
+    def _merge(context: PipelineContext, attempt: PipelineContext) -> None:
+        if isinstance(attempt.result, OfferBatch):
+            context.result.extend(attempt.result.to_records())
+        elif isinstance(attempt.result, list):
+            context.result.extend(attempt.result)
+        for key, value in attempt.meta.items():
+            current = context.meta.get(key)
+            if isinstance(value, list) and isinstance(current, list):
+                current.extend(value)
+            elif (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and isinstance(current, (int, float))
+            ):
+                context.meta[key] = current + value
+            else:
+                context.meta[key] = copy.copy(value)
+
+    def _dead_letter(self, item: Any, errors: List[str]) -> PipelineDeadLetterCreate:
+        fields = item if isinstance(item, dict) else {}
+        code = fields.get("external_product_code")
+        return PipelineDeadLetterCreate(
+            pipeline=self.name,
+            provider_id=fields.get("provider_id"),
+            external_product_code=str(code) if code is not None else None,
+            payload=jsonable_encoder(
+                item if isinstance(item, dict) else {"item": item}
+            ),
+            error="; ".join(errors),
+        )
@@ -92,7 +92,9 @@ class CreateUserStep(BaseStep):
                 "email": created_user.email,
                 "phone_number": created_user.phone_number,
             }
-            await self.cache_service.lpush("users:recent", json.dumps(user_cache_data))
-            await self.cache_service.ltrim("users:recent", 0, 9)
+            # LPUSH + LTRIM tek round trip'te, atomik
+            async with self.cache_service.pipeline() as pipe:
+                pipe.lpush("users:recent", json.dumps(user_cache_data))
+                pipe.ltrim("users:recent", 0, 9)
         except Exception as e:
             print(f"Redis cache error: {e}")
@@ -1,35 +1,47 @@
 """Category Service for business logic - uses PostgreSQL database."""
 
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import structlog
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 
+from app.core.infrastructure.cache_aside import CacheAside
+from app.domain.i_services.i_cache_service import ICacheService
 from app.domain.schemas.products.category import (
     CategoryResponse,
     CategoryWithChildrenResponse,
     CategoryWithProductsResponse,
     ProductSearchResultSimple,
 )
+from app.application.services.product_search_service import (
+    fetch_product_page,
+    price_summary_filters,
+)
+from app.domain.schemas.pagination import TotalMode
 from app.infrastructure.unit_of_work import UnitOfWork
 from app.persistence.db.session import AsyncSessionLocal
 from app.persistence.models.products.product import Product
-from app.persistence.models.products.product_mappings import ProductMapping
-from app.persistence.models.price.price_history import PriceHistory
+from app.persistence.models.price.current_offer import ProductPriceSummary
 
 logger = structlog.get_logger(__name__)
 
+CATEGORY_TREE_CACHE_KEY = "categories:tree"
+CATEGORY_TREE_CACHE_TTL = 600  # 10 minutes
+CATEGORY_TREE_CACHE_STALE_TTL = 3600
+
 
 class CategoryService:
     """
     Category Service.
     Handles category business logic and product fetching via PostgreSQL.
+    The category tree is cached (single-flight, stale-while-revalidate) when
+    a cache service is given.
     """
 
-    def __init__(self, uow: UnitOfWork) -> None:
+    def __init__(self, uow: UnitOfWork, cache: Optional[ICacheService] = None) -> None:
         self.uow = uow
+        self.cache = CacheAside(cache) if cache else None
 
     async def get_category_with_products(
         self,
@@ -40,9 +52,12 @@ class CategoryService:
         max_price: Optional[Decimal] = None,
         brand: Optional[str] = None,
         in_stock_only: bool = True,
+        cursor: Optional[str] = None,
+        total_mode: Optional[TotalMode] = None,
     ) -> Optional[CategoryWithProductsResponse]:
         """
         Get category details with products from database.
+        With a cursor, products are paginated by keyset instead of OFFSET.
         """
         async with self.uow:
             # Get category
@@ -52,57 +67,40 @@ class CategoryService:
 
         # Get products from database
         async with AsyncSessionLocal() as session:
-            # Base query for products in this category
-            query = (
-                select(Product)
+            # Filtered product ids in this category, joined with price summary
+            filtered = (
+                select(Product.id.label("id"))
+                .outerjoin(
+                    ProductPriceSummary, ProductPriceSummary.product_id == Product.id
+                )
                 .where(Product.category_id == category.id)
             )
 
             # Brand filter
             if brand:
-                query = query.where(Product.brand == brand)
+                filtered = filtered.where(Product.brand == brand)
 
-            # Get total count
-            count_query = select(func.count()).select_from(query.subquery())
-            total_result = await session.execute(count_query)
-            total = total_result.scalar() or 0
-
-            # Pagination
-            offset = (page - 1) * page_size
-            query = query.offset(offset).limit(page_size).order_by(Product.name)
+            # Price / stock filters (applied before pagination)
+            filtered = filtered.where(
+                *price_summary_filters(min_price, max_price, in_stock_only)
+            )
 
-            # Execute
-            result = await session.execute(query)
-            products_db = result.scalars().all()
+            # Single statement page (offset or keyset), total per total_mode
+            detail = select(Product, ProductPriceSummary).outerjoin(
+                ProductPriceSummary, ProductPriceSummary.product_id == Product.id
+            )
+            rows, total, next_cursor = await fetch_product_page(
+                session,
+                filtered,
+                detail,
+                page=page,
+                page_size=page_size,
+                cursor=cursor,
+                total_mode=total_mode,
+            )
 
-            # Get lowest prices and build response
             products: List[ProductSearchResultSimple] = []
-            for product in products_db:
-                # Get lowest price
-                price_query = (
-                    select(PriceHistory.price, PriceHistory.original_price, PriceHistory.in_stock)
-                    .join(ProductMapping, PriceHistory.mapping_id == ProductMapping.id)
-                    .where(ProductMapping.product_id == product.id)
-                    .order_by(PriceHistory.price)
-                    .limit(1)
-                )
-                price_result = await session.execute(price_query)
-                price_row = price_result.first()
-
-                lowest_price = Decimal(str(price_row[0])) if price_row else None
-                original_price = Decimal(str(price_row[1])) if price_row and price_row[1] else None
-                in_stock = price_row[2] if price_row else True
-
-                # Apply filters
-                if min_price is not None and lowest_price is not None:
-                    if lowest_price < min_price:
-                        continue
-                if max_price is not None and lowest_price is not None:
-                    if lowest_price > max_price:
-                        continue
-                if in_stock_only and not in_stock:
-                    continue
-
+            for product, summary, *_ in rows:
                 products.append(
                     ProductSearchResultSimple(
                         id=product.id,
@@ -110,10 +108,16 @@ class CategoryService:
                         slug=product.slug,
                         brand=product.brand,
                         image_url=product.image_url,
-                        lowest_price=lowest_price,
-                        original_price=original_price,
+                        lowest_price=(
+                            Decimal(str(summary.lowest_price)) if summary else None
+                        ),
+                        original_price=(
+                            Decimal(str(summary.original_price))
+                            if summary and summary.original_price
+                            else None
+                        ),
                         currency_code="TRY",
-                        in_stock=in_stock,
+                        in_stock=summary.in_stock if summary else True,
                     )
                 )
 
@@ -123,6 +127,7 @@ class CategoryService:
                 total=total,
                 page=page,
                 page_size=page_size,
+                next_cursor=next_cursor,
             )
 
     async def get_all_categories(self) -> List[CategoryResponse]:
@@ -132,15 +137,32 @@ class CategoryService:
 
     async def get_category_tree(self) -> List[CategoryWithChildrenResponse]:
         """Get full category tree with nested children."""
+        if self.cache is None:
+            return await self._load_tree()
+
+        cached = await self.cache.get_or_load(
+            CATEGORY_TREE_CACHE_KEY,
+            self._load_tree_json,
+            ttl=CATEGORY_TREE_CACHE_TTL,
+            stale_ttl=CATEGORY_TREE_CACHE_STALE_TTL,
+        )
+        return [CategoryWithChildrenResponse(**node) for node in cached]
+
+    async def _load_tree(self) -> List[CategoryWithChildrenResponse]:
         async with self.uow:
             return await self.uow.categories.get_tree()
 
+    async def _load_tree_json(self) -> List[Dict[str, Any]]:
+        return [node.model_dump(mode="json") for node in await self._load_tree()]
+
     async def get_category(self, identifier: str) -> Optional[CategoryResponse]:
         """Get category by ID or slug."""
         async with self.uow:
             return await self.uow.categories.get_by_id_or_slug(identifier)
 
 
-def get_category_service(uow: UnitOfWork) -> CategoryService:
+def get_category_service(
+    uow: UnitOfWork, cache: Optional[ICacheService] = None
+) -> CategoryService:
     """Factory function for CategoryService."""
-    return CategoryService(uow)
+    return CategoryService(uow, cache)
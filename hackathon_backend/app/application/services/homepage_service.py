@@ -0,0 +1,111 @@
+"""Homepage Service - ana sayfa aggregate verisi ve cache'i."""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.infrastructure.cache_aside import CacheAside
+from app.domain.i_services.i_cache_service import ICacheService
+from app.domain.schemas.homepage import HomepageResponse, TrendingProductItem
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.persistence.models.analytics.trending_product import TrendingProduct
+from app.persistence.models.price.current_offer import ProductPriceSummary
+
+HOMEPAGE_CACHE_KEY = "homepage:data"
+HOMEPAGE_CACHE_TTL = 300  # 5 minutes
+# Süresi dolan veri bu kadar daha sunulur, arka planda tek bir görev yeniler
+HOMEPAGE_CACHE_STALE_TTL = 600
+
+
+class HomepageService:
+    """
+    Homepage Service.
+    /homepage cache'ten okunur; data collector trending listesini yazdıktan
+    sonra refresh() ile cache'i yeniden doldurur, böylece endpoint soğuk
+    cache'e veya yarım kalmış bir listeye düşmez. Cache boşsa eşzamanlı
+    istekler tek bir sorguda birleşir (CacheAside).
+    """
+
+    def __init__(self, uow: UnitOfWork, cache: ICacheService) -> None:
+        self.uow = uow
+        self.cache = CacheAside(cache)
+
+    async def get(self) -> HomepageResponse:
+        cached = await self.cache.get_or_load(
+            HOMEPAGE_CACHE_KEY,
+            self._load,
+            ttl=HOMEPAGE_CACHE_TTL,
+            stale_ttl=HOMEPAGE_CACHE_STALE_TTL,
+        )
+        return HomepageResponse(**cached)
+
+    async def refresh(self) -> HomepageResponse:
+        """Ana sayfa verisini veritabanından okuyup cache'e yazar."""
+        response = await self._build()
+        await self.cache.put(
+            HOMEPAGE_CACHE_KEY,
+            response.model_dump(mode="json"),
+            ttl=HOMEPAGE_CACHE_TTL,
+            stale_ttl=HOMEPAGE_CACHE_STALE_TTL,
+        )
+        return response
+
+    async def _load(self) -> Dict[str, Any]:
+        return (await self._build()).model_dump(mode="json")
+
+    async def _build(self) -> HomepageResponse:
+        async with self.uow:
+            # Get trending products with product info and price summary
+            query = (
+                select(TrendingProduct, ProductPriceSummary)
+                .outerjoin(
+                    ProductPriceSummary,
+                    ProductPriceSummary.product_id == TrendingProduct.product_id,
+                )
+                .options(selectinload(TrendingProduct.product))
+                .order_by(TrendingProduct.rank)
+            )
+            result = await self.uow.db.execute(query)
+            trending_rows = result.all()
+
+            # Build response items
+            trending_items: List[TrendingProductItem] = []
+
+            for record, summary in trending_rows:
+                product = record.product
+                if not product:
+                    continue
+
+                # Determine trend direction from score
+                if record.trend_score > 0:
+                    direction = "up"
+                elif record.trend_score < 0:
+                    direction = "down"
+                else:
+                    direction = "stable"
+
+                # Best in-stock price from the product price summary
+                best_price = None
+                if summary and summary.in_stock:
+                    best_price = summary.lowest_price
+
+                trending_items.append(
+                    TrendingProductItem(
+                        rank=record.rank,
+                        product_id=product.id,
+                        name=product.name,
+                        slug=product.slug,
+                        brand=product.brand,
+                        image_url=product.image_url,
+                        trend_score=record.trend_score,
+                        trend_direction=direction,
+                        best_price=best_price,
+                    )
+                )
+
+        return HomepageResponse(
+            trending=trending_items,
+            cached_at=datetime.now(timezone.utc),
+        )
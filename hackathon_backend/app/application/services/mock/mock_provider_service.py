@@ -6,7 +6,7 @@ Uses UnifiedProduct schema for standardized output.
 import random
 import asyncio
 from datetime import datetime
-from typing import List
+from typing import AsyncGenerator, List
 
 from app.domain.schemas.product import UnifiedProduct, Provider
 
@@ -252,6 +252,20 @@ class MockProviderService:
         """AlpineGear - EU/EUR - 30% error rate."""
         return await cls._get_products_for_provider(Provider.ALPINE_GEAR)
     
+    @classmethod
+    async def stream_products(
+        cls, provider: Provider, chunk_size: int = 10
+    ) -> AsyncGenerator[List[UnifiedProduct], None]:
+        """
+        Yield a provider's products in chunks, like a paginated API.
+        Every page after the first costs another round trip.
+        """
+        products = await cls._get_products_for_provider(provider)
+        for start in range(0, len(products), chunk_size):
+            if start:
+                await cls._add_latency(0.05, 0.2)
+            yield products[start : start + chunk_size]
+
     @classmethod
     async def get_all_products(cls) -> List[UnifiedProduct]:
         """Get products from all providers."""
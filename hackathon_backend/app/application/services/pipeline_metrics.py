@@ -0,0 +1,52 @@
+"""
+Pipeline adım metriklerinin süreçler arası paylaşımı.
+
+Ölçümler süreç içinde (step_metrics) tutulur; collector Celery worker'ında
+çalıştığı için API süreci bunları göremez. Worker her çalıştırmadan sonra
+kendi snapshot'ını cache'e yayınlar, /health/metrics yerel kayıtla birlikte
+yayınlanmış snapshot'ları sunar.
+"""
+
+import os
+import socket
+from typing import Any, Dict, List
+
+from app.core.patterns.instrumentation import step_metrics
+from app.domain.i_services.i_cache_service import ICacheService
+
+METRICS_SOURCES_KEY = "pipeline_metrics:sources"
+METRICS_KEY_PREFIX = "pipeline_metrics:"
+# Yayın yapmayı bırakan worker'ın metrikleri bu süre sonra düşer
+METRICS_TTL_SECONDS = 24 * 60 * 60
+MAX_SOURCES = 32
+
+
+def process_source() -> str:
+    """Metrik kaynağını tanımlayan süreç adı (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def publish_step_metrics(cache: ICacheService) -> None:
+    """Bu sürecin kümülatif adım metriklerini cache'e yazar."""
+    source = process_source()
+    await cache.set(
+        f"{METRICS_KEY_PREFIX}{source}",
+        step_metrics.snapshot(),
+        expire=METRICS_TTL_SECONDS,
+    )
+    if source not in await cache.lrange(METRICS_SOURCES_KEY, 0, -1):
+        await cache.lpush(METRICS_SOURCES_KEY, source)
+        await cache.ltrim(METRICS_SOURCES_KEY, 0, MAX_SOURCES - 1)
+
+
+async def collect_step_metrics(cache: ICacheService) -> Dict[str, List[Dict[str, Any]]]:
+    """Kaynak -> snapshot; bu süreç için yerel (en güncel) kayıt kullanılır."""
+    local = process_source()
+    snapshots: Dict[str, List[Dict[str, Any]]] = {local: step_metrics.snapshot()}
+    for source in await cache.lrange(METRICS_SOURCES_KEY, 0, -1):
+        if source in snapshots:
+            continue
+        published = await cache.get(f"{METRICS_KEY_PREFIX}{source}")
+        if published:
+            snapshots[source] = published
+    return snapshots
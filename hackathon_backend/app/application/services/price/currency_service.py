@@ -5,6 +5,7 @@ Döviz kuru işlemlerini yönetir, cache ve provider ile çalışır.
 
 from typing import Dict, Optional
 
+from app.core.infrastructure.cache_aside import CacheAside
 from app.domain.i_services.i_cache_service import ICacheService
 from app.domain.i_services.i_currency_service import ICurrencyService
 from app.domain.i_services.i_exchange_rate_provider import IExchangeRateProvider
@@ -13,11 +14,14 @@ from app.domain.i_services.i_exchange_rate_provider import IExchangeRateProvider
 class CurrencyService(ICurrencyService):
     """
     Döviz kurlarını yöneten servis.
-    Cache desteği ile API çağrılarını optimize eder.
+    Cache desteği ile API çağrılarını optimize eder; süresi dolan kurlar
+    yenilenirken eşzamanlı istekler tek bir provider çağrısını paylaşır.
     """
 
     CACHE_KEY = "exchange_rates"
     CACHE_TTL = 300  # 5 dakika
+    # Provider erişilemezse son kurlar bu kadar daha kullanılır
+    CACHE_STALE_TTL = 3600
 
     def __init__(
         self,
@@ -26,25 +30,22 @@ class CurrencyService(ICurrencyService):
     ) -> None:
         self.exchange_rate_provider = exchange_rate_provider
         self.cache_service = cache_service
+        self._cache = CacheAside(cache_service) if cache_service else None
 
     async def get_exchange_rates(self) -> Dict[str, float]:
         """
         Güncel kurları cache'ten veya provider'dan getirir.
         Dönen değerler: 1 Birim Yabancı Para = Kaç TRY (Örn: USD: 34.20)
         """
-        # 1. Cache kontrol
-        if self.cache_service:
-            cached_rates = await self.cache_service.get(self.CACHE_KEY)
-            if cached_rates:
-                return cached_rates
-
-        # 2. Provider'dan çek
-        rates = await self.exchange_rate_provider.get_rates()
-
-        # 3. Cache'e kaydet
-        if self.cache_service:
-            await self.cache_service.set(self.CACHE_KEY, rates, expire=self.CACHE_TTL)
+        if self._cache is None:
+            return await self.exchange_rate_provider.get_rates()
 
+        rates: Dict[str, float] = await self._cache.get_or_load(
+            self.CACHE_KEY,
+            self.exchange_rate_provider.get_rates,
+            ttl=self.CACHE_TTL,
+            stale_ttl=self.CACHE_STALE_TTL,
+        )
         return rates
 
     async def convert_price(self, amount: float, currency: str) -> float:
@@ -0,0 +1,93 @@
+"""
+Price History Retention Service - Application Layer.
+price_histories partition bakımı, OHLC rollup ve saklama süresi yönetimi.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from app.domain.i_repositories.i_unit_of_work import IUnitOfWork
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+class PriceHistoryRetentionService:
+    """
+    Ham fiyat geçmişini yönetir:
+    1. İleriye dönük günlük partition'ları hazırlar.
+    2. Son saatleri saatlik/günlük rollup'lara işler (grafik güncel kalsın).
+    3. Saklama süresini aşan partition'ları önce rollup'a indirger, ertesi güne
+       uzanan aralıkları ertesi güne taşır, sonra siler.
+    4. Süresi dolan saatlik rollup'ları temizler (günlükler kalıcıdır).
+
+    Günlük rollup'ı (fiyat grafiği) değişen ürünler chart_changed_product_ids
+    altında döner; detay cache'leri commit sonrası silinmelidir.
+
+    Tüm adımlar idempotenttir; iş periyodik olarak tekrar çalıştırılabilir.
+    Commit çağırana aittir.
+    """
+
+    # Her çalışmada tekrar hesaplanan saat sayısı (geç gelen kayıtlar için)
+    ROLLUP_LOOKBACK_HOURS = 2
+
+    def __init__(
+        self,
+        uow: IUnitOfWork,
+        raw_retention_days: int = 7,
+        hourly_retention_days: int = 90,
+        partitions_ahead_days: int = 7,
+    ) -> None:
+        self.uow = uow
+        self.raw_retention_days = raw_retention_days
+        self.hourly_retention_days = hourly_retention_days
+        self.partitions_ahead_days = partitions_ahead_days
+
+    async def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        now = now or datetime.now(timezone.utc)
+        today = now.astimezone(timezone.utc).date()
+
+        # 1. Gelecek partition'lar
+        created = await self.uow.price_histories.ensure_partitions(
+            today, today + timedelta(days=self.partitions_ahead_days)
+        )
+
+        # 2. Güncel saatlerin rollup'ı (mevcut saat dahil, kısmi olarak)
+        hour_start = now.astimezone(timezone.utc).replace(
+            minute=0, second=0, microsecond=0
+        )
+        since = hour_start - timedelta(hours=self.ROLLUP_LOOKBACK_HOURS)
+        await self.uow.price_rollups.rollup_hourly(since, now)
+        chart_changed = set(
+            await self.uow.price_rollups.rollup_daily(_day_start(since.date()), now)
+        )
+
+        # 3. Saklama süresi dolan partition'lar: rollup + sil
+        cutoff_day = today - timedelta(days=self.raw_retention_days)
+        dropped = []
+        for day in await self.uow.price_histories.get_partition_days():
+            if day >= cutoff_day:
+                continue
+            day_start = _day_start(day)
+            next_day = day_start + timedelta(days=1)
+            await self.uow.price_rollups.rollup_hourly(day_start, next_day)
+            chart_changed.update(
+                await self.uow.price_rollups.rollup_daily(day_start, next_day)
+            )
+            # Değişmeyen fiyatın aralığı (ve son gözlemi) silinen günde kalmasın
+            await self.uow.price_histories.carry_open_intervals(day)
+            await self.uow.price_histories.drop_partition(day)
+            dropped.append(day.isoformat())
+
+        # 4. Eski saatlik rollup'lar
+        deleted_hourly = await self.uow.price_rollups.delete_hourly_before(
+            _day_start(today - timedelta(days=self.hourly_retention_days))
+        )
+
+        return {
+            "partitions_created": created,
+            "partitions_dropped": dropped,
+            "hourly_rollups_deleted": deleted_hourly,
+            "chart_changed_product_ids": sorted(chart_changed),
+        }
@@ -0,0 +1,268 @@
+"""
+Product Indexer.
+Ürün dokümanlarını Elasticsearch'e yazar:
+
+- index_products: Pipeline'ın dokunduğu ürünleri (change feed) incremental indexler.
+- rebuild: Tüm katalogu yeni bir index'e kurar ve products alias'ını atomik
+  olarak taşır (arama kesintisiz). Kurulum sırasında değişen ürünler alias
+  taşındıktan sonra yeniden indexlenir. Yarıda kalan kurulum resume ile devam eder.
+
+Dokümanlar chunk başına tek SQL sorgusuyla üretilir; üretici (DB) ile tüketici
+(bulk) arasında sınırlı bir kuyruk vardır, ES yavaşsa DB okuması bekler.
+"""
+
+import asyncio
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import DateTime, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.product_search_es import (
+    PRODUCTS_INDEX,
+    PRODUCTS_INDEX_SETTINGS,
+    PRODUCTS_MAPPING,
+    load_product_documents,
+)
+from app.core.config.settings import settings
+from app.core.infrastructure.elasticsearch import get_search_service
+from app.domain.i_services.i_search_service import ISearchService
+from app.persistence.db.session import AsyncSessionLocal
+from app.persistence.models.price.current_offer import ProductPriceSummary
+from app.persistence.models.products.product import Product
+from app.persistence.models.products.product_variant import ProductVariant
+
+logger = structlog.get_logger(__name__)
+
+# (indexlenecek dokümanlar, artık var olmayan ürün id'leri)
+Batch = Tuple[List[Dict[str, Any]], List[int]]
+
+INDEX_TIMESTAMP = "%Y%m%d%H%M%S"
+# Rebuild başlamadan açılmış, sonra commit edilmiş transaction'lar için pay
+CATCH_UP_MARGIN = timedelta(minutes=5)
+
+
+class IndexingError(Exception):
+    """Bir chunk'ın dokümanları hedef index'e tam yazılamadığında fırlatılır."""
+
+
+class ProductIndexer:
+    """
+    Ürün index'i yazıcısı. products her zaman alias'tır; somut index'ler
+    products-<UTC zaman damgası> adını taşır.
+    """
+
+    def __init__(
+        self,
+        search_service: ISearchService,
+        alias: str = PRODUCTS_INDEX,
+        chunk_size: int = 500,
+        max_pending_chunks: int = 2,
+    ) -> None:
+        self.search_service = search_service
+        self.alias = alias
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+
+    # --- Incremental ---
+
+    async def index_products(self, product_ids: Iterable[int]) -> int:
+        """
+        Verilen ürünlerin dokümanlarını yeniden üretip yazar; silinmiş ürünlerin
+        dokümanlarını kaldırır. Yazılan doküman sayısını döner.
+        """
+        ids = sorted(set(product_ids))
+        if not ids:
+            return 0
+        if not await self.search_service.index_exists(self.alias):
+            logger.warning("Product index missing, skipping incremental indexing")
+            return 0
+
+        async def batches() -> AsyncGenerator[Batch, None]:
+            async with AsyncSessionLocal() as session:
+                for start in range(0, len(ids), self.chunk_size):
+                    chunk = ids[start : start + self.chunk_size]
+                    documents = await load_product_documents(session, product_ids=chunk)
+                    found = {doc["id"] for doc in documents}
+                    yield documents, [i for i in chunk if i not in found]
+
+        indexed = await self._stream(batches(), self.alias)
+        logger.info("Products indexed", count=indexed, index=self.alias)
+        return indexed
+
+    async def _building_indices(self) -> List[str]:
+        """Alias'a bağlanmamış (kurulumu süren/yarıda kalmış) index'ler."""
+        current = await self.search_service.get_alias(self.alias)
+        indices = await self.search_service.list_indices(f"{self.alias}-*")
+        return [index for index in indices if index not in current]
+
+    # --- Full rebuild ---
+
+    async def rebuild(self, resume: bool = False, keep_old: bool = False) -> int:
+        """
+        Tüm ürünleri yeni bir index'e yazar, refresh eder ve alias'ı taşır.
+        Alias taşındıktan sonra kurulum boyunca değişen ürünler (catch-up)
+        yeniden indexlenir; o ana kadar aramalar eski index'ten cevaplanır.
+
+        resume=True ise en son yarıda kalan index'e kaldığı yerden devam edilir.
+        Aksi halde yarıda kalmış index'ler silinip sıfırdan başlanır.
+        Bu çalıştırmada yazılan doküman sayısını döner.
+        """
+        building = await self._building_indices()
+        target: Optional[str] = None
+        after_id = 0
+        if resume and building:
+            target = building[-1]
+            after_id = await self._resume_point(target)
+            building = building[:-1]
+            logger.info(
+                "Resuming product index rebuild", index=target, after_id=after_id
+            )
+        for stale in building:
+            await self.search_service.delete_index(stale)
+
+        if target is None:
+            target = f"{self.alias}-{datetime.now(timezone.utc):{INDEX_TIMESTAMP}}"
+            created = await self.search_service.create_index(
+                target, PRODUCTS_MAPPING, PRODUCTS_INDEX_SETTINGS
+            )
+            if not created:
+                raise IndexingError(f"Index oluşturulamadı: {target}")
+
+        async def batches() -> AsyncGenerator[Batch, None]:
+            last_id = after_id
+            async with AsyncSessionLocal() as session:
+                while True:
+                    documents = await load_product_documents(
+                        session, after_id=last_id, limit=self.chunk_size
+                    )
+                    if not documents:
+                        return
+                    last_id = documents[-1]["id"]
+                    yield documents, []
+
+        indexed = await self._stream(batches(), target)
+        await self.search_service.refresh_index(target)
+
+        previous = await self.search_service.get_alias(self.alias)
+        if not await self.search_service.swap_alias(self.alias, target):
+            raise IndexingError(f"Alias taşınamadı: {self.alias} -> {target}")
+
+        # Kurulum sırasında eski index'e yazılan değişiklikleri yeni index'e taşı
+        started_at = datetime.strptime(
+            target.rsplit("-", 1)[1], INDEX_TIMESTAMP
+        ).replace(tzinfo=timezone.utc)
+        async with AsyncSessionLocal() as session:
+            changed = await changed_product_ids(session, started_at - CATCH_UP_MARGIN)
+        caught_up = await self.index_products(changed)
+
+        if not keep_old:
+            for old in previous:
+                if old != target:
+                    await self.search_service.delete_index(old)
+
+        logger.info(
+            "Product index rebuilt", index=target, indexed=indexed, caught_up=caught_up
+        )
+        return indexed
+
+    async def _resume_point(self, index: str) -> int:
+        """
+        Kaldığı yer: index'teki en büyük id'den chunk_size doküman gerideki id.
+        Chunk'lar id sırasıyla ve tek tek yazıldığı için yarım kalan chunk en
+        fazla chunk_size doküman içerir; ondan önceki tüm id'ler tamdır.
+        """
+        await self.search_service.refresh_index(index)
+        result = await self.search_service.search(
+            index,
+            {"match_all": {}},
+            from_=self.chunk_size,
+            size=1,
+            sort=[{"id": {"order": "desc"}}],
+            raise_on_error=True,
+        )
+        return int(result["hits"][0]["id"]) if result["hits"] else 0
+
+    # --- Streaming ---
+
+    async def _stream(self, batches: AsyncGenerator[Batch, None], target: str) -> int:
+        """
+        Batch'leri sınırlı bir kuyruk üzerinden bulk isteklerine aktarır.
+        Kuyruk doluysa üretici bekler (backpressure); bir chunk tam yazılamazsa
+        IndexingError fırlatılır ve üretici durdurulur.
+        """
+        queue: asyncio.Queue[Optional[Batch]] = asyncio.Queue(
+            maxsize=self.max_pending_chunks
+        )
+
+        async def produce() -> None:
+            async with aclosing(batches) as stream:
+                try:
+                    async for batch in stream:
+                        await queue.put(batch)
+                finally:
+                    # İptal edilmediysek (hata dahil) tüketiciye bitişi bildir
+                    task = asyncio.current_task()
+                    if task is None or not task.cancelling():
+                        await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        indexed = 0
+        try:
+            while (batch := await queue.get()) is not None:
+                documents, deleted = batch
+                written = await self.search_service.bulk_index(target, documents)
+                if written < len(documents):
+                    raise IndexingError(
+                        f"{target}: {len(documents) - written} doküman yazılamadı"
+                    )
+                for product_id in deleted:
+                    await self.search_service.delete_document(target, str(product_id))
+                indexed += written
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+        return indexed
+
+
+async def changed_product_ids(session: AsyncSession, since: datetime) -> List[int]:
+    """Dokümanı since'ten sonra değişmiş olabilecek ürünler (ürün, fiyat, varyant)."""
+    since_param = literal(since, type_=DateTime(timezone=True))
+    changed_variants = select(ProductVariant.product_id).where(
+        or_(
+            ProductVariant.created_at >= since_param,
+            ProductVariant.updated_at >= since_param,
+        )
+    )
+    query = (
+        select(Product.id)
+        .outerjoin(ProductPriceSummary, ProductPriceSummary.product_id == Product.id)
+        .where(
+            or_(
+                Product.created_at >= since_param,
+                Product.updated_at >= since_param,
+                ProductPriceSummary.updated_at >= since_param,
+                Product.id.in_(changed_variants),
+            )
+        )
+    )
+    return list((await session.execute(query)).scalars().all())
+
+
+async def index_changed_products(product_ids: Iterable[int]) -> int:
+    """
+    Pipeline commit'inden sonra çağrılır. Arama Elasticsearch'te değilse
+    no-op; indexleme hataları pipeline sonucunu etkilemez (bir sonraki
+    rebuild veya değişiklik dokümanı düzeltir).
+    """
+    if settings.PRODUCT_SEARCH_BACKEND != "elasticsearch":
+        return 0
+    try:
+        return await ProductIndexer(get_search_service()).index_products(product_ids)
+    except Exception as e:
+        logger.warning("Incremental product indexing failed", error=str(e))
+        return 0
@@ -0,0 +1,352 @@
+"""
+Elasticsearch Product Search Backend.
+Ürün dokümanları (index mapping'i ve Postgres'ten doküman üretimi) ile
+BM25 eşleşmesi, fiyat/stok filtreleri ve facet aggregation'larını içerir.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.i_services.i_search_service import ISearchService
+from app.domain.schemas.products.product_search import (
+    FacetBucket,
+    ProductSearchRequest,
+    ProductSearchResponse,
+    ProductSearchResult,
+)
+from app.persistence.models.price.current_offer import ProductPriceSummary
+from app.persistence.models.products.category import Category
+from app.persistence.models.products.product import Product
+from app.persistence.models.products.product_variant import ProductVariant
+
+logger = structlog.get_logger(__name__)
+
+PRODUCTS_INDEX = "products"
+
+# Türkçe küçük harf + ASCII katlama:
+# "Kazak" / "KAZAK" / "kazak", "ayakkabı" / "ayakkabi"
+PRODUCTS_INDEX_SETTINGS: Dict[str, Any] = {
+    "analysis": {
+        "filter": {"tr_lowercase": {"type": "lowercase", "language": "turkish"}},
+        "analyzer": {
+            "product_text": {
+                "type": "custom",
+                "tokenizer": "standard",
+                "filter": ["tr_lowercase", "asciifolding"],
+            }
+        },
+    }
+}
+
+_KEYWORD_WITH_TEXT: Dict[str, Any] = {
+    "type": "keyword",
+    "fields": {"text": {"type": "text", "analyzer": "product_text"}},
+}
+
+PRODUCTS_MAPPING: Dict[str, Any] = {
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {
+            "type": "text",
+            "analyzer": "product_text",
+            "fields": {"keyword": {"type": "keyword"}},
+        },
+        "slug": {"type": "keyword"},
+        "brand": _KEYWORD_WITH_TEXT,
+        "category_id": {"type": "integer"},
+        "category_name": _KEYWORD_WITH_TEXT,
+        "gender": {"type": "keyword"},
+        "description": {"type": "text", "analyzer": "product_text"},
+        "image_url": {"type": "keyword", "index": False},
+        "lowest_price": {"type": "scaled_float", "scaling_factor": 100},
+        "original_price": {"type": "scaled_float", "scaling_factor": 100},
+        "currency_code": {"type": "keyword"},
+        "in_stock": {"type": "boolean"},
+        "offer_count": {"type": "integer"},
+        "colors": {"type": "keyword"},
+        "sizes": {"type": "keyword"},
+        "materials": {"type": "keyword"},
+        "variant_attributes": {"type": "text", "analyzer": "product_text"},
+    }
+}
+
+# BM25 ile aranan alanlar (best_fields, alan ağırlıklarıyla)
+SEARCH_FIELDS = [
+    "name^3",
+    "brand.text^2",
+    "category_name.text^1.5",
+    "variant_attributes",
+    "description",
+]
+
+PRICE_RANGES = [
+    {"key": "0-250", "to": 250},
+    {"key": "250-500", "from": 250, "to": 500},
+    {"key": "500-1000", "from": 500, "to": 1000},
+    {"key": "1000-2500", "from": 1000, "to": 2500},
+    {"key": "2500+", "from": 2500},
+]
+
+FACET_FIELDS = {
+    "brands": "brand",
+    "categories": "category_name",
+    "genders": "gender",
+    "colors": "colors",
+    "sizes": "sizes",
+}
+FACET_SIZE = 20
+
+# from + size bu değeri aşamaz (ES index.max_result_window varsayılanı)
+MAX_RESULT_WINDOW = 10_000
+
+
+class ElasticsearchProductSearch:
+    """
+    ProductSearchRequest'i ES sorgusuna çevirir ve sonucu ProductSearchResponse'a
+    dönüştürür. Hatalar yükseltilir; fallback kararı ProductSearchService'tedir.
+
+    Filtre semantiği Postgres yolu ile aynıdır: fiyatı veya stok bilgisi
+    olmayan ürünler fiyat/stok filtrelerine takılmaz.
+    """
+
+    def __init__(
+        self, search_service: ISearchService, index: str = PRODUCTS_INDEX
+    ) -> None:
+        self.search_service = search_service
+        self.index = index
+
+    def supports(self, request: ProductSearchRequest) -> bool:
+        """Cursor sayfalama ve result window dışı derin sayfalar Postgres'te kalır."""
+        if request.cursor:
+            return False
+        return request.page * request.page_size <= MAX_RESULT_WINDOW
+
+    async def ensure_index(self) -> bool:
+        return await self.search_service.create_index(
+            self.index, PRODUCTS_MAPPING, PRODUCTS_INDEX_SETTINGS
+        )
+
+    async def search(self, request: ProductSearchRequest) -> ProductSearchResponse:
+        result = await self.search_service.search(
+            self.index,
+            self.build_query(request),
+            from_=(request.page - 1) * request.page_size,
+            size=request.page_size,
+            sort=self.build_sort(request),
+            aggs=self.build_aggregations(),
+            raise_on_error=True,
+        )
+        return ProductSearchResponse(
+            query=request.q,
+            products=[self._to_search_result(doc) for doc in result["hits"]],
+            total=result["total"],
+            page=request.page,
+            page_size=request.page_size,
+            facets=self.parse_facets(result.get("aggregations") or {}),
+        )
+
+    @staticmethod
+    def _has_text(request: ProductSearchRequest) -> bool:
+        return bool(request.q and request.q.strip() not in ("", "*"))
+
+    def build_query(self, request: ProductSearchRequest) -> Dict[str, Any]:
+        must: List[Dict[str, Any]] = []
+        if self._has_text(request):
+            must.append(
+                {
+                    "multi_match": {
+                        "query": request.q.strip(),
+                        "fields": SEARCH_FIELDS,
+                        "type": "best_fields",
+                        "operator": "and",
+                    }
+                }
+            )
+        else:
+            must.append({"match_all": {}})
+
+        filters: List[Dict[str, Any]] = []
+        if request.category_id:
+            filters.append({"term": {"category_id": request.category_id}})
+        if request.brand:
+            filters.append({"term": {"brand": request.brand}})
+        if request.gender:
+            filters.append({"term": {"gender": request.gender}})
+
+        # Fiyat/stok: değeri olmayan dokümanlar da geçer (Postgres ile aynı)
+        price_bounds: Dict[str, float] = {}
+        if request.min_price is not None:
+            price_bounds["gte"] = float(request.min_price)
+        if request.max_price is not None:
+            price_bounds["lte"] = float(request.max_price)
+        if price_bounds:
+            filters.append(
+                _or_missing("lowest_price", {"range": {"lowest_price": price_bounds}})
+            )
+        if request.in_stock_only:
+            filters.append(_or_missing("in_stock", {"term": {"in_stock": True}}))
+
+        return {"bool": {"must": must, "filter": filters}}
+
+    def build_sort(self, request: ProductSearchRequest) -> List[Dict[str, Any]]:
+        """Metin aramasında alaka (BM25), aksi halde Postgres ile aynı isim sırası."""
+        by_name = [{"name.keyword": {"order": "asc"}}, {"id": {"order": "asc"}}]
+        if self._has_text(request):
+            return [{"_score": {"order": "desc"}}, *by_name]
+        return by_name
+
+    @staticmethod
+    def build_aggregations() -> Dict[str, Any]:
+        aggs: Dict[str, Any] = {
+            name: {"terms": {"field": field, "size": FACET_SIZE}}
+            for name, field in FACET_FIELDS.items()
+        }
+        aggs["in_stock"] = {"terms": {"field": "in_stock", "size": 2}}
+        aggs["price_ranges"] = {
+            "range": {"field": "lowest_price", "ranges": PRICE_RANGES}
+        }
+        return aggs
+
+    @staticmethod
+    def parse_facets(aggregations: Dict[str, Any]) -> Dict[str, List[FacetBucket]]:
+        facets: Dict[str, List[FacetBucket]] = {}
+        for name, agg in aggregations.items():
+            facets[name] = [
+                FacetBucket(
+                    # ES boolean terms key'i 0/1 döner; key_as_string "true"/"false"
+                    value=str(bucket.get("key_as_string", bucket["key"])).lower()
+                    if name == "in_stock"
+                    else str(bucket["key"]),
+                    count=bucket["doc_count"],
+                )
+                for bucket in agg.get("buckets", [])
+            ]
+        return facets
+
+    @staticmethod
+    def _to_search_result(doc: Dict[str, Any]) -> ProductSearchResult:
+        return ProductSearchResult(
+            id=doc["id"],
+            name=doc["name"],
+            slug=doc.get("slug"),
+            brand=doc.get("brand"),
+            category_id=doc.get("category_id"),
+            category_name=doc.get("category_name"),
+            gender=doc.get("gender"),
+            image_url=doc.get("image_url"),
+            description=doc.get("description"),
+            lowest_price=_decimal(doc.get("lowest_price")),
+            original_price=_decimal(doc.get("original_price")),
+            currency_code=doc.get("currency_code") or "TRY",
+            in_stock=doc.get("in_stock") is not False,
+            colors=doc.get("colors") or [],
+            sizes=doc.get("sizes") or [],
+            materials=doc.get("materials") or [],
+        )
+
+
+def _or_missing(field: str, clause: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "bool": {
+            "should": [clause, {"bool": {"must_not": {"exists": {"field": field}}}}],
+            "minimum_should_match": 1,
+        }
+    }
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    return Decimal(str(value)) if value is not None else None
+
+
+async def load_product_documents(
+    session: AsyncSession,
+    *,
+    product_ids: Optional[Sequence[int]] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Denormalize ES dokümanlarını tek sorguda üretir: ürün + fiyat özeti +
+    kategori adı + varyant attribute'ları (LATERAL json_agg).
+    product_ids veya (after_id, limit) ile id sırasında batch okunur.
+    """
+    variants = (
+        select(func.json_agg(ProductVariant.attributes).label("attributes"))
+        .where(ProductVariant.product_id == Product.id)
+        .lateral("variants")
+    )
+    query = (
+        select(
+            Product,
+            ProductPriceSummary,
+            Category.name.label("category_name"),
+            variants.c.attributes,
+        )
+        .outerjoin(ProductPriceSummary, ProductPriceSummary.product_id == Product.id)
+        .outerjoin(Category, Category.id == Product.category_id)
+        .outerjoin(variants, true())
+        .order_by(Product.id)
+    )
+    if product_ids is not None:
+        query = query.where(Product.id.in_(list(product_ids)))
+    if after_id is not None:
+        query = query.where(Product.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await session.execute(query)
+    return [
+        build_product_document(product, summary, category_name, attributes or [])
+        for product, summary, category_name, attributes in result.all()
+    ]
+
+
+def build_product_document(
+    product: Product,
+    summary: Optional[ProductPriceSummary],
+    category_name: Optional[str],
+    variant_attributes: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Ürün satırından ES dokümanı (PRODUCTS_MAPPING) üretir."""
+    colors: List[str] = []
+    sizes: List[str] = []
+    materials: List[str] = []
+    all_attributes: List[str] = []
+    for attrs in variant_attributes:
+        attrs = attrs or {}
+        if "color" in attrs:
+            colors.append(str(attrs["color"]))
+        if "size" in attrs:
+            sizes.append(str(attrs["size"]))
+        if "material" in attrs:
+            materials.append(str(attrs["material"]))
+        all_attributes.extend(str(value) for value in attrs.values())
+
+    return {
+        "id": product.id,
+        "name": product.name,
+        "slug": product.slug,
+        "brand": product.brand,
+        "category_id": product.category_id,
+        "category_name": category_name,
+        "gender": product.gender,
+        "description": product.description,
+        "image_url": product.image_url,
+        "lowest_price": float(summary.lowest_price) if summary else None,
+        "original_price": (
+            float(summary.original_price)
+            if summary and summary.original_price
+            else None
+        ),
+        "currency_code": "TRY",
+        "in_stock": summary.in_stock if summary else None,
+        "offer_count": summary.offer_count if summary else 0,
+        "colors": sorted(set(colors)),
+        "sizes": sorted(set(sizes)),
+        "materials": sorted(set(materials)),
+        "variant_attributes": " ".join(sorted(set(all_attributes))),
+    }
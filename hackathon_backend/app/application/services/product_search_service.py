@@ -1,55 +1,118 @@
-"""Product Search Service using PostgreSQL database."""
+"""Product Search Service (Elasticsearch, PostgreSQL fallback)."""
 
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 import structlog
-from sqlalchemy import select, func, or_
-from sqlalchemy.orm import selectinload
-
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    String,
+    distinct,
+    func,
+    null,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.product_search_es import ElasticsearchProductSearch
+from app.core.config.settings import settings
+from app.core.infrastructure.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    get_circuit_breaker,
+)
+from app.core.infrastructure.elasticsearch import get_search_service
 from app.domain.schemas.products.product_search import (
     ProductSearchRequest,
     ProductSearchResponse,
     ProductSearchResult,
 )
+from app.domain.schemas.pagination import TotalMode
+from app.infrastructure.repositories.keyset import KeysetOrder, estimate_count
 from app.persistence.db.session import AsyncSessionLocal
+from app.persistence.models.products.category import Category
 from app.persistence.models.products.product import Product
-from app.persistence.models.products.product_mappings import ProductMapping
-from app.persistence.models.price.price_history import PriceHistory
+from app.persistence.models.products.product_variant import ProductVariant
+from app.persistence.models.price.current_offer import ProductPriceSummary
 
 logger = structlog.get_logger(__name__)
 
+SEARCH_CIRCUIT = "elasticsearch-search"
+
 
 class ProductSearchService:
     """
     Product Search Service.
-    PostgreSQL veritabanı üzerinden basit ürün arama işlemleri.
-    ILIKE ile isim bazlı arama yapar.
+    es_search verilirse arama Elasticsearch'te (BM25 + facet) yapılır; ES
+    hata verirse veya devre açıksa PostgreSQL ILIKE aramasına düşülür.
     """
 
+    def __init__(
+        self,
+        es_search: Optional[ElasticsearchProductSearch] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.es_search = es_search
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(
+            SEARCH_CIRCUIT,
+            CircuitBreakerConfig(failure_threshold=3, timeout_seconds=30.0),
+        )
+
     async def ensure_index(self) -> bool:
-        """No-op: Database araması için index gerekmez."""
-        return True
+        """ES kullanılıyorsa products index'ini oluşturur; database için no-op."""
+        if self.es_search is None:
+            return True
+        return await self.es_search.ensure_index()
 
     async def search_products(
         self, request: ProductSearchRequest
     ) -> ProductSearchResponse:
         """
         Ürün arama.
-        
-        PostgreSQL ILIKE ile name alanında arama yapar.
+
+        Cursor sayfalama ve ES result window'u dışındaki sayfalar her zaman
+        PostgreSQL'de çalışır.
+        """
+        if (
+            self.es_search is not None
+            and self.es_search.supports(request)
+            and self.circuit_breaker.can_execute()
+        ):
+            try:
+                response = await self.es_search.search(request)
+                self.circuit_breaker.record_success()
+                return response
+            except Exception as e:
+                self.circuit_breaker.record_failure()
+                logger.warning(
+                    "Elasticsearch search failed, using database", error=str(e)
+                )
+
+        return await self._search_postgres(request)
+
+    async def _search_postgres(
+        self, request: ProductSearchRequest
+    ) -> ProductSearchResponse:
+        """
+        PostgreSQL ILIKE ile name alanında arama yapar. Filtreleme, sayfalama,
+        fiyat özeti, kategori adı ve varyant renk/bedenleri tek SQL
+        statement'ında gelir (bkz. fetch_product_page). request.cursor verilirse
+        OFFSET yerine keyset sayfalama kullanılır.
         """
         async with AsyncSessionLocal() as session:
-            # Base query
-            query = select(Product).options(
-                selectinload(Product.category),
-                selectinload(Product.variants),
+            # Filtrelenmiş ürün id'leri
+            filtered = select(Product.id.label("id")).outerjoin(
+                ProductPriceSummary, ProductPriceSummary.product_id == Product.id
             )
 
             # Search filter
             if request.q and request.q.strip() != "*":
                 search_term = f"%{request.q.strip()}%"
-                query = query.where(
+                filtered = filtered.where(
                     or_(
                         Product.name.ilike(search_term),
                         Product.description.ilike(search_term),
@@ -59,95 +122,36 @@ class ProductSearchService:
 
             # Category filter
             if request.category_id:
-                query = query.where(Product.category_id == request.category_id)
+                filtered = filtered.where(Product.category_id == request.category_id)
 
             # Brand filter
             if request.brand:
-                query = query.where(Product.brand == request.brand)
+                filtered = filtered.where(Product.brand == request.brand)
 
             # Gender filter
             if request.gender:
-                query = query.where(Product.gender == request.gender)
-
-            # Get total count
-            count_query = select(func.count()).select_from(query.subquery())
-            total_result = await session.execute(count_query)
-            total = total_result.scalar() or 0
-
-            # Pagination
-            offset = (request.page - 1) * request.page_size
-            query = query.offset(offset).limit(request.page_size)
-
-            # Order by name
-            query = query.order_by(Product.name)
-
-            # Execute
-            result = await session.execute(query)
-            products_db = result.scalars().all()
-
-            # Get lowest prices for each product
-            products: List[ProductSearchResult] = []
-            for product in products_db:
-                # Get lowest price from price_histories via product_mappings
-                price_query = (
-                    select(PriceHistory.price, PriceHistory.original_price, PriceHistory.in_stock)
-                    .join(ProductMapping, PriceHistory.mapping_id == ProductMapping.id)
-                    .where(ProductMapping.product_id == product.id)
-                    .order_by(PriceHistory.price)
-                    .limit(1)
+                filtered = filtered.where(Product.gender == request.gender)
+
+            # Price / stock filters (fiyatı olmayan ürünler filtreden geçer)
+            filtered = filtered.where(
+                *price_summary_filters(
+                    request.min_price, request.max_price, request.in_stock_only
                 )
-                price_result = await session.execute(price_query)
-                price_row = price_result.first()
-
-                lowest_price = Decimal(str(price_row[0])) if price_row else None
-                original_price = Decimal(str(price_row[1])) if price_row and price_row[1] else None
-                in_stock = price_row[2] if price_row else True
-
-                # Price filter (post-filter since we need to calculate lowest price first)
-                if request.min_price is not None and lowest_price is not None:
-                    if lowest_price < request.min_price:
-                        continue
-                if request.max_price is not None and lowest_price is not None:
-                    if lowest_price > request.max_price:
-                        continue
-                if request.in_stock_only and not in_stock:
-                    continue
-
-                # Calculate discount
-                discount_pct = None
-                if original_price and lowest_price and original_price > lowest_price:
-                    discount_pct = int(((original_price - lowest_price) / original_price) * 100)
-
-                # Extract colors and sizes from variants
-                colors: List[str] = []
-                sizes: List[str] = []
-                if product.variants:
-                    for v in product.variants:
-                        attrs = v.attributes or {}
-                        if attrs.get("color"):
-                            colors.append(str(attrs["color"]))
-                        if attrs.get("size"):
-                            sizes.append(str(attrs["size"]))
-
-                products.append(ProductSearchResult(
-                    id=product.id,
-                    name=product.name,
-                    slug=product.slug,
-                    brand=product.brand,
-                    category_id=product.category_id,
-                    category_name=product.category.name if product.category else None,
-                    gender=product.gender,
-                    image_url=product.image_url,
-                    description=product.description,
-                    lowest_price=lowest_price,
-                    original_price=original_price,
-                    currency_code="TRY",
-                    in_stock=in_stock,
-                    colors=list(set(colors)),
-                    sizes=list(set(sizes)),
-                    materials=[],
-                    discount_percentage=discount_pct,
-                ))
+            )
+
+            rows, total, next_cursor = await fetch_product_page(
+                session,
+                filtered,
+                _detail_query(),
+                page=request.page,
+                page_size=request.page_size,
+                cursor=request.cursor,
+                total_mode=request.total_mode,
+            )
+
+            products: List[ProductSearchResult] = [
+                self._to_search_result(*row[:5]) for row in rows
+            ]
 
             return ProductSearchResponse(
                 query=request.q,
@@ -155,78 +159,184 @@ class ProductSearchService:
                 total=total,
                 page=request.page,
                 page_size=request.page_size,
+                next_cursor=next_cursor,
             )
 
     async def get_product_by_id(self, product_id: int) -> Optional[ProductSearchResult]:
         """ID ile ürün getir."""
         async with AsyncSessionLocal() as session:
-            query = (
-                select(Product)
-                .options(
-                    selectinload(Product.category),
-                    selectinload(Product.variants),
-                )
-                .where(Product.id == product_id)
+            result = await session.execute(
+                _detail_query().where(Product.id == product_id)
             )
-            result = await session.execute(query)
-            product = result.scalars().first()
+            row = result.first()
 
-            if not product:
+            if not row:
                 return None
 
-            # Get lowest price
-            price_query = (
-                select(PriceHistory.price, PriceHistory.original_price, PriceHistory.in_stock)
-                .join(ProductMapping, PriceHistory.mapping_id == ProductMapping.id)
-                .where(ProductMapping.product_id == product.id)
-                .order_by(PriceHistory.price)
-                .limit(1)
-            )
-            price_result = await session.execute(price_query)
-            price_row = price_result.first()
-
-            lowest_price = Decimal(str(price_row[0])) if price_row else None
-            original_price = Decimal(str(price_row[1])) if price_row and price_row[1] else None
-            in_stock = price_row[2] if price_row else True
-
-            # Calculate discount
-            discount_pct = None
-            if original_price and lowest_price and original_price > lowest_price:
-                discount_pct = int(((original_price - lowest_price) / original_price) * 100)
-
-            # Extract colors and sizes
-            colors: List[str] = []
-            sizes: List[str] = []
-            if product.variants:
-                for v in product.variants:
-                    attrs = v.attributes or {}
-                    if attrs.get("color"):
-                        colors.append(str(attrs["color"]))
-                    if attrs.get("size"):
-                        sizes.append(str(attrs["size"]))
-
-            return ProductSearchResult(
-                id=product.id,
-                name=product.name,
-                slug=product.slug,
-                brand=product.brand,
-                category_id=product.category_id,
-                category_name=product.category.name if product.category else None,
-                gender=product.gender,
-                image_url=product.image_url,
-                description=product.description,
-                lowest_price=lowest_price,
-                original_price=original_price,
-                currency_code="TRY",
-                in_stock=in_stock,
-                colors=list(set(colors)),
-                sizes=list(set(sizes)),
-                materials=[],
-                discount_percentage=discount_pct,
-            )
+            return self._to_search_result(*row)
+
+    @staticmethod
+    def _to_search_result(
+        product: Product,
+        summary: Optional[ProductPriceSummary],
+        category_name: Optional[str],
+        colors: Optional[List[str]],
+        sizes: Optional[List[str]],
+    ) -> ProductSearchResult:
+        """Ürün satırını (fiyat özeti, kategori, varyantlar) arama sonucuna çevirir."""
+        lowest_price = Decimal(str(summary.lowest_price)) if summary else None
+        original_price = (
+            Decimal(str(summary.original_price))
+            if summary and summary.original_price
+            else None
+        )
+        in_stock = summary.in_stock if summary else True
+
+        return ProductSearchResult(
+            id=product.id,
+            name=product.name,
+            slug=product.slug,
+            brand=product.brand,
+            category_id=product.category_id,
+            category_name=category_name,
+            gender=product.gender,
+            image_url=product.image_url,
+            description=product.description,
+            lowest_price=lowest_price,
+            original_price=original_price,
+            currency_code="TRY",
+            in_stock=in_stock,
+            colors=colors or [],
+            sizes=sizes or [],
+            materials=[],
+        )
+
+
+def _detail_query() -> Select[Any]:
+    """
+    Ürün + fiyat özeti + kategori adı + varyant renk/bedenleri.
+    Varyantlar ürün başına LATERAL alt sorguyla toplanır (ayrı sorgu yok).
+    """
+    color = ProductVariant.attributes["color"].as_string()
+    size = ProductVariant.attributes["size"].as_string()
+    variant_facets = (
+        select(
+            func.array_remove(
+                func.array_agg(distinct(color)), null(), type_=ARRAY(String)
+            ).label("colors"),
+            func.array_remove(
+                func.array_agg(distinct(size)), null(), type_=ARRAY(String)
+            ).label("sizes"),
+        )
+        .where(ProductVariant.product_id == Product.id)
+        .lateral("variant_facets")
+    )
+    return (
+        select(
+            Product,
+            ProductPriceSummary,
+            Category.name.label("category_name"),
+            variant_facets.c.colors,
+            variant_facets.c.sizes,
+        )
+        .outerjoin(ProductPriceSummary, ProductPriceSummary.product_id == Product.id)
+        .outerjoin(Category, Category.id == Product.category_id)
+        .outerjoin(variant_facets, true())
+    )
+
+
+# Ürün listelerinin sırası; son anahtar id (keyset sayfalama için benzersiz)
+PRODUCT_ORDER = KeysetOrder.of((Product.name, False), (Product.id, False))
+
+
+async def fetch_product_page(
+    session: AsyncSession,
+    filtered: Select[Any],
+    detail: Select[Any],
+    *,
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None,
+    total_mode: Optional[TotalMode] = None,
+) -> Tuple[List[Any], Optional[int], Optional[str]]:
+    """
+    Filtrelenmiş ürün id sorgusundan bir sayfa okur; (satırlar, toplam, sonraki cursor).
+
+    - İç sorgu: filtreler + PRODUCT_ORDER + keyset koşulu veya OFFSET + LIMIT
+      page_size + 1 (sonraki sayfa var mı?). OFFSET modunda kesin toplam
+      count(*) OVER () ile aynı statement'ta hesaplanır.
+    - Dış sorgu: detail (Product ile başlayan select) sadece sayfa satırları için.
+
+    total_mode verilmezse OFFSET modunda "exact", cursor modunda "none"dır;
+    cursor modunda "exact" ayrı bir count(*) çalıştırır.
+    """
+    total_mode = total_mode or ("none" if cursor else "exact")
+    inline_total = total_mode == "exact" and not cursor
+
+    page_query = filtered
+    if inline_total:
+        page_query = page_query.add_columns(func.count().over().label("total"))
+    if cursor:
+        page_query = page_query.where(PRODUCT_ORDER.after(cursor))
+    else:
+        page_query = page_query.offset((page - 1) * page_size)
+    page_ids = (
+        page_query.order_by(*PRODUCT_ORDER.order_by())
+        .limit(page_size + 1)
+        .subquery("page")
+    )
+
+    query = detail.join(page_ids, page_ids.c.id == Product.id)
+    if inline_total:
+        query = query.add_columns(page_ids.c.total)
+    result = await session.execute(query.order_by(*PRODUCT_ORDER.order_by()))
+    rows = result.all()
+
+    total: Optional[int] = None
+    if inline_total and rows:
+        total = rows[0].total
+    elif total_mode == "exact" and (cursor or page > 1):
+        # Cursor modu veya son sayfanın ötesi (pencere fonksiyonu satır döndürmez)
+        count_query = select(func.count()).select_from(filtered.subquery())
+        total = (await session.execute(count_query)).scalar() or 0
+    elif total_mode == "exact":
+        total = 0
+    elif total_mode == "estimated":
+        total = await estimate_count(session, filtered)
+
+    rows, next_cursor = PRODUCT_ORDER.paginate(
+        rows, page_size, lambda row: [row[0].name, row[0].id]
+    )
+    return rows, total, next_cursor
+
+
+def price_summary_filters(
+    min_price: Optional[Decimal],
+    max_price: Optional[Decimal],
+    in_stock_only: bool,
+) -> List[ColumnElement[bool]]:
+    """
+    product_price_summary üzerinde fiyat/stok filtreleri.
+    Fiyat bilgisi olmayan ürünler (özet satırı yok) filtrelere takılmaz.
+    """
+    conditions: List[ColumnElement[bool]] = []
+    no_summary = ProductPriceSummary.product_id.is_(None)
+    if min_price is not None:
+        conditions.append(
+            or_(no_summary, ProductPriceSummary.lowest_price >= min_price)
+        )
+    if max_price is not None:
+        conditions.append(
+            or_(no_summary, ProductPriceSummary.lowest_price <= max_price)
+        )
+    if in_stock_only:
+        conditions.append(or_(no_summary, ProductPriceSummary.in_stock.is_(True)))
+    return conditions
 
 
 # Factory function
 def get_product_search_service() -> ProductSearchService:
-    """Returns ProductSearchService instance."""
+    """Returns ProductSearchService instance (backend: PRODUCT_SEARCH_BACKEND)."""
+    if settings.PRODUCT_SEARCH_BACKEND == "elasticsearch":
+        return ProductSearchService(ElasticsearchProductSearch(get_search_service()))
     return ProductSearchService()
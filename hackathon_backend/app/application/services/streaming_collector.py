@@ -0,0 +1,176 @@
+"""
+Streaming Collector - Application Layer.
+Sağlayıcılardan gelen ürünleri chunk chunk işler:
+
+- Her sağlayıcı kendi üreticisiyle sınırlı bir asyncio.Queue'ya chunk yazar.
+  Kuyruk doluysa üretici bekler; bellekte en fazla queue_size + workers chunk bulunur.
+- N worker chunk'ları eşzamanlı tüketir. Her chunk handler tarafından kendi
+  transaction'ında işlenir ve commit edilir; yavaş bir sağlayıcı diğerlerini
+  bekletmez, hatalı bir chunk diğerlerini geri almaz.
+- Sağlayıcı başına gecikme, item ve hata metrikleri tutulur.
+"""
+
+import asyncio
+import time
+from contextlib import aclosing
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ChunkResult:
+    """
+    Bir chunk'ın işlenme sonucu (handler döner).
+    failed_items: Commit edilen chunk'ta ayıklanan (ör. dead-letter'a yazılan)
+        item sayısı.
+    """
+
+    committed: bool
+    errors: List[str] = field(default_factory=list)
+    meta: Dict[str, Any] = field(default_factory=dict)
+    failed_items: int = 0
+
+
+@dataclass
+class ProviderMetrics:
+    """
+    fetch_seconds: Sağlayıcıdan chunk beklenen toplam süre (kuyruk beklemesi hariç).
+    process_seconds: Chunk'ların pipeline + commit toplam süresi.
+    """
+
+    provider: str
+    chunks: int = 0
+    items: int = 0
+    committed_items: int = 0
+    failed_items: int = 0
+    failed_chunks: int = 0
+    fetch_seconds: float = 0.0
+    process_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["fetch_seconds"] = round(self.fetch_seconds, 3)
+        data["process_seconds"] = round(self.process_seconds, 3)
+        return data
+
+
+# Sağlayıcının chunk akışını başlatan fabrika ve tek bir chunk'ı işleyen handler
+ChunkSource = Callable[[], AsyncGenerator[List[T], None]]
+ChunkHandler = Callable[[str, List[T]], Awaitable[ChunkResult]]
+
+
+class StreamingCollector(Generic[T]):
+    """
+    sources: sağlayıcı adı -> chunk akışı.
+    handler: (sağlayıcı, chunk) -> ChunkResult; hata fırlatırsa chunk başarısız sayılır.
+    """
+
+    def __init__(
+        self,
+        sources: Mapping[str, ChunkSource[T]],
+        handler: ChunkHandler[T],
+        workers: int = 4,
+        queue_size: int = 8,
+    ) -> None:
+        self.sources = sources
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self.metrics: Dict[str, ProviderMetrics] = {}
+        self.results: List[ChunkResult] = []
+
+    async def run(self) -> Dict[str, ProviderMetrics]:
+        """Tüm sağlayıcılar tükenip kuyruktaki chunk'lar işlenene kadar çalışır."""
+        self.metrics = {name: ProviderMetrics(name) for name in self.sources}
+        self.results = []
+        queue: asyncio.Queue[Optional[Tuple[str, List[T]]]] = asyncio.Queue(
+            maxsize=self.queue_size
+        )
+
+        workers = [asyncio.create_task(self._work(queue)) for _ in range(self.workers)]
+        try:
+            await asyncio.gather(
+                *(
+                    self._produce(name, source, queue)
+                    for name, source in self.sources.items()
+                )
+            )
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                if not worker.done():
+                    worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return self.metrics
+
+    async def _produce(
+        self,
+        provider: str,
+        source: ChunkSource[T],
+        queue: "asyncio.Queue[Optional[Tuple[str, List[T]]]]",
+    ) -> None:
+        metrics = self.metrics[provider]
+        started = time.perf_counter()
+        try:
+            async with aclosing(source()) as chunks:
+                async for chunk in chunks:
+                    metrics.fetch_seconds += time.perf_counter() - started
+                    if chunk:
+                        await queue.put((provider, chunk))
+                    started = time.perf_counter()
+        except Exception as e:
+            # Sağlayıcı hatası diğer sağlayıcıları ve işlenmiş chunk'ları etkilemez
+            metrics.fetch_seconds += time.perf_counter() - started
+            metrics.errors.append(f"Sağlayıcı okunamadı: {e}")
+            logger.warning("Provider stream failed", provider=provider, error=str(e))
+
+    async def _work(
+        self, queue: "asyncio.Queue[Optional[Tuple[str, List[T]]]]"
+    ) -> None:
+        while (entry := await queue.get()) is not None:
+            provider, chunk = entry
+            metrics = self.metrics[provider]
+            started = time.perf_counter()
+            try:
+                result = await self.handler(provider, chunk)
+            except Exception as e:
+                result = ChunkResult(committed=False, errors=[str(e)])
+            metrics.process_seconds += time.perf_counter() - started
+
+            metrics.chunks += 1
+            metrics.items += len(chunk)
+            if result.committed:
+                metrics.committed_items += len(chunk) - result.failed_items
+                metrics.failed_items += result.failed_items
+            else:
+                metrics.failed_items += len(chunk)
+                metrics.failed_chunks += 1
+                logger.warning(
+                    "Chunk failed",
+                    provider=provider,
+                    size=len(chunk),
+                    errors=result.errors,
+                )
+            metrics.errors.extend(result.errors)
+            self.results.append(result)
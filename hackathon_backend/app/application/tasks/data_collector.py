@@ -1,97 +1,266 @@
 import asyncio
 import structlog
-from datetime import datetime
-from typing import List
+from functools import partial
+from typing import Any, Dict, List, Optional, Set
 
 from app.core.config.celery import celery_app
-from app.application.services.mock.mock_provider_service import MockProviderService
+from app.core.config.settings import settings
+from app.application.services.mock.mock_provider_service import (
+    PROVIDER_CONFIGS,
+    MockProviderService,
+)
 from app.domain.schemas.product import UnifiedProduct
 from app.infrastructure.unit_of_work import UnitOfWork
-from app.core.infrastructure.cache import get_cache
+from app.core.infrastructure.tiered_cache import get_tiered_cache
 from app.core.infrastructure.exchange_rate_provider import ExchangeRateApiProvider
 from app.application.services.price.currency_service import CurrencyService
+from app.application.cqrs.queries.product_query import invalidate_product_details
 from app.application.pipelines.analytics.product_analysis_pipeline import ProductAnalysisPipeline
+from app.application.pipelines.analytics.product_matcher import ProductMatchIndex
+from app.application.pipelines.analytics.steps.update_trending_step import top_trending
+from app.application.services.homepage_service import HomepageService
+from app.application.services.product_indexer import index_changed_products
+from app.application.services.pipeline_metrics import publish_step_metrics
+from app.application.services.streaming_collector import ChunkResult, StreamingCollector
+from app.core.infrastructure.profiling import Profiler, capture_profile
+from app.domain.i_services.i_cache_service import ICacheService
+from app.domain.i_services.i_currency_service import ICurrencyService
+from app.domain.schemas.analytics.trending_product import TrendingEntry
 
 logger = structlog.get_logger()
 
 
 @celery_app.task
-def collect_data_task():
-    """Celery task wrapper for async data collection."""
+def collect_data_task(profile: Optional[Profiler] = None):
+    """
+    Celery task wrapper for async data collection.
+    profile: "cprofile" veya "pyinstrument" verilirse bu çalıştırmanın profili yazılır.
+    """
     loop = asyncio.get_event_loop()
     if loop.is_closed():
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(collect_data())
 
+    return loop.run_until_complete(collect_data(profile=profile))
 
-async def collect_data():
+
+def _to_pipeline_data(
+    products: List[UnifiedProduct], provider_map: Dict[str, int]
+) -> List[Dict[str, Any]]:
+    pipeline_data = []
+    for p in products:
+        # Provider.SPORT_DIRECT.value is "sport_direct"
+        p_slug = p.provider.value
+        # Try direct match or kebab-case match
+        provider_id = provider_map.get(p_slug)
+        if not provider_id:
+            provider_id = provider_map.get(p_slug.replace("_", "-"))
+
+        if not provider_id:
+            logger.warning("provider_not_found", slug=p_slug)
+            continue
+
+        data_dict = p.model_dump()
+        data_dict["provider_id"] = provider_id
+        data_dict["external_product_code"] = p.provider_product_id
+        data_dict["product_url"] = p.url
+        data_dict["stock_quantity"] = p.stock
+        data_dict["in_stock"] = p.stock > 0
+
+        pipeline_data.append(data_dict)
+    return pipeline_data
+
+
+async def _process_chunk(
+    provider: str,
+    products: List[UnifiedProduct],
+    *,
+    provider_map: Dict[str, int],
+    currency_service: ICurrencyService,
+    match_index: Optional[ProductMatchIndex],
+) -> ChunkResult:
+    """Bir chunk'ı kendi UnitOfWork'ünde pipeline'dan geçirir ve commit eder."""
+    pipeline_data = _to_pipeline_data(products, provider_map)
+    if not pipeline_data:
+        return ChunkResult(committed=False, errors=[f"{provider}: geçerli veri yok"])
+
+    async with UnitOfWork() as uow:
+        pipeline = ProductAnalysisPipeline(
+            uow, currency_service, match_index=match_index
+        )
+        # Hatalı item'lar SAVEPOINT ile ayıklanıp dead-letter'a yazılır,
+        # geri kalanlar commit edilir
+        context = await pipeline.execute_chunked(
+            pipeline_data, chunk_size=settings.PIPELINE_CHUNK_SIZE
+        )
+
+        if context.is_valid:
+            try:
+                await uow.commit()
+                return ChunkResult(
+                    committed=True,
+                    errors=context.meta["item_errors"],
+                    meta=context.meta,
+                    failed_items=context.meta["dead_lettered"],
+                )
+            except Exception as e:
+                context.errors.append(f"Commit başarısız: {e}")
+
+        await uow.rollback()
+        # Geri alınan ürünler paylaşılan index'te eşleşme adayı olarak kalmasın
+        if match_index is not None:
+            match_index.discard(context.meta.get("created_product_ids", []))
+        return ChunkResult(committed=False, errors=context.errors, meta=context.meta)
+
+
+def _merge_stats(results: List[ChunkResult]) -> Dict[str, Any]:
+    """Commit edilen chunk'ların sayısal pipeline metriklerini toplar."""
+    stats: Dict[str, Any] = {}
+    for result in results:
+        if not result.committed:
+            continue
+        for key, value in result.meta.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                stats[key] = stats.get(key, 0) + value
+    return stats
+
+
+async def _finalize(
+    product_ids: Set[int],
+    trending: List[TrendingEntry],
+    cache_service: ICacheService,
+) -> Dict[str, int]:
+    """
+    product_ids fiyat gözlemi değişen ürünlerdir; değişmeyen bir çalıştırmada
+    boştur ve hiçbir detay cache'i silinmez, hiçbir ürün indexlenmez.
+    Eşzamanlı chunk'lar aynı ürünün özetini birbirinin commit'ini görmeden
+    hesaplamış olabilir: bu ürünlerin özetleri tüm teklifler commit edildikten
+    sonra bir kez daha hesaplanır. Chunk'ların trending adaylarından seçilen
+    genel top-N aynı transaction'da rank'e göre upsert edilir. Commit sonrası
+    bu ürünlerin detay cache'i silinir, ana sayfa cache'i yeniden doldurulur ve
+    arama index'i güncellenir.
+    """
+    if not product_ids and not trending:
+        return {
+            "price_summaries_reconciled": 0,
+            "trending_updated": 0,
+            "product_details_invalidated": 0,
+            "search_indexed": 0,
+        }
+
+    ids = sorted(product_ids)
+    async with UnitOfWork() as uow:
+        reconciled = await uow.current_offers.refresh_price_summaries(ids)
+        trending_updated = await uow.trending_products.replace_ranking(trending)
+        await uow.commit()
+
+    # Detaylar ilk istekte (tek yüklemeyle) yeniden oluşturulur
+    details_invalidated = 0
+    try:
+        details_invalidated = await invalidate_product_details(cache_service, ids)
+    except Exception as e:
+        logger.warning("Product detail cache could not be invalidated", error=str(e))
+
+    try:
+        await HomepageService(UnitOfWork(), cache_service).refresh()
+    except Exception as e:
+        logger.warning("Homepage cache could not be refreshed", error=str(e))
+
+    return {
+        "price_summaries_reconciled": reconciled,
+        "trending_updated": trending_updated,
+        "product_details_invalidated": details_invalidated,
+        "search_indexed": await index_changed_products(ids) if ids else 0,
+    }
+
+
+async def collect_data(profile: Optional[Profiler] = None) -> Dict[str, Any]:
+    # Yazımlar (homepage:data, exchange_rates) API worker'larının yerel
+    # katmanını pub/sub ile geçersiz kılsın diye iki katmanlı cache kullanılır
+    cache_service = get_tiered_cache()
+    if profile:
+        with capture_profile("collect_data", profiler=profile) as capture:
+            result = await _collect(cache_service)
+        result["profile"] = capture.path
+    else:
+        result = await _collect(cache_service)
+
+    # Adım metrikleri /health/metrics'te görünsün (API ayrı süreçtir)
+    try:
+        await publish_step_metrics(cache_service)
+    except Exception as e:
+        logger.warning("Step metrics could not be published", error=str(e))
+    return result
+
+
+async def _collect(cache_service: ICacheService) -> Dict[str, Any]:
     logger.info("Starting data collection from all providers...")
-    
+
     # Initialize Services
     exchange_provider = ExchangeRateApiProvider()
-    cache_service = get_cache()
     currency_service = CurrencyService(exchange_provider, cache_service)
-    
-    # Fetch data from internal mock service (no HTTP calls)
-    products: List[UnifiedProduct] = await MockProviderService.get_all_products()
-    
-    logger.info("Raw data collected", count=len(products))
 
-    # --- Pipeline Execution ---
+    # Provider id'leri ve eşleştirme index'i çalıştırma başına bir kez yüklenir
     async with UnitOfWork() as uow:
-        # 1. Fetch Provider IDs
         provider_map = await uow.providers.get_all_as_dict()
-        
-        # 2. Prepare Data for Pipeline
-        pipeline_data = []
-        for p in products:
-            # Provider.SPORT_DIRECT.value is "sport_direct"
-            p_slug = p.provider.value
-            # Try direct match or kebab-case match
-            provider_id = provider_map.get(p_slug) or provider_map.get(p_slug.replace("_", "-"))
-            
-            if not provider_id:
-                logger.warning("provider_not_found", slug=p_slug)
-                continue
-                
-            data_dict = p.model_dump()
-            data_dict["provider_id"] = provider_id
-            data_dict["external_product_code"] = p.provider_product_id
-            data_dict["product_url"] = p.url
-            data_dict["stock_quantity"] = p.stock
-            data_dict["in_stock"] = p.stock > 0
-            
-            pipeline_data.append(data_dict)
-
-        if not pipeline_data:
-            logger.warning("No valid data for pipeline")
-            return {"status": "warning", "message": "No valid data to process"}
-
-        # 3. Run Pipeline
-        pipeline = ProductAnalysisPipeline(uow, currency_service)
-        
-        # BasePipeline.execute wraps data in PipelineContext automatically
-        context = await pipeline.execute(pipeline_data)
-        
-        # 4. Commit results
-        if context.result and not context.errors:
-            if not context.errors:
-                await uow.commit()
-                logger.info("Pipeline completed successfully", 
-                            saved=context.meta.get("saved_price_records"), 
-                            errors=context.meta.get("price_save_errors"))
-                return {
-                    "status": "success", 
-                    "products_collected": len(products),
-                    "pipeline_stats": context.meta
-                }
-            else:
-                await uow.rollback()
-                logger.error("Pipeline failed", errors=context.errors)
-                return {"status": "error", "errors": context.errors}
-        else:
-            await uow.rollback()
-            logger.error("Pipeline failed", errors=context.errors)
-            return {"status": "error", "errors": context.errors}
+        match_index = ProductMatchIndex.build(await uow.products.get_match_candidates())
+
+    collector: StreamingCollector[UnifiedProduct] = StreamingCollector(
+        sources={
+            provider.value: partial(
+                MockProviderService.stream_products,
+                provider,
+                settings.COLLECTOR_CHUNK_SIZE,
+            )
+            for provider in PROVIDER_CONFIGS
+        },
+        handler=partial(
+            _process_chunk,
+            provider_map=provider_map,
+            currency_service=currency_service,
+            match_index=match_index,
+        ),
+        workers=settings.COLLECTOR_WORKERS,
+        queue_size=settings.COLLECTOR_QUEUE_SIZE,
+    )
+    metrics = await collector.run()
+
+    committed = [result for result in collector.results if result.committed]
+    changed_ids: Set[int] = {
+        product_id
+        for result in committed
+        for product_id in result.meta.get("search_changed_product_ids", [])
+    }
+    trending = top_trending(
+        (product_id, score)
+        for result in committed
+        for product_id, score in result.meta.get("trending_candidates", [])
+    )
+    stats = _merge_stats(collector.results)
+    stats.update(await _finalize(changed_ids, trending, cache_service))
+
+    providers = {name: m.as_dict() for name, m in metrics.items()}
+    collected = sum(m.items for m in metrics.values())
+    failed_chunks = sum(m.failed_chunks for m in metrics.values())
+    errors = [error for m in metrics.values() for error in m.errors]
+
+    if not collector.results and not errors:
+        logger.warning("No valid data for pipeline")
+        return {"status": "warning", "message": "No valid data to process"}
+
+    if failed_chunks or errors:
+        status = "partial" if committed else "error"
+        logger.error("Pipeline failed", status=status, errors=errors)
+    else:
+        status = "success"
+        logger.info("Pipeline completed successfully",
+                    saved=stats.get("saved_price_records"),
+                    errors=stats.get("price_save_errors"))
+    return {
+        "status": status,
+        "products_collected": collected,
+        "chunks": len(collector.results),
+        "pipeline_stats": stats,
+        "providers": providers,
+        "errors": errors,
+    }
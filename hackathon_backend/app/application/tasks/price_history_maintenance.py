@@ -0,0 +1,55 @@
+import asyncio
+
+import structlog
+
+from app.application.cqrs.queries.product_query import invalidate_product_details
+from app.application.services.price.price_history_retention_service import (
+    PriceHistoryRetentionService,
+)
+from app.core.config.celery import celery_app
+from app.core.config.settings import settings
+from app.core.infrastructure.tiered_cache import get_tiered_cache
+from app.infrastructure.unit_of_work import UnitOfWork
+
+logger = structlog.get_logger()
+
+
+@celery_app.task
+def maintain_price_history_task():
+    """Celery task wrapper for price history partition/rollup maintenance."""
+    loop = asyncio.get_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(maintain_price_history())
+
+
+async def maintain_price_history():
+    async with UnitOfWork() as uow:
+        service = PriceHistoryRetentionService(
+            uow,
+            raw_retention_days=settings.PRICE_HISTORY_RAW_RETENTION_DAYS,
+            hourly_retention_days=settings.PRICE_HISTORY_HOURLY_RETENTION_DAYS,
+            partitions_ahead_days=settings.PRICE_HISTORY_PARTITIONS_AHEAD_DAYS,
+        )
+        try:
+            stats = await service.run()
+            await uow.commit()
+        except Exception as e:
+            await uow.rollback()
+            logger.error("Price history maintenance failed", error=str(e))
+            return {"status": "error", "error": str(e)}
+
+    # Grafiği değişen ürünlerin detayları ilk istekte yeniden oluşturulur
+    product_ids = stats.pop("chart_changed_product_ids")
+    stats["product_details_invalidated"] = 0
+    try:
+        stats["product_details_invalidated"] = await invalidate_product_details(
+            get_tiered_cache(), product_ids
+        )
+    except Exception as e:
+        logger.warning("Product detail cache could not be invalidated", error=str(e))
+
+    logger.info("Price history maintenance completed", **stats)
+    return {"status": "success", **stats}
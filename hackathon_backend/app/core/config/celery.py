@@ -14,11 +14,23 @@ celery_app.conf.update(
     enable_utc=True,
     # Görevleri otomatik bul (app/application/tasks/ klasörüne bakacak)
     # Görevleri otomatik bul (app/application/tasks/ klasörüne bakacak)
-    imports=["app.application.tasks.example_task", "app.application.tasks.data_collector"],
+    imports=[
+        "app.application.tasks.example_task",
+        "app.application.tasks.data_collector",
+        "app.application.tasks.price_history_maintenance",
+    ],
     beat_schedule={
         "collect_data_every_5_minutes": {
             "task": "app.application.tasks.data_collector.collect_data_task",
             "schedule": 30.0,  # 30 saniye
         },
+        # Partition hazırlığı + OHLC rollup + saklama süresi temizliği
+        "maintain_price_history_every_15_minutes": {
+            "task": (
+                "app.application.tasks.price_history_maintenance"
+                ".maintain_price_history_task"
+            ),
+            "schedule": 900.0,  # 15 dakika
+        },
     },
 )
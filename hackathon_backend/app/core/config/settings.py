@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Literal
 
 from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,8 +21,26 @@ class Settings(BaseSettings):
     # DB 1: Broker (Kuyruk)
     # DB 2: Result Backend
     REDIS_URL: str = "redis://localhost:6380/0"
+    # Cache bağlantı havuzu: en fazla bağlantı ve havuz doluyken bekleme süresi
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: int = 5
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
+    # Redis önündeki süreç içi LRU katmanı: en fazla kayıt ve key başına
+    # yerel TTL (sn). Listede olmayan key'ler sadece Redis'ten okunur;
+    # '*' ile biten kalıplar prefix olarak eşleşir.
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024
+    CACHE_LOCAL_TTLS: Dict[str, int] = {
+        "exchange_rates": 60,
+        "homepage:data": 30,
+        "product:detail:*": 30,
+    }
+    # Redis değer formatı: "json" (çerçevesiz, eski sürümlerle uyumlu),
+    # "orjson" veya "msgpack" (çerçeveli). Tüm worker'lar yeni sürüme
+    # geçtikten sonra değiştirilmeli; eski değerler her codec ile okunur.
+    CACHE_CODEC: Literal["json", "orjson", "msgpack"] = "json"
+    # Bu boyuttan (bayt) büyük değerler zstd ile sıkıştırılır; 0 = kapalı
+    CACHE_COMPRESS_MIN_BYTES: int = 0
     # --- JWT Ayarları ---
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # Token geçerlilik süresi (dakika)
@@ -51,7 +69,24 @@ class Settings(BaseSettings):
     COLLECTOR_TIMEOUT_SECONDS: float = 30.0
     COLLECTOR_MAX_RETRIES: int = 3
     COLLECTOR_CACHE_TTL_SECONDS: int = 300  # 5 dakika
+    # Sağlayıcı başına chunk boyutu, eşzamanlı pipeline worker'ı ve
+    # kuyrukta bekleyebilecek en fazla chunk (bellek sınırı)
+    COLLECTOR_CHUNK_SIZE: int = 10
+    COLLECTOR_WORKERS: int = 4
+    COLLECTOR_QUEUE_SIZE: int = 8
+    # Pipeline'ın tek SAVEPOINT'te işlediği item sayısı; hatalı chunk'lar
+    # bölünerek hatalı item'lar dead-letter tablosuna ayıklanır
+    PIPELINE_CHUNK_SIZE: int = 50
+    # collect_data_task(profile="cprofile"|"pyinstrument") raporlarının yazıldığı dizin
+    PIPELINE_PROFILE_DIR: str = "profiles"
     
+    # --- Fiyat Geçmişi Saklama Ayarları ---
+    # Ham price_histories partition'ları bu kadar gün tutulur, sonra
+    # saatlik/günlük OHLC rollup'lara indirgenip silinir
+    PRICE_HISTORY_RAW_RETENTION_DAYS: int = 7
+    PRICE_HISTORY_HOURLY_RETENTION_DAYS: int = 90
+    PRICE_HISTORY_PARTITIONS_AHEAD_DAYS: int = 7
+
     # --- EXCHANGE RATE API ---
     EXCHANGE_RATE_API: str
     # --- Elasticsearch Ayarları ---
@@ -60,6 +95,9 @@ class Settings(BaseSettings):
     ELASTICSEARCH_API_KEY: str = ""
     ELASTICSEARCH_URL: str = ""
     ELASTICSEARCH_INDEX_PREFIX: str = "hackathon"
+    # /products/search arka ucu: "postgres" veya "elasticsearch"
+    # (ES erişilemezse istekler otomatik olarak Postgres'e düşer)
+    PRODUCT_SEARCH_BACKEND: Literal["postgres", "elasticsearch"] = "postgres"
 
     @computed_field  # type: ignore[prop-decorator]
     @property
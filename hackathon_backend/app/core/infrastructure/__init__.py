@@ -1,4 +1,5 @@
 from .cache import CacheService, get_cache
+from .tiered_cache import TieredCacheService, get_tiered_cache
 from .logging import setup_logging, get_logger
 from .exchange_rate_provider import ExchangeRateApiProvider
 from .circuit_breaker import (
@@ -19,6 +20,8 @@ __all__ = [
     # Cache
     "CacheService",
     "get_cache",
+    "TieredCacheService",
+    "get_tiered_cache",
     # Logging
     "setup_logging",
     "get_logger",
@@ -1,47 +1,189 @@
-import json
-from typing import Any, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, Optional, Sequence
 
-from redis.asyncio import from_url
+import structlog
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from app.core.config.settings import settings
-from app.domain.i_services.i_cache_service import ICacheService
+from app.core.infrastructure.cache_codec import CacheCodec
+from app.domain.i_services.i_cache_service import ICachePipeline, ICacheService
+
+logger = structlog.get_logger(__name__)
+
+
+# GET + DEL tek komutta: arada süresi dolup başkasının aldığı kilit silinmez
+_COMPARE_AND_DELETE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _decode_text(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class CachePipeline(ICachePipeline):
+    """Redis pipeline'ı üzerinde codec'li komut kuyruğu."""
+
+    def __init__(
+        self, pipe: Any, decode: Callable[[str, Any], Any], codec: CacheCodec
+    ) -> None:
+        self._pipe = pipe
+        self._decode = decode
+        self._codec = codec
+        self._decoders: List[Callable[[Any], Any]] = []
+        self.results: List[Any] = []
+        self.keys_written: List[str] = []
+
+    def get(self, key: str) -> None:
+        self._pipe.get(key)
+        self._decoders.append(lambda value: self._decode(key, value))
+
+    def set(self, key: str, value: Any, expire: int = 60) -> None:
+        self._pipe.set(key, self._codec.encode(value), ex=expire)
+        self._decoders.append(bool)
+        self.keys_written.append(key)
+
+    def delete(self, key: str) -> None:
+        self._pipe.delete(key)
+        self._decoders.append(int)
+        self.keys_written.append(key)
+
+    def lpush(self, key: str, value: str) -> None:
+        self._pipe.lpush(key, value)
+        self._decoders.append(int)
+
+    def ltrim(self, key: str, start: int, end: int) -> None:
+        self._pipe.ltrim(key, start, end)
+        self._decoders.append(bool)
+
+    async def execute(self) -> List[Any]:
+        if not self._decoders:
+            return []
+        raw = await self._pipe.execute()
+        self.results = [
+            decode(value) for decode, value in zip(self._decoders, raw, strict=True)
+        ]
+        return self.results
 
 
 class CacheService(ICacheService):
-    def __init__(self) -> None:
+    def __init__(self, codec: Optional[CacheCodec] = None) -> None:
+        # Havuz dolduğunda yeni bağlantı açmak yerine timeout kadar beklenir
+        pool = BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+            # Değerler ikili (msgpack/zstd) olabileceği için yanıtlar decode edilmez
+            decode_responses=False,
+        )
         # Redis in Python 3.13+ is not a generic class, use Any typing
-        self.redis: Any = from_url(
-            settings.REDIS_URL, encoding="utf-8", decode_responses=True
+        self.redis: Any = Redis.from_pool(pool)
+        self.codec = codec or CacheCodec(
+            settings.CACHE_CODEC, compress_min_bytes=settings.CACHE_COMPRESS_MIN_BYTES
         )
 
+    def _decode(self, key: str, value: Any) -> Optional[Any]:
+        """Okunamayan değerler (bilinmeyen zarf) miss sayılır."""
+        if not value:
+            return None
+        try:
+            return self.codec.decode(value)
+        except ValueError as e:
+            logger.warning("Cache value could not be decoded", key=key, error=str(e))
+            return None
+
     async def get(self, key: str) -> Optional[Any]:
         """Cache'ten veri çeker."""
-        value = await self.redis.get(key)
-        if value:
-            return json.loads(value)
-        return None
+        return self._decode(key, await self.redis.get(key))
 
     async def set(self, key: str, value: Any, expire: int = 60) -> None:
         """
         Cache'e veri yazar.
         expire: Saniye cinsinden yaşam süresi (TTL). Default 60sn.
         """
-        await self.redis.set(key, json.dumps(value), ex=expire)
+        await self.redis.set(key, self.codec.encode(value), ex=expire)
+
+    async def set_if_absent(self, key: str, value: Any, expire: int = 60) -> bool:
+        """Key yoksa yazar (SET NX EX); yazıldıysa True döner."""
+        return bool(
+            await self.redis.set(key, self.codec.encode(value), ex=expire, nx=True)
+        )
 
     async def delete(self, key: str) -> None:
         """Belirli bir key'i siler."""
         await self.redis.delete(key)
 
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        """Değer karşılaştırması Redis'te Lua ile yapılır (EVAL)."""
+        deleted = await self.redis.eval(
+            _COMPARE_AND_DELETE, 1, key, self.codec.encode(value)
+        )
+        return bool(deleted)
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """MGET: tüm key'ler tek round trip'te okunur."""
+        if not keys:
+            return []
+        values = await self.redis.mget(list(keys))
+        return [
+            self._decode(key, value) for key, value in zip(keys, values, strict=True)
+        ]
+
+    async def mset(self, items: Mapping[str, Any], expire: int = 60) -> None:
+        """
+        MSET TTL desteklemediği için SET EX komutları tek pipeline'da gönderilir
+        (transaction gerekmez; her key bağımsızdır).
+        """
+        if not items:
+            return
+        async with self.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, expire=expire)
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        if not keys:
+            return 0
+        deleted: int = await self.redis.delete(*keys)
+        return deleted
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator[CachePipeline]:
+        """
+        async with cache.pipeline() as pipe:
+            pipe.lpush("users:recent", data)
+            pipe.ltrim("users:recent", 0, 9)
+        Blok hata verirse kuyruktaki komutlar gönderilmez.
+        """
+        async with self.redis.pipeline(transaction=transaction) as redis_pipe:
+            pipe = CachePipeline(redis_pipe, self._decode, self.codec)
+            yield pipe
+            await pipe.execute()
+
+    def pool_stats(self) -> Dict[str, int]:
+        pool = self.redis.connection_pool
+        in_use = len(getattr(pool, "_in_use_connections", ()))
+        available = len(getattr(pool, "_available_connections", ()))
+        return {
+            "max_connections": pool.max_connections,
+            "created": in_use + available,
+            "in_use": in_use,
+            "available": available,
+        }
+
     async def close(self) -> None:
-        """Bağlantıyı kapatır."""
-        await self.redis.close()
+        """Bağlantıyı ve havuzu kapatır."""
+        await self.redis.aclose()
 
     async def lpush(self, key: str, value: str) -> None:
         await self.redis.lpush(key, value)
 
     async def lrange(self, key: str, start: int, end: int) -> List[Any]:
         result: List[Any] = await self.redis.lrange(key, start, end)
-        return result
+        # Liste elemanları codec'ten geçmez (düz metin); str olarak döner
+        return [_decode_text(v) for v in result]
 
     async def ltrim(self, key: str, start: int, end: int) -> None:
         await self.redis.ltrim(key, start, end)
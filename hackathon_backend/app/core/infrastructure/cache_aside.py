@@ -0,0 +1,166 @@
+"""
+Cache-Aside - single-flight yükleme ve stale-while-revalidate.
+
+Süresi dolan sıcak bir key'de (homepage:data, exchange_rates) eşzamanlı tüm
+istekler aynı anda miss olup aynı sorguyu/API çağrısını tekrarlamasın diye:
+
+- Aynı süreçteki eşzamanlı miss'ler tek bir loader çağrısını bekler (future).
+- Worker'lar arasında Redis kilidi (SET NX) ile tek worker yükler; diğerleri
+  değer cache'e yazılana kadar bekler.
+- Değerler ttl kadar taze, sonrasında stale_ttl boyunca bayat sunulur; bayat
+  değer dönerken arka planda tek bir görev yeniler.
+
+Cache'e {"v": değer, "fresh_until": epoch} zarfı yazılır; zarf olmayan eski
+değerler miss sayılır.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+
+from app.domain.i_services.i_cache_service import ICacheService
+
+logger = structlog.get_logger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+# Süreç genelinde paylaşılır: servisler istek başına oluşturulsa da aynı key'in
+# yüklemesi birleşir. Future'lar event loop'a bağlı olduğundan anahtara loop dahildir.
+_inflight: Dict[Tuple[int, str], "asyncio.Task[Any]"] = {}
+_refreshing: Dict[Tuple[int, str], "asyncio.Task[None]"] = {}
+
+
+def _loop_key(key: str) -> Tuple[int, str]:
+    return id(asyncio.get_running_loop()), key
+
+
+class CacheAside:
+    """
+    ICacheService üzerinde cache-aside yardımcısı.
+    Değerler JSON'a çevrilebilir olmalıdır (örn. model_dump(mode="json")).
+    """
+
+    LOCK_PREFIX = "lock:"
+    LOCK_TTL = 30  # Loader bu süreden uzun sürerse kilit kendiliğinden düşer
+    WAIT_TIMEOUT = 10.0  # Kilit sahibini bekleme süresi; sonra kendimiz yükleriz
+    POLL_INTERVAL = 0.05
+
+    def __init__(
+        self, cache: ICacheService, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.cache = cache
+        self._clock = clock
+
+    async def get_or_load(
+        self, key: str, loader: Loader, ttl: int, stale_ttl: int = 0
+    ) -> Any:
+        """
+        Taze değer varsa döner; bayatsa döner ve arka planda yeniler;
+        yoksa tek bir loader çağrısıyla yükleyip yazar.
+        """
+        envelope = await self._read(key)
+        if envelope is not None:
+            if envelope["fresh_until"] <= self._clock():
+                self._schedule_refresh(key, loader, ttl, stale_ttl)
+            return envelope["v"]
+
+        task_key = _loop_key(key)
+        task = _inflight.get(task_key)
+        if task is None:
+            task = asyncio.ensure_future(self._load_locked(key, loader, ttl, stale_ttl))
+            _inflight[task_key] = task
+            task.add_done_callback(lambda _: _inflight.pop(task_key, None))
+        # Bir isteğin iptali diğer bekleyenlerin yüklemesini iptal etmesin
+        return await asyncio.shield(task)
+
+    async def put(self, key: str, value: Any, ttl: int, stale_ttl: int = 0) -> None:
+        """Değeri zarflayıp yazar; Redis'te ttl + stale_ttl boyunca kalır."""
+        envelope = {"v": value, "fresh_until": self._clock() + ttl}
+        await self.cache.set(key, envelope, expire=ttl + stale_ttl)
+
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            envelope = await self.cache.get(key)
+        except Exception as e:
+            logger.warning("Cache read failed", key=key, error=str(e))
+            return None
+        if isinstance(envelope, dict) and "v" in envelope and "fresh_until" in envelope:
+            return envelope
+        return None
+
+    async def _load_locked(
+        self, key: str, loader: Loader, ttl: int, stale_ttl: int
+    ) -> Any:
+        """Kilidi alan worker yükler; alamayan, değer yazılana kadar bekler."""
+        lock_key = f"{self.LOCK_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        if await self._acquire(lock_key, token):
+            try:
+                return await self._load(key, loader, ttl, stale_ttl)
+            finally:
+                await self._release(lock_key, token)
+
+        deadline = time.monotonic() + self.WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            envelope = await self._read(key)
+            if envelope is not None:
+                return envelope["v"]
+
+        logger.warning("Cache lock wait timed out, loading directly", key=key)
+        return await self._load(key, loader, ttl, stale_ttl)
+
+    async def _load(self, key: str, loader: Loader, ttl: int, stale_ttl: int) -> Any:
+        value = await loader()
+        try:
+            await self.put(key, value, ttl, stale_ttl)
+        except Exception as e:
+            logger.warning("Cache write failed", key=key, error=str(e))
+        return value
+
+    def _schedule_refresh(
+        self, key: str, loader: Loader, ttl: int, stale_ttl: int
+    ) -> None:
+        task_key = _loop_key(key)
+        if task_key in _refreshing:
+            return
+        task = asyncio.ensure_future(self._refresh(key, loader, ttl, stale_ttl))
+        _refreshing[task_key] = task
+        task.add_done_callback(lambda _: _refreshing.pop(task_key, None))
+
+    async def _refresh(
+        self, key: str, loader: Loader, ttl: int, stale_ttl: int
+    ) -> None:
+        """Bayat değeri arka planda yeniler; kilidi başka worker tutuyorsa atlar."""
+        lock_key = f"{self.LOCK_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        if not await self._acquire(lock_key, token):
+            return
+        try:
+            await self._load(key, loader, ttl, stale_ttl)
+        except Exception as e:
+            # Bayat değer stale_ttl dolana kadar sunulmaya devam eder
+            logger.warning("Background cache refresh failed", key=key, error=str(e))
+        finally:
+            await self._release(lock_key, token)
+
+    async def _acquire(self, lock_key: str, token: str) -> bool:
+        try:
+            return await self.cache.set_if_absent(lock_key, token, expire=self.LOCK_TTL)
+        except Exception as e:
+            # Redis yoksa koordinasyon da yok; süreç içi birleştirme yine geçerli
+            logger.warning("Cache lock unavailable", key=lock_key, error=str(e))
+            return True
+
+    async def _release(self, lock_key: str, token: str) -> None:
+        """
+        Kilidi sadece hâlâ bizdeyse bırakır (süresi dolup başka bir worker'a
+        geçmiş olabilir); karşılaştırma ve silme atomiktir.
+        """
+        try:
+            await self.cache.delete_if_equals(lock_key, token)
+        except Exception as e:
+            logger.warning("Cache lock release failed", key=lock_key, error=str(e))
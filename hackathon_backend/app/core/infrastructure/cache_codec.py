@@ -0,0 +1,176 @@
+"""
+Cache Codec - CacheService değerlerinin Redis'teki bayt formatı.
+
+Codec'ler:
+- json: stdlib json, çerçevesiz metin. Eski sürümlerin yazdığı ve okuyabildiği
+  format; sıkıştırma kapalıyken varsayılan budur.
+- orjson: aynı JSON formatı, C ile encode/decode. Çerçeveli yazılır.
+- msgpack: ikili format. Çerçeveli yazılır; int map key'leri korunur.
+
+Çerçeve (zarf): MAGIC | VERSION | FORMAT | FLAGS | payload.
+MAGIC 0xC1 ne geçerli bir UTF-8 başlangıcı ne de msgpack tipi olduğundan
+çerçevesiz eski JSON değerlerinden ayırt edilir; bunlar her codec ile okunur.
+FLAGS_ZSTD: payload, compress_min_bytes'tan büyükse zstd ile sıkıştırılır.
+
+orjson/msgpack/zstd opsiyoneldir; kurulu değilse yazarken json'a düşülür,
+okunamayan çerçeveler ValueError verir (CacheService miss sayar).
+"""
+
+import importlib.util
+import json
+from typing import Any, Callable, Literal, Optional, Tuple, Union
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+CodecName = Literal["json", "orjson", "msgpack"]
+
+ENVELOPE_MAGIC = 0xC1
+ENVELOPE_VERSION = 1
+FORMAT_JSON = 1
+FORMAT_MSGPACK = 2
+FLAG_ZSTD = 0x01
+_HEADER_SIZE = 4
+
+Dumps = Callable[[Any], bytes]
+Loads = Callable[[bytes], Any]
+
+
+def _json_format() -> Tuple[Dumps, Loads]:
+    """JSON formatı; orjson varsa onunla, yoksa stdlib json ile."""
+    try:
+        import orjson
+    except ImportError:
+        return (lambda value: json.dumps(value).encode("utf-8")), json.loads
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    return dumps, orjson.loads
+
+
+def _msgpack_format() -> Optional[Tuple[Dumps, Loads]]:
+    try:
+        import msgpack
+    except ImportError:
+        return None
+
+    def dumps(value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+    return dumps, loads
+
+
+def _zstd() -> Optional[Tuple[Callable[[bytes, int], bytes], Callable[[bytes], bytes]]]:
+    """
+    (compress, decompress); Python 3.14 compression.zstd veya zstandard paketi.
+    Bozuk çerçeveler decompress'te ValueError verir.
+    """
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        def decompress(data: bytes) -> bytes:
+            try:
+                return zstd.decompress(data)
+            except zstd.ZstdError as e:
+                raise ValueError(f"zstd çerçevesi açılamadı: {e}") from e
+
+        return (lambda data, level: zstd.compress(data, level=level)), decompress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    def decompress_frame(data: bytes) -> bytes:
+        try:
+            return zstandard.ZstdDecompressor().decompress(data)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"zstd çerçevesi açılamadı: {e}") from e
+
+    return (
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+        decompress_frame,
+    )
+
+
+def zstd_available() -> bool:
+    return _zstd() is not None
+
+
+class CacheCodec:
+    """Değerleri Redis'e yazılacak baytlara çevirir ve geri okur."""
+
+    def __init__(
+        self,
+        codec: CodecName = "json",
+        compress_min_bytes: int = 0,
+        compress_level: int = 3,
+    ) -> None:
+        self._json = _json_format()
+        self._msgpack = _msgpack_format()
+        self._zstd = _zstd()
+
+        if codec == "orjson" and importlib.util.find_spec("orjson") is None:
+            logger.warning(
+                "orjson kurulu değil, JSON çerçevesi stdlib json ile yazılıyor"
+            )
+        if codec == "msgpack" and self._msgpack is None:
+            logger.warning("msgpack kurulu değil, cache codec'i json kullanılıyor")
+            codec = "json"
+        if compress_min_bytes and self._zstd is None:
+            logger.warning("zstd bulunamadı, cache sıkıştırması kapalı")
+            compress_min_bytes = 0
+
+        self.codec: CodecName = codec
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+
+    def encode(self, value: Any) -> Union[bytes, str]:
+        if self.codec == "json" and not self.compress_min_bytes:
+            # Çerçevesiz eski format: önceki sürümler de okuyabilir
+            return json.dumps(value)
+
+        if self.codec == "msgpack":
+            assert self._msgpack is not None
+            fmt, payload = FORMAT_MSGPACK, self._msgpack[0](value)
+        else:
+            fmt, payload = FORMAT_JSON, self._json[0](value)
+
+        flags = 0
+        if self.compress_min_bytes and len(payload) >= self.compress_min_bytes:
+            assert self._zstd is not None
+            payload = self._zstd[0](payload, self.compress_level)
+            flags |= FLAG_ZSTD
+        return bytes((ENVELOPE_MAGIC, ENVELOPE_VERSION, fmt, flags)) + payload
+
+    def decode(self, raw: Union[bytes, str]) -> Any:
+        if isinstance(raw, str):
+            return self._json[1](raw)
+        if not raw or raw[0] != ENVELOPE_MAGIC:
+            return self._json[1](raw)
+        if len(raw) < _HEADER_SIZE:
+            raise ValueError("Cache zarfı eksik")
+
+        version, fmt, flags = raw[1], raw[2], raw[3]
+        if version != ENVELOPE_VERSION:
+            raise ValueError(f"Desteklenmeyen cache zarfı sürümü: {version}")
+
+        payload = raw[_HEADER_SIZE:]
+        if flags & FLAG_ZSTD:
+            if self._zstd is None:
+                raise ValueError("zstd ile sıkıştırılmış değer okunamıyor")
+            payload = self._zstd[1](payload)
+
+        if fmt == FORMAT_JSON:
+            return self._json[1](payload)
+        if fmt == FORMAT_MSGPACK:
+            if self._msgpack is None:
+                raise ValueError("msgpack değer okunamıyor")
+            return self._msgpack[1](payload)
+        raise ValueError(f"Bilinmeyen cache formatı: {fmt}")
@@ -3,7 +3,7 @@
 from typing import Any, Dict, List, Optional
 
 import structlog
-from elasticsearch import AsyncElasticsearch
+from elasticsearch import AsyncElasticsearch, NotFoundError
 from elasticsearch.helpers import async_bulk
 
 from app.core.config.settings import settings
@@ -119,14 +119,18 @@ class ElasticsearchService(ISearchService):
         from_: int = 0,
         size: int = 20,
         sort: Optional[List[Dict[str, Any]]] = None,
+        aggs: Optional[Dict[str, Any]] = None,
+        raise_on_error: bool = False,
     ) -> Dict[str, Any]:
         """Arama yapar."""
         full_index = self._get_index_name(index)
 
         try:
-            body: Dict[str, Any] = {"query": query}
+            body: Dict[str, Any] = {"query": query, "track_total_hits": True}
             if sort:
                 body["sort"] = sort
+            if aggs:
+                body["aggs"] = aggs
 
             response = await self.client.search(
                 index=full_index,
@@ -141,10 +145,13 @@ class ElasticsearchService(ISearchService):
             return {
                 "hits": [hit["_source"] for hit in hits],
                 "total": total,
+                "aggregations": response.get("aggregations", {}),
             }
         except Exception as e:
             logger.error("Search failed", index=index, error=str(e))
-            return {"hits": [], "total": 0}
+            if raise_on_error:
+                raise
+            return {"hits": [], "total": 0, "aggregations": {}}
 
     async def delete_document(self, index: str, doc_id: str) -> bool:
         """Dokümanı siler."""
@@ -216,6 +223,59 @@ class ElasticsearchService(ISearchService):
             logger.error("Refresh index failed", index=index, error=str(e))
             return False
 
+    def _strip_prefix(self, full_index: str) -> str:
+        prefix = settings.ELASTICSEARCH_INDEX_PREFIX
+        if prefix and full_index.startswith(f"{prefix}_"):
+            return full_index[len(prefix) + 1 :]
+        return full_index
+
+    async def list_indices(self, pattern: str) -> List[str]:
+        """Pattern'e uyan index adlarını (prefix'siz) döner."""
+        try:
+            result = await self.client.indices.get(
+                index=self._get_index_name(pattern),
+                allow_no_indices=True,
+                features="settings",
+            )
+            return sorted(self._strip_prefix(name) for name in result.keys())
+        except NotFoundError:
+            return []
+
+    async def get_alias(self, alias: str) -> List[str]:
+        """Alias'ın işaret ettiği index'leri döner."""
+        try:
+            result = await self.client.indices.get_alias(
+                name=self._get_index_name(alias)
+            )
+            return sorted(self._strip_prefix(name) for name in result.keys())
+        except NotFoundError:
+            return []
+
+    async def swap_alias(self, alias: str, index: str) -> bool:
+        """Alias'ı tek _aliases isteğiyle index'e taşır."""
+        full_alias = self._get_index_name(alias)
+        try:
+            current = await self.get_alias(alias)
+            actions: List[Dict[str, Any]] = [
+                {"remove": {"index": self._get_index_name(old), "alias": full_alias}}
+                for old in current
+                if old != index
+            ]
+            if not current and await self.index_exists(alias):
+                # Alias'tan önceki somut index; aynı işlemde kaldırılır
+                actions.append({"remove_index": {"index": full_alias}})
+            actions.append(
+                {"add": {"index": self._get_index_name(index), "alias": full_alias}}
+            )
+            await self.client.indices.update_aliases(actions=actions)
+            logger.info(
+                "Alias swapped", alias=full_alias, index=index, previous=current
+            )
+            return True
+        except Exception as e:
+            logger.error("Alias swap failed", alias=alias, index=index, error=str(e))
+            return False
+
     async def health_check(self) -> bool:
         """Elasticsearch bağlantısını kontrol eder."""
         try:
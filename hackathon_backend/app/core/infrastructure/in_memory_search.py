@@ -0,0 +1,374 @@
+"""In-Memory Search Service Implementation."""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.domain.i_services.i_search_service import ISearchService
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokenize(value: Any) -> List[str]:
+    """ES'deki lowercase + asciifolding analyzer'ının karşılığı."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [t for item in value for t in _tokenize(item)]
+    folded = unicodedata.normalize("NFKD", str(value).casefold().replace("ı", "i"))
+    return _TOKEN.findall("".join(c for c in folded if not unicodedata.combining(c)))
+
+
+def _field(name: str) -> str:
+    """'brand.text' / 'name.keyword' gibi alt alanları kaynak alana indirger."""
+    return name.split(".", 1)[0]
+
+
+def _values(doc: Dict[str, Any], field: str) -> List[Any]:
+    value = doc.get(_field(field))
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class InMemorySearchService(ISearchService):
+    """
+    ISearchService'in bellek içi karşılığı (testler ve ES'siz yerel geliştirme).
+
+    Elasticsearch query DSL'inin ürün aramasında kullanılan alt kümesini
+    destekler: match_all, multi_match (BM25, best_fields), bool
+    (must/filter/should/must_not/minimum_should_match), term, terms, range,
+    exists; terms/range aggregation'ları; alan ve _score sıralaması.
+    """
+
+    # BM25 parametreleri (ES varsayılanları)
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self) -> None:
+        self.indices: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Index başına BM25 istatistikleri; yazmalarda geçersiz kılınır
+        self._stats: Dict[str, Dict[str, Tuple[float, Counter[str]]]] = {}
+        self.aliases: Dict[str, str] = {}
+        self.available = True
+
+    def _check(self) -> None:
+        if not self.available:
+            raise ConnectionError("In-memory search service unavailable")
+
+    def _resolve(self, index: str) -> str:
+        return self.aliases.get(index, index)
+
+    async def index_document(
+        self,
+        index: str,
+        doc_id: str,
+        document: Dict[str, Any],
+    ) -> bool:
+        self._check()
+        index = self._resolve(index)
+        self.indices.setdefault(index, {})[str(doc_id)] = dict(document)
+        self._stats.pop(index, None)
+        return True
+
+    async def bulk_index(
+        self,
+        index: str,
+        documents: List[Dict[str, Any]],
+        id_field: str = "id",
+    ) -> int:
+        self._check()
+        index = self._resolve(index)
+        docs = self.indices.setdefault(index, {})
+        for doc in documents:
+            docs[str(doc.get(id_field))] = dict(doc)
+        self._stats.pop(index, None)
+        return len(documents)
+
+    async def search(
+        self,
+        index: str,
+        query: Dict[str, Any],
+        *,
+        from_: int = 0,
+        size: int = 20,
+        sort: Optional[List[Dict[str, Any]]] = None,
+        aggs: Optional[Dict[str, Any]] = None,
+        raise_on_error: bool = False,
+    ) -> Dict[str, Any]:
+        try:
+            self._check()
+            index = self._resolve(index)
+            docs = list(self.indices.get(index, {}).values())
+            if index not in self._stats:
+                self._stats[index] = self._field_stats(docs)
+            stats = self._stats[index]
+            matched: List[Tuple[float, Dict[str, Any]]] = []
+            for doc in docs:
+                hit = self._evaluate(query, doc, stats)
+                if hit is not None:
+                    matched.append((hit, doc))
+        except Exception:
+            if raise_on_error:
+                raise
+            return {"hits": [], "total": 0, "aggregations": {}}
+
+        for key, direction in reversed(self._sort_keys(sort)):
+            matched.sort(key=key, reverse=direction == "desc")
+
+        return {
+            "hits": [dict(doc) for _, doc in matched[from_ : from_ + size]],
+            "total": len(matched),
+            "aggregations": {
+                name: self._aggregate(spec, [doc for _, doc in matched])
+                for name, spec in (aggs or {}).items()
+            },
+        }
+
+    async def delete_document(self, index: str, doc_id: str) -> bool:
+        self._check()
+        index = self._resolve(index)
+        self._stats.pop(index, None)
+        return self.indices.get(index, {}).pop(str(doc_id), None) is not None
+
+    async def delete_index(self, index: str) -> bool:
+        self._check()
+        self.indices.pop(index, None)
+        self._stats.pop(index, None)
+        self.aliases = {a: i for a, i in self.aliases.items() if i != index}
+        return True
+
+    async def create_index(
+        self,
+        index: str,
+        mappings: Optional[Dict[str, Any]] = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        self._check()
+        self.indices.setdefault(self._resolve(index), {})
+        return True
+
+    async def index_exists(self, index: str) -> bool:
+        return self.available and self._resolve(index) in self.indices
+
+    async def refresh_index(self, index: str) -> bool:
+        self._check()
+        return True
+
+    async def list_indices(self, pattern: str) -> List[str]:
+        self._check()
+        return sorted(name for name in self.indices if fnmatchcase(name, pattern))
+
+    async def get_alias(self, alias: str) -> List[str]:
+        self._check()
+        return [self.aliases[alias]] if alias in self.aliases else []
+
+    async def swap_alias(self, alias: str, index: str) -> bool:
+        self._check()
+        if alias not in self.aliases:
+            self.indices.pop(alias, None)
+            self._stats.pop(alias, None)
+        self.aliases[alias] = index
+        return True
+
+    async def health_check(self) -> bool:
+        return self.available
+
+    # --- Query evaluation ---
+
+    def _field_stats(
+        self, docs: List[Dict[str, Any]]
+    ) -> Dict[str, Tuple[float, Counter[str]]]:
+        """Alan başına (ortalama uzunluk, doküman frekansı) - BM25 için."""
+        stats: Dict[str, Tuple[float, Counter[str]]] = {}
+        fields = {
+            key
+            for doc in docs
+            for key, value in doc.items()
+            if isinstance(value, (str, list))
+        }
+        for field in fields:
+            lengths = []
+            df: Counter[str] = Counter()
+            for doc in docs:
+                tokens = _tokenize(doc.get(field))
+                lengths.append(len(tokens))
+                df.update(set(tokens))
+            stats[field] = (sum(lengths) / len(lengths) if lengths else 0.0, df)
+        stats["__count__"] = (float(len(docs)), Counter())
+        return stats
+
+    def _evaluate(
+        self, query: Dict[str, Any], doc: Dict[str, Any], stats: Dict[str, Any]
+    ) -> Optional[float]:
+        """Eşleşmezse None, eşleşirse skor döner."""
+        (kind, body), = query.items()
+
+        if kind == "match_all":
+            return 1.0
+        if kind == "multi_match":
+            return self._multi_match(body, doc, stats)
+        if kind == "bool":
+            return self._bool(body, doc, stats)
+        if kind == "term":
+            (field, expected), = body.items()
+            if isinstance(expected, dict):
+                expected = expected["value"]
+            return 0.0 if expected in _values(doc, field) else None
+        if kind == "terms":
+            (field, options), = body.items()
+            return 0.0 if set(options) & set(_values(doc, field)) else None
+        if kind == "range":
+            (field, bounds), = body.items()
+            in_range = any(self._in_range(v, bounds) for v in _values(doc, field))
+            return 0.0 if in_range else None
+        if kind == "exists":
+            return 0.0 if _values(doc, body["field"]) else None
+        raise ValueError(f"Unsupported query: {kind}")
+
+    def _bool(
+        self, body: Dict[str, Any], doc: Dict[str, Any], stats: Dict[str, Any]
+    ) -> Optional[float]:
+        score = 0.0
+        for clause in self._clauses(body.get("must")):
+            result = self._evaluate(clause, doc, stats)
+            if result is None:
+                return None
+            score += result
+        for clause in self._clauses(body.get("filter")):
+            if self._evaluate(clause, doc, stats) is None:
+                return None
+        for clause in self._clauses(body.get("must_not")):
+            if self._evaluate(clause, doc, stats) is not None:
+                return None
+
+        should = self._clauses(body.get("should"))
+        if should:
+            results = [self._evaluate(clause, doc, stats) for clause in should]
+            matches = [r for r in results if r is not None]
+            has_required = body.get("must") or body.get("filter")
+            minimum = int(body.get("minimum_should_match", 0 if has_required else 1))
+            if len(matches) < minimum:
+                return None
+            score += sum(matches)
+        return score
+
+    def _multi_match(
+        self, body: Dict[str, Any], doc: Dict[str, Any], stats: Dict[str, Any]
+    ) -> Optional[float]:
+        terms = _tokenize(body["query"])
+        if not terms:
+            return None
+        require_all = body.get("operator", "or") == "and"
+        total_docs = stats["__count__"][0]
+        best: Optional[float] = None
+        for spec in body["fields"]:
+            name, _, boost = spec.partition("^")
+            field = _field(name)
+            tokens = _tokenize(doc.get(field))
+            counts = Counter(tokens)
+            present = [t for t in terms if counts[t]]
+            if not present or (require_all and len(present) < len(set(terms))):
+                continue
+            avgdl, df = stats.get(field, (0.0, Counter()))
+            score = 0.0
+            for term in present:
+                idf = math.log(1 + (total_docs - df[term] + 0.5) / (df[term] + 0.5))
+                tf = counts[term]
+                norm = tf + self.K1 * (1 - self.B + self.B * len(tokens) / (avgdl or 1))
+                score += idf * tf * (self.K1 + 1) / norm
+            score *= float(boost or 1)
+            best = score if best is None else max(best, score)
+        return best
+
+    @staticmethod
+    def _clauses(value: Any) -> List[Dict[str, Any]]:
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    @staticmethod
+    def _in_range(value: Any, bounds: Dict[str, Any]) -> bool:
+        if value is None:
+            return False
+        checks: Dict[str, Callable[[Any, Any], bool]] = {
+            "gte": lambda v, b: v >= b,
+            "gt": lambda v, b: v > b,
+            "lte": lambda v, b: v <= b,
+            "lt": lambda v, b: v < b,
+        }
+        return all(
+            checks[op](value, bound) for op, bound in bounds.items() if op in checks
+        )
+
+    # --- Sorting & aggregations ---
+
+    @staticmethod
+    def _sort_keys(
+        sort: Optional[List[Dict[str, Any]]],
+    ) -> List[Tuple[Callable[[Tuple[float, Dict[str, Any]]], Any], str]]:
+        keys = []
+        for item in sort or [{"_score": "desc"}]:
+            (field, spec), = item.items()
+            direction = spec["order"] if isinstance(spec, dict) else spec
+            if field == "_score":
+                keys.append((lambda hit: hit[0], direction))
+            else:
+                # Eksik değerler her iki yönde de sona (ES varsayılanı)
+                def key(
+                    hit: Tuple[float, Dict[str, Any]],
+                    field: str = field,
+                    direction: str = direction,
+                ) -> Any:
+                    values = _values(hit[1], field)
+                    missing = not values
+                    return (
+                        missing != (direction == "desc"),
+                        values[0] if values else 0,
+                    )
+
+                keys.append((key, direction))
+        return keys
+
+    @staticmethod
+    def _aggregate(
+        spec: Dict[str, Any], docs: Iterable[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        (kind, body), = spec.items()
+        field = body["field"]
+        if kind == "terms":
+            counts: Counter[Any] = Counter()
+            for doc in docs:
+                counts.update(set(_values(doc, field)))
+            ordered = sorted(counts.items(), key=lambda kv: (-kv[1], str(kv[0])))
+            return {
+                "buckets": [
+                    {"key": key, "doc_count": count}
+                    for key, count in ordered[: body.get("size", 10)]
+                ]
+            }
+        if kind == "range":
+            docs = list(docs)
+            buckets = []
+            for r in body["ranges"]:
+                bounds = {}
+                if "from" in r:
+                    bounds["gte"] = r["from"]
+                if "to" in r:
+                    bounds["lt"] = r["to"]
+                count = sum(
+                    1
+                    for doc in docs
+                    if any(
+                        InMemorySearchService._in_range(v, bounds)
+                        for v in _values(doc, field)
+                    )
+                )
+                bucket: Dict[str, Any] = {"key": r.get("key"), "doc_count": count}
+                bucket.update({k: r[k] for k in ("from", "to") if k in r})
+                buckets.append(bucket)
+            return {"buckets": buckets}
+        raise ValueError(f"Unsupported aggregation: {kind}")
@@ -0,0 +1,93 @@
+"""
+Tek bir çalıştırma için profil yakalama (cProfile veya pyinstrument).
+
+Kullanım:
+    with capture_profile("collect_data", profiler="pyinstrument") as capture:
+        await collect()
+    capture.path  # yazılan rapor
+
+Profil süresince tracemalloc da açılır; pipeline adım ölçümleri bu sırada
+tepe belleği de raporlar. pyinstrument kurulu değilse cProfile kullanılır.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Literal, Optional
+
+import structlog
+
+from app.core.config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+Profiler = Literal["cprofile", "pyinstrument"]
+
+
+@dataclass
+class ProfileCapture:
+    profiler: Profiler
+    path: Optional[str] = None
+
+
+@contextmanager
+def capture_profile(
+    name: str, profiler: Profiler = "cprofile", output_dir: Optional[str] = None
+) -> Iterator[ProfileCapture]:
+    """
+    Blok süresince profil toplar ve raporu output_dir'e yazar
+    (varsayılan PIPELINE_PROFILE_DIR): cProfile için .prof (snakeviz/pstats),
+    pyinstrument için .html.
+    """
+    directory = Path(output_dir or settings.PIPELINE_PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = directory / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}"
+
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler as PyinstrumentProfiler
+        except ImportError:
+            logger.warning("pyinstrument kurulu değil, cProfile kullanılıyor")
+            profiler = "cprofile"
+
+    capture = ProfileCapture(profiler=profiler)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        if profiler == "pyinstrument":
+            sampler = PyinstrumentProfiler(async_mode="enabled")
+            sampler.start()
+            try:
+                yield capture
+            finally:
+                sampler.stop()
+                capture.path = f"{stem}.html"
+                Path(capture.path).write_text(sampler.output_html(), encoding="utf-8")
+        else:
+            tracer = cProfile.Profile()
+            tracer.enable()
+            try:
+                yield capture
+            finally:
+                tracer.disable()
+                capture.path = f"{stem}.prof"
+                tracer.dump_stats(capture.path)
+                summary = io.StringIO()
+                pstats.Stats(tracer, stream=summary).sort_stats(
+                    "cumulative"
+                ).print_stats(15)
+                logger.info(
+                    "Profile top functions", name=name, stats=summary.getvalue()
+                )
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        logger.info(
+            "Profile captured", name=name, profiler=capture.profiler, path=capture.path
+        )
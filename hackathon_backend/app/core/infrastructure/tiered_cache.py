@@ -0,0 +1,337 @@
+"""
+Tiered Cache - Redis önünde süreç içi LRU/TTL katmanı.
+
+Sık okunan key'ler (exchange_rates, homepage:data) her istekte Redis'e gidip
+json.loads edilmesin diye worker belleğinde tutulur. Yerel katman sadece
+settings.CACHE_LOCAL_TTLS'te tanımlı key'ler için kullanılır; diğer key'ler
+doğrudan Redis'ten okunur.
+
+Tutarlılık: set/delete işlemleri Redis'e yazıldıktan sonra CACHE_INVALIDATION_CHANNEL
+kanalına yayınlanır; start() ile dinleyici başlatılan worker'lar ilgili key'i
+yerel katmandan siler. Dinleyicisi olmayan süreçlerde (Celery) bayatlık en fazla
+key'in yerel TTL'i kadardır.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import structlog
+
+from app.core.config.settings import settings
+from app.core.infrastructure.cache import CacheService, cache
+from app.domain.i_services.i_cache_service import ICachePipeline, ICacheService
+
+logger = structlog.get_logger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+_RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+
+@dataclass
+class CacheTierStats:
+    """Bir cache katmanının sayaçları."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LocalCache:
+    """
+    Boyut sınırlı, key başına TTL'li LRU.
+    Değerler kopyalanmadan döner; çağıranlar değiştirmemelidir.
+    """
+
+    def __init__(
+        self, max_entries: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(bulundu mu, değer) döner; süresi dolan kayıt silinir."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TieredCacheService(ICacheService):
+    """
+    İki katmanlı cache: süreç içi LRU -> Redis (CacheService).
+    Liste işlemleri (lpush/lrange/ltrim) doğrudan Redis'e gider.
+    """
+
+    def __init__(
+        self,
+        remote: CacheService,
+        local_ttls: Optional[Dict[str, int]] = None,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.remote = remote
+        self.local = LocalCache(max_entries, clock)
+        # "product:*" gibi '*' ile biten kalıplar prefix olarak eşleşir
+        self.local_ttls = dict(local_ttls or {})
+        self.local_stats = CacheTierStats()
+        self.redis_stats = CacheTierStats()
+        self.invalidations = 0
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    def local_ttl(self, key: str) -> Optional[int]:
+        """Key'in yerel katman TTL'i; yerelde tutulmayacaksa None."""
+        if key in self.local_ttls:
+            return self.local_ttls[key]
+        matches = [
+            (len(pattern), ttl)
+            for pattern, ttl in self.local_ttls.items()
+            if pattern.endswith("*") and key.startswith(pattern[:-1])
+        ]
+        return max(matches)[1] if matches else None
+
+    async def get(self, key: str) -> Optional[Any]:
+        ttl = self.local_ttl(key)
+        if ttl is not None:
+            found, value = self.local.get(key)
+            if found:
+                self.local_stats.hits += 1
+                return value
+            self.local_stats.misses += 1
+
+        value = await self.remote.get(key)
+        if value is None:
+            self.redis_stats.misses += 1
+            return None
+        self.redis_stats.hits += 1
+        if ttl is not None:
+            self.local.set(key, value, ttl)
+        return value
+
+    async def set(self, key: str, value: Any, expire: int = 60) -> None:
+        await self.remote.set(key, value, expire=expire)
+        ttl = self.local_ttl(key)
+        if ttl is not None:
+            self.local.set(key, value, min(ttl, expire))
+        await self._publish_invalidation([key])
+
+    async def set_if_absent(self, key: str, value: Any, expire: int = 60) -> bool:
+        # Kilit gibi koordinasyon key'leri yerel katmana alınmaz
+        return await self.remote.set_if_absent(key, value, expire=expire)
+
+    async def delete(self, key: str) -> None:
+        await self.remote.delete(key)
+        self.local.discard(key)
+        await self._publish_invalidation([key])
+
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        # set_if_absent gibi sadece Redis'te tutulan koordinasyon key'leri için
+        return await self.remote.delete_if_equals(key, value)
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Yerel katmanda olmayan key'ler tek MGET ile Redis'ten okunur."""
+        values: List[Optional[Any]] = [None] * len(keys)
+        remote_indexes: List[int] = []
+        for index, key in enumerate(keys):
+            if self.local_ttl(key) is not None:
+                found, value = self.local.get(key)
+                if found:
+                    self.local_stats.hits += 1
+                    values[index] = value
+                    continue
+                self.local_stats.misses += 1
+            remote_indexes.append(index)
+
+        if remote_indexes:
+            fetched = await self.remote.mget([keys[i] for i in remote_indexes])
+            for index, value in zip(remote_indexes, fetched, strict=True):
+                if value is None:
+                    self.redis_stats.misses += 1
+                    continue
+                self.redis_stats.hits += 1
+                values[index] = value
+                ttl = self.local_ttl(keys[index])
+                if ttl is not None:
+                    self.local.set(keys[index], value, ttl)
+        return values
+
+    async def mset(self, items: Mapping[str, Any], expire: int = 60) -> None:
+        await self.remote.mset(items, expire=expire)
+        for key, value in items.items():
+            ttl = self.local_ttl(key)
+            if ttl is not None:
+                self.local.set(key, value, min(ttl, expire))
+        await self._publish_invalidation(list(items))
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        deleted = await self.remote.delete_many(keys)
+        for key in keys:
+            self.local.discard(key)
+        await self._publish_invalidation(keys)
+        return deleted
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator[ICachePipeline]:
+        """Redis pipeline'ı; yazılan key'ler çalıştırıldıktan sonra geçersiz kılınır."""
+        async with self.remote.pipeline(transaction=transaction) as pipe:
+            yield pipe
+        for key in pipe.keys_written:
+            self.local.discard(key)
+        await self._publish_invalidation(pipe.keys_written)
+
+    def pool_stats(self) -> Dict[str, int]:
+        return self.remote.pool_stats()
+
+    async def close(self) -> None:
+        await self.stop()
+        await self.remote.close()
+
+    async def lpush(self, key: str, value: str) -> None:
+        await self.remote.lpush(key, value)
+
+    async def lrange(self, key: str, start: int, end: int) -> List[Any]:
+        return await self.remote.lrange(key, start, end)
+
+    async def ltrim(self, key: str, start: int, end: int) -> None:
+        await self.remote.ltrim(key, start, end)
+
+    def stats(self) -> Dict[str, Any]:
+        """Katman bazlı hit/miss sayaçları (/health/cache)."""
+        return {
+            "local": {
+                **asdict(self.local_stats),
+                "hit_rate": round(self.local_stats.hit_rate, 4),
+                "entries": len(self.local),
+                "max_entries": self.local.max_entries,
+                "evictions": self.local.evictions,
+                "invalidations": self.invalidations,
+                "listening": self._listener is not None and not self._listener.done(),
+            },
+            "redis": {
+                **asdict(self.redis_stats),
+                "hit_rate": round(self.redis_stats.hit_rate, 4),
+            },
+        }
+
+    # --- Pub/Sub invalidation ---
+
+    async def start(self) -> None:
+        """Invalidation dinleyicisini başlatır (API lifespan)."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _publish_invalidation(self, keys: Sequence[str]) -> None:
+        """Yerelde tutulabilen key'ler için tek bir mesaj yayınlar."""
+        local_keys = [key for key in keys if self.local_ttl(key) is not None]
+        if not local_keys:
+            return
+        try:
+            message = json.dumps({"keys": local_keys, "origin": self._origin})
+            await self.remote.redis.publish(CACHE_INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            # Yayın kaybolursa diğer worker'lar en fazla yerel TTL kadar bayat okur
+            logger.warning(
+                "Cache invalidation could not be published",
+                keys=local_keys,
+                error=str(e),
+            )
+
+    def handle_invalidation(self, data: str) -> None:
+        """Kanal mesajını işler; kendi yayınlarımız yoksayılır."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self._origin:
+            return
+        for key in message.get("keys", []):
+            self.local.discard(key)
+            self.invalidations += 1
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.remote.redis.pubsub()
+            try:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                # Abonelik yokken kaçırılmış mesajlar olabilir
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Cache invalidation listener failed", error=str(e))
+                self.local.clear()
+                await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+# Singleton instance
+tiered_cache = TieredCacheService(
+    cache,
+    local_ttls=settings.CACHE_LOCAL_TTLS,
+    max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+)
+
+
+def get_tiered_cache() -> TieredCacheService:
+    """İki katmanlı cache singleton instance döndürür."""
+    return tiered_cache
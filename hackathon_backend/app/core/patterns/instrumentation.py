@@ -0,0 +1,242 @@
+"""
+Pipeline adım enstrümantasyonu.
+
+PipelineRunner her BaseStep.process çağrısını kayıtlı StepInstrument'larla
+sarar ve tek bir StepSample üretir: duvar saati, CPU süresi, DB sorgu sayısı,
+giren/çıkan satır ve (tracemalloc açıksa) tepe bellek. Örnekler structlog'a
+"Pipeline step" olayı olarak yazılır ve süreç içi step_metrics kaydında
+toplanır; /health/metrics bu kaydı Prometheus formatında sunar.
+"""
+
+import threading
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sized, Tuple
+
+if TYPE_CHECKING:
+    from app.core.patterns.pipeline import PipelineContext
+
+
+@dataclass
+class StepSample:
+    """Tek bir adım çalıştırmasının ölçümleri."""
+
+    pipeline: str
+    step: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    db_statements: int = 0
+    rows_in: int = 0
+    rows_out: int = 0
+    peak_memory_bytes: Optional[int] = None
+    failed: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["wall_seconds"] = round(self.wall_seconds, 6)
+        data["cpu_seconds"] = round(self.cpu_seconds, 6)
+        return data
+
+
+class StepInstrument(ABC):
+    """
+    Adım çevresinde ölçüm yapan eklenti.
+    start adım başlamadan çağrılır, döndürdüğü durum stop'a geri verilir.
+    """
+
+    @abstractmethod
+    def start(self, context: "PipelineContext") -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stop(self, state: Any, context: "PipelineContext", sample: StepSample) -> None:
+        raise NotImplementedError
+
+
+class TimingInstrument(StepInstrument):
+    """
+    Duvar saati ve CPU süresi.
+    CPU süresi thread bazlıdır: aynı event loop'ta eşzamanlı çalışan diğer
+    coroutine'lerin CPU'su da adımın await noktalarında araya girebilir.
+    """
+
+    def start(self, context: "PipelineContext") -> Tuple[float, float]:
+        return time.perf_counter(), time.thread_time()
+
+    def stop(
+        self, state: Tuple[float, float], context: "PipelineContext", sample: StepSample
+    ) -> None:
+        wall_started, cpu_started = state
+        sample.wall_seconds = time.perf_counter() - wall_started
+        sample.cpu_seconds = time.thread_time() - cpu_started
+
+
+def _count(value: Any) -> int:
+    return (
+        len(value)
+        if isinstance(value, Sized) and not isinstance(value, (str, bytes))
+        else 0
+    )
+
+
+class RowCountInstrument(StepInstrument):
+    """Adıma giren ve sonraki adıma aktarılan (context.data) item sayısı."""
+
+    def start(self, context: "PipelineContext") -> int:
+        return _count(context.data)
+
+    def stop(self, state: int, context: "PipelineContext", sample: StepSample) -> None:
+        sample.rows_in = state
+        sample.rows_out = _count(context.data)
+
+
+# Çalışan adımın sorgu sayacı; ContextVar olduğu için eşzamanlı
+# task'lardaki (ör. collector worker'ları) adımlar birbirini saymaz
+_db_statements: ContextVar[Optional[List[int]]] = ContextVar(
+    "db_statements", default=None
+)
+
+
+def record_db_statement() -> None:
+    """Veritabanı motoru her sorguda çağırır (bkz. persistence.db.session)."""
+    counter = _db_statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class DbStatementInstrument(StepInstrument):
+    def start(self, context: "PipelineContext") -> Any:
+        return _db_statements.set([0])
+
+    def stop(self, state: Any, context: "PipelineContext", sample: StepSample) -> None:
+        counter = _db_statements.get()
+        sample.db_statements = counter[0] if counter else 0
+        _db_statements.reset(state)
+
+
+class MemoryInstrument(StepInstrument):
+    """
+    Adım süresince tracemalloc tepe değeri (bayt).
+    Sadece tracemalloc açıkken ölçer (profil modu veya PYTHONTRACEMALLOC);
+    tepe değer süreç genelidir, eşzamanlı adımlarda yaklaşık değerdir.
+    """
+
+    def start(self, context: "PipelineContext") -> bool:
+        if not tracemalloc.is_tracing():
+            return False
+        tracemalloc.reset_peak()
+        return True
+
+    def stop(self, state: bool, context: "PipelineContext", sample: StepSample) -> None:
+        if state and tracemalloc.is_tracing():
+            sample.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+
+
+def default_instruments() -> List[StepInstrument]:
+    return [
+        TimingInstrument(),
+        RowCountInstrument(),
+        DbStatementInstrument(),
+        MemoryInstrument(),
+    ]
+
+
+# Metrik adı -> açıklama (Prometheus'ta pipeline_step_ öneki alır)
+_COUNTERS = {
+    "runs": "Adım çalıştırma sayısı",
+    "failures": "Hata ile biten adım çalıştırma sayısı",
+    "wall_seconds": "Adımlarda geçen toplam duvar saati süresi",
+    "cpu_seconds": "Adımlarda harcanan toplam CPU süresi",
+    "db_statements": "Adımların çalıştırdığı toplam SQL sorgusu",
+    "rows_in": "Adımlara giren toplam item",
+    "rows_out": "Adımlardan çıkan toplam item",
+}
+_GAUGES = {
+    "wall_seconds_max": "En uzun tek adım çalıştırması (saniye)",
+    "peak_memory_bytes": "Ölçülen en yüksek tracemalloc tepe belleği (bayt)",
+}
+
+
+class StepMetricsRegistry:
+    """(pipeline, adım) bazında toplanan süreç içi metrikler; thread-safe."""
+
+    def __init__(self) -> None:
+        self._series: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, sample: StepSample) -> None:
+        with self._lock:
+            series = self._series.setdefault(
+                (sample.pipeline, sample.step),
+                {name: 0 for name in (*_COUNTERS, *_GAUGES)},
+            )
+            series["runs"] += 1
+            series["failures"] += int(sample.failed)
+            series["wall_seconds"] += sample.wall_seconds
+            series["cpu_seconds"] += sample.cpu_seconds
+            series["db_statements"] += sample.db_statements
+            series["rows_in"] += sample.rows_in
+            series["rows_out"] += sample.rows_out
+            series["wall_seconds_max"] = max(
+                series["wall_seconds_max"], sample.wall_seconds
+            )
+            if sample.peak_memory_bytes is not None:
+                series["peak_memory_bytes"] = max(
+                    series["peak_memory_bytes"], sample.peak_memory_bytes
+                )
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """JSON'a çevrilebilir kopya (cache'e yayınlamak için)."""
+        with self._lock:
+            return [
+                {"pipeline": pipeline, "step": step, **values}
+                for (pipeline, step), values in sorted(self._series.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(round(value, 6))
+
+
+def render_prometheus(snapshots: Dict[str, Iterable[Dict[str, Any]]]) -> str:
+    """
+    Snapshot'ları Prometheus text formatına çevirir.
+    snapshots: kaynak (süreç) adı -> StepMetricsRegistry.snapshot()
+    """
+    rows = [
+        (source, series)
+        for source, items in sorted(snapshots.items())
+        for series in items
+    ]
+    lines: List[str] = []
+    for kind, metrics in (("counter", _COUNTERS), ("gauge", _GAUGES)):
+        for name, help_text in metrics.items():
+            metric = f"pipeline_step_{name}" + ("_total" if kind == "counter" else "")
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for source, series in rows:
+                labels = ",".join(
+                    f'{label}="{_escape(str(value))}"'
+                    for label, value in (
+                        ("source", source),
+                        ("pipeline", series["pipeline"]),
+                        ("step", series["step"]),
+                    )
+                )
+                lines.append(f"{metric}{{{labels}}} {_format(series.get(name, 0))}")
+    return "\n".join(lines) + "\n"
+
+
+# Süreç içi kayıt (API ve Celery worker'ı ayrı süreçlerdir)
+step_metrics = StepMetricsRegistry()
@@ -0,0 +1,253 @@
+"""
+OfferBatch - Pipeline verisi için sütunlu (columnar) batch.
+
+Her alan tek bir listede tutulur (columns[alan][satır]). Adımlar satırları
+kopyalayıp güncellemek yerine sütun ekler veya değiştirir:
+
+    batch = OfferBatch.coerce(context.data)
+    batch.set_column("mapping_id", mapping_ids)
+
+Dict bekleyen adımlar için her satır bir OfferRow görünümüdür
+(MutableMapping): product.get("price"), item["product_id"] = 5 gibi
+kullanımlar veriyi kopyalamadan doğrudan sütunlara yazar.
+
+Bir satırda hiç atanmamış alanlar MISSING ile işaretlenir; görünüm bu
+alanları dict'teki gibi "yok" sayar ("x" in row -> False).
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+    overload,
+)
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __reduce__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+
+class OfferBatch:
+    """
+    Sütunlu satır kümesi.
+    Sütun listeleri fork'lar arasında paylaşılır; bir sütuna satır bazında
+    ilk yazışta kopyalanır (copy-on-write), set_column ise listeyi değiştirir.
+    """
+
+    __slots__ = ("_columns", "_length", "_owned")
+
+    def __init__(
+        self, columns: Optional[Dict[str, List[Any]]] = None, length: int = 0
+    ) -> None:
+        self._columns: Dict[str, List[Any]] = columns or {}
+        self._length = length
+        # Bu batch'in satır bazında değiştirebileceği (paylaşılmayan) sütunlar
+        self._owned: Set[str] = set(self._columns)
+        for name, values in self._columns.items():
+            if len(values) != length:
+                raise ValueError(
+                    f"'{name}' sütunu {len(values)} satır, batch {length} satır"
+                )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> "OfferBatch":
+        """Dict listesini tek geçişte sütunlara çevirir."""
+        columns: Dict[str, List[Any]] = {}
+        length = 0
+        for index, record in enumerate(records):
+            for key, value in record.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [MISSING] * index
+                column.append(value)
+            length = index + 1
+            for column in columns.values():
+                if len(column) < length:
+                    column.append(MISSING)
+        return cls(columns, length)
+
+    @classmethod
+    def coerce(
+        cls, data: Union["OfferBatch", Iterable[Mapping[str, Any]], None]
+    ) -> "OfferBatch":
+        """OfferBatch ise aynen, dict listesi ise sütunlara çevrilmiş olarak döner."""
+        if isinstance(data, OfferBatch):
+            return data
+        return cls.from_records(data or [])
+
+    # --- Sütun erişimi ---
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def has_column(self, name: str) -> bool:
+        return name in self._columns
+
+    def column(self, name: str) -> List[Any]:
+        """Ham sütun (MISSING içerebilir); salt okunur kullanılmalıdır."""
+        return self._columns.get(name) or [MISSING] * self._length
+
+    def values(self, name: str, default: Any = None) -> List[Any]:
+        """Sütun değerleri; olmayan alanlar default ile (row.get gibi)."""
+        column = self._columns.get(name)
+        if column is None:
+            return [default] * self._length
+        return [default if value is MISSING else value for value in column]
+
+    def set_column(self, name: str, values: List[Any]) -> None:
+        """Sütunu yerinde ekler/değiştirir (liste sahiplenilir, kopyalanmaz)."""
+        if len(values) != self._length:
+            raise ValueError(
+                f"'{name}' sütunu {len(values)} satır, batch {self._length} satır"
+            )
+        self._columns[name] = values
+        self._owned.add(name)
+
+    def _writable(self, name: str) -> List[Any]:
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = [MISSING] * self._length
+        elif name not in self._owned:
+            column = self._columns[name] = list(column)
+        self._owned.add(name)
+        return column
+
+    # --- Satır işlemleri ---
+
+    def take(self, indices: Sequence[int]) -> "OfferBatch":
+        """Verilen satırlardan yeni bir batch (filtreleme/sıralama)."""
+        if len(indices) == self._length and all(i == n for n, i in enumerate(indices)):
+            return self
+        return OfferBatch(
+            {
+                name: [values[i] for i in indices]
+                for name, values in self._columns.items()
+            },
+            len(indices),
+        )
+
+    def fork(self) -> "OfferBatch":
+        """Sütunları paylaşan kopya; yazılan sütunlar fork'a özel olur."""
+        forked = OfferBatch(length=self._length)
+        forked._columns = dict(self._columns)
+        forked._owned = set()
+        return forked
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        if not self._columns:
+            return [{} for _ in range(self._length)]
+        names = list(self._columns)
+        return [
+            {
+                name: value
+                for name, value in zip(names, row, strict=True)
+                if value is not MISSING
+            }
+            for row in zip(*self._columns.values(), strict=True)
+        ]
+
+    # --- Sequence davranışı (dict listesi bekleyen kod için) ---
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator["OfferRow"]:
+        return (OfferRow(self, index) for index in range(self._length))
+
+    @overload
+    def __getitem__(self, index: int) -> "OfferRow": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "OfferBatch": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["OfferRow", "OfferBatch"]:
+        if isinstance(index, slice):
+            return self.take(range(self._length)[index])
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("OfferBatch index out of range")
+        return OfferRow(self, index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (OfferBatch, list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other, strict=True)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"OfferBatch(rows={self._length}, columns={self.column_names})"
+
+
+class OfferRow(MutableMapping[str, Any]):
+    """OfferBatch'teki tek satırın dict görünümü; yazılar sütunlara gider."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: OfferBatch, index: int) -> None:
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        column = self._batch._columns.get(key)
+        if column is None or column[self._index] is MISSING:
+            raise KeyError(key)
+        return column[self._index]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        column = self._batch._columns.get(key)
+        if column is None:
+            return default
+        value = column[self._index]
+        return default if value is MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        column = self._batch._columns.get(key)  # type: ignore[call-overload]
+        return column is not None and column[self._index] is not MISSING
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._batch._writable(key)[self._index] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._batch._writable(key)[self._index] = MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        index = self._index
+        return (
+            name
+            for name, column in self._batch._columns.items()
+            if column[index] is not MISSING
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict[str, Any]:
+        """dict.copy uyumluluğu: bağımsız bir dict döner."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"OfferRow({self.copy()!r})"
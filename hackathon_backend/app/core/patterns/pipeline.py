@@ -1,8 +1,20 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set
 
+import structlog
+
+from app.core.patterns.instrumentation import (
+    StepInstrument,
+    StepSample,
+    default_instruments,
+    step_metrics,
+)
+from app.core.patterns.offer_batch import OfferBatch
 from app.domain.schemas.auth import UserContext
 
+logger = structlog.get_logger(__name__)
+
 
 class PipelineContext:
     def __init__(self, initial_data: Any = None, user: Optional[UserContext] = None):
@@ -19,20 +31,187 @@ class PipelineContext:
 
 # Her adımın uyması gereken şablon
 class BaseStep(ABC):
+    # DAG zamanlaması için adımın okuduğu / yazdığı item alanları ve kaynaklar
+    # (item alanı olmayan kaynaklar "db.<tablo>" gibi adlandırılır).
+    # None ise adım bariyerdir: önceki tüm adımlar bitince tek başına çalışır.
+    # Bildirim yapan adımlar item sayısını ve sırasını değiştiremez.
+    reads: Optional[FrozenSet[str]] = None
+    writes: Optional[FrozenSet[str]] = None
+    # Ana UnitOfWork session'ını kullanan adımlar birbirleriyle eşzamanlı çalışmaz
+    uses_session: bool = True
+
+    @property
+    def is_barrier(self) -> bool:
+        return self.reads is None or self.writes is None
+
     @abstractmethod
     async def process(self, context: PipelineContext) -> None:
         """Her adım context üzerinde işlem yapar."""
         pass
 
+    async def on_rollback(self, context: PipelineContext) -> None:
+        """
+        Adımın yazdıkları geri alındığında çağrılır (ör. chunk SAVEPOINT'i).
+        Bellekte tutulan durumu (cache, index) geri almak için override edilir.
+        """
+        return None
+
 
 # Adımları sırayla çalıştıran yönetici
 class PipelineRunner:
-    def __init__(self, steps: List[BaseStep]):
+    """
+    instruments: Her adımı saran ölçüm eklentileri (None ise varsayılanlar,
+    boş liste ise ölçüm yapılmaz). Ölçümler structlog'a yazılır ve
+    step_metrics'e eklenir.
+    """
+
+    def __init__(
+        self,
+        steps: List[BaseStep],
+        name: str = "pipeline",
+        instruments: Optional[Sequence[StepInstrument]] = None,
+    ):
         self.steps = steps
+        self.name = name
+        self.instruments = default_instruments() if instruments is None else instruments
 
     async def run(self, context: PipelineContext) -> PipelineContext:
         for step in self.steps:
             if not context.is_valid:
                 break  # Hata varsa dur
+            await self._run_step(step, context)
+        return context
+
+    async def _run_step(self, step: BaseStep, context: PipelineContext) -> None:
+        if not self.instruments:
             await step.process(context)
+            return
+
+        sample = StepSample(pipeline=self.name, step=type(step).__name__)
+        states = [instrument.start(context) for instrument in self.instruments]
+        try:
+            await step.process(context)
+        except BaseException:
+            sample.failed = True
+            raise
+        finally:
+            for instrument, state in reversed(
+                list(zip(self.instruments, states, strict=True))
+            ):
+                instrument.stop(state, context, sample)
+            sample.failed = sample.failed or not context.is_valid
+            step_metrics.record(sample)
+            logger.info("Pipeline step", **sample.as_dict())
+
+
+def step_dependencies(steps: Sequence[BaseStep]) -> List[Set[int]]:
+    """
+    Her adımın beklemesi gereken önceki adımların index'leri.
+    j, kendinden önceki i'ye şu durumlarda bağlıdır: ikisinden biri bariyerse,
+    j'nin okuduğunu i yazıyorsa, j'nin yazdığını i okuyor/yazıyorsa veya
+    ikisi de ana session'ı kullanıyorsa.
+    """
+    dependencies: List[Set[int]] = []
+    for j, later in enumerate(steps):
+        needs: Set[int] = set()
+        for i, earlier in enumerate(steps[:j]):
+            if earlier.is_barrier or later.is_barrier:
+                needs.add(i)
+                continue
+            assert earlier.reads is not None and earlier.writes is not None
+            assert later.reads is not None and later.writes is not None
+            if (
+                earlier.writes & (later.reads | later.writes)
+                or earlier.reads & later.writes
+                or (earlier.uses_session and later.uses_session)
+            ):
+                needs.add(i)
+        dependencies.append(needs)
+    return dependencies
+
+
+class DagPipelineRunner(PipelineRunner):
+    """
+    Adımları bildirdikleri okuma/yazma kümelerine göre DAG olarak çalıştırır.
+    Bağımlılıkları biten adımlar asyncio.TaskGroup altında eşzamanlı başlar;
+    toplam süre adımların toplamı değil kritik yol kadardır.
+
+    Eşzamanlı adımlar OfferBatch'in bir fork'u üzerinde çalışır, bittiklerinde
+    sadece writes'taki sütunlar ana batch'e yazılır. Hata raporlayan bir
+    adımdan sonra yeni adım başlatılmaz (çalışanlar tamamlanır).
+    Bildirimi olmayan adımlardan oluşan pipeline PipelineRunner gibi sıralı çalışır.
+    """
+
+    def __init__(
+        self,
+        steps: List[BaseStep],
+        name: str = "pipeline",
+        instruments: Optional[Sequence[StepInstrument]] = None,
+    ):
+        super().__init__(steps, name=name, instruments=instruments)
+        self.dependencies = step_dependencies(steps)
+
+    async def run(self, context: PipelineContext) -> PipelineContext:
+        finished = [asyncio.Event() for _ in self.steps]
+
+        async def run_node(index: int) -> None:
+            for dependency in self.dependencies[index]:
+                await finished[dependency].wait()
+            try:
+                if context.is_valid:
+                    await self._run_node(self.steps[index], context)
+            finally:
+                finished[index].set()
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for index in range(len(self.steps)):
+                    group.create_task(run_node(index))
+        except BaseExceptionGroup as errors:
+            # Sıralı çalıştırmadaki gibi adımın kendi hatası yukarı çıksın
+            if len(errors.exceptions) == 1:
+                raise errors.exceptions[0] from None
+            raise
         return context
+
+    async def _run_node(self, step: BaseStep, context: PipelineContext) -> None:
+        if step.is_barrier:
+            await self._run_step(step, context)
+            return
+
+        # Sütunlar fork ile paylaşılır; adımın yazdığı sütunlar fork'a özel olur
+        items = OfferBatch.coerce(context.data)
+        context.data = items
+        meta = dict(context.meta)
+        fork = PipelineContext(initial_data=items.fork(), user=context.user)
+        fork.meta = dict(meta)
+        await self._run_step(step, fork)
+
+        if (
+            not isinstance(fork.data, (OfferBatch, list))
+            or len(fork.data) != len(items)
+        ):
+            raise RuntimeError(
+                f"{type(step).__name__} item sayısını değiştirdi; "
+                "bariyer olarak bildirilmeli"
+            )
+        # Ana batch bu arada başka adımlarca güncellenmiş olabilir: yeniden oku
+        assert step.writes is not None
+        changed = OfferBatch.coerce(fork.data)
+        batch = OfferBatch.coerce(context.data)
+        for field in step.writes:
+            if changed.has_column(field):
+                batch.set_column(field, changed.column(field))
+        previous = context.data
+        context.data = batch
+        if fork.result is fork.data:
+            context.result = context.data
+        elif fork.result is not None:
+            context.result = fork.result
+        elif context.result is previous:
+            context.result = context.data
+        # Sadece adımın değiştirdiği meta anahtarları (eşzamanlı adımları ezmemek için)
+        for key, value in fork.meta.items():
+            if key not in meta or meta[key] is not value:
+                context.meta[key] = value
+        context.errors.extend(fork.errors)
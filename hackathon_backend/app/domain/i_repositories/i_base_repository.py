@@ -3,6 +3,7 @@ from typing import Any, Generic, Optional, Sequence, TypeVar
 
 from pydantic import BaseModel
 
+from app.domain.schemas.pagination import CursorPage
 from app.domain.schemas.query import QueryParams
 
 ModelType = TypeVar("ModelType")
@@ -24,6 +25,11 @@ class IBaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType
         """Gelişmiş filtreleme ve sıralama ile liste getirir."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_page(self, query_params: QueryParams) -> CursorPage[ModelType]:
+        """Keyset (cursor) sayfalama ile liste ve sonraki cursor'ı getirir."""
+        raise NotImplementedError
+
     @abstractmethod
     async def create(
         self, *, obj_in: CreateSchemaType, commit: bool = True
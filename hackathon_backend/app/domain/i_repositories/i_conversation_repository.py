@@ -9,6 +9,7 @@ from app.domain.schemas.chat.conversation import (
     ConversationCreate,
     ConversationUpdate,
 )
+from app.domain.schemas.pagination import CursorPage
 
 
 class IConversationRepository(
@@ -26,6 +27,13 @@ class IConversationRepository(
         """Kullanıcının tüm konuşmalarını getirir."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_page_by_user_id(
+        self, user_id: int, *, limit: int = 50, cursor: Optional[str] = None
+    ) -> CursorPage[Conversation]:
+        """Kullanıcının konuşmalarını keyset (cursor) sayfalama ile getirir."""
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_mapping_id(
         self, mapping_id: int, user_id: int
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from app.domain.i_repositories.i_base_repository import IBaseRepository
+from app.domain.schemas.price.current_offer import (
+    CurrentOffer,
+    CurrentOfferCreate,
+    CurrentOfferUpdate,
+)
+
+
+class ICurrentOfferRepository(
+    IBaseRepository[CurrentOffer, CurrentOfferCreate, CurrentOfferUpdate], ABC
+):
+    """
+    Current Offer Repository Interface.
+    current_offers ve üzerindeki product_price_summary tablolarını yönetir.
+    """
+
+    @abstractmethod
+    async def upsert_many(self, offers: Sequence[CurrentOfferCreate]) -> int:
+        """
+        Mapping başına güncel teklifleri toplu upsert eder. Aynı mapping
+        birden fazla gelirse sonuncusu geçerlidir. Commit etmez.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refresh_price_summaries(self, product_ids: Sequence[int]) -> int:
+        """
+        Verilen ürünlerin product_price_summary satırlarını current_offers'tan
+        tek statement ile yeniden hesaplar. Commit etmez.
+        """
+        raise NotImplementedError
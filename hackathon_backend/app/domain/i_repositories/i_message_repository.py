@@ -9,6 +9,7 @@ from app.domain.schemas.chat.message import (
     MessageCreate,
     MessageUpdate,
 )
+from app.domain.schemas.pagination import CursorPage
 
 
 class IMessageRepository(
@@ -26,6 +27,13 @@ class IMessageRepository(
         """Konuşmadaki tüm mesajları getirir."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_page_by_conversation_id(
+        self, conversation_id: int, *, limit: int = 100, cursor: Optional[str] = None
+    ) -> CursorPage[Message]:
+        """Konuşmadaki mesajları keyset (cursor) sayfalama ile getirir."""
+        raise NotImplementedError
+
     @abstractmethod
     async def create_message(
         self,
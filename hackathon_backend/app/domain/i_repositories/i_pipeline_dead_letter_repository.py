@@ -0,0 +1,18 @@
+"""Pipeline Dead Letter Repository Interface."""
+
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from app.domain.schemas.analytics.pipeline_dead_letter import PipelineDeadLetterCreate
+
+
+class IPipelineDeadLetterRepository(ABC):
+    """
+    Pipeline Dead Letter Repository Interface.
+    Chunked pipeline çalıştırmasında işlenemeyen item'ları saklar.
+    """
+
+    @abstractmethod
+    async def add_many(self, entries: Sequence[PipelineDeadLetterCreate]) -> int:
+        """Kayıtları tek multi-row INSERT ile ekler. Commit etmez."""
+        raise NotImplementedError
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
 
 from app.domain.i_repositories.i_base_repository import IBaseRepository
 from app.domain.schemas.price.price_history import (
     PriceHistory,
     PriceHistoryCreate,
     PriceHistoryUpdate,
+    PriceObservation,
 )
 
 
@@ -24,6 +27,16 @@ class IPriceHistoryRepository(
         """Belirli bir product mapping için fiyat geçmişini getirir."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_recent_prices_by_mapping_ids(
+        self, mapping_ids: Sequence[int], limit: int = 10
+    ) -> Dict[int, List[Decimal]]:
+        """
+        Birden fazla mapping için son `limit` fiyatı tek sorguda getirir.
+        Sonuç {mapping_id: [fiyat, ...]} şeklinde, en yeniden eskiye sıralıdır.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_variant_id(
         self, variant_id: int, limit: int = 100
@@ -44,3 +57,49 @@ class IPriceHistoryRepository(
     ) -> List[PriceHistory]:
         """Toplu fiyat geçmişi kaydı oluşturur (batch insert)."""
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_latest_observations(
+        self, mapping_ids: Sequence[int]
+    ) -> Dict[int, PriceObservation]:
+        """Her mapping'in en son fiyat kaydını tek sorguda getirir."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def touch_last_seen(self, observations: Sequence[PriceObservation]) -> int:
+        """Değişmeyen gözlemlerin kayıtlarında last_seen_at'i ilerletir."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def insert_many(self, items: Sequence[PriceHistoryCreate]) -> List[int]:
+        """
+        Yüksek hacimli ingest (COPY / multi-row INSERT); ORM nesnesi üretmez,
+        sadece oluşturulan id'leri items sırasıyla döner. Commit etmez.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def ensure_partitions(self, from_day: date, to_day: date) -> int:
+        """
+        [from_day, to_day] aralığındaki eksik günlük partition'ları oluşturur.
+        Oluşturulan partition sayısını döner.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_partition_days(self) -> List[date]:
+        """Mevcut günlük partition'ların günlerini (eskiden yeniye) döner."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def carry_open_intervals(self, day: date) -> int:
+        """
+        Günün partition'ındaki, ertesi güne uzanan aralıkları ertesi günün
+        başından başlayan kopyalar olarak yazar (partition silinmeden önce).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def drop_partition(self, day: date) -> None:
+        """Verilen günün partition'ını ayırır ve siler."""
+        raise NotImplementedError
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+
+from app.domain.i_repositories.i_base_repository import IBaseRepository
+from app.domain.schemas.price.price_rollup import (
+    PriceRollup,
+    PriceRollupCreate,
+    PriceRollupUpdate,
+)
+
+
+class IPriceRollupRepository(
+    IBaseRepository[PriceRollup, PriceRollupCreate, PriceRollupUpdate], ABC
+):
+    """
+    Price Rollup Repository Interface.
+    Ham fiyat geçmişinin saatlik ve günlük OHLC özetlerini yönetir.
+    """
+
+    @abstractmethod
+    async def rollup_hourly(self, since: datetime, until: datetime) -> int:
+        """
+        [since, until) aralığındaki ham fiyatları saatlik rollup'a yazar; her
+        kayıt created_at'ten last_seen_at'e kadar kapsadığı saatlere sayılır.
+        Aralık saat başına hizalı olmalıdır; tekrar çalıştırmak güvenlidir (upsert).
+        Etkilenen satır sayısını döner.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def rollup_daily(self, since: datetime, until: datetime) -> List[int]:
+        """
+        [since, until) aralığındaki saatlik rollup'ları günlük rollup'a yazar.
+        Aralık gün başına hizalı olmalıdır; tekrar çalıştırmak güvenlidir (upsert).
+        Günlük kapanışı değişen veya yeni gün eklenen ürünlerin id'lerini döner
+        (fiyat grafiği değişen ürünler).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_hourly_before(self, cutoff: datetime) -> int:
+        """cutoff'tan eski saatlik rollup'ları siler, silinen satır sayısını döner."""
+        raise NotImplementedError
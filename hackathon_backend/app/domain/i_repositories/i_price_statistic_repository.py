@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Dict, List, Mapping, Sequence
+
+from app.domain.i_repositories.i_base_repository import IBaseRepository
+from app.domain.schemas.price.price_statistic import (
+    PriceStatistic,
+    PriceStatisticCreate,
+    PriceStatisticUpdate,
+)
+
+
+class IPriceStatisticRepository(
+    IBaseRepository[PriceStatistic, PriceStatisticCreate, PriceStatisticUpdate], ABC
+):
+    """
+    Price Statistic Repository Interface.
+    Mapping bazlı artımlı fiyat istatistikleri için metodları tanımlar.
+    """
+
+    @abstractmethod
+    async def get_by_mapping_ids(
+        self, mapping_ids: Sequence[int]
+    ) -> Dict[int, PriceStatistic]:
+        """
+        Birden fazla mapping'in istatistiklerini tek sorguda getirir.
+        Kaydı olmayan mapping'ler sözlükte yer almaz.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def apply_samples(
+        self, samples: Mapping[int, List[Decimal]]
+    ) -> Dict[int, PriceStatistic]:
+        """
+        Yeni fiyatları ({mapping_id: [fiyat, ...]} eskiden yeniye) mevcut
+        istatistiklere ekler ve güncel halleri döner. Commit etmez.
+        """
+        raise NotImplementedError
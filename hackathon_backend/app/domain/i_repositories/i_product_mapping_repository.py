@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Mapping, Optional, Sequence, Tuple
 
 from app.domain.i_repositories.i_base_repository import IBaseRepository
 from app.domain.schemas.products.product_mapping import (
@@ -36,3 +36,22 @@ class IProductMappingRepository(
         Upsert mantığı.
         """
         raise NotImplementedError
+
+    @abstractmethod
+    async def bulk_find_or_create(
+        self, items: Sequence[Tuple[int, str, Optional[str]]]
+    ) -> Dict[Tuple[int, str], ProductMapping]:
+        """
+        (provider_id, external_product_code, product_url) listesi için
+        mapping'leri toplu bulur veya oluşturur.
+        Sonuç (provider_id, external_product_code) anahtarıyla döner.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def assign_products(self, assignments: Mapping[int, int]) -> int:
+        """
+        mapping_id -> product_id atamalarını toplu yazar.
+        Güncellenen mapping sayısını döner.
+        """
+        raise NotImplementedError
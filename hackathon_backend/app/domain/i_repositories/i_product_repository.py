@@ -0,0 +1,46 @@
+"""Product Repository Interface."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from app.persistence.models.products.product import Product
+
+
+class IProductRepository(ABC):
+    """
+    Product Repository Interface.
+    Ürün eşleştirme için tekil ve set-based (batch) metodları tanımlar.
+    """
+
+    @abstractmethod
+    async def get_by_name(self, name: str) -> Optional[Product]:
+        """İsme göre ürün getirir."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_ids_by_names(self, names: Sequence[str]) -> Dict[str, int]:
+        """
+        İsimleri tek sorguda ürün id'lerine çözer (isim -> id).
+        Aynı isimde birden fazla ürün varsa en eski (en küçük id) döner.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_match_candidates(self) -> List[Tuple[int, str, Optional[str]]]:
+        """Bulanık eşleştirme index'i için tüm ürünlerin (id, name, brand) satırları."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def bulk_create(
+        self, products: Sequence[Mapping[str, Any]]
+    ) -> Dict[str, int]:
+        """
+        Ürünleri toplu ekler (slug benzersizdir). Slug -> id döner; zaten var
+        olan slug'lar mevcut ürünün id'sine çözülür.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def bulk_create_variants(self, variants: Sequence[Mapping[str, Any]]) -> int:
+        """Varyantları toplu ekler; var olan SKU'ları atlar. Eklenen sayıyı döner."""
+        raise NotImplementedError
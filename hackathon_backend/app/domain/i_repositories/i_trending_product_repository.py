@@ -0,0 +1,21 @@
+"""Trending Product Repository Interface."""
+
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from app.domain.schemas.analytics.trending_product import TrendingEntry
+
+
+class ITrendingProductRepository(ABC):
+    """
+    Trending Product Repository Interface.
+    Ana sayfadaki trending listesinin sıralamasını saklar.
+    """
+
+    @abstractmethod
+    async def replace_ranking(self, entries: Sequence[TrendingEntry]) -> int:
+        """
+        Sıralamayı rank'e göre upsert eder (entries[0] rank 1), fazla rank'leri
+        siler. Liste boşsa mevcut sıralamaya dokunmaz. Commit etmez.
+        """
+        raise NotImplementedError
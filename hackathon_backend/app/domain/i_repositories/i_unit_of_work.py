@@ -1,16 +1,32 @@
 from abc import ABC, abstractmethod
 from types import TracebackType
-from typing import TYPE_CHECKING, Optional, Type, Any
+from typing import TYPE_CHECKING, AsyncContextManager, Optional, Type
 
 if TYPE_CHECKING:
     from app.domain.i_repositories.i_category_repository import ICategoryRepository
+    from app.domain.i_repositories.i_current_offer_repository import (
+        ICurrentOfferRepository,
+    )
+    from app.domain.i_repositories.i_pipeline_dead_letter_repository import (
+        IPipelineDeadLetterRepository,
+    )
     from app.domain.i_repositories.i_price_history_repository import (
         IPriceHistoryRepository,
     )
+    from app.domain.i_repositories.i_price_rollup_repository import (
+        IPriceRollupRepository,
+    )
+    from app.domain.i_repositories.i_price_statistic_repository import (
+        IPriceStatisticRepository,
+    )
     from app.domain.i_repositories.i_product_mapping_repository import (
         IProductMappingRepository,
     )
+    from app.domain.i_repositories.i_product_repository import IProductRepository
     from app.domain.i_repositories.i_role_repository import IRoleRepository
+    from app.domain.i_repositories.i_trending_product_repository import (
+        ITrendingProductRepository,
+    )
     from app.domain.i_repositories.i_user_repository import IUserRepository
 
 
@@ -43,6 +59,23 @@ class IUnitOfWork(ABC):
     async def rollback(self) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def savepoint(self) -> AsyncContextManager[None]:
+        """
+        Transaction içinde SAVEPOINT açar. Blok hata fırlatırsa sadece blok
+        içindeki değişiklikler geri alınır, transaction devam eder.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def reader(self) -> "IUnitOfWork":
+        """
+        Ayrı bir session açan yeni (başlatılmamış) UnitOfWork döner.
+        Pipeline'ın eşzamanlı salt-okuma işleri için kullanılır; bu
+        transaction'ın commit edilmemiş yazılarını görmez.
+        """
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def users(self) -> "IUserRepository":
@@ -53,16 +86,46 @@ class IUnitOfWork(ABC):
     def roles(self) -> "IRoleRepository":
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def current_offers(self) -> "ICurrentOfferRepository":
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def price_histories(self) -> "IPriceHistoryRepository":
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def price_rollups(self) -> "IPriceRollupRepository":
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def price_statistics(self) -> "IPriceStatisticRepository":
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def product_mappings(self) -> "IProductMappingRepository":
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def products(self) -> "IProductRepository":
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def dead_letters(self) -> "IPipelineDeadLetterRepository":
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def trending_products(self) -> "ITrendingProductRepository":
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def categories(self) -> "ICategoryRepository":
@@ -1,5 +1,38 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, AsyncContextManager, Dict, List, Mapping, Optional, Sequence
+
+
+class ICachePipeline(ABC):
+    """
+    Cache Pipeline Interface.
+    Komutlar kuyruğa alınır ve context'ten çıkarken tek round trip'te
+    (transaction=True ise MULTI/EXEC ile atomik) çalıştırılır.
+    Sonuçlar komut sırasıyla results'ta bulunur.
+    """
+
+    results: List[Any]
+    # set/delete ile değişen key'ler (yerel cache katmanlarının invalidation'ı için)
+    keys_written: List[str]
+
+    @abstractmethod
+    def get(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expire: int = 60) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def lpush(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def ltrim(self, key: str, start: int, end: int) -> None:
+        raise NotImplementedError
 
 
 class ICacheService(ABC):
@@ -18,6 +51,49 @@ class ICacheService(ABC):
         """Cache'e veri yazar. expire: Saniye cinsinden TTL."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def set_if_absent(self, key: str, value: Any, expire: int = 60) -> bool:
+        """Key yoksa yazar (SET NX); yazıldıysa True döner. Dağıtık kilitler için."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Belirli bir key'i siler."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        """
+        Key sadece değeri value ise atomik olarak silinir; silindiyse True döner.
+        set_if_absent ile alınan kilitleri bırakmak için.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def mget(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Birden fazla key'i tek round trip'te çeker; olmayanlar None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def mset(self, items: Mapping[str, Any], expire: int = 60) -> None:
+        """Birden fazla key'i aynı TTL ile tek round trip'te yazar."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Key'leri tek komutla siler; silinen key sayısını döner."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def pipeline(self, transaction: bool = True) -> AsyncContextManager[ICachePipeline]:
+        """Komutları toplayıp tek round trip'te çalıştıran pipeline."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def pool_stats(self) -> Dict[str, int]:
+        """Bağlantı havuzu durumu (max, açık, kullanımda, boşta)."""
+        raise NotImplementedError
+
     @abstractmethod
     async def lpush(self, key: str, value: str) -> None:
         """Listeye eleman ekler (Sol taraftan)."""
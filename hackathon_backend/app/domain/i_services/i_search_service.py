@@ -39,12 +39,17 @@ class ISearchService(ABC):
         from_: int = 0,
         size: int = 20,
         sort: Optional[List[Dict[str, Any]]] = None,
+        aggs: Optional[Dict[str, Any]] = None,
+        raise_on_error: bool = False,
     ) -> Dict[str, Any]:
         """
         Arama yapar.
 
+        raise_on_error=True ise hatalar boş sonuç yerine exception olarak
+        yükselir (çağıran fallback uygulayabilsin diye).
+
         Returns:
-            Dict with keys: 'hits' (list), 'total' (int)
+            Dict with keys: 'hits' (list), 'total' (int), 'aggregations' (dict)
         """
         raise NotImplementedError
 
@@ -78,6 +83,24 @@ class ISearchService(ABC):
         """Index'i yeniler (aramalar için güncel hale getirir)."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def list_indices(self, pattern: str) -> List[str]:
+        """Pattern'e (ör. 'products-*') uyan index adlarını döner."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_alias(self, alias: str) -> List[str]:
+        """Alias'ın işaret ettiği index'leri döner (alias yoksa boş liste)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def swap_alias(self, alias: str, index: str) -> bool:
+        """
+        Alias'ı tek atomik işlemle index'e taşır (diğer index'lerden kaldırır).
+        Alias adında somut bir index varsa aynı işlemde silinir.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def health_check(self) -> bool:
         """Elasticsearch bağlantısını kontrol eder."""
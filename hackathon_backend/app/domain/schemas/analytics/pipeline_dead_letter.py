@@ -0,0 +1,13 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class PipelineDeadLetterCreate(BaseModel):
+    """Chunked pipeline'ın işleyemediği bir item."""
+
+    pipeline: str
+    provider_id: Optional[int] = None
+    external_product_code: Optional[str] = None
+    payload: Dict[str, Any]
+    error: str
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class TrendingEntry(BaseModel):
+    """Trending sıralamasındaki bir ürün (rank listedeki sırasıdır)."""
+
+    product_id: int
+    trend_score: int
@@ -51,3 +51,5 @@ class ConversationListResponse(BaseModel):
 
     conversations: List[Conversation]
     total: int
+    # Sonraki sayfa için opak cursor (son sayfada None)
+    next_cursor: Optional[str] = None
@@ -0,0 +1,21 @@
+"""Cursor (keyset) pagination schemas."""
+
+from typing import Generic, List, Literal, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+# exact: count(*), estimated: planner tahmini, none: sayılmaz
+TotalMode = Literal["exact", "estimated", "none"]
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Keyset sayfalama sonucu.
+    next_cursor opak bir token'dır; None ise son sayfaya gelinmiştir.
+    """
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
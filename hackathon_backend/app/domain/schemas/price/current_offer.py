@@ -0,0 +1,52 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CurrentOfferBase(BaseModel):
+    mapping_id: int
+    price: Decimal
+    original_price: Optional[Decimal] = None
+    in_stock: bool = True
+    stock_quantity: Optional[int] = None
+
+
+class CurrentOfferCreate(CurrentOfferBase):
+    """Güncel teklif upsert'i için."""
+
+    pass
+
+
+class CurrentOfferUpdate(BaseModel):
+    """Güncel teklifi güncellemek için (opsiyonel alanlar)."""
+
+    price: Optional[Decimal] = None
+    original_price: Optional[Decimal] = None
+    in_stock: Optional[bool] = None
+    stock_quantity: Optional[int] = None
+
+
+class CurrentOffer(CurrentOfferBase):
+    """Güncel teklif response model."""
+
+    id: int
+    observed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProductPriceSummary(BaseModel):
+    """Ürün bazlı fiyat özeti response model."""
+
+    product_id: int
+    lowest_price: Decimal
+    original_price: Optional[Decimal] = None
+    in_stock: bool
+    offer_count: int
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -22,6 +22,17 @@ class PriceHistoryCreate(PriceHistoryBase):
     pass
 
 
+class PriceObservation(BaseModel):
+    """Mapping'in en son fiyat kaydı; yeni gözlemin değişip değişmediğini belirler."""
+
+    id: int
+    created_at: datetime
+    price: Decimal
+    original_price: Optional[Decimal] = None
+    in_stock: bool
+    stock_quantity: Optional[int] = None
+
+
 class PriceHistoryUpdate(BaseModel):
     """Fiyat geçmişi güncellemek için (opsiyonel alanlar)."""
 
@@ -37,6 +48,7 @@ class PriceHistory(PriceHistoryBase):
 
     id: int
     created_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
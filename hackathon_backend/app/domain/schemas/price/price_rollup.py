@@ -0,0 +1,41 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PriceRollupBase(BaseModel):
+    mapping_id: int
+    bucket_start: datetime
+    open_price: Decimal
+    high_price: Decimal
+    low_price: Decimal
+    close_price: Decimal
+    sample_count: int
+
+
+class PriceRollupCreate(PriceRollupBase):
+    """Yeni rollup kaydı oluşturmak için."""
+
+    pass
+
+
+class PriceRollupUpdate(BaseModel):
+    """Rollup kaydını güncellemek için (opsiyonel alanlar)."""
+
+    open_price: Optional[Decimal] = None
+    high_price: Optional[Decimal] = None
+    low_price: Optional[Decimal] = None
+    close_price: Optional[Decimal] = None
+    sample_count: Optional[int] = None
+
+
+class PriceRollup(PriceRollupBase):
+    """Saatlik/günlük OHLC rollup response model."""
+
+    id: int
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
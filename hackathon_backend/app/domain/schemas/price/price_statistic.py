@@ -0,0 +1,98 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Sequence
+
+from pydantic import BaseModel
+
+# Ring buffer'da tutulan son fiyat sayısı (TrendAnalysisStep geçmiş limiti)
+RECENT_PRICE_WINDOW = 10
+
+# EWMA yumuşatma katsayısı: yeni fiyatın ağırlığı
+EWMA_ALPHA = Decimal("0.3")
+
+_EWMA_QUANT = Decimal("0.0001")
+
+
+class PriceStatisticBase(BaseModel):
+    mapping_id: int
+    sample_count: int = 0
+    price_sum: Decimal = Decimal("0")
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    last_price: Optional[Decimal] = None
+    recent_prices: List[Decimal] = []  # En yeniden eskiye
+    ewma_price: Optional[Decimal] = None
+
+
+class PriceStatisticCreate(PriceStatisticBase):
+    """Yeni istatistik kaydı oluşturmak için."""
+
+    pass
+
+
+class PriceStatisticUpdate(BaseModel):
+    """İstatistik kaydını güncellemek için (opsiyonel alanlar)."""
+
+    sample_count: Optional[int] = None
+    price_sum: Optional[Decimal] = None
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    last_price: Optional[Decimal] = None
+    recent_prices: Optional[List[Decimal]] = None
+    ewma_price: Optional[Decimal] = None
+
+
+class PriceStatistic(PriceStatisticBase):
+    """Mapping bazlı kümülatif fiyat istatistikleri response model."""
+
+    id: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+    @property
+    def avg_price(self) -> Optional[Decimal]:
+        """Tüm geçmişin ortalaması."""
+        if not self.sample_count:
+            return None
+        return self.price_sum / self.sample_count
+
+    def with_samples(
+        self,
+        prices: Sequence[Decimal],
+        window: int = RECENT_PRICE_WINDOW,
+        alpha: Decimal = EWMA_ALPHA,
+    ) -> "PriceStatistic":
+        """
+        Yeni fiyatları (eskiden yeniye sıralı) istatistiklere ekler ve
+        güncellenmiş bir kopya döner. Maliyet geçmiş uzunluğundan bağımsızdır.
+        """
+        if not prices:
+            return self.model_copy()
+
+        ewma = self.ewma_price
+        for price in prices:
+            ewma = price if ewma is None else alpha * price + (1 - alpha) * ewma
+
+        batch_min = min(prices)
+        batch_max = max(prices)
+        return self.model_copy(
+            update={
+                "sample_count": self.sample_count + len(prices),
+                "price_sum": self.price_sum + sum(prices, Decimal("0")),
+                "min_price": (
+                    batch_min
+                    if self.min_price is None
+                    else min(self.min_price, batch_min)
+                ),
+                "max_price": (
+                    batch_max
+                    if self.max_price is None
+                    else max(self.max_price, batch_max)
+                ),
+                "last_price": prices[-1],
+                "recent_prices": (list(reversed(prices)) + self.recent_prices)[:window],
+                "ewma_price": ewma.quantize(_EWMA_QUANT) if ewma is not None else None,
+            }
+        )
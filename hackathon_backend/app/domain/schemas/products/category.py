@@ -59,14 +59,19 @@ class CategoryWithProductsResponse(BaseModel):
 
     category: CategoryResponse
     products: List["ProductSearchResultSimple"]
-    total: int
+    # None when total_mode="none"; planner estimate when "estimated"
+    total: Optional[int] = None
     page: int
     page_size: int
+    # Opaque cursor for the next page (None on the last page)
+    next_cursor: Optional[str] = None
 
     @computed_field  # type: ignore[prop-decorator]
     @property
-    def total_pages(self) -> int:
+    def total_pages(self) -> Optional[int]:
         """Calculate total pages."""
+        if self.total is None:
+            return None
         if self.page_size <= 0:
             return 0
         return (self.total + self.page_size - 1) // self.page_size
@@ -1,10 +1,12 @@
 """Product search response schemas."""
 
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, computed_field
 
+from app.domain.schemas.pagination import TotalMode
+
 
 class ProductSearchResult(BaseModel):
     """Arama sonucu ürün bilgisi."""
@@ -46,19 +48,33 @@ class ProductSearchResult(BaseModel):
         from_attributes = True
 
 
+class FacetBucket(BaseModel):
+    """Facet değeri ve eşleşen ürün sayısı."""
+
+    value: str
+    count: int
+
+
 class ProductSearchResponse(BaseModel):
     """Ürün arama response."""
 
     query: str
     products: list[ProductSearchResult]
-    total: int
+    # total_mode="none" ise None, "estimated" ise planner tahmini
+    total: Optional[int] = None
     page: int
     page_size: int
+    # Sonraki sayfa için opak cursor (son sayfada None)
+    next_cursor: Optional[str] = None
+    # Marka/kategori/renk/beden/fiyat aralığı sayıları (sadece Elasticsearch)
+    facets: Dict[str, List[FacetBucket]] = {}
 
     @computed_field  # type: ignore[prop-decorator]
     @property
-    def total_pages(self) -> int:
+    def total_pages(self) -> Optional[int]:
         """Toplam sayfa sayısı."""
+        if self.total is None:
+            return None
         if self.page_size <= 0:
             return 0
         return (self.total + self.page_size - 1) // self.page_size
@@ -76,3 +92,7 @@ class ProductSearchRequest(BaseModel):
     in_stock_only: bool = True
     page: int = 1
     page_size: int = 20
+    # Verilirse OFFSET yerine keyset sayfalama (page yok sayılır)
+    cursor: Optional[str] = None
+    # None: OFFSET modunda exact, cursor modunda none
+    total_mode: Optional[TotalMode] = None
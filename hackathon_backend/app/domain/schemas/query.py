@@ -1,7 +1,9 @@
-from typing import Any, List, Literal
+from typing import Any, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from app.domain.schemas.pagination import TotalMode
+
 
 # Hangi alan, hangi operatör, hangi değer?
 class FilterParam(BaseModel):
@@ -24,6 +26,10 @@ class QueryParams(BaseModel):
     sort: List[SortParam] = Field(default_factory=list)
     page: int = Field(default=1, ge=1)
     size: int = Field(default=20, ge=1, le=100)
+    # Verilirse OFFSET yerine keyset sayfalama (page yok sayılır)
+    cursor: Optional[str] = None
+    # get_page için toplam sayı modu
+    total_mode: TotalMode = "none"
 
     @property
     def skip(self) -> int:
@@ -1,12 +1,14 @@
-from typing import Any, Optional, Sequence, Type
+from typing import Any, Optional, Sequence, Tuple, Type
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import and_, asc, desc, select
+from sqlalchemy import Select, and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.i_repositories.i_base_repository import IBaseRepository
+from app.domain.schemas.pagination import CursorPage
 from app.domain.schemas.query import QueryParams
+from app.infrastructure.repositories.keyset import KeysetOrder, estimate_count
 from app.persistence.db.base import Base
 
 # Type variables for ORM model and Pydantic schemas
@@ -37,6 +39,51 @@ class BaseRepository(IBaseRepository[BaseModel, BaseModel, BaseModel]):
         return self._to_schema(db_obj) if db_obj else None
 
     async def get_multi(self, query_params: QueryParams) -> Sequence[BaseModel]:
+        query, keyset = self._build_query(query_params)
+
+        if query_params.cursor:
+            query = query.where(keyset.after(query_params.cursor))
+        else:
+            query = query.offset(query_params.skip)
+        query = query.limit(query_params.size)
+
+        result = await self.db.execute(query)
+        db_objs = result.scalars().all()
+        return [self._to_schema(obj) for obj in db_objs]
+
+    async def get_page(self, query_params: QueryParams) -> CursorPage[BaseModel]:
+        """
+        Keyset sayfalama: cursor'dan sonraki size kaydı ve sonraki cursor'ı döner.
+        Toplam sayı query_params.total_mode'a göre hesaplanır (varsayılan: yok).
+        """
+        query, keyset = self._build_query(query_params)
+
+        total: Optional[int] = None
+        if query_params.total_mode == "exact":
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await self.db.execute(count_query)).scalar() or 0
+        elif query_params.total_mode == "estimated":
+            total = await estimate_count(self.db, query)
+
+        if query_params.cursor:
+            query = query.where(keyset.after(query_params.cursor))
+        result = await self.db.execute(query.limit(query_params.size + 1))
+
+        db_objs, next_cursor = keyset.paginate(
+            result.scalars().all(),
+            query_params.size,
+            lambda obj: [getattr(obj, name) for name in keyset.names],
+        )
+        return CursorPage(
+            items=[self._to_schema(obj) for obj in db_objs],
+            next_cursor=next_cursor,
+            total=total,
+        )
+
+    def _build_query(
+        self, query_params: QueryParams
+    ) -> Tuple[Select[Any], KeysetOrder]:
+        """Filtreli ve sıralı sorgu + keyset anahtarı (id ile tamamlanır)."""
         query = select(self.orm_model)
 
         # Filtering
@@ -70,24 +117,16 @@ class BaseRepository(IBaseRepository[BaseModel, BaseModel, BaseModel]):
         if conditions:
             query = query.where(and_(*conditions))
 
-        # Sorting
+        # Sorting (id her zaman son anahtar: sayfalar arası kararlı sıra)
+        keys = []
         for s in query_params.sort:
-            if not hasattr(self.orm_model, s.field):
+            if not hasattr(self.orm_model, s.field) or s.field == "id":
                 continue
-            column = getattr(self.orm_model, s.field)
-            if s.direction == "desc":
-                query = query.order_by(desc(column))
-            else:
-                query = query.order_by(asc(column))
-
-        if not query_params.sort and hasattr(self.orm_model, "id"):
-            query = query.order_by(self.orm_model.id)  # type: ignore
-
-        query = query.offset(query_params.skip).limit(query_params.size)
+            keys.append((getattr(self.orm_model, s.field), s.direction == "desc"))
+        keys.append((self.orm_model.id, False))  # type: ignore[attr-defined]
 
-        result = await self.db.execute(query)
-        db_objs = result.scalars().all()
-        return [self._to_schema(obj) for obj in db_objs]
+        keyset = KeysetOrder.of(*keys)
+        return query.order_by(*keyset.order_by()), keyset
 
     async def create(self, *, obj_in: BaseModel, commit: bool = True) -> BaseModel:
         obj_in_data = jsonable_encoder(obj_in)
@@ -14,9 +14,16 @@ from app.domain.schemas.chat.conversation import (
 from app.domain.schemas.chat.conversation import (
     ConversationCreate,
 )
+from app.domain.schemas.pagination import CursorPage
 from app.infrastructure.repositories.base_repository import BaseRepository
+from app.infrastructure.repositories.keyset import KeysetOrder
 from app.persistence.models.chat.conversation import Conversation as ConversationModel
 
+# En yeniden eskiye; aynı updated_at için id ile kararlı sıra
+CONVERSATION_ORDER = KeysetOrder.of(
+    (ConversationModel.updated_at, True), (ConversationModel.id, True)
+)
+
 
 class ConversationRepository(BaseRepository, IConversationRepository):
     """
@@ -44,6 +51,27 @@ class ConversationRepository(BaseRepository, IConversationRepository):
         db_objs = result.scalars().all()
         return [self._to_schema(obj) for obj in db_objs]  # type: ignore
 
+    async def get_page_by_user_id(
+        self, user_id: int, *, limit: int = 50, cursor: Optional[str] = None
+    ) -> CursorPage[ConversationSchema]:
+        """Kullanıcının konuşmalarını keyset sayfalamayla getirir (yeniden eskiye)."""
+        query = (
+            select(ConversationModel)
+            .where(ConversationModel.user_id == user_id)
+            .order_by(*CONVERSATION_ORDER.order_by())
+        )
+        if cursor:
+            query = query.where(CONVERSATION_ORDER.after(cursor))
+        result = await self.db.execute(query.limit(limit + 1))
+
+        db_objs, next_cursor = CONVERSATION_ORDER.paginate(
+            result.scalars().all(), limit, lambda obj: [obj.updated_at, obj.id]
+        )
+        return CursorPage(
+            items=[self._to_schema(obj) for obj in db_objs],  # type: ignore
+            next_cursor=next_cursor,
+        )
+
     async def get_by_mapping_id(
         self, mapping_id: int, user_id: int
     ) -> Optional[ConversationSchema]:
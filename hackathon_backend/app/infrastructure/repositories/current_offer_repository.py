@@ -0,0 +1,126 @@
+from typing import Any, Dict, Sequence, Type
+
+from sqlalchemy import Integer, any_, bindparam, case, func, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.i_repositories.i_current_offer_repository import ICurrentOfferRepository
+from app.domain.schemas.price.current_offer import (
+    CurrentOffer as CurrentOfferSchema,
+)
+from app.domain.schemas.price.current_offer import (
+    CurrentOfferCreate,
+)
+from app.infrastructure.repositories.base_repository import BaseRepository
+from app.persistence.models.price.current_offer import (
+    CurrentOffer as CurrentOfferModel,
+)
+from app.persistence.models.price.current_offer import (
+    ProductPriceSummary as ProductPriceSummaryModel,
+)
+from app.persistence.models.products.product_mappings import ProductMapping
+
+
+class CurrentOfferRepository(BaseRepository, ICurrentOfferRepository):
+    """
+    Current Offer Repository Implementation.
+    Güncel teklifleri ve ürün fiyat özetlerini set-based upsert'lerle yazar.
+    """
+
+    orm_model: Type[CurrentOfferModel] = CurrentOfferModel
+    schema_class: Type[CurrentOfferSchema] = CurrentOfferSchema
+
+    # Tek statement'taki satır sayısı (bind parametre limiti için)
+    BULK_CHUNK_SIZE = 5000
+
+    def __init__(self, db: AsyncSession) -> None:
+        super().__init__(db)
+
+    async def upsert_many(self, offers: Sequence[CurrentOfferCreate]) -> int:
+        """
+        INSERT ... ON CONFLICT (mapping_id) DO UPDATE ile güncel teklifleri yazar.
+        observed_at transaction zamanıdır (price_histories.created_at ile aynı).
+        updated_at sadece fiyat, liste fiyatı veya stok durumu değiştiğinde
+        ilerler; ürün detayı (ve ETag'i) her gözlemde değişmesin.
+        """
+        # Aynı statement'ta bir satır iki kez güncellenemez: son teklif kazanır
+        latest: Dict[int, CurrentOfferCreate] = {o.mapping_id: o for o in offers}
+        rows = [offer.model_dump() for offer in latest.values()]
+
+        for start in range(0, len(rows), self.BULK_CHUNK_SIZE):
+            stmt = pg_insert(CurrentOfferModel).values(
+                rows[start : start + self.BULK_CHUNK_SIZE]
+            )
+            offer, excluded = CurrentOfferModel, stmt.excluded
+            changed = tuple_(
+                offer.price, offer.original_price, offer.in_stock
+            ).is_distinct_from(
+                tuple_(excluded.price, excluded.original_price, excluded.in_stock)
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CurrentOfferModel.mapping_id],
+                set_={
+                    "price": stmt.excluded.price,
+                    "original_price": stmt.excluded.original_price,
+                    "in_stock": stmt.excluded.in_stock,
+                    "stock_quantity": stmt.excluded.stock_quantity,
+                    "observed_at": func.now(),
+                    "updated_at": case(
+                        (changed, func.now()), else_=offer.updated_at
+                    ),
+                },
+            )
+            await self.db.execute(stmt)
+
+        return len(rows)
+
+    async def refresh_price_summaries(self, product_ids: Sequence[int]) -> int:
+        """
+        Ürün başına en ucuz teklif (stoktakiler önce), stok durumu ve teklif
+        sayısını INSERT ... SELECT ... ON CONFLICT ile yeniden hesaplar.
+        """
+        unique_ids = list(dict.fromkeys(pid for pid in product_ids if pid))
+        if not unique_ids:
+            return 0
+
+        offer = CurrentOfferModel
+        # Stoktaki teklifler önce, sonra fiyata göre: ilk eleman en iyi teklif
+        best_first = (offer.in_stock.desc(), offer.price, offer.mapping_id)
+
+        def best(column: Any) -> Any:
+            return func.array_agg(aggregate_order_by(column, *best_first))[1]
+
+        source = (
+            select(
+                ProductMapping.product_id,
+                best(offer.price),
+                best(offer.original_price),
+                func.bool_or(offer.in_stock),
+                func.count(),
+            )
+            .join(ProductMapping, offer.mapping_id == ProductMapping.id)
+            .where(
+                ProductMapping.product_id
+                == any_(bindparam("product_ids", unique_ids, type_=ARRAY(Integer)))
+            )
+            .group_by(ProductMapping.product_id)
+            # Eşzamanlı transaction'lar özet satırlarını aynı sırada kilitlesin
+            .order_by(ProductMapping.product_id)
+        )
+        stmt = pg_insert(ProductPriceSummaryModel).from_select(
+            ("product_id", "lowest_price", "original_price", "in_stock", "offer_count"),
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductPriceSummaryModel.product_id],
+            set_={
+                "lowest_price": stmt.excluded.lowest_price,
+                "original_price": stmt.excluded.original_price,
+                "in_stock": stmt.excluded.in_stock,
+                "offer_count": stmt.excluded.offer_count,
+                "updated_at": func.now(),
+            },
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount or 0  # type: ignore[attr-defined]
@@ -0,0 +1,138 @@
+"""
+Keyset (cursor) pagination yardımcıları.
+
+Cursor, son satırın sıralama anahtarı + id değerlerini taşıyan opak bir
+token'dır (base64url JSON). Sonraki sayfa OFFSET yerine
+"anahtar > son anahtar" koşuluyla okunur; derin sayfalar da O(page_size)'dır.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import ColumnElement, Select, and_, or_, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+
+T = TypeVar("T")
+
+INVALID_CURSOR = "Geçersiz cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    raise TypeError(f"Cursor değeri serileştirilemiyor: {type(value).__name__}")
+
+
+def _decode_value(obj: Any) -> Any:
+    if "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    if "$dec" in obj:
+        return Decimal(obj["$dec"])
+    return obj
+
+
+@dataclass(frozen=True)
+class KeysetOrder:
+    """
+    Sıralama anahtarı: (kolon, azalan mı) çiftleri.
+    Son kolon benzersiz olmalıdır (genelde id); anahtar kolonları NULL içermemelidir.
+    """
+
+    keys: Tuple[Tuple[Any, bool], ...]
+
+    @classmethod
+    def of(cls, *keys: Tuple[Any, bool]) -> "KeysetOrder":
+        return cls(tuple(keys))
+
+    @property
+    def names(self) -> List[str]:
+        return [column.key for column, _ in self.keys]
+
+    def order_by(self) -> List[Any]:
+        return [column.desc() if desc else column.asc() for column, desc in self.keys]
+
+    def encode(self, values: Sequence[Any]) -> str:
+        payload = json.dumps(
+            {"k": self.names, "v": list(values)},
+            default=_encode_value,
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> List[Any]:
+        """Cursor'ı çözer; bozuksa veya başka sıralamaya aitse ValidationException."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(
+                base64.urlsafe_b64decode(padded.encode()),
+                object_hook=_decode_value,
+            )
+            values = payload["v"]
+            names = payload["k"]
+        except (binascii.Error, ValueError, KeyError, TypeError) as e:
+            raise ValidationException(INVALID_CURSOR) from e
+        if names != self.names or len(values) != len(self.keys):
+            raise ValidationException(INVALID_CURSOR)
+        return values
+
+    def after(self, cursor: str) -> ColumnElement[bool]:
+        """
+        Cursor'dan sonraki satırlar için WHERE koşulu.
+        Tüm yönler aynıysa satır karşılaştırması (index'e uygun), değilse
+        (a > x) OR (a = x AND b > y) ... açılımı kullanılır.
+        """
+        values = self.decode(cursor)
+        columns = [column for column, _ in self.keys]
+        directions = {desc for _, desc in self.keys}
+        if len(directions) == 1:
+            left, right = tuple_(*columns), tuple_(*values)
+            return left < right if directions.pop() else left > right
+
+        clauses = []
+        for i, (column, desc) in enumerate(self.keys):
+            equal = [c == v for c, v in zip(columns[:i], values[:i], strict=True)]
+            step = column < values[i] if desc else column > values[i]
+            clauses.append(and_(*equal, step))
+        return or_(*clauses)
+
+    def paginate(
+        self, rows: Sequence[T], limit: int, key: Any
+    ) -> Tuple[List[T], Optional[str]]:
+        """
+        limit + 1 satır okunmuş sonuçtan sayfayı ve sonraki cursor'ı çıkarır.
+        key: satırdan sıralama anahtarı değerlerini dönen fonksiyon.
+        """
+        page = list(rows[:limit])
+        if len(rows) <= limit or not page:
+            return page, None
+        return page, self.encode(key(page[-1]))
+
+
+async def estimate_count(db: AsyncSession, query: Select[Any]) -> Optional[int]:
+    """
+    Sorgunun satır sayısını EXPLAIN ile planner tahmininden okur (count(*) yok).
+    Sorgu literal olarak derlenemezse None döner.
+    """
+    try:
+        sql = str(
+            query.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+    except Exception:
+        return None
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -10,9 +10,16 @@ from app.domain.i_repositories.i_message_repository import IMessageRepository
 from app.domain.schemas.chat.message import (
     Message as MessageSchema,
 )
+from app.domain.schemas.pagination import CursorPage
 from app.infrastructure.repositories.base_repository import BaseRepository
+from app.infrastructure.repositories.keyset import KeysetOrder
 from app.persistence.models.chat.message import Message as MessageModel
 
+# Eskiden yeniye; aynı created_at için id ile kararlı sıra
+MESSAGE_ORDER = KeysetOrder.of(
+    (MessageModel.created_at, False), (MessageModel.id, False)
+)
+
 
 class MessageRepository(BaseRepository, IMessageRepository):
     """
@@ -40,6 +47,27 @@ class MessageRepository(BaseRepository, IMessageRepository):
         db_objs = result.scalars().all()
         return [self._to_schema(obj) for obj in db_objs]  # type: ignore
 
+    async def get_page_by_conversation_id(
+        self, conversation_id: int, *, limit: int = 100, cursor: Optional[str] = None
+    ) -> CursorPage[MessageSchema]:
+        """Konuşmadaki mesajları keyset sayfalama ile getirir (eskiden yeniye)."""
+        query = (
+            select(MessageModel)
+            .where(MessageModel.conversation_id == conversation_id)
+            .order_by(*MESSAGE_ORDER.order_by())
+        )
+        if cursor:
+            query = query.where(MESSAGE_ORDER.after(cursor))
+        result = await self.db.execute(query.limit(limit + 1))
+
+        db_objs, next_cursor = MESSAGE_ORDER.paginate(
+            result.scalars().all(), limit, lambda obj: [obj.created_at, obj.id]
+        )
+        return CursorPage(
+            items=[self._to_schema(obj) for obj in db_objs],  # type: ignore
+            next_cursor=next_cursor,
+        )
+
     async def create_message(
         self,
         *,
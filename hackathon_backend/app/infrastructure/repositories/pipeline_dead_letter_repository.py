@@ -0,0 +1,27 @@
+from typing import Sequence
+
+from sqlalchemy import insert
+
+from app.domain.i_repositories.i_pipeline_dead_letter_repository import (
+    IPipelineDeadLetterRepository,
+)
+from app.domain.schemas.analytics.pipeline_dead_letter import PipelineDeadLetterCreate
+from app.infrastructure.repositories.base_repository import BaseRepository
+from app.persistence.models.analytics.pipeline_dead_letter import PipelineDeadLetter
+
+
+class PipelineDeadLetterRepository(BaseRepository, IPipelineDeadLetterRepository):
+    """
+    Pipeline Dead Letter Repository Implementation.
+    Kayıtlar pipeline transaction'ı içinde, başarılı chunk'larla birlikte commit edilir.
+    """
+
+    orm_model = PipelineDeadLetter
+
+    async def add_many(self, entries: Sequence[PipelineDeadLetterCreate]) -> int:
+        if not entries:
+            return 0
+        await self.db.execute(
+            insert(PipelineDeadLetter).values([entry.model_dump() for entry in entries])
+        )
+        return len(entries)
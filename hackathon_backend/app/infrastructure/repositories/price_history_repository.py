@@ -1,16 +1,47 @@
-from typing import List, Optional, Type
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
 
-from sqlalchemy import desc, select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    any_,
+    bindparam,
+    desc,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.i_repositories.i_price_history_repository import IPriceHistoryRepository
 from app.domain.schemas.price.price_history import (
     PriceHistory as PriceHistorySchema,
+)
+from app.domain.schemas.price.price_history import (
     PriceHistoryCreate,
+    PriceObservation,
 )
 from app.infrastructure.repositories.base_repository import BaseRepository
 from app.persistence.models.price.price_history import PriceHistory as PriceHistoryModel
 
+# insert_many'nin yazdığı kolonlar (id ve created_at veritabanında üretilir)
+_INSERT_COLUMNS: Tuple[str, ...] = (
+    "mapping_id",
+    "variant_id",
+    "price",
+    "original_price",
+    "discount_rate",
+    "currency_id",
+    "in_stock",
+    "stock_quantity",
+)
+
 
 class PriceHistoryRepository(BaseRepository, IPriceHistoryRepository):
     """
@@ -21,6 +52,13 @@ class PriceHistoryRepository(BaseRepository, IPriceHistoryRepository):
     orm_model: Type[PriceHistoryModel] = PriceHistoryModel
     schema_class: Type[PriceHistorySchema] = PriceHistorySchema
 
+    # Günlük partition adı: price_histories_pYYYYMMDD
+    PARTITION_PREFIX = "price_histories_p"
+    # Tek INSERT'teki satır sayısı (bind parametre limiti 32767 / 8 kolon)
+    INSERT_CHUNK_SIZE = 4000
+    # Bu sayıdan itibaren satırlar COPY ile yazılır
+    COPY_THRESHOLD = 10_000
+
     def __init__(self, db: AsyncSession) -> None:
         super().__init__(db)
 
@@ -37,6 +75,51 @@ class PriceHistoryRepository(BaseRepository, IPriceHistoryRepository):
         db_objs = result.scalars().all()
         return [self._to_schema(obj) for obj in db_objs]  # type: ignore
 
+    async def get_recent_prices_by_mapping_ids(
+        self, mapping_ids: Sequence[int], limit: int = 10
+    ) -> Dict[int, List[Decimal]]:
+        """
+        Birden fazla mapping için son `limit` fiyatı tek sorguda getirir.
+
+        ROW_NUMBER() OVER (PARTITION BY mapping_id ORDER BY created_at DESC)
+        ile her mapping'in en yeni kayıtları numaralandırılır. Sonuç
+        {mapping_id: [fiyat, ...]} şeklinde, en yeniden eskiye sıralı döner.
+        Geçmişi olmayan mapping'ler sözlükte yer almaz.
+        """
+        unique_ids = list(dict.fromkeys(mapping_ids))
+        if not unique_ids or limit <= 0:
+            return {}
+
+        row_number = (
+            func.row_number()
+            .over(
+                partition_by=PriceHistoryModel.mapping_id,
+                order_by=(
+                    desc(PriceHistoryModel.created_at),
+                    desc(PriceHistoryModel.id),
+                ),
+            )
+            .label("rn")
+        )
+        ranked = (
+            select(PriceHistoryModel.mapping_id, PriceHistoryModel.price, row_number)
+            .where(
+                PriceHistoryModel.mapping_id
+                == any_(bindparam("mapping_ids", unique_ids, type_=ARRAY(Integer)))
+            )
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(ranked.c.mapping_id, ranked.c.price)
+            .where(ranked.c.rn <= limit)
+            .order_by(ranked.c.mapping_id, ranked.c.rn)
+        )
+
+        prices: Dict[int, List[Decimal]] = {}
+        for mapping_id, price in result.all():
+            prices.setdefault(mapping_id, []).append(price)
+        return prices
+
     async def get_by_variant_id(
         self, variant_id: int, limit: int = 100
     ) -> List[PriceHistorySchema]:
@@ -93,3 +176,205 @@ class PriceHistoryRepository(BaseRepository, IPriceHistoryRepository):
             await self.db.flush()
 
         return [self._to_schema(obj) for obj in db_objs]  # type: ignore
+
+    async def get_latest_observations(
+        self, mapping_ids: Sequence[int]
+    ) -> Dict[int, PriceObservation]:
+        """
+        Her mapping'in en son fiyat kaydı; DISTINCT ON (mapping_id) ile tek sorgu
+        (ix_price_histories_mapping_id_created_at kullanılır).
+        """
+        unique_ids = list(dict.fromkeys(mapping_ids))
+        if not unique_ids:
+            return {}
+
+        ph = PriceHistoryModel
+        result = await self.db.execute(
+            select(
+                ph.mapping_id,
+                ph.id,
+                ph.created_at,
+                ph.price,
+                ph.original_price,
+                ph.in_stock,
+                ph.stock_quantity,
+            )
+            .where(
+                ph.mapping_id
+                == any_(bindparam("mapping_ids", unique_ids, type_=ARRAY(Integer)))
+            )
+            .distinct(ph.mapping_id)
+            .order_by(ph.mapping_id, desc(ph.created_at), desc(ph.id))
+        )
+        return {
+            row.mapping_id: PriceObservation(
+                id=row.id,
+                created_at=row.created_at,
+                price=row.price,
+                original_price=row.original_price,
+                in_stock=row.in_stock,
+                stock_quantity=row.stock_quantity,
+            )
+            for row in result.all()
+        }
+
+    async def touch_last_seen(self, observations: Sequence[PriceObservation]) -> int:
+        """
+        Değişmeyen gözlemler için kayıtların last_seen_at'ini transaction
+        zamanına çeker. (id, created_at) ile partition'ı doğrudan hedefler.
+        """
+        if not observations:
+            return 0
+
+        ph = PriceHistoryModel
+        result = await self.db.execute(
+            update(ph)
+            .where(
+                tuple_(ph.id, ph.created_at).in_(
+                    select(
+                        func.unnest(
+                            bindparam(
+                                "ids",
+                                [o.id for o in observations],
+                                type_=ARRAY(Integer),
+                            )
+                        ),
+                        func.unnest(
+                            bindparam(
+                                "created_ats",
+                                [o.created_at for o in observations],
+                                type_=ARRAY(DateTime(timezone=True)),
+                            )
+                        ),
+                    )
+                )
+            )
+            .values(last_seen_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0  # type: ignore[attr-defined]
+
+    async def insert_many(self, items: Sequence[PriceHistoryCreate]) -> List[int]:
+        """
+        Yüksek hacimli ingest: ORM nesnesi, refresh ve şema dönüşümü olmadan
+        satırları yazar ve sadece id'leri (items sırasıyla) döner.
+
+        COPY_THRESHOLD ve üzeri satır asyncpg COPY ile, daha azı chunk başına tek
+        multi-row INSERT ... RETURNING id ile yazılır. Commit çağırana aittir.
+        """
+        if not items:
+            return []
+
+        rows = [
+            tuple(getattr(item, column) for column in _INSERT_COLUMNS) for item in items
+        ]
+        if len(rows) >= self.COPY_THRESHOLD:
+            driver = await self._driver_connection()
+            if hasattr(driver, "copy_records_to_table"):
+                return await self._copy_rows(driver, rows)
+        return await self._insert_rows(rows)
+
+    async def _insert_rows(self, rows: List[Tuple[Any, ...]]) -> List[int]:
+        table = PriceHistoryModel.__table__
+        ids: List[int] = []
+        for start in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+            values = [
+                dict(zip(_INSERT_COLUMNS, row, strict=True))
+                for row in rows[start : start + self.INSERT_CHUNK_SIZE]
+            ]
+            result = await self.db.execute(
+                insert(table).values(values).returning(table.c.id)
+            )
+            ids.extend(result.scalars().all())
+        return ids
+
+    async def _copy_rows(self, driver: Any, rows: List[Tuple[Any, ...]]) -> List[int]:
+        """
+        id'ler sequence'tan tek sorguda ayrılır, satırlar id ile birlikte COPY
+        edilir; böylece COPY de id döndürebilir. Session'ın transaction'ında çalışır.
+        """
+        result = await self.db.execute(
+            text(
+                "SELECT nextval('price_histories_id_seq')"
+                " FROM generate_series(1, :count)"
+            ),
+            {"count": len(rows)},
+        )
+        ids = [int(value) for value in result.scalars().all()]
+        await driver.copy_records_to_table(
+            PriceHistoryModel.__tablename__,
+            records=[(row_id, *row) for row_id, row in zip(ids, rows, strict=True)],
+            columns=("id", *_INSERT_COLUMNS),
+        )
+        return ids
+
+    async def _driver_connection(self) -> Any:
+        """Session'ın kullandığı bağlantının sürücü (asyncpg) nesnesi."""
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    async def ensure_partitions(self, from_day: date, to_day: date) -> int:
+        """
+        [from_day, to_day] aralığındaki eksik günlük partition'ları oluşturur.
+        Oluşturulan partition sayısını döner.
+        """
+        result = await self.db.execute(
+            text("SELECT create_price_history_partitions(:from_day, :to_day)"),
+            {"from_day": from_day, "to_day": to_day},
+        )
+        return int(result.scalar() or 0)
+
+    async def get_partition_days(self) -> List[date]:
+        """Mevcut günlük partition'ların günlerini (eskiden yeniye) döner."""
+        result = await self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'price_histories'::regclass"
+            )
+        )
+        days: List[date] = []
+        for (name,) in result.all():
+            if not name.startswith(self.PARTITION_PREFIX):
+                continue
+            suffix = name[len(self.PARTITION_PREFIX) :]
+            try:
+                days.append(datetime.strptime(suffix, "%Y%m%d").date())
+            except ValueError:
+                continue
+        return sorted(days)
+
+    async def carry_open_intervals(self, day: date) -> int:
+        """
+        Günün partition'ındaki, ertesi güne uzanan aralıkları (last_seen_at >=
+        ertesi gün) ertesi günün başından başlayan kopyalar olarak yazar.
+        Partition silindiğinde açık aralıklar ve son gözlemler kaybolmaz.
+        Ertesi günün partition'ı mevcut olmalıdır. Kopyalanan satır sayısını döner.
+        """
+        ph = PriceHistoryModel
+        day_start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        next_day = day_start + timedelta(days=1)
+        source = select(
+            *(getattr(ph, column) for column in _INSERT_COLUMNS),
+            literal(next_day, DateTime(timezone=True)),
+            ph.last_seen_at,
+        ).where(
+            ph.created_at >= day_start,
+            ph.created_at < next_day,
+            ph.last_seen_at >= next_day,
+        )
+        result = await self.db.execute(
+            insert(ph).from_select(
+                (*_INSERT_COLUMNS, "created_at", "last_seen_at"), source
+            )
+        )
+        return result.rowcount or 0  # type: ignore[attr-defined]
+
+    async def drop_partition(self, day: date) -> None:
+        """Verilen günün partition'ını ayırır ve siler."""
+        name = f"{self.PARTITION_PREFIX}{day:%Y%m%d}"
+        await self.db.execute(
+            text(f'ALTER TABLE price_histories DETACH PARTITION "{name}"')
+        )
+        await self.db.execute(text(f'DROP TABLE "{name}"'))
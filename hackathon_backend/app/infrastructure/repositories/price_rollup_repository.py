@@ -0,0 +1,177 @@
+from datetime import datetime
+from typing import Any, List, Type
+
+from sqlalchemy import Select, and_, delete, func, literal_column, select
+from sqlalchemy.dialects.postgresql import Insert, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.i_repositories.i_price_rollup_repository import IPriceRollupRepository
+from app.domain.schemas.price.price_rollup import PriceRollup as PriceRollupSchema
+from app.infrastructure.repositories.base_repository import BaseRepository
+from app.persistence.models.price.price_history import PriceHistory as PriceHistoryModel
+from app.persistence.models.price.price_rollup import (
+    PriceHistoryDaily as PriceHistoryDailyModel,
+)
+from app.persistence.models.price.price_rollup import (
+    PriceHistoryHourly as PriceHistoryHourlyModel,
+)
+from app.persistence.models.products.product_mappings import ProductMapping
+
+_ROLLUP_COLUMNS = (
+    "mapping_id",
+    "bucket_start",
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "sample_count",
+)
+
+# GROUP BY ifadesiyle birebir eşleşmesi için bind parametre yerine literal
+_HOUR = literal_column("'hour'")
+_DAY = literal_column("'day'")
+_UTC = literal_column("'UTC'")
+_ONE_HOUR = literal_column("interval '1 hour'")
+
+
+class PriceRollupRepository(BaseRepository, IPriceRollupRepository):
+    """
+    Price Rollup Repository Implementation.
+    Rollup'lar INSERT ... SELECT ... ON CONFLICT DO UPDATE ile tamamen
+    veritabanında hesaplanır; satırlar Python'a taşınmaz.
+    """
+
+    orm_model: Type[PriceHistoryHourlyModel] = PriceHistoryHourlyModel
+    schema_class: Type[PriceRollupSchema] = PriceRollupSchema
+
+    def __init__(self, db: AsyncSession) -> None:
+        super().__init__(db)
+
+    async def rollup_hourly(self, since: datetime, until: datetime) -> int:
+        """
+        Ham fiyatları (mapping, UTC saat) bazında OHLC'ye indirger.
+        Her satır created_at'ten last_seen_at'e kadar değişmemiş bir aralıktır:
+        kapsadığı her saate (aralık sonuna kadar fiyat taşınarak) sayılır.
+        """
+        ph = PriceHistoryModel
+        seen_until = func.coalesce(ph.last_seen_at, ph.created_at)
+        hours = func.generate_series(
+            func.date_trunc(_HOUR, func.greatest(ph.created_at, since), _UTC),
+            func.date_trunc(_HOUR, seen_until, _UTC),
+            _ONE_HOUR,
+        )
+        intervals = (
+            select(
+                ph.mapping_id,
+                ph.id,
+                ph.created_at,
+                ph.price,
+                hours.label("bucket_start"),
+            )
+            .where(
+                ph.mapping_id.is_not(None),
+                ph.created_at < until,
+                seen_until >= since,
+            )
+            .subquery()
+        )
+        row = intervals.c
+        opening = aggregate_order_by(row.price, row.created_at, row.id)
+        closing = aggregate_order_by(row.price, row.created_at.desc(), row.id.desc())
+        source = (
+            select(
+                row.mapping_id,
+                row.bucket_start,
+                func.array_agg(opening)[1],
+                func.max(row.price),
+                func.min(row.price),
+                func.array_agg(closing)[1],
+                func.count(),
+            )
+            .where(row.bucket_start < until)
+            .group_by(row.mapping_id, row.bucket_start)
+        )
+        return await self._upsert_from(PriceHistoryHourlyModel, source)
+
+    async def rollup_daily(self, since: datetime, until: datetime) -> List[int]:
+        """
+        Saatlik rollup'ları (mapping, UTC gün) bazında OHLC'ye indirger.
+        Önceki kapanışlar upsert ile aynı statement'ta (aynı snapshot'tan)
+        okunur; kapanışı değişen veya yeni eklenen günlerin ürünleri döner.
+        """
+        hourly = PriceHistoryHourlyModel
+        bucket = func.date_trunc(_DAY, hourly.bucket_start, _UTC)
+        source = (
+            select(
+                hourly.mapping_id,
+                bucket,
+                func.array_agg(
+                    aggregate_order_by(hourly.open_price, hourly.bucket_start)
+                )[1],
+                func.max(hourly.high_price),
+                func.min(hourly.low_price),
+                func.array_agg(
+                    aggregate_order_by(hourly.close_price, hourly.bucket_start.desc())
+                )[1],
+                func.sum(hourly.sample_count),
+            )
+            .where(hourly.bucket_start >= since, hourly.bucket_start < until)
+            .group_by(hourly.mapping_id, bucket)
+        )
+        daily = PriceHistoryDailyModel
+        previous = (
+            select(daily.mapping_id, daily.bucket_start, daily.close_price)
+            .where(daily.bucket_start >= since, daily.bucket_start < until)
+            .cte("previous")
+        )
+        upserted = (
+            self._upsert_statement(daily, source)
+            .returning(daily.mapping_id, daily.bucket_start, daily.close_price)
+            .cte("upserted")
+        )
+        result = await self.db.execute(
+            select(ProductMapping.product_id)
+            .distinct()
+            .select_from(upserted)
+            .join(ProductMapping, ProductMapping.id == upserted.c.mapping_id)
+            .outerjoin(
+                previous,
+                and_(
+                    previous.c.mapping_id == upserted.c.mapping_id,
+                    previous.c.bucket_start == upserted.c.bucket_start,
+                ),
+            )
+            .where(
+                ProductMapping.product_id.is_not(None),
+                previous.c.close_price.is_distinct_from(upserted.c.close_price),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def delete_hourly_before(self, cutoff: datetime) -> int:
+        result = await self.db.execute(
+            delete(PriceHistoryHourlyModel).where(
+                PriceHistoryHourlyModel.bucket_start < cutoff
+            )
+        )
+        return result.rowcount or 0  # type: ignore[attr-defined]
+
+    async def _upsert_from(self, model: Any, source: Select[Any]) -> int:
+        result = await self.db.execute(self._upsert_statement(model, source))
+        return result.rowcount or 0  # type: ignore[attr-defined]
+
+    @staticmethod
+    def _upsert_statement(model: Any, source: Select[Any]) -> Insert:
+        stmt = pg_insert(model).from_select(_ROLLUP_COLUMNS, source)
+        return stmt.on_conflict_do_update(
+            index_elements=[model.mapping_id, model.bucket_start],
+            set_={
+                "open_price": stmt.excluded.open_price,
+                "high_price": stmt.excluded.high_price,
+                "low_price": stmt.excluded.low_price,
+                "close_price": stmt.excluded.close_price,
+                "sample_count": stmt.excluded.sample_count,
+                "updated_at": func.now(),
+            },
+        )
@@ -0,0 +1,129 @@
+from decimal import Decimal
+from typing import Dict, List, Mapping, Sequence, Type
+
+from sqlalchemy import Integer, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.i_repositories.i_price_statistic_repository import (
+    IPriceStatisticRepository,
+)
+from app.domain.schemas.price.price_statistic import (
+    PriceStatistic as PriceStatisticSchema,
+)
+from app.infrastructure.repositories.base_repository import BaseRepository
+from app.persistence.models.price.price_statistic import (
+    PriceStatistic as PriceStatisticModel,
+)
+
+
+class PriceStatisticRepository(BaseRepository, IPriceStatisticRepository):
+    """
+    Price Statistic Repository Implementation.
+    Mapping başına count/sum/min/max, son N fiyat ve EWMA tutar.
+    """
+
+    orm_model: Type[PriceStatisticModel] = PriceStatisticModel
+    schema_class: Type[PriceStatisticSchema] = PriceStatisticSchema
+
+    # Tek statement'taki satır sayısı (bind parametre limiti için)
+    BULK_CHUNK_SIZE = 2000
+
+    def __init__(self, db: AsyncSession) -> None:
+        super().__init__(db)
+
+    async def get_by_mapping_ids(
+        self, mapping_ids: Sequence[int]
+    ) -> Dict[int, PriceStatisticSchema]:
+        """Birden fazla mapping'in istatistiklerini tek sorguda getirir."""
+        unique_ids = list(dict.fromkeys(mapping_ids))
+        if not unique_ids:
+            return {}
+
+        result = await self.db.execute(
+            select(PriceStatisticModel).where(
+                PriceStatisticModel.mapping_id
+                == any_(bindparam("mapping_ids", unique_ids, type_=ARRAY(Integer)))
+            )
+        )
+        return {
+            obj.mapping_id: self._to_schema(obj)  # type: ignore
+            for obj in result.scalars().all()
+        }
+
+    async def apply_samples(
+        self, samples: Mapping[int, List[Decimal]]
+    ) -> Dict[int, PriceStatisticSchema]:
+        """
+        Yeni fiyatları mevcut istatistiklere ekler (upsert).
+
+        Chunk başına iki statement çalışır: mevcut satırlar SELECT ... FOR
+        UPDATE ile kilitlenerek okunur, Python'da birleştirilir ve tek
+        INSERT ... ON CONFLICT DO UPDATE ile yazılır. Deadlock'a karşı
+        satırlar mapping_id sırasıyla kilitlenir.
+        """
+        mapping_ids = sorted(m for m, prices in samples.items() if prices)
+        updated: Dict[int, PriceStatisticSchema] = {}
+
+        for start in range(0, len(mapping_ids), self.BULK_CHUNK_SIZE):
+            chunk = mapping_ids[start : start + self.BULK_CHUNK_SIZE]
+            updated.update(await self._apply_chunk(chunk, samples))
+
+        return updated
+
+    async def _apply_chunk(
+        self, mapping_ids: List[int], samples: Mapping[int, List[Decimal]]
+    ) -> Dict[int, PriceStatisticSchema]:
+        result = await self.db.execute(
+            select(PriceStatisticModel)
+            .where(
+                PriceStatisticModel.mapping_id
+                == any_(bindparam("mapping_ids", mapping_ids, type_=ARRAY(Integer)))
+            )
+            .order_by(PriceStatisticModel.mapping_id)
+            .with_for_update()
+        )
+        current = {
+            obj.mapping_id: self._to_schema(obj) for obj in result.scalars().all()
+        }
+
+        merged: Dict[int, PriceStatisticSchema] = {}
+        for mapping_id in mapping_ids:
+            base = current.get(mapping_id) or PriceStatisticSchema(
+                mapping_id=mapping_id
+            )
+            merged[mapping_id] = base.with_samples(samples[mapping_id])  # type: ignore
+
+        stmt = pg_insert(PriceStatisticModel).values(
+            [
+                stat.model_dump(
+                    include={
+                        "mapping_id",
+                        "sample_count",
+                        "price_sum",
+                        "min_price",
+                        "max_price",
+                        "last_price",
+                        "recent_prices",
+                        "ewma_price",
+                    }
+                )
+                for stat in merged.values()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PriceStatisticModel.mapping_id],
+            set_={
+                "sample_count": stmt.excluded.sample_count,
+                "price_sum": stmt.excluded.price_sum,
+                "min_price": stmt.excluded.min_price,
+                "max_price": stmt.excluded.max_price,
+                "last_price": stmt.excluded.last_price,
+                "recent_prices": stmt.excluded.recent_prices,
+                "ewma_price": stmt.excluded.ewma_price,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+        return merged
@@ -1,6 +1,7 @@
-from typing import Optional, Type
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Type
 
-from sqlalchemy import select
+from sqlalchemy import Integer, column, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.i_repositories.i_product_mapping_repository import (
@@ -8,6 +9,8 @@ from app.domain.i_repositories.i_product_mapping_repository import (
 )
 from app.domain.schemas.products.product_mapping import (
     ProductMapping as ProductMappingSchema,
+)
+from app.domain.schemas.products.product_mapping import (
     ProductMappingCreate,
 )
 from app.infrastructure.repositories.base_repository import BaseRepository
@@ -25,6 +28,10 @@ class ProductMappingRepository(BaseRepository, IProductMappingRepository):
     orm_model: Type[ProductMappingModel] = ProductMappingModel
     schema_class: Type[ProductMappingSchema] = ProductMappingSchema
 
+    # PostgreSQL tek sorguda en fazla 32767 bind parametresi kabul eder;
+    # satır başına 3 parametre ile bu değer limitin güvenle altında kalır.
+    BULK_CHUNK_SIZE = 5000
+
     def __init__(self, db: AsyncSession) -> None:
         super().__init__(db)
 
@@ -65,6 +72,117 @@ class ProductMappingRepository(BaseRepository, IProductMappingRepository):
         )
         return await self.create(obj_in=create_data, commit=False)  # type: ignore
 
+    async def bulk_find_or_create(
+        self, items: Sequence[Tuple[int, str, Optional[str]]]
+    ) -> Dict[Tuple[int, str], ProductMappingSchema]:
+        """
+        (provider_id, external_product_code, product_url) listesi için
+        mapping'leri toplu olarak bulur veya oluşturur.
+
+        Her BULK_CHUNK_SIZE'lık dilim için en fazla 3 sorgu çalışır:
+        1. Mevcut çiftler tek SELECT ile çekilir.
+        2. Eksikler tek INSERT ... ON CONFLICT DO NOTHING RETURNING ile eklenir.
+        3. Eşzamanlı bir insert'e kaybedilen çiftler (RETURNING'de dönmeyenler)
+           tek SELECT ile tekrar okunur.
+        """
+        # Aynı çift batch içinde birden fazla gelebilir, ilk URL geçerli
+        requested: Dict[Tuple[int, str], Optional[str]] = {}
+        for provider_id, external_code, product_url in items:
+            requested.setdefault((provider_id, external_code), product_url)
+
+        if not requested:
+            return {}
+
+        keys = list(requested)
+        resolved: Dict[Tuple[int, str], ProductMappingSchema] = {}
+        for start in range(0, len(keys), self.BULK_CHUNK_SIZE):
+            chunk = keys[start : start + self.BULK_CHUNK_SIZE]
+            resolved.update(await self._resolve_chunk(chunk, requested))
+        return resolved
+
+    async def _resolve_chunk(
+        self,
+        keys: List[Tuple[int, str]],
+        urls: Dict[Tuple[int, str], Optional[str]],
+    ) -> Dict[Tuple[int, str], ProductMappingSchema]:
+        """Tek bir chunk için SELECT + INSERT ON CONFLICT akışını çalıştırır."""
+        resolved = await self._get_by_keys(keys)
+
+        missing = [key for key in keys if key not in resolved]
+        if not missing:
+            return resolved
+
+        stmt = (
+            pg_insert(ProductMappingModel)
+            .values(
+                [
+                    {
+                        "provider_id": provider_id,
+                        "external_product_code": external_code,
+                        "product_url": urls.get((provider_id, external_code)),
+                    }
+                    for provider_id, external_code in missing
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uix_provider_external_code")
+            .returning(ProductMappingModel)
+        )
+        result = await self.db.execute(stmt)
+        for db_obj in result.scalars().all():
+            key = (db_obj.provider_id, db_obj.external_product_code)
+            resolved[key] = self._to_schema(db_obj)  # type: ignore
+
+        # Başka bir transaction aynı anda eklediyse RETURNING boş döner
+        lost = [key for key in missing if key not in resolved]
+        if lost:
+            resolved.update(await self._get_by_keys(lost))
+
+        return resolved
+
+    async def _get_by_keys(
+        self, keys: List[Tuple[int, str]]
+    ) -> Dict[Tuple[int, str], ProductMappingSchema]:
+        """(provider_id, external_product_code) çiftlerini tek sorguda getirir."""
+        result = await self.db.execute(
+            select(ProductMappingModel).where(
+                tuple_(
+                    ProductMappingModel.provider_id,
+                    ProductMappingModel.external_product_code,
+                ).in_(keys)
+            )
+        )
+        return {
+            (db_obj.provider_id, db_obj.external_product_code): (
+                self._to_schema(db_obj)  # type: ignore
+            )
+            for db_obj in result.scalars().all()
+        }
+
+    async def assign_products(self, assignments: Mapping[int, int]) -> int:
+        """
+        mapping_id -> product_id atamalarını chunk başına tek
+        UPDATE ... FROM (VALUES ...) ile yazar. Güncellenen satır sayısını döner.
+        """
+        pairs = list(assignments.items())
+        updated = 0
+        for start in range(0, len(pairs), self.BULK_CHUNK_SIZE):
+            assigned = values(
+                column("mapping_id", Integer),
+                column("product_id", Integer),
+                name="assigned",
+            ).data(pairs[start : start + self.BULK_CHUNK_SIZE])
+            stmt = (
+                update(ProductMappingModel)
+                .where(ProductMappingModel.id == assigned.c.mapping_id)
+                .values(product_id=assigned.c.product_id)
+                # Session'daki mapping nesneleri product_id okumaz;
+                # senkronizasyon gereksiz
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.db.execute(stmt)
+            updated += result.rowcount or 0  # type: ignore[attr-defined]
+        return updated
+
     async def get_orm(self, mapping_id: int) -> Optional[ProductMappingModel]:
         """
         ORM entity olarak mapping getirir (SQLAlchemy dirty tracking için).
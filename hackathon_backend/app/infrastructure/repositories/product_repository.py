@@ -1,17 +1,107 @@
-from typing import Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-# Actually, I should use the ORM model directly or the Entity if it's separated.
-# The codebase uses 'app.persistence.models.products.product' as the ORM model.
-# Let's check imports in other repos. ProviderRepository used 'app.persistence.models.providers.provider'.
+from app.domain.i_repositories.i_product_repository import IProductRepository
 from app.infrastructure.repositories.base_repository import BaseRepository
 from app.persistence.models.products.product import Product
+from app.persistence.models.products.product_variant import ProductVariant
+
+
+class ProductRepository(BaseRepository, IProductRepository):
+    """
+    Product Repository Implementation.
+    Eşleştirme adımı için isim çözümleme ve toplu ürün/varyant ekleme.
+    """
 
-class ProductRepository(BaseRepository):
     orm_model = Product
 
+    # Tek statement'taki satır sayısı (bind parametre limiti için)
+    BULK_CHUNK_SIZE = 5000
+
     async def get_by_name(self, name: str) -> Optional[Product]:
         query = select(self.orm_model).where(self.orm_model.name == name)
         result = await self.db.execute(query)
         return result.scalars().first()
+
+    async def get_ids_by_names(self, names: Sequence[str]) -> Dict[str, int]:
+        """name = ANY(:names) ile tek sorgu (ix_products_name_id kullanılır)."""
+        unique_names = list(dict.fromkeys(names))
+        if not unique_names:
+            return {}
+
+        result = await self.db.execute(
+            select(Product.name, Product.id)
+            .where(
+                Product.name
+                == any_(bindparam("names", unique_names, type_=ARRAY(String)))
+            )
+            .order_by(Product.id)
+        )
+        ids: Dict[str, int] = {}
+        for name, product_id in result.all():
+            ids.setdefault(name, product_id)
+        return ids
+
+    async def get_match_candidates(self) -> List[Tuple[int, str, Optional[str]]]:
+        """Sadece index'in ihtiyaç duyduğu kolonlar; ORM nesnesi üretilmez."""
+        result = await self.db.execute(
+            select(Product.id, Product.name, Product.brand).order_by(Product.id)
+        )
+        return [(product_id, name, brand) for product_id, name, brand in result.all()]
+
+    async def bulk_create(
+        self, products: Sequence[Mapping[str, Any]]
+    ) -> Dict[str, int]:
+        """
+        Chunk başına tek INSERT ... ON CONFLICT (slug) DO NOTHING RETURNING.
+        Eşzamanlı bir insert'e kaybedilen slug'lar tek SELECT ile okunur.
+        """
+        rows: Dict[str, Mapping[str, Any]] = {}
+        for product in products:
+            rows.setdefault(product["slug"], product)
+        if not rows:
+            return {}
+
+        # Eşzamanlı batch'ler satırları aynı sırada kilitlesin (deadlock olmasın)
+        values: List[Mapping[str, Any]] = [rows[slug] for slug in sorted(rows)]
+        ids: Dict[str, int] = {}
+        for start in range(0, len(values), self.BULK_CHUNK_SIZE):
+            stmt = (
+                pg_insert(Product)
+                .values(values[start : start + self.BULK_CHUNK_SIZE])
+                .on_conflict_do_nothing(index_elements=[Product.slug])
+                .returning(Product.slug, Product.id)
+            )
+            result = await self.db.execute(stmt)
+            ids.update({slug: product_id for slug, product_id in result.all()})
+
+        lost = [slug for slug in rows if slug not in ids]
+        if lost:
+            result = await self.db.execute(
+                select(Product.slug, Product.id).where(
+                    Product.slug == any_(bindparam("slugs", lost, type_=ARRAY(String)))
+                )
+            )
+            ids.update({slug: product_id for slug, product_id in result.all()})
+        return ids
+
+    async def bulk_create_variants(self, variants: Sequence[Mapping[str, Any]]) -> int:
+        """Core insert() ile chunk başına tek multi-row INSERT ... ON CONFLICT (sku)."""
+        rows: Dict[str, Mapping[str, Any]] = {}
+        for variant in variants:
+            rows.setdefault(variant["sku"], variant)
+
+        values: List[Mapping[str, Any]] = [rows[sku] for sku in sorted(rows)]
+        created = 0
+        for start in range(0, len(values), self.BULK_CHUNK_SIZE):
+            stmt = (
+                pg_insert(ProductVariant)
+                .values(values[start : start + self.BULK_CHUNK_SIZE])
+                .on_conflict_do_nothing(index_elements=[ProductVariant.sku])
+            )
+            result = await self.db.execute(stmt)
+            created += result.rowcount or 0  # type: ignore[attr-defined]
+        return created
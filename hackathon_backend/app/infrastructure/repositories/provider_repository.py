@@ -1,4 +1,4 @@
-from typing import Optional, Dict
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -30,3 +30,18 @@ class ProviderRepository(BaseRepository):
         providers = result.scalars().all()
         # Slug varsa slug, yoksa ismi (lower/snake_case) kullan
         return {p.slug or p.name.lower().replace(" ", "_"): p.id for p in providers}
+
+    async def get_reliability_scores(
+        self, ids: List[int]
+    ) -> Dict[int, Tuple[float, Optional[int]]]:
+        """{id: (reliability_score, data_quality_score)} - tek sorguda."""
+        query = select(
+            self.orm_model.id,
+            self.orm_model.reliability_score,
+            self.orm_model.data_quality_score,
+        ).where(self.orm_model.id.in_(ids))
+        result = await self.db.execute(query)
+        return {
+            row.id: (float(row.reliability_score), row.data_quality_score)
+            for row in result
+        }
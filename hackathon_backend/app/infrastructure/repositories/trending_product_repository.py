@@ -0,0 +1,46 @@
+from typing import Sequence
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.domain.i_repositories.i_trending_product_repository import (
+    ITrendingProductRepository,
+)
+from app.domain.schemas.analytics.trending_product import TrendingEntry
+from app.infrastructure.repositories.base_repository import BaseRepository
+from app.persistence.models.analytics.trending_product import TrendingProduct
+
+
+class TrendingProductRepository(BaseRepository, ITrendingProductRepository):
+    """
+    Trending Product Repository Implementation.
+    Sıralama DELETE + INSERT yerine rank'e göre upsert edilir; okuyucular
+    commit'e kadar eski, sonra yeni listeyi görür, boş tablo görmez.
+    """
+
+    orm_model = TrendingProduct
+
+    async def replace_ranking(self, entries: Sequence[TrendingEntry]) -> int:
+        if not entries:
+            return 0
+
+        stmt = pg_insert(TrendingProduct).values(
+            [
+                {"rank": rank, "product_id": e.product_id, "trend_score": e.trend_score}
+                for rank, e in enumerate(entries, start=1)
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TrendingProduct.rank],
+            set_={
+                "product_id": stmt.excluded.product_id,
+                "trend_score": stmt.excluded.trend_score,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+        # Liste kısaldıysa eski sıralamanın kuyruğu kalmasın
+        await self.db.execute(
+            delete(TrendingProduct).where(TrendingProduct.rank > len(entries))
+        )
+        return len(entries)
@@ -1,5 +1,6 @@
+from contextlib import asynccontextmanager
 from types import TracebackType
-from typing import Optional, Type
+from typing import AsyncIterator, Optional, Type
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
@@ -9,17 +10,32 @@ from app.infrastructure.repositories.conversation_repository import (
     ConversationRepository,
 )
 from app.infrastructure.repositories.currency_repository import CurrencyRepository
+from app.infrastructure.repositories.current_offer_repository import (
+    CurrentOfferRepository,
+)
 from app.infrastructure.repositories.message_repository import MessageRepository
+from app.infrastructure.repositories.pipeline_dead_letter_repository import (
+    PipelineDeadLetterRepository,
+)
 from app.infrastructure.repositories.price_history_repository import (
     PriceHistoryRepository,
 )
+from app.infrastructure.repositories.price_rollup_repository import (
+    PriceRollupRepository,
+)
+from app.infrastructure.repositories.price_statistic_repository import (
+    PriceStatisticRepository,
+)
 from app.infrastructure.repositories.product_mapping_repository import (
     ProductMappingRepository,
 )
+from app.infrastructure.repositories.product_repository import ProductRepository
+from app.infrastructure.repositories.provider_repository import ProviderRepository
 from app.infrastructure.repositories.role_repository import RoleRepository
+from app.infrastructure.repositories.trending_product_repository import (
+    TrendingProductRepository,
+)
 from app.infrastructure.repositories.user_repository import UserRepository
-from app.infrastructure.repositories.provider_repository import ProviderRepository
-from app.infrastructure.repositories.product_repository import ProductRepository
 from app.persistence.db.session import AsyncSessionLocal
 
 
@@ -57,6 +73,14 @@ class UnitOfWork(IUnitOfWork):
         if self.session:
             await self.session.rollback()
 
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncIterator[None]:
+        async with self.db.begin_nested():
+            yield
+
+    def reader(self) -> "UnitOfWork":
+        return UnitOfWork(self.session_factory)
+
     @property
     def users(self) -> UserRepository:
         return UserRepository(self.db)
@@ -69,10 +93,22 @@ class UnitOfWork(IUnitOfWork):
     def currencies(self) -> CurrencyRepository:
         return CurrencyRepository(self.db)
 
+    @property
+    def current_offers(self) -> CurrentOfferRepository:
+        return CurrentOfferRepository(self.db)
+
     @property
     def price_histories(self) -> PriceHistoryRepository:
         return PriceHistoryRepository(self.db)
 
+    @property
+    def price_rollups(self) -> PriceRollupRepository:
+        return PriceRollupRepository(self.db)
+
+    @property
+    def price_statistics(self) -> PriceStatisticRepository:
+        return PriceStatisticRepository(self.db)
+
     @property
     def product_mappings(self) -> ProductMappingRepository:
         return ProductMappingRepository(self.db)
@@ -97,6 +133,14 @@ class UnitOfWork(IUnitOfWork):
     def products(self) -> ProductRepository:
         return ProductRepository(self.db)
 
+    @property
+    def dead_letters(self) -> PipelineDeadLetterRepository:
+        return PipelineDeadLetterRepository(self.db)
+
+    @property
+    def trending_products(self) -> TrendingProductRepository:
+        return TrendingProductRepository(self.db)
+
     @property
     def db(self) -> AsyncSession:
         if not self.session:
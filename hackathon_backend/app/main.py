@@ -6,8 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import api_router
 from app.core.config.settings import settings
-from app.core.infrastructure.cache import cache
 from app.core.infrastructure.logging import setup_logging
+from app.core.infrastructure.tiered_cache import tiered_cache
 from app.core.web.middleware import RequestLoggerMiddleware
 from app.domain.schemas.common import HealthCheck
 
@@ -18,11 +18,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # 1. Startup: Logging sistemini kur
     # Bu sayede uygulama başlar başlamaz JSON logları akmaya başlar.
     setup_logging()
+    # Diğer worker'ların cache yazımlarında yerel katmanı temizleyen dinleyici
+    await tiered_cache.start()
 
     yield
 
-    # 2. Shutdown: Redis bağlantısını temizle
-    await cache.close()
+    # 2. Shutdown: Dinleyiciyi durdur ve Redis bağlantısını temizle
+    await tiered_cache.close()
 
 
 app = FastAPI(
@@ -40,6 +42,7 @@ app.add_middleware(
     allow_credentials=True,  # Cookie gönderimi için
     allow_methods=["*"],  # Tüm HTTP metodları (GET, POST, PUT, DELETE, vb.)
     allow_headers=["*"],  # Tüm header'lar
+    expose_headers=["X-Next-Cursor"],  # Cursor sayfalama (mesaj listesi)
 )
 
 # 4. Request Logger Middleware
@@ -1,8 +1,10 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config.settings import settings
+from app.core.patterns.instrumentation import record_db_statement
 
 # Motoru (Engine) Başlatıyoruz
 # echo=True ise terminalde SQL sorgularını görürsün (Debug için harika)
@@ -12,6 +14,13 @@ engine = create_async_engine(
     future=True,
 )
 
+
+# Pipeline adım ölçümleri için sorgu sayacı (sadece ölçülen adımlar içinde sayar)
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(*_: Any) -> None:
+    record_db_statement()
+
+
 # Session Fabrikası
 # Veritabanı işlemleri için 'Session' nesneleri üretecek.
 AsyncSessionLocal = async_sessionmaker(
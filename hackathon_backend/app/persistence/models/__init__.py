@@ -10,4 +10,11 @@ from app.persistence.models.providers.provider import Provider # noqa: F401
 from app.persistence.models.price.currency import Currency # noqa: F401
 from app.persistence.models.price.price_history import PriceHistory # noqa: F401
 from app.persistence.models.price.price_tier import PriceTier # noqa: F401
+from app.persistence.models.price.price_statistic import PriceStatistic # noqa: F401
+from app.persistence.models.price.price_rollup import (  # noqa: F401
+    PriceHistoryDaily,
+    PriceHistoryHourly,
+)
+from app.persistence.models.price.current_offer import CurrentOffer, ProductPriceSummary # noqa: F401
 from app.persistence.models.analytics.trending_product import TrendingProduct # noqa: F401
+from app.persistence.models.analytics.pipeline_dead_letter import PipelineDeadLetter # noqa: F401
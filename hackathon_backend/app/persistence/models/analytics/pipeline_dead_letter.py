@@ -0,0 +1,22 @@
+"""PipelineDeadLetter model for items a chunked pipeline run could not process."""
+
+from sqlalchemy import Column, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.persistence.models.base_entity import BaseEntity
+
+
+class PipelineDeadLetter(BaseEntity):
+    """
+    Chunked pipeline çalıştırmasında tek başına da başarısız olan item'lar.
+    Item'ın pipeline'a giren hali (payload) ve hata mesajları saklanır;
+    inceleme/yeniden işleme için kullanılır.
+    """
+    __tablename__ = "pipeline_dead_letters"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    pipeline = Column(String(100), nullable=False, index=True)
+    provider_id = Column(Integer, ForeignKey("providers.id"), nullable=True, index=True)
+    external_product_code = Column(String(255), nullable=True)
+    payload = Column(JSONB, nullable=False)
+    error = Column(Text, nullable=False)
@@ -1,6 +1,6 @@
 """TrendingProduct model for storing top trending products."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, func
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 
 from app.persistence.models.base_entity import BaseEntity
@@ -10,11 +10,24 @@ class TrendingProduct(BaseEntity):
     """
     Cache tablosu: En yüksek trend skoruna sahip ürünleri saklar.
     Pipeline tarafından periyodik olarak güncellenir.
+
+    Satırlar rank'e göre yerinde upsert edilir (tablo hiç boşalmaz). Ürünlerin
+    sıra değiştirmesi tek statement'ta yapılabilsin diye product_id tekilliği
+    commit'te kontrol edilir (DEFERRABLE INITIALLY DEFERRED).
     """
     __tablename__ = "trending_products"
+    __table_args__ = (
+        UniqueConstraint("rank", name="uq_trending_products_rank"),
+        UniqueConstraint(
+            "product_id",
+            name="uq_trending_products_product_id",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, unique=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     trend_score = Column(Integer, nullable=False, default=0)  # -100 to +100
     rank = Column(Integer, nullable=False)  # 1-5
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, relationship
 
 from app.persistence.models.base_entity import BaseEntity
@@ -11,6 +11,10 @@ if TYPE_CHECKING:
 
 class Conversation(BaseEntity):
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Keyset sayfalama: (user_id, updated_at DESC, id DESC)
+        Index("ix_conversations_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, relationship
 
 from app.persistence.models.base_entity import BaseEntity
@@ -11,6 +11,15 @@ if TYPE_CHECKING:
 
 class Message(BaseEntity):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Keyset sayfalama: (conversation_id, created_at, id)
+        Index(
+            "ix_messages_conversation_id_created_at_id",
+            "conversation_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
@@ -0,0 +1,46 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Numeric, func
+
+from app.persistence.models.base_entity import BaseEntity
+
+
+class CurrentOffer(BaseEntity):
+    """
+    Mapping başına en güncel teklif (son fiyat, stok, zaman).
+    Pipeline her çalışmada upsert eder; okuma yolları price_histories
+    yerine bu tabloyu kullanır.
+    """
+    __tablename__ = "current_offers"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mapping_id = Column(
+        Integer, ForeignKey("product_mappings.id"), nullable=False, unique=True
+    )
+    price = Column(Numeric(10, 2), nullable=False)
+    original_price = Column(Numeric(10, 2), nullable=True)
+    in_stock = Column(Boolean, default=True, nullable=False)
+    stock_quantity = Column(Integer, nullable=True)
+    observed_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class ProductPriceSummary(BaseEntity):
+    """
+    Ürün başına current_offers özeti.
+    lowest_price stoktaki en ucuz teklif, stokta teklif yoksa en ucuz tekliftir.
+    """
+    __tablename__ = "product_price_summary"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, unique=True)
+    lowest_price = Column(Numeric(10, 2), nullable=False, index=True)
+    # En ucuz teklifin liste fiyatı
+    original_price = Column(Numeric(10, 2), nullable=True)
+    in_stock = Column(Boolean, nullable=False)
+    offer_count = Column(Integer, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
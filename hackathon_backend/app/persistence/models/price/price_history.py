@@ -1,11 +1,34 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Numeric, func
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.persistence.models.base_entity import BaseEntity
 
 
 class PriceHistory(BaseEntity):
+    """
+    Ham fiyat kayıtları.
+
+    Veritabanında created_at'e göre günlük range-partitioned tablodur
+    (bkz. d5a8f3c61e2b migration'ı); PK (id, created_at)'tir. Eski
+    partition'lar PriceHistoryRetentionService tarafından saatlik/günlük
+    OHLC rollup'lara indirgenip silinir.
+
+    Her satır bir aralıktır: fiyat/stok created_at'ten last_seen_at'e kadar
+    değişmemiştir (NULL ise sadece created_at'te görülmüştür).
+    """
     __tablename__ = "price_histories"
+    __table_args__ = (
+        Index("ix_price_histories_mapping_id_created_at", "mapping_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     mapping_id = Column(Integer, ForeignKey("product_mappings.id"), nullable=True)
@@ -16,10 +39,20 @@ class PriceHistory(BaseEntity):
     currency_id = Column(Integer, ForeignKey("currencies.id"), nullable=False)
     in_stock = Column(Boolean, default=True, nullable=False)
     stock_quantity = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    # Değişmeyen fiyat gözlemleri yeni satır yazmaz, bu alanı ilerletir
+    last_seen_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=True
+    )
 
     # Relationships
     mapping = relationship("ProductMapping")
     variant = relationship("ProductVariant")
     currency = relationship("Currency")
-    price_tiers = relationship("PriceTier", back_populates="price_history")
+    price_tiers = relationship(
+        "PriceTier",
+        back_populates="price_history",
+        primaryjoin="PriceHistory.id == foreign(PriceTier.price_history_id)",
+    )
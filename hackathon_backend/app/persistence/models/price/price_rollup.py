@@ -0,0 +1,61 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    Numeric,
+    UniqueConstraint,
+    func,
+)
+
+from app.persistence.models.base_entity import BaseEntity
+
+
+class PriceHistoryHourly(BaseEntity):
+    """
+    Saatlik OHLC fiyat rollup'ı (mapping başına saat başı bir satır).
+    PriceHistoryRetentionService tarafından ham price_histories'ten üretilir.
+    """
+    __tablename__ = "price_history_hourly"
+    __table_args__ = (
+        UniqueConstraint(
+            "mapping_id", "bucket_start", name="uix_price_history_hourly_mapping_bucket"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mapping_id = Column(Integer, ForeignKey("product_mappings.id"), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # UTC saat başı
+    open_price = Column(Numeric(10, 2), nullable=False)
+    high_price = Column(Numeric(10, 2), nullable=False)
+    low_price = Column(Numeric(10, 2), nullable=False)
+    close_price = Column(Numeric(10, 2), nullable=False)
+    sample_count = Column(Integer, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class PriceHistoryDaily(BaseEntity):
+    """
+    Günlük OHLC fiyat rollup'ı (mapping başına gün başı bir satır).
+    Saatlik rollup'lardan üretilir; ürün detayındaki 30 günlük grafik buradan okunur.
+    """
+    __tablename__ = "price_history_daily"
+    __table_args__ = (
+        UniqueConstraint(
+            "mapping_id", "bucket_start", name="uix_price_history_daily_mapping_bucket"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mapping_id = Column(Integer, ForeignKey("product_mappings.id"), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # UTC gün başı
+    open_price = Column(Numeric(10, 2), nullable=False)
+    high_price = Column(Numeric(10, 2), nullable=False)
+    low_price = Column(Numeric(10, 2), nullable=False)
+    close_price = Column(Numeric(10, 2), nullable=False)
+    sample_count = Column(Integer, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
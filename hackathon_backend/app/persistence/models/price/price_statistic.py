@@ -0,0 +1,29 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, func
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.persistence.models.base_entity import BaseEntity
+
+
+class PriceStatistic(BaseEntity):
+    """
+    Mapping başına artımlı (incremental) fiyat istatistikleri.
+    SavePriceHistoryStep tarafından price_histories insert'i ile aynı
+    transaction içinde güncellenir; trend hesabı ham geçmişi okumaz.
+    """
+    __tablename__ = "price_statistics"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mapping_id = Column(
+        Integer, ForeignKey("product_mappings.id"), nullable=False, unique=True
+    )
+    sample_count = Column(Integer, nullable=False, default=0)
+    price_sum = Column(Numeric(18, 2), nullable=False, default=0)
+    min_price = Column(Numeric(10, 2), nullable=True)
+    max_price = Column(Numeric(10, 2), nullable=True)
+    last_price = Column(Numeric(10, 2), nullable=True)
+    # En yeniden eskiye
+    recent_prices = Column(ARRAY(Numeric(10, 2)), nullable=False, default=list)
+    ewma_price = Column(Numeric(14, 4), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
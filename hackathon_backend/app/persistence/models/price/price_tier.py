@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Column, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
 from app.persistence.models.base_entity import BaseEntity
@@ -8,9 +8,14 @@ class PriceTier(BaseEntity):
     __tablename__ = "price_tiers"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    price_history_id = Column(Integer, ForeignKey("price_histories.id"), nullable=False)
+    # Partitioned price_histories'e FK tanımlanamaz (PK created_at içerir)
+    price_history_id = Column(Integer, nullable=False)
     min_quantity = Column(Integer, nullable=False)
     unit_price = Column(Numeric(10, 2), nullable=False)
     condition_text = Column(String(255), nullable=True)
 
-    price_history = relationship("PriceHistory", back_populates="price_tiers")
+    price_history = relationship(
+        "PriceHistory",
+        back_populates="price_tiers",
+        primaryjoin="foreign(PriceTier.price_history_id) == PriceHistory.id",
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import relationship
 
 from app.persistence.models.base_entity import BaseEntity
@@ -7,6 +7,10 @@ from app.persistence.models.products.category import Category
 
 class Product(BaseEntity):
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset sayfalama: (name, id)
+        Index("ix_products_name_id", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
@@ -0,0 +1,125 @@
+"""
+Integration tests for PriceRollupRepository over change-only price history.
+A price_histories row is an interval: the price held from created_at until
+last_seen_at.
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.repositories.price_rollup_repository import (
+    PriceRollupRepository,
+)
+from app.persistence.models import Product, ProductMapping
+from app.persistence.models.price.currency import Currency
+from app.persistence.models.price.price_history import PriceHistory
+from app.persistence.models.price.price_rollup import PriceHistoryDaily
+
+DAY = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+async def _mapping_id(db_session: AsyncSession) -> int:
+    currency = Currency(code="TRY")
+    product = Product(name="Kamp Çadırı")
+    db_session.add_all([currency, product])
+    await db_session.flush()
+    mapping = ProductMapping(product_id=product.id, external_product_code="TENT-1")
+    db_session.add(mapping)
+    await db_session.flush()
+    return int(mapping.id)
+
+
+async def _daily_closes(db_session: AsyncSession, mapping_id: int) -> list:
+    result = await db_session.execute(
+        select(PriceHistoryDaily.bucket_start, PriceHistoryDaily.close_price)
+        .where(PriceHistoryDaily.mapping_id == mapping_id)
+        .order_by(PriceHistoryDaily.bucket_start)
+    )
+    return [(bucket.date(), close) for bucket, close in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_flat_price_is_rolled_up_for_every_day_it_was_seen(
+    db_session: AsyncSession,
+) -> None:
+    mapping_id = await _mapping_id(db_session)
+    currency_id = (await db_session.execute(select(Currency.id))).scalar_one()
+    db_session.add_all(
+        [
+            # Seen unchanged for four days, then a single drop
+            PriceHistory(
+                mapping_id=mapping_id,
+                price=Decimal("100.00"),
+                currency_id=currency_id,
+                created_at=DAY + timedelta(hours=10),
+                last_seen_at=DAY + timedelta(days=3, hours=18),
+            ),
+            PriceHistory(
+                mapping_id=mapping_id,
+                price=Decimal("90.00"),
+                currency_id=currency_id,
+                created_at=DAY + timedelta(days=3, hours=19),
+                last_seen_at=DAY + timedelta(days=3, hours=19),
+            ),
+        ]
+    )
+    await db_session.flush()
+    repository = PriceRollupRepository(db_session)
+
+    await repository.rollup_hourly(DAY, DAY + timedelta(days=5))
+    await repository.rollup_daily(DAY, DAY + timedelta(days=5))
+
+    assert await _daily_closes(db_session, mapping_id) == [
+        (DAY.date(), Decimal("100.00")),
+        ((DAY + timedelta(days=1)).date(), Decimal("100.00")),
+        ((DAY + timedelta(days=2)).date(), Decimal("100.00")),
+        ((DAY + timedelta(days=3)).date(), Decimal("90.00")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_daily_rollup_reports_products_whose_chart_changed(
+    db_session: AsyncSession,
+) -> None:
+    mapping_id = await _mapping_id(db_session)
+    product_id = (
+        await db_session.execute(
+            select(ProductMapping.product_id).where(ProductMapping.id == mapping_id)
+        )
+    ).scalar_one()
+    currency_id = (await db_session.execute(select(Currency.id))).scalar_one()
+    db_session.add(
+        PriceHistory(
+            mapping_id=mapping_id,
+            price=Decimal("100.00"),
+            currency_id=currency_id,
+            created_at=DAY + timedelta(hours=10),
+            last_seen_at=DAY + timedelta(hours=12),
+        )
+    )
+    await db_session.flush()
+    repository = PriceRollupRepository(db_session)
+    until = DAY + timedelta(days=1)
+
+    await repository.rollup_hourly(DAY, until)
+    assert await repository.rollup_daily(DAY, until) == [product_id]
+    # Recomputing the same closes leaves the chart (and its cache) alone
+    await repository.rollup_hourly(DAY, until)
+    assert await repository.rollup_daily(DAY, until) == []
+
+    db_session.add(
+        PriceHistory(
+            mapping_id=mapping_id,
+            price=Decimal("95.00"),
+            currency_id=currency_id,
+            created_at=DAY + timedelta(hours=13),
+            last_seen_at=DAY + timedelta(hours=13),
+        )
+    )
+    await db_session.flush()
+    await repository.rollup_hourly(DAY, until)
+    assert await repository.rollup_daily(DAY, until) == [product_id]
@@ -3,7 +3,10 @@ Integration tests for ProductAnalysisPipeline.
 Tests the full pipeline flow with mocked dependencies.
 """
 
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -11,7 +14,12 @@ import pytest
 from app.application.pipelines.analytics.product_analysis_pipeline import (
     ProductAnalysisPipeline,
 )
-from app.domain.schemas.price.price_history import PriceHistory, PriceHistoryCreate
+from app.domain.schemas.price.price_history import (
+    PriceHistory,
+    PriceHistoryCreate,
+    PriceObservation,
+)
+from app.domain.schemas.price.price_statistic import PriceStatistic
 from app.domain.schemas.products.product_mapping import ProductMapping
 
 
@@ -50,33 +58,135 @@ class MockProductMappingRepository:
             self.next_id += 1
         return self.mappings[key]
 
+    async def bulk_find_or_create(
+        self, items: List[Tuple[int, str, str | None]]
+    ) -> Dict[Tuple[int, str], ProductMapping]:
+        result: Dict[Tuple[int, str], ProductMapping] = {}
+        for provider_id, external_product_code, product_url in items:
+            result[(provider_id, external_product_code)] = await self.find_or_create(
+                provider_id, external_product_code, product_url
+            )
+        return result
+
+    async def assign_products(self, assignments: Dict[int, int]) -> int:
+        for mapping in self.mappings.values():
+            if mapping.id in assignments:
+                mapping.product_id = assignments[mapping.id]
+        return len(assignments)
+
+
+class MockProductRepository:
+    """Mock ProductRepository."""
+
+    def __init__(self) -> None:
+        self.products: Dict[str, Dict[str, Any]] = {}
+        self.variants: List[Dict[str, Any]] = []
+
+    async def get_ids_by_names(self, names: List[str]) -> Dict[str, int]:
+        by_name = {p["name"]: p["id"] for p in self.products.values()}
+        return {name: by_name[name] for name in names if name in by_name}
+
+    async def get_match_candidates(self) -> List[Tuple[int, str, Optional[str]]]:
+        return [(p["id"], p["name"], p.get("brand")) for p in self.products.values()]
+
+    async def bulk_create(self, products: List[Dict[str, Any]]) -> Dict[str, int]:
+        for product in products:
+            if product["slug"] not in self.products:
+                self.products[product["slug"]] = {
+                    **product,
+                    "id": len(self.products) + 1,
+                }
+        return {p["slug"]: self.products[p["slug"]]["id"] for p in products}
+
+    async def bulk_create_variants(self, variants: List[Dict[str, Any]]) -> int:
+        self.variants.extend(variants)
+        return len(variants)
+
 
 class MockPriceHistoryRepository:
     """Mock PriceHistoryRepository."""
 
     def __init__(self) -> None:
         self.records: List[PriceHistory] = []
+        self.touched: List[int] = []
         self.next_id = 1
 
-    async def create_bulk(
-        self, *, items: List[PriceHistoryCreate], commit: bool = True
-    ) -> List[PriceHistory]:
-        result = []
-        for item in items:
-            record = PriceHistory(
-                id=self.next_id,
-                mapping_id=item.mapping_id,
-                price=item.price,
-                original_price=item.original_price,
-                discount_rate=item.discount_rate,
-                currency_id=item.currency_id,
-                in_stock=item.in_stock,
-                stock_quantity=item.stock_quantity,
+    async def get_latest_observations(
+        self, mapping_ids: List[int]
+    ) -> Dict[int, PriceObservation]:
+        latest = {
+            r.mapping_id: PriceObservation(
+                id=r.id,
+                created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                price=r.price,
+                in_stock=r.in_stock,
+                stock_quantity=r.stock_quantity,
             )
-            self.records.append(record)
-            result.append(record)
+            for r in self.records
+        }
+        return {i: latest[i] for i in mapping_ids if i in latest}
+
+    async def touch_last_seen(self, observations: List[PriceObservation]) -> int:
+        self.touched.extend(o.id for o in observations)
+        return len(observations)
+
+    async def insert_many(self, items: List[PriceHistoryCreate]) -> List[int]:
+        ids = []
+        for item in items:
+            self.records.append(PriceHistory(id=self.next_id, **item.model_dump()))
+            ids.append(self.next_id)
             self.next_id += 1
-        return result
+        return ids
+
+
+class MockPriceStatisticRepository:
+    """Mock PriceStatisticRepository."""
+
+    def __init__(self) -> None:
+        self.statistics: Dict[int, PriceStatistic] = {}
+
+    async def apply_samples(
+        self, samples: Dict[int, List[Decimal]]
+    ) -> Dict[int, PriceStatistic]:
+        for mapping_id, prices in samples.items():
+            current = self.statistics.get(mapping_id) or PriceStatistic(
+                mapping_id=mapping_id
+            )
+            self.statistics[mapping_id] = current.with_samples(prices)
+        return {m: self.statistics[m] for m in samples}
+
+    async def get_by_mapping_ids(
+        self, mapping_ids: List[int]
+    ) -> Dict[int, PriceStatistic]:
+        return {m: self.statistics[m] for m in mapping_ids if m in self.statistics}
+
+
+class MockCurrencyRepository:
+    """Mock CurrencyRepository."""
+
+    async def get_all(self) -> List[SimpleNamespace]:
+        return [
+            SimpleNamespace(id=1, code="TRY"),
+            SimpleNamespace(id=2, code="USD"),
+            SimpleNamespace(id=3, code="EUR"),
+        ]
+
+
+class MockCurrentOfferRepository:
+    """Mock CurrentOfferRepository."""
+
+    def __init__(self) -> None:
+        self.offers: Dict[int, Any] = {}
+        self.summarized_product_ids: List[int] = []
+
+    async def upsert_many(self, offers: List[Any]) -> int:
+        for offer in offers:
+            self.offers[offer.mapping_id] = offer
+        return len(offers)
+
+    async def refresh_price_summaries(self, product_ids: List[int]) -> int:
+        self.summarized_product_ids.extend(product_ids)
+        return len(set(product_ids))
 
 
 class MockUnitOfWork:
@@ -84,7 +194,11 @@ class MockUnitOfWork:
 
     def __init__(self) -> None:
         self.product_mappings = MockProductMappingRepository()
+        self.products = MockProductRepository()
         self.price_histories = MockPriceHistoryRepository()
+        self.price_statistics = MockPriceStatisticRepository()
+        self.currencies = MockCurrencyRepository()
+        self.current_offers = MockCurrentOfferRepository()
         self._committed = False
 
     async def __aenter__(self) -> "MockUnitOfWork":
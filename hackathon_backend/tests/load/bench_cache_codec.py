@@ -0,0 +1,164 @@
+"""
+Cache Codec Benchmark.
+Temsili cache değerlerini (exchange_rates, homepage:data, büyük bir homepage
+dökümü, kategori ağacı) her codec kurulumuyla encode/decode edip değer başına
+süreyi ve bayt boyutunu ölçer. --redis ile değerler Redis'e yazılıp
+MEMORY USAGE ile gerçek bellek tüketimi de raporlanır.
+
+Kurulu olmayan codec'ler (msgpack, zstd) atlanır.
+
+Kullanım:
+    PYTHONPATH=. uv run python tests/load/bench_cache_codec.py
+    Seçenekler: [--iterations 2000] [--redis]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.infrastructure.cache import CacheService
+from app.core.infrastructure.cache_codec import CacheCodec, CodecName, zstd_available
+
+ITERATIONS = 2000
+COMPRESS_MIN_BYTES = 1024
+BENCH_KEY_PREFIX = "bench:codec:"
+
+
+def homepage_payload(items: int) -> Dict[str, Any]:
+    return {
+        "trending": [
+            {
+                "rank": rank,
+                "product_id": rank,
+                "name": f"Trend Ürün {rank} Outdoor Mont Su Geçirmez",
+                "slug": f"trend-urun-{rank}",
+                "brand": "Bench",
+                "image_url": f"https://cdn.example.com/products/{rank}/main.jpg",
+                "trend_score": 90 - rank % 180,
+                "trend_direction": "up",
+                "best_price": "1299.90",
+            }
+            for rank in range(1, items + 1)
+        ],
+        "cached_at": "2026-10-17T12:00:00+00:00",
+    }
+
+
+def category_tree(
+    roots: int = 12, children: int = 8, leaves: int = 6
+) -> List[Dict[str, Any]]:
+    next_id = iter(range(1, 10_000))
+
+    def node(
+        name: str, parent_id: Optional[int], sub: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            "id": next(next_id),
+            "name": name,
+            "slug": name.lower().replace(" ", "-"),
+            "parent_id": parent_id,
+            "children": sub,
+        }
+
+    return [
+        node(
+            f"Kategori {r}",
+            None,
+            [
+                node(
+                    f"Alt Kategori {r}-{c}",
+                    r,
+                    [node(f"Yaprak {r}-{c}-{leaf}", c, []) for leaf in range(leaves)],
+                )
+                for c in range(children)
+            ],
+        )
+        for r in range(roots)
+    ]
+
+
+PAYLOADS: Dict[str, Any] = {
+    "exchange_rates": {"TRY": 1.0, "USD": 32.5, "EUR": 35.1, "GBP": 41.2},
+    "homepage (5)": homepage_payload(5),
+    "homepage (200)": homepage_payload(200),
+    "category tree": category_tree(),
+}
+
+
+def codec_setups() -> List[Tuple[str, CacheCodec]]:
+    setups: List[Tuple[str, CodecName, int]] = [
+        ("json", "json", 0),
+        ("orjson", "orjson", 0),
+    ]
+    has_msgpack = importlib.util.find_spec("msgpack") is not None
+    if has_msgpack:
+        setups.append(("msgpack", "msgpack", 0))
+    if zstd_available():
+        setups.append(("orjson+zstd", "orjson", COMPRESS_MIN_BYTES))
+        if has_msgpack:
+            setups.append(("msgpack+zstd", "msgpack", COMPRESS_MIN_BYTES))
+    return [
+        (label, CacheCodec(name, compress_min_bytes=size))
+        for label, name, size in setups
+    ]
+
+
+def measure(codec: CacheCodec, value: Any, iterations: int) -> Tuple[float, float, int]:
+    """(encode µs, decode µs, bayt)"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        encoded = codec.encode(value)
+    encode_us = (time.perf_counter() - started) / iterations * 1e6
+
+    raw = encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+    started = time.perf_counter()
+    for _ in range(iterations):
+        codec.decode(raw)
+    decode_us = (time.perf_counter() - started) / iterations * 1e6
+    return encode_us, decode_us, len(raw)
+
+
+async def redis_memory(codec: CacheCodec, key: str, value: Any) -> Optional[int]:
+    service = CacheService(codec)
+    try:
+        await service.set(key, value, expire=60)
+        usage: Optional[int] = await service.redis.memory_usage(key)
+        await service.delete(key)
+        return usage
+    finally:
+        await service.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--redis", action="store_true", help="Redis MEMORY USAGE ölç")
+    args = parser.parse_args()
+
+    print(
+        f"{'değer':<16} {'codec':<14} {'encode':>10} {'decode':>10}"
+        f" {'bayt':>9} {'redis':>9}"
+    )
+    for payload_name, value in PAYLOADS.items():
+        for label, codec in codec_setups():
+            encode_us, decode_us, size = measure(codec, value, args.iterations)
+            memory = "-"
+            if args.redis:
+                try:
+                    usage = await redis_memory(
+                        codec, f"{BENCH_KEY_PREFIX}{label}", value
+                    )
+                    memory = str(usage)
+                except Exception as e:
+                    print(f"Redis erişilemiyor: {e}")
+                    args.redis = False
+            print(
+                f"{payload_name:<16} {label:<14}"
+                f" {encode_us:>8.1f}µs {decode_us:>8.1f}µs {size:>9} {memory:>9}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Homepage Cache Benchmark.
+GET /api/v1/homepage isteğini ASGI üzerinden (ağ olmadan) tekrar tekrar çağırıp
+p50/p99 gecikmelerini iki cache kurulumunda karşılaştırır:
+
+- redis: CacheService (her istekte Redis GET + json.loads)
+- redis + local: TieredCacheService (süreç içi LRU, Redis sadece ilk istekte)
+
+homepage:data key'i sentetik bir trending listesiyle doldurulur, böylece
+istekler veritabanına gitmez. Çalışan bir Redis gerektirir (settings.REDIS_URL).
+
+Kullanım:
+    PYTHONPATH=. uv run python tests/load/bench_homepage_cache.py
+    Seçenekler: [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_cache_service
+from app.application.services.homepage_service import (
+    HOMEPAGE_CACHE_KEY,
+    HOMEPAGE_CACHE_STALE_TTL,
+)
+from app.core.config.settings import settings
+from app.core.infrastructure.cache import CacheService
+from app.core.infrastructure.cache_aside import CacheAside
+from app.core.infrastructure.tiered_cache import TieredCacheService
+from app.domain.i_services.i_cache_service import ICacheService
+from app.main import app
+
+REQUESTS = 5000
+WARMUP = 100
+
+
+def homepage_payload() -> Dict[str, Any]:
+    return {
+        "trending": [
+            {
+                "rank": rank,
+                "product_id": rank,
+                "name": f"Trend Ürün {rank}",
+                "slug": f"trend-urun-{rank}",
+                "brand": "Bench",
+                "image_url": f"https://example.com/{rank}.jpg",
+                "trend_score": 90 - rank * 10,
+                "trend_direction": "up",
+                "best_price": "1299.90",
+            }
+            for rank in range(1, 6)
+        ],
+        "cached_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def measure(label: str, cache_service: ICacheService, requests: int) -> None:
+    app.dependency_overrides[get_cache_service] = lambda: cache_service
+    url = f"{settings.API_V1_STR}/homepage"
+    latencies: List[float] = []
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for i in range(WARMUP + requests):
+            started = time.perf_counter()
+            response = await client.get(url)
+            elapsed = (time.perf_counter() - started) * 1000
+            response.raise_for_status()
+            if i >= WARMUP:
+                latencies.append(elapsed)
+    app.dependency_overrides.pop(get_cache_service, None)
+
+    p99 = statistics.quantiles(latencies, n=100)[-1]
+    print(f"{label:<16} p50={statistics.median(latencies):7.3f} ms  p99={p99:7.3f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=REQUESTS)
+    args = parser.parse_args()
+
+    remote = CacheService()
+    try:
+        await CacheAside(remote).put(
+            HOMEPAGE_CACHE_KEY,
+            homepage_payload(),
+            ttl=600,
+            stale_ttl=HOMEPAGE_CACHE_STALE_TTL,
+        )
+    except Exception as e:
+        print(f"Redis erişilemiyor ({settings.REDIS_URL}): {e}")
+        return
+
+    tiered = TieredCacheService(
+        remote,
+        local_ttls=settings.CACHE_LOCAL_TTLS,
+        max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+    )
+    try:
+        await measure("redis", remote, args.requests)
+        await measure("redis + local", tiered, args.requests)
+        print(tiered.stats())
+    finally:
+        await remote.delete(HOMEPAGE_CACHE_KEY)
+        await remote.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+"""
+OfferBatch Benchmark.
+100k teklif üzerinde satır kopyalayan (dict.copy + update) zenginleştirme ile
+sütun ekleyen OfferBatch'i bellek (tracemalloc peak) ve hız (teklif/s) olarak
+karşılaştırır. Ardından DB'ye ihtiyaç duymayan gerçek adım zincirini
+(Normalize -> Mapping -> ProviderReliability -> ReliabilityWeighting) dict
+listesi ve OfferBatch girdisiyle çalıştırır.
+
+Kullanım: PYTHONPATH=. uv run python tests/load/bench_offer_batch.py [--offers 100000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.application.pipelines.analytics.steps.find_or_create_mapping_step import (
+    FindOrCreateMappingStep,
+)
+from app.application.pipelines.analytics.steps.normalize_currency_step import (
+    NormalizeCurrencyStep,
+)
+from app.application.pipelines.analytics.steps.provider_reliability_step import (
+    ProviderReliabilityStep,
+)
+from app.application.pipelines.analytics.steps.reliability_weighting_step import (
+    ReliabilityWeightingStep,
+)
+from app.core.patterns.offer_batch import OfferBatch
+from app.core.patterns.pipeline import PipelineContext, PipelineRunner
+
+OFFERS = 100_000
+PROVIDERS = 8
+ENRICHED_FIELDS = (
+    "market_avg_price",
+    "profit_margin_percent",
+    "weighted_profit_margin",
+    "has_market_data",
+)
+
+
+class BenchCurrencyService:
+    async def get_exchange_rates(self) -> Dict[str, float]:
+        return {"TRY": 1.0, "USD": 32.5, "EUR": 35.1}
+
+
+class BenchProviderRepository:
+    async def get_reliability_scores(
+        self, ids: List[int]
+    ) -> Dict[int, Tuple[float, int]]:
+        return {i: (0.7 + i / 40, 60 + i) for i in ids}
+
+
+class BenchUnitOfWork:
+    def __init__(self) -> None:
+        self.providers = BenchProviderRepository()
+
+    def reader(self) -> "BenchUnitOfWork":
+        return self
+
+    async def __aenter__(self) -> "BenchUnitOfWork":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+def generate_offers(count: int, seed: int = 11) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"offer-{i}",
+            "name": f"Ürün {i}",
+            "price": round(rng.uniform(50, 5000), 2),
+            "currency": rng.choice(("TRY", "TRY", "USD", "EUR")),
+            "provider": f"provider_{i % PROVIDERS}",
+            "provider_id": i % PROVIDERS + 1,
+            "mapping_id": i + 1,
+            "stock": rng.randint(0, 100),
+        }
+        for i in range(count)
+    ]
+
+
+def measure(label: str, count: int, run: Callable[[], Any]) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<34} {elapsed:>8.3f}s {count / elapsed:>12,.0f}/s"
+        f" {peak / 2**20:>10.1f} MiB"
+    )
+
+
+def enrich_rows(offers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Eski adımların kalıbı: her satır kopyalanıp güncellenir."""
+    enriched = []
+    for offer in offers:
+        row = offer.copy()
+        price = offer["price"]
+        row.update(
+            market_avg_price=price * 1.1,
+            profit_margin_percent=9.1,
+            weighted_profit_margin=price * 0.01,
+            has_market_data=True,
+        )
+        enriched.append(row)
+    return enriched
+
+
+def chain_rows(offers: List[Dict[str, Any]], steps: int = 4) -> List[Dict[str, Any]]:
+    """Her adım bir önceki adımın kopyaladığı satırları yeniden kopyalar."""
+    for _ in range(steps):
+        offers = enrich_rows(offers)
+    return offers
+
+
+def enrich_columns(batch: OfferBatch) -> OfferBatch:
+    prices = batch.values("price")
+    batch.set_column(ENRICHED_FIELDS[0], [p * 1.1 for p in prices])
+    batch.set_column(ENRICHED_FIELDS[1], [9.1] * len(batch))
+    batch.set_column(ENRICHED_FIELDS[2], [p * 0.01 for p in prices])
+    batch.set_column(ENRICHED_FIELDS[3], [True] * len(batch))
+    return batch
+
+
+async def run_steps(data: Any) -> PipelineContext:
+    uow = BenchUnitOfWork()
+    runner = PipelineRunner(
+        [
+            NormalizeCurrencyStep(BenchCurrencyService()),  # type: ignore[arg-type]
+            FindOrCreateMappingStep(uow),  # type: ignore[arg-type]
+            ProviderReliabilityStep(uow),  # type: ignore[arg-type]
+            ReliabilityWeightingStep(uow),  # type: ignore[arg-type]
+        ],
+        name="bench",
+        instruments=[],
+    )
+    return await runner.run(PipelineContext(initial_data=data))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--offers", type=int, default=OFFERS)
+    args = parser.parse_args()
+
+    offers = generate_offers(args.offers)
+    print(f"{'senaryo':<34} {'süre':>9} {'teklif/s':>13} {'peak':>14}")
+
+    # Dört ardışık zenginleştirme adımı
+    measure("satır kopyalama x4", len(offers), lambda: chain_rows(offers))
+    batch = OfferBatch.from_records(offers)
+    measure(
+        "sütun ekleme x4",
+        len(offers),
+        lambda: [enrich_columns(batch) for _ in range(4)],
+    )
+    measure(
+        "from_records + to_records",
+        len(offers),
+        lambda: OfferBatch.from_records(offers).to_records(),
+    )
+
+    # Gerçek adım zinciri; adımlar girdiye sütun yazdığı için her senaryo taze girdiyle
+    records = generate_offers(args.offers)
+    measure(
+        "adım zinciri (dict girdisi)",
+        len(offers),
+        lambda: asyncio.run(run_steps(records)),
+    )
+    fresh = OfferBatch.from_records(generate_offers(args.offers))
+    measure(
+        "adım zinciri (OfferBatch girdisi)",
+        len(offers),
+        lambda: asyncio.run(run_steps(fresh)),
+    )
+
+
+if __name__ == "__main__":
+    main()
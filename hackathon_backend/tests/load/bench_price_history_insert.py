@@ -0,0 +1,123 @@
+"""
+Price History Insert Benchmark.
+Aynı satırları üç yoldan price_histories'e yazar ve satır/s ölçer:
+
+- create_bulk: satır başına ORM nesnesi + session.add + flush + şema dönüşümü
+- insert_many (INSERT): chunk başına multi-row INSERT ... RETURNING id
+- insert_many (COPY): sequence'tan id ayırma + asyncpg copy_records_to_table
+
+Her ölçüm kendi transaction'ında yapılır ve geri alınır; tabloda veri kalmaz.
+Bugünün partition'ı yoksa oluşturulur. Çalışan bir PostgreSQL gerektirir
+(settings.DATABASE_URL).
+
+Kullanım:
+    PYTHONPATH=. uv run python tests/load/bench_price_history_insert.py
+    Seçenekler: [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import select
+
+from app.domain.schemas.price.price_history import PriceHistoryCreate
+from app.infrastructure.repositories.price_history_repository import (
+    PriceHistoryRepository,
+)
+from app.persistence.db.session import AsyncSessionLocal, engine
+from app.persistence.models.price.currency import Currency
+
+SIZES = (10_000, 100_000, 1_000_000)
+# create_bulk bu boyuttan büyük batch'lerde çok yavaş; atlanır
+ORM_LIMIT = 100_000
+
+
+def generate_rows(
+    count: int, currency_id: int, seed: int = 3
+) -> List[PriceHistoryCreate]:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        price = Decimal(f"{rng.uniform(10, 5000):.2f}")
+        rows.append(
+            PriceHistoryCreate(
+                price=price,
+                original_price=price + Decimal("10.00"),
+                discount_rate=rng.randint(0, 50),
+                currency_id=currency_id,
+                in_stock=rng.random() < 0.9,
+                stock_quantity=rng.randint(0, 500),
+            )
+        )
+    return rows
+
+
+async def measure(
+    label: str,
+    rows: List[PriceHistoryCreate],
+    run: Callable[[PriceHistoryRepository], Awaitable[object]],
+) -> None:
+    async with AsyncSessionLocal() as session:
+        repository = PriceHistoryRepository(session)
+        started = time.perf_counter()
+        await run(repository)
+        elapsed = time.perf_counter() - started
+        await session.rollback()
+    print(
+        f"{len(rows):>10} {label:<22} {elapsed:>9.3f}s {len(rows) / elapsed:>12,.0f}/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    args = parser.parse_args()
+
+    try:
+        async with AsyncSessionLocal() as session:
+            currency_id = (
+                await session.execute(select(Currency.id).limit(1))
+            ).scalar_one()
+            await PriceHistoryRepository(session).ensure_partitions(
+                date.today(), date.today()
+            )
+            await session.commit()
+
+        print(f"{'satır':>10} {'yol':<22} {'süre':>10} {'satır/s':>13}")
+        for size in args.sizes:
+            rows = generate_rows(size, currency_id)
+
+            if size <= ORM_LIMIT:
+                await measure(
+                    "create_bulk (ORM)",
+                    rows,
+                    lambda r, rows=rows: r.create_bulk(items=rows, commit=False),
+                )
+
+            def insert(
+                repository: PriceHistoryRepository,
+                rows: List[PriceHistoryCreate] = rows,
+            ) -> Awaitable[List[int]]:
+                repository.COPY_THRESHOLD = len(rows) + 1
+                return repository.insert_many(rows)
+
+            def copy(
+                repository: PriceHistoryRepository,
+                rows: List[PriceHistoryCreate] = rows,
+            ) -> Awaitable[List[int]]:
+                repository.COPY_THRESHOLD = 1
+                return repository.insert_many(rows)
+
+            await measure("insert_many (INSERT)", rows, insert)
+            await measure("insert_many (COPY)", rows, copy)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
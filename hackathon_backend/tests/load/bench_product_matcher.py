@@ -0,0 +1,185 @@
+"""
+Product Matcher Benchmark.
+Sentetik çok sağlayıcılı bir katalogda ProductMatchIndex'in isabetini
+(precision/recall) ve hızını, MatchProductStep'in eski exact eşleştirmesiyle
+karşılaştırır.
+
+Katalog: marka + model adı + tip kelimeleri (+ model numarası) ürünler; birbirinden
+sadece numarası veya tek kelimesi farklı "zor negatif" kardeşler içerir.
+Her sağlayıcı ismi farklı yazar: büyük/küçük harf, Türkçe karakter kaybı,
+kelime sırası, harf hatası, ek kelime, markanın yazılmaması. Teklif edilen
+ürünlerin bir kısmı katalogda yoktur (yeni ürün, eşleşmemeli).
+
+Kullanım:
+    PYTHONPATH=. uv run python tests/load/bench_product_matcher.py
+    Seçenekler: [--threshold 0.6]
+"""
+
+import argparse
+import random
+import time
+from typing import List, Optional, Tuple
+
+from app.application.pipelines.analytics.product_matcher import (
+    DEFAULT_THRESHOLD,
+    ProductMatchIndex,
+)
+from app.application.pipelines.analytics.steps.match_product_step import (
+    MatchProductStep,
+)
+
+SIZES = (10_000, 100_000)
+OFFERS = 20_000
+NEW_PRODUCT_RATIO = 0.2
+
+BRANDS = [
+    "Nike", "Adidas", "Puma", "Mavi", "Koton", "LC Waikiki", "DeFacto",
+    "Columbia", "The North Face", "Levi's", "Zara", "Hummel", "Skechers",
+    "New Balance", "Lumberjack", "Kinetix", "U.S. Polo Assn.", "Tommy Hilfiger",
+]
+WORDS = [
+    "Koşu", "Ayakkabısı", "Sneaker", "Mont", "Kazak", "Tişört", "Gömlek",
+    "Şort", "Eşofman", "Altı", "Üstü", "Çanta", "Sırt", "Bot", "Yağmurluk",
+    "Polar", "Hırka", "Elbise", "Etek", "Pantolon", "Jean", "Slim", "Fit",
+    "Oversize", "Basic", "Outdoor", "Trekking", "Su", "Geçirmez", "Kapüşonlu",
+    "Fermuarlı", "Pamuklu", "Keten", "Yün", "Deri", "Süet", "Spor", "Klasik",
+    "Air", "Max", "Ultra", "Boost", "Runner", "Pro", "Classic", "Retro",
+]
+SYLLABLES = [
+    "ka", "ro", "zen", "tix", "mo", "la", "vi", "pe", "ga", "sus", "ar", "do",
+    "ne", "qu", "el", "ti", "bu", "ser", "xa", "fo", "lu", "mi", "ra", "ko",
+]
+EXTRAS = ["Erkek", "Kadın", "Unisex", "Yeni Sezon", "Orijinal", "2024"]
+ASCII = str.maketrans("çğıöşüÇĞİÖŞÜ", "cgiosuCGIOSU")
+
+Product = Tuple[int, str, Optional[str]]
+
+
+def model_name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def generate_catalog(count: int, rng: random.Random) -> List[Product]:
+    """(id, isim, marka); her ürünün yarısının zor negatif bir kardeşi vardır."""
+    products: List[Product] = []
+    seen = set()
+    while len(products) < count:
+        brand = rng.choice(BRANDS)
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        if rng.random() < 0.8:
+            words.insert(0, model_name(rng))
+        number = str(rng.randint(1, 999)) if rng.random() < 0.6 else None
+        variants = [words + ([number] if number else [])]
+        if rng.random() < 0.5:
+            sibling = list(words)
+            if number:
+                sibling.append(str(int(number) + rng.randint(1, 9)))
+            else:
+                sibling[rng.randrange(len(sibling))] = rng.choice(WORDS)
+            variants.append(sibling)
+        for model in variants:
+            name = f"{brand} {' '.join(model)}"
+            if name.lower() in seen or len(products) >= count:
+                continue
+            seen.add(name.lower())
+            products.append((len(products) + 1, name, brand))
+    return products
+
+
+def typo(word: str, rng: random.Random) -> str:
+    if len(word) < 5 or any(c.isdigit() for c in word):
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1 :] if rng.random() < 0.5 else (
+        word[:i] + word[i + 1] + word[i] + word[i + 2 :]
+    )
+
+
+def perturb(product: Product, rng: random.Random) -> Tuple[str, Optional[str]]:
+    """Bir sağlayıcının aynı ürünü yazış şekli: (isim, marka)."""
+    _, name, brand = product
+    assert brand is not None
+    words = name[len(brand) + 1 :].split()
+    if rng.random() < 0.3:
+        rng.shuffle(words)
+    if rng.random() < 0.3:
+        k = rng.randrange(len(words))
+        words[k] = typo(words[k], rng)
+    if rng.random() < 0.3:
+        words.insert(rng.randint(0, len(words)), rng.choice(EXTRAS[:-1]))
+    text = " ".join(words)
+    if rng.random() < 0.3:
+        text = text.translate(ASCII)
+    if rng.random() < 0.3:
+        text = text.upper()
+    if rng.random() < 0.7:
+        text = f"{brand} {text}"
+    return text, brand if rng.random() < 0.5 else None
+
+
+def generate_offers(
+    catalog: List[Product], count: int, rng: random.Random
+) -> Tuple[List[Product], List[Tuple[str, Optional[str], Optional[int]]]]:
+    """Index'lenecek ürünler ve (isim, marka, doğru ürün id'si) teklifleri."""
+    held_out = set(
+        rng.sample(range(len(catalog)), int(len(catalog) * NEW_PRODUCT_RATIO))
+    )
+    indexed = [p for i, p in enumerate(catalog) if i not in held_out]
+    offers = []
+    for _ in range(count):
+        position = rng.randrange(len(catalog))
+        product = catalog[position]
+        name, brand = perturb(product, rng)
+        offers.append((name, brand, None if position in held_out else product[0]))
+    return indexed, offers
+
+
+def score(
+    predictions: List[Optional[int]], truth: List[Optional[int]]
+) -> Tuple[float, float]:
+    predicted = sum(1 for p in predictions if p is not None)
+    relevant = sum(1 for t in truth if t is not None)
+    correct = sum(
+        1 for p, t in zip(predictions, truth, strict=True) if p is not None and p == t
+    )
+    return correct / max(predicted, 1), correct / max(relevant, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--offers", type=int, default=OFFERS)
+    args = parser.parse_args()
+
+    normalize = MatchProductStep(uow=None)._normalize_name  # type: ignore
+    print(f"{'catalog':>8} {'method':>7} {'build (s)':>10} {'offers/s':>10} "
+          f"{'precision':>10} {'recall':>8}")
+    for size in SIZES:
+        rng = random.Random(size)
+        catalog = generate_catalog(size, rng)
+        indexed, offers = generate_offers(catalog, args.offers, rng)
+        truth = [expected for _, _, expected in offers]
+
+        start = time.perf_counter()
+        exact = {normalize(name): product_id for product_id, name, _ in indexed}
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        predictions = [exact.get(normalize(name)) for name, _, _ in offers]
+        rate = len(offers) / (time.perf_counter() - start)
+        precision, recall = score(predictions, truth)
+        print(f"{size:>8} {'exact':>7} {build:>10.3f} {rate:>10.0f} "
+              f"{precision:>10.3f} {recall:>8.3f}")
+
+        start = time.perf_counter()
+        index = ProductMatchIndex.build(indexed, threshold=args.threshold)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        results = [index.match(name, brand) for name, brand, _ in offers]
+        rate = len(offers) / (time.perf_counter() - start)
+        precision, recall = score([r.product_id if r else None for r in results], truth)
+        print(f"{size:>8} {'fuzzy':>7} {build:>10.3f} {rate:>10.0f} "
+              f"{precision:>10.3f} {recall:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
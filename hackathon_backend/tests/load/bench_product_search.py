@@ -0,0 +1,245 @@
+"""
+Product Search Benchmark.
+ProductSearchService.search_products'ın istek başına SQL statement sayısını ve
+p95 gecikmesini 20 ve 100'lük sayfalarda ölçer. Karşılaştırma için eski akış
+(count + sayfa + ürün başına fiyat sorgusu, Python post-filter) da çalıştırılır.
+
+Gerçek bir PostgreSQL gerektirir (settings.SQLALCHEMY_DATABASE_URI).
+--seed ile 100k ürünlük sentetik katalog (kategori, varyant, teklif, özet) oluşturulur;
+--cleanup ile silinir. Sentetik kayıtlar slug/sku/kod öneki ile ayırt edilir.
+
+Kullanım:
+    PYTHONPATH=. uv run python tests/load/bench_product_search.py --seed
+    Seçenekler: [--cleanup]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import event, func, or_, select, text
+from sqlalchemy.orm import selectinload
+
+from app.application.services.product_search_service import ProductSearchService
+from app.domain.schemas.products.product_search import ProductSearchRequest
+from app.persistence.db.session import AsyncSessionLocal, engine
+from app.persistence.models.price.current_offer import CurrentOffer
+from app.persistence.models.products.product import Product
+from app.persistence.models.products.product_mappings import ProductMapping
+
+CATALOG_SIZE = 100_000
+PAGE_SIZES = (20, 100)
+ITERATIONS = 50
+PREFIX = "bench-search"
+
+QUERIES = [
+    ProductSearchRequest(q="*"),
+    ProductSearchRequest(q="kazak"),
+    ProductSearchRequest(q="*", min_price=Decimal("100"), max_price=Decimal("900")),
+    ProductSearchRequest(q="ayakkabı", brand="Marka 7", page=3),
+]
+
+
+class StatementCounter:
+    """Engine üzerinde çalışan SQL statement'larını sayar."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+
+async def seed(size: int) -> None:
+    """Sentetik katalogu tek seferde INSERT ... SELECT generate_series ile yükler."""
+    statements = [
+        f"""
+        INSERT INTO categories (name, slug)
+        SELECT 'Kategori ' || g, '{PREFIX}-cat-' || g FROM generate_series(1, 50) g
+        """,
+        f"""
+        INSERT INTO providers (name, slug, rating, review_count, total_sales_count,
+                               is_verified, is_active, country, reliability_score)
+        SELECT 'Sağlayıcı ' || g, '{PREFIX}-prov-' || g, 4.5, 0, 0, true, true,
+               'Turkey', 1.0
+        FROM generate_series(1, 5) g
+        """,
+        f"""
+        INSERT INTO products (category_id, name, slug, brand, gender, description)
+        SELECT c.id,
+               (ARRAY['Kazak', 'Ayakkabı', 'Gömlek', 'Pantolon', 'Ceket'])[g % 5 + 1]
+                   || ' Model ' || g,
+               '{PREFIX}-' || g,
+               'Marka ' || (g % 40),
+               (ARRAY['erkek', 'kadın', 'unisex'])[g % 3 + 1],
+               'Sentetik ürün ' || g
+        FROM generate_series(1, {size}) g
+        JOIN categories c ON c.slug = '{PREFIX}-cat-' || (g % 50 + 1)
+        """,
+        f"""
+        INSERT INTO product_variants (product_id, sku, attributes)
+        SELECT p.id, p.slug || '-' || v,
+               json_build_object(
+                   'color', (ARRAY['siyah', 'beyaz', 'mavi'])[v],
+                   'size', (ARRAY['S', 'M', 'L'])[v]
+               )
+        FROM products p, generate_series(1, 3) v
+        WHERE p.slug LIKE '{PREFIX}-%'
+        """,
+        f"""
+        INSERT INTO product_mappings (product_id, provider_id, external_product_code)
+        SELECT p.id, pr.id, p.slug || '-' || pr.slug
+        FROM products p
+        JOIN providers pr ON pr.slug LIKE '{PREFIX}-prov-%'
+        WHERE p.slug LIKE '{PREFIX}-%' AND (p.id + pr.id) % 2 = 0
+        """,
+        f"""
+        INSERT INTO current_offers (mapping_id, price, original_price, in_stock)
+        SELECT m.id, round((50 + random() * 1950)::numeric, 2),
+               round((2000 + random() * 500)::numeric, 2), random() > 0.1
+        FROM product_mappings m
+        WHERE m.external_product_code LIKE '{PREFIX}-%'
+        """,
+        f"""
+        INSERT INTO product_price_summary (product_id, lowest_price, original_price,
+                                           in_stock, offer_count)
+        SELECT pm.product_id,
+               (array_agg(co.price
+                   ORDER BY co.in_stock DESC, co.price, co.mapping_id))[1],
+               (array_agg(co.original_price
+                   ORDER BY co.in_stock DESC, co.price, co.mapping_id))[1],
+               bool_or(co.in_stock), count(*)
+        FROM current_offers co
+        JOIN product_mappings pm ON pm.id = co.mapping_id
+        WHERE pm.external_product_code LIKE '{PREFIX}-%'
+        GROUP BY pm.product_id
+        """,
+        "ANALYZE",
+    ]
+    async with engine.begin() as conn:
+        for statement in statements:
+            await conn.execute(text(statement))
+
+
+async def cleanup() -> None:
+    statements = [
+        f"""DELETE FROM product_price_summary WHERE product_id IN
+            (SELECT id FROM products WHERE slug LIKE '{PREFIX}-%')""",
+        f"""DELETE FROM current_offers WHERE mapping_id IN
+            (SELECT id FROM product_mappings
+             WHERE external_product_code LIKE '{PREFIX}-%')""",
+        f"DELETE FROM product_mappings WHERE external_product_code LIKE '{PREFIX}-%'",
+        f"DELETE FROM product_variants WHERE sku LIKE '{PREFIX}-%'",
+        f"DELETE FROM products WHERE slug LIKE '{PREFIX}-%'",
+        f"DELETE FROM providers WHERE slug LIKE '{PREFIX}-prov-%'",
+        f"DELETE FROM categories WHERE slug LIKE '{PREFIX}-cat-%'",
+    ]
+    async with engine.begin() as conn:
+        for statement in statements:
+            await conn.execute(text(statement))
+
+
+async def legacy_search(request: ProductSearchRequest) -> int:
+    """Eski akış: count + sayfa (selectinload) + ürün başına fiyat sorgusu."""
+    async with AsyncSessionLocal() as session:
+        query = select(Product).options(
+            selectinload(Product.category), selectinload(Product.variants)
+        )
+        if request.q and request.q.strip() != "*":
+            term = f"%{request.q.strip()}%"
+            query = query.where(
+                or_(
+                    Product.name.ilike(term),
+                    Product.description.ilike(term),
+                    Product.brand.ilike(term),
+                )
+            )
+        if request.brand:
+            query = query.where(Product.brand == request.brand)
+        await session.execute(select(func.count()).select_from(query.subquery()))
+        offset = (request.page - 1) * request.page_size
+        result = await session.execute(
+            query.offset(offset).limit(request.page_size).order_by(Product.name)
+        )
+        kept = 0
+        for product in result.scalars().all():
+            price = (
+                await session.execute(
+                    select(func.min(CurrentOffer.price))
+                    .join(ProductMapping, CurrentOffer.mapping_id == ProductMapping.id)
+                    .where(ProductMapping.product_id == product.id)
+                )
+            ).scalar()
+            if request.min_price is not None and (
+                price is None or price < request.min_price
+            ):
+                continue
+            if request.max_price is not None and (
+                price is None or price > request.max_price
+            ):
+                continue
+            kept += 1
+        return kept
+
+
+async def measure(
+    name: str,
+    page_size: int,
+    search: Callable[[ProductSearchRequest], Awaitable[Any]],
+    counter: StatementCounter,
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    statements: List[int] = []
+    for i in range(ITERATIONS):
+        request = QUERIES[i % len(QUERIES)].model_copy(update={"page_size": page_size})
+        before = counter.count
+        start = time.perf_counter()
+        await search(request)
+        latencies.append((time.perf_counter() - start) * 1000)
+        statements.append(counter.count - before)
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{name:<8} page_size={page_size:<4} "
+        f"statements/request={statistics.mean(statements):6.1f}  "
+        f"p50={statistics.median(latencies):8.2f} ms  p95={p95:8.2f} ms"
+    )
+    return {"p95": p95, "statements": statistics.mean(statements)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--seed", action="store_true", help="100k ürünlük katalog oluştur"
+    )
+    parser.add_argument("--cleanup", action="store_true", help="Sentetik katalogu sil")
+    parser.add_argument("--size", type=int, default=CATALOG_SIZE)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    if args.seed:
+        start = time.perf_counter()
+        await seed(args.size)
+        print(f"Seeded {args.size} products in {time.perf_counter() - start:.1f}s")
+
+    service = ProductSearchService()
+    counter = StatementCounter()
+    try:
+        for page_size in PAGE_SIZES:
+            await service.search_products(
+                QUERIES[0].model_copy(update={"page_size": page_size})
+            )
+            await measure("single", page_size, service.search_products, counter)
+            if not args.skip_legacy:
+                await measure("legacy", page_size, legacy_search, counter)
+    finally:
+        if args.cleanup:
+            await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+Search Backend Benchmark.
+Aynı sorgu setini PostgreSQL (ILIKE + product_price_summary) ve Elasticsearch
+(BM25 + facet) üzerinde çalıştırıp p50/p95 gecikmelerini karşılaştırır.
+
+Katalog bench_product_search ile aynıdır (--seed / --cleanup). Elasticsearch
+settings.ELASTICSEARCH_URL üzerinden erişilebilirse sentetik ürünler ayrı bir
+index'e yüklenir ve ölçülür; erişilemezse sadece PostgreSQL ölçülür.
+--in-memory ile ES yerine InMemorySearchService ile sorgu/facet katmanı ölçülür.
+
+Kullanım:
+    PYTHONPATH=. uv run python tests/load/bench_search_backends.py --seed
+    Seçenekler: [--cleanup] [--in-memory]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+from sqlalchemy import select
+
+from app.application.services.product_search_es import (
+    ElasticsearchProductSearch,
+    load_product_documents,
+)
+from app.application.services.product_search_service import ProductSearchService
+from app.core.infrastructure.elasticsearch import get_search_service
+from app.core.infrastructure.in_memory_search import InMemorySearchService
+from app.domain.i_services.i_search_service import ISearchService
+from app.domain.schemas.products.product_search import ProductSearchRequest
+from app.persistence.db.session import AsyncSessionLocal, engine
+from app.persistence.models.products.product import Product
+from tests.load.bench_product_search import CATALOG_SIZE, PREFIX, QUERIES, cleanup, seed
+
+BENCH_INDEX = f"{PREFIX}-products"
+ITERATIONS = 100
+BATCH_SIZE = 2000
+
+
+async def load_index(search: ISearchService, es: ElasticsearchProductSearch) -> int:
+    """Sentetik ürünleri id sırasıyla batch'ler halinde index'e yükler."""
+    await search.delete_index(BENCH_INDEX)
+    await es.ensure_index()
+    indexed = 0
+    last_id = 0
+    async with AsyncSessionLocal() as session:
+        while True:
+            ids = (
+                await session.execute(
+                    select(Product.id)
+                    .where(Product.slug.like(f"{PREFIX}-%"), Product.id > last_id)
+                    .order_by(Product.id)
+                    .limit(BATCH_SIZE)
+                )
+            ).scalars().all()
+            if not ids:
+                break
+            documents = await load_product_documents(session, product_ids=ids)
+            indexed += await search.bulk_index(BENCH_INDEX, documents)
+            last_id = ids[-1]
+    await search.refresh_index(BENCH_INDEX)
+    return indexed
+
+
+async def measure(
+    name: str, search: Callable[[ProductSearchRequest], Awaitable[Any]]
+) -> None:
+    latencies: List[float] = []
+    for i in range(ITERATIONS):
+        request = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        await search(request)
+        latencies.append((time.perf_counter() - start) * 1000)
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{name:<14} p50={statistics.median(latencies):8.2f} ms  p95={p95:8.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="store_true", help="Sentetik katalog oluştur")
+    parser.add_argument("--cleanup", action="store_true", help="Sentetik katalogu sil")
+    parser.add_argument("--size", type=int, default=CATALOG_SIZE)
+    parser.add_argument(
+        "--in-memory", action="store_true", help="ES yerine bellek içi index"
+    )
+    args = parser.parse_args()
+
+    if args.seed:
+        start = time.perf_counter()
+        await seed(args.size)
+        print(f"Seeded {args.size} products in {time.perf_counter() - start:.1f}s")
+
+    search: Optional[ISearchService] = (
+        InMemorySearchService() if args.in_memory else get_search_service()
+    )
+    try:
+        postgres = ProductSearchService()
+        await postgres.search_products(QUERIES[0])
+        await measure("postgres", postgres.search_products)
+
+        if not await search.health_check():
+            print("Elasticsearch erişilemiyor, sadece PostgreSQL ölçüldü.")
+            search = None
+        else:
+            es = ElasticsearchProductSearch(search, index=BENCH_INDEX)
+            start = time.perf_counter()
+            indexed = await load_index(search, es)
+            print(f"Indexed {indexed} documents in {time.perf_counter() - start:.1f}s")
+            await es.search(QUERIES[0])
+            name = "in-memory" if args.in_memory else "elasticsearch"
+            await measure(name, es.search)
+    finally:
+        if search is not None:
+            await search.delete_index(BENCH_INDEX)
+        if args.cleanup:
+            await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Trend Engine Microbenchmark.
+Skaler TrendAnalysisStep._analyze_trend ile VectorizedTrendEngine'i
+10k, 100k ve 1M mapping üzerinde karşılaştırır.
+
+Kullanım: PYTHONPATH=. uv run python tests/load/bench_trend_engine.py [--skip-scalar]
+"""
+
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from app.application.pipelines.analytics.steps.trend_analysis_step import (
+    PROVIDER_RELIABILITY_WEIGHTS,
+    TrendAnalysisStep,
+)
+from app.application.pipelines.analytics.trend_engine import VectorizedTrendEngine
+
+SIZES = (10_000, 100_000, 1_000_000)
+HISTORY_LIMIT = TrendAnalysisStep.DEFAULT_HISTORY_LIMIT
+
+
+def generate_batch(
+    count: int, seed: int = 7
+) -> Tuple[List[float], List[List[float]], List[float]]:
+    """Sentetik batch: güncel fiyat, fiyat geçmişi, güvenilirlik ağırlığı."""
+    rng = random.Random(seed)
+    weights = list(PROVIDER_RELIABILITY_WEIGHTS.values())
+    current: List[float] = []
+    histories: List[List[float]] = []
+    reliability: List[float] = []
+    for _ in range(count):
+        base = rng.uniform(50, 5000)
+        length = rng.randint(0, HISTORY_LIMIT)
+        histories.append(
+            [round(base * rng.uniform(0.9, 1.1), 2) for _ in range(length)]
+        )
+        current.append(round(base * rng.uniform(0.85, 1.15), 2))
+        reliability.append(rng.choice(weights))
+    return current, histories, reliability
+
+
+def run_scalar(
+    current: List[float], histories: List[List[float]], weights: List[float]
+) -> float:
+    step = TrendAnalysisStep(uow=None)  # type: ignore
+    start = time.perf_counter()
+    for price, history, weight in zip(current, histories, weights, strict=True):
+        step._analyze_trend(price, history, weight)
+    return time.perf_counter() - start
+
+
+def run_vectorized(
+    current: List[float], histories: List[List[float]], weights: List[float]
+) -> Tuple[float, float]:
+    """(toplam süre, sadece hesaplama süresi) döner."""
+    engine = VectorizedTrendEngine()
+    start = time.perf_counter()
+    matrix, lengths = VectorizedTrendEngine.build_price_matrix(histories, HISTORY_LIMIT)
+    compute_start = time.perf_counter()
+    result = engine.analyze(
+        np.asarray(current), matrix, lengths, np.asarray(weights)
+    )
+    compute = time.perf_counter() - compute_start
+    result.to_dicts()
+    return time.perf_counter() - start, compute
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--skip-scalar", action="store_true", help="Skaler ölçümü atla"
+    )
+    args = parser.parse_args()
+
+    print(f"{'mappings':>10} {'scalar (s)':>12} {'vector (s)':>12} "
+          f"{'kernel (s)':>12} {'speedup':>9}")
+    for size in SIZES:
+        current, histories, weights = generate_batch(size)
+        scalar = None if args.skip_scalar else run_scalar(current, histories, weights)
+        total, kernel = run_vectorized(current, histories, weights)
+        speedup = f"{scalar / total:.1f}x" if scalar else "-"
+        scalar_str = f"{scalar:.3f}" if scalar else "-"
+        print(
+            f"{size:>10} {scalar_str:>12} {total:>12.3f} {kernel:>12.3f} {speedup:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -49,3 +49,129 @@ async def test_cache_get_logic(mocker: MockerFixture) -> None:
     # Kontrol
     assert result == {"id": 1, "name": "Hackathon"}
     assert isinstance(result, dict)  # String değil dict olmalı
+
+
+@pytest.mark.asyncio
+async def test_cache_get_unreadable_envelope_is_a_miss(mocker: MockerFixture) -> None:
+    """
+    Unit Test: Bu sürümün okuyamadığı zarflar (yeni sürüm) hata yerine miss sayılır.
+    """
+    mock_redis = mocker.AsyncMock()
+    mocker.patch.object(cache, "redis", mock_redis)
+    mock_redis.get.return_value = b"\xc1\x09\x01\x00{}"
+
+    assert await cache.get("test_key") is None
+
+
+class MockRedisPipeline:
+    """redis.asyncio Pipeline taklidi: komutları kuyruğa alır, execute'ta çalıştırır."""
+
+    def __init__(self, store: dict, transaction: bool) -> None:
+        self.store = store
+        self.transaction = transaction
+        self.commands: list = []
+        self.executed = 0
+
+    async def __aenter__(self) -> "MockRedisPipeline":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+    def get(self, key: str) -> None:
+        self.commands.append(lambda: self.store.get(key))
+
+    def set(self, key: str, value: object, ex: int) -> None:
+        self.commands.append(lambda: self.store.__setitem__(key, value) or True)
+
+    def lpush(self, key: str, value: str) -> None:
+        self.commands.append(
+            lambda: self.store.setdefault(key, []).insert(0, value) or 1
+        )
+
+    def ltrim(self, key: str, start: int, end: int) -> None:
+        self.commands.append(
+            lambda: (
+                self.store.__setitem__(key, self.store[key][start : end + 1]) or True
+            )
+        )
+
+    async def execute(self) -> list:
+        self.executed += 1
+        return [command() for command in self.commands]
+
+
+@pytest.mark.asyncio
+async def test_cache_pipeline_runs_queued_commands_once(mocker: MockerFixture) -> None:
+    """
+    Unit Test: Pipeline komutları tek execute ile gider, get sonuçları decode edilir.
+    """
+    store: dict = {}
+    pipelines: list = []
+
+    def make_pipeline(transaction: bool = True) -> MockRedisPipeline:
+        pipelines.append(MockRedisPipeline(store, transaction))
+        return pipelines[-1]
+
+    mock_redis = mocker.MagicMock()
+    mock_redis.pipeline.side_effect = make_pipeline
+    mocker.patch.object(cache, "redis", mock_redis)
+
+    async with cache.pipeline() as pipe:
+        pipe.set("health_check", {"ok": True}, expire=10)
+        pipe.get("health_check")
+        pipe.lpush("users:recent", "a")
+        pipe.ltrim("users:recent", 0, 9)
+
+    assert pipelines[0].transaction is True
+    assert pipelines[0].executed == 1
+    assert pipe.results[1] == {"ok": True}
+    assert pipe.keys_written == ["health_check"]
+
+
+@pytest.mark.asyncio
+async def test_cache_mget_and_mset(mocker: MockerFixture) -> None:
+    """
+    Unit Test: mget tek MGET ile okur; mset SET EX'leri tek pipeline'da yollar.
+    """
+    store: dict = {}
+    pipelines: list = []
+
+    def make_pipeline(transaction: bool = True) -> MockRedisPipeline:
+        pipelines.append(MockRedisPipeline(store, transaction))
+        return pipelines[-1]
+
+    mock_redis = mocker.MagicMock()
+    mock_redis.pipeline.side_effect = make_pipeline
+    mock_redis.mget = mocker.AsyncMock(
+        side_effect=lambda keys: [store.get(k) for k in keys]
+    )
+    mocker.patch.object(cache, "redis", mock_redis)
+
+    await cache.mset({"product:1": {"id": 1}, "product:2": {"id": 2}}, expire=120)
+
+    assert len(pipelines) == 1 and pipelines[0].transaction is False
+    assert await cache.mget(["product:1", "missing", "product:2"]) == [
+        {"id": 1},
+        None,
+        {"id": 2},
+    ]
+    mock_redis.mget.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cache_delete_if_equals_is_a_single_script(mocker: MockerFixture) -> None:
+    """
+    Unit Test: Kilit bırakma GET + DEL yerine tek bir Lua script'i ile yapılır.
+    """
+    mock_redis = mocker.AsyncMock()
+    mocker.patch.object(cache, "redis", mock_redis)
+    mock_redis.eval.return_value = 0
+
+    assert await cache.delete_if_equals("lock:k", "token") is False
+
+    script, numkeys, key, value = mock_redis.eval.call_args.args
+    assert "redis.call('del', KEYS[1])" in script
+    assert (numkeys, key, value) == (1, "lock:k", json.dumps("token"))
+    mock_redis.get.assert_not_called()
+    mock_redis.delete.assert_not_called()
@@ -0,0 +1,202 @@
+"""
+Unit tests for CacheAside (single-flight loading and stale-while-revalidate).
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+import pytest
+
+from app.application.services.price.currency_service import CurrencyService
+from app.core.infrastructure.cache_aside import CacheAside
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MockCache:
+    """Dict-backed cache with SET NX semantics; expiry is not modelled."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Any] = {}
+        self.expires: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: Any, expire: int = 60) -> None:
+        self.data[key] = value
+        self.expires[key] = expire
+
+    async def set_if_absent(self, key: str, value: Any, expire: int = 60) -> bool:
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        if key not in self.data or self.data[key] != value:
+            return False
+        del self.data[key]
+        return True
+
+
+class CountingLoader:
+    def __init__(self, value: Any, delay: float = 0.01) -> None:
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> Any:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+class MockExchangeRateProvider:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def get_rates(self) -> Dict[str, float]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"USD": 32.5}
+
+
+class TestCacheAside:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self) -> None:
+        cache = MockCache()
+        loader = CountingLoader({"trending": []})
+        aside = CacheAside(cache)  # type: ignore[arg-type]
+
+        results = await asyncio.gather(
+            *(aside.get_or_load("homepage:data", loader, ttl=300) for _ in range(20))
+        )
+
+        assert loader.calls == 1
+        assert all(r == {"trending": []} for r in results)
+        assert cache.data["homepage:data"]["v"] == {"trending": []}
+        assert "lock:homepage:data" not in cache.data
+
+    @pytest.mark.asyncio
+    async def test_fresh_value_is_served_without_loading(self) -> None:
+        clock = FakeClock()
+        cache = MockCache()
+        aside = CacheAside(cache, clock=clock)  # type: ignore[arg-type]
+        await aside.put("k", 1, ttl=60, stale_ttl=120)
+        loader = CountingLoader(2)
+
+        assert await aside.get_or_load("k", loader, ttl=60, stale_ttl=120) == 1
+        assert loader.calls == 0
+        assert cache.expires["k"] == 180
+
+    @pytest.mark.asyncio
+    async def test_stale_value_is_served_while_one_task_refreshes(self) -> None:
+        clock = FakeClock()
+        cache = MockCache()
+        aside = CacheAside(cache, clock=clock)  # type: ignore[arg-type]
+        await aside.put("k", "old", ttl=60, stale_ttl=600)
+        clock.now += 61
+        loader = CountingLoader("new")
+
+        results = await asyncio.gather(
+            *(aside.get_or_load("k", loader, ttl=60, stale_ttl=600) for _ in range(5))
+        )
+        assert results == ["old"] * 5
+
+        await asyncio.sleep(0.05)
+        assert loader.calls == 1
+        assert await aside.get_or_load("k", loader, ttl=60, stale_ttl=600) == "new"
+
+    @pytest.mark.asyncio
+    async def test_waits_for_value_when_another_worker_holds_the_lock(self) -> None:
+        cache = MockCache()
+        cache.data["lock:k"] = "other-worker"
+        aside = CacheAside(cache)  # type: ignore[arg-type]
+        aside.POLL_INTERVAL = 0.005
+        loader = CountingLoader("mine")
+
+        async def other_worker_finishes() -> None:
+            await asyncio.sleep(0.02)
+            await CacheAside(cache).put("k", "theirs", ttl=60)  # type: ignore[arg-type]
+
+        result, _ = await asyncio.gather(
+            aside.get_or_load("k", loader, ttl=60), other_worker_finishes()
+        )
+
+        assert result == "theirs"
+        assert loader.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_loads_itself_when_lock_wait_times_out(self) -> None:
+        cache = MockCache()
+        cache.data["lock:k"] = "stuck-worker"
+        aside = CacheAside(cache)  # type: ignore[arg-type]
+        aside.WAIT_TIMEOUT = 0.02
+        aside.POLL_INTERVAL = 0.005
+        loader = CountingLoader("mine")
+
+        assert await aside.get_or_load("k", loader, ttl=60) == "mine"
+        assert loader.calls == 1
+        assert cache.data["lock:k"] == "stuck-worker"
+
+    @pytest.mark.asyncio
+    async def test_lock_taken_over_by_another_worker_is_kept(self) -> None:
+        cache = MockCache()
+        aside = CacheAside(cache)  # type: ignore[arg-type]
+
+        async def lock_expires_and_is_taken() -> str:
+            # Our lock expired mid-load and another worker acquired it
+            cache.data["lock:k"] = "other-worker"
+            return "mine"
+
+        assert await aside.get_or_load("k", lock_expires_and_is_taken, ttl=60) == "mine"
+        assert cache.data["lock:k"] == "other-worker"
+
+    @pytest.mark.asyncio
+    async def test_loader_errors_reach_every_waiter(self) -> None:
+        aside = CacheAside(MockCache())  # type: ignore[arg-type]
+
+        async def failing() -> Any:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            *(aside.get_or_load("k", failing, ttl=60) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestCurrencyServiceCoalescing:
+    @pytest.mark.asyncio
+    async def test_concurrent_rate_requests_call_provider_once(self) -> None:
+        provider = MockExchangeRateProvider()
+        cache = MockCache()
+
+        results = await asyncio.gather(
+            *(
+                CurrencyService(provider, cache).get_exchange_rates()  # type: ignore[arg-type]
+                for _ in range(10)
+            )
+        )
+
+        assert provider.calls == 1
+        assert all(r == {"USD": 32.5} for r in results)
+
+    @pytest.mark.asyncio
+    async def test_without_cache_calls_provider(self) -> None:
+        provider = MockExchangeRateProvider()
+
+        assert await CurrencyService(provider).get_exchange_rates() == {"USD": 32.5}  # type: ignore[arg-type]
+        assert provider.calls == 1
@@ -0,0 +1,100 @@
+"""
+Unit tests for the CacheService codec layer (versioned envelope).
+"""
+
+import importlib.util
+import json
+
+import pytest
+
+from app.core.infrastructure.cache_codec import (
+    ENVELOPE_MAGIC,
+    ENVELOPE_VERSION,
+    FLAG_ZSTD,
+    FORMAT_JSON,
+    CacheCodec,
+    zstd_available,
+)
+
+PAYLOAD = {
+    "trending": [
+        {"rank": i, "name": f"Ürün {i}", "best_price": "1299.90"} for i in range(50)
+    ],
+    "cached_at": "2026-01-01T00:00:00+00:00",
+}
+
+needs_msgpack = pytest.mark.skipif(
+    importlib.util.find_spec("msgpack") is None, reason="msgpack not installed"
+)
+needs_zstd = pytest.mark.skipif(not zstd_available(), reason="zstd not available")
+
+
+class TestCacheCodec:
+    def test_json_codec_writes_unframed_legacy_json(self) -> None:
+        codec = CacheCodec("json")
+
+        encoded = codec.encode(PAYLOAD)
+
+        assert encoded == json.dumps(PAYLOAD)
+        assert codec.decode(encoded.encode("utf-8")) == PAYLOAD
+
+    def test_orjson_codec_writes_versioned_envelope(self) -> None:
+        encoded = CacheCodec("orjson").encode(PAYLOAD)
+
+        assert isinstance(encoded, bytes)
+        assert encoded[:4] == bytes((ENVELOPE_MAGIC, ENVELOPE_VERSION, FORMAT_JSON, 0))
+        assert CacheCodec("orjson").decode(encoded) == PAYLOAD
+        # Workers still on the json codec can read framed values as well
+        assert CacheCodec("json").decode(encoded) == PAYLOAD
+
+    def test_legacy_entries_are_readable_by_every_codec(self) -> None:
+        legacy = json.dumps(PAYLOAD).encode("utf-8")
+
+        for name in ("json", "orjson", "msgpack"):
+            assert CacheCodec(name).decode(legacy) == PAYLOAD  # type: ignore[arg-type]
+
+    def test_unknown_envelope_version_is_rejected(self) -> None:
+        framed = bytes((ENVELOPE_MAGIC, ENVELOPE_VERSION + 1, FORMAT_JSON, 0)) + b"{}"
+
+        with pytest.raises(ValueError):
+            CacheCodec("orjson").decode(framed)
+
+    @needs_msgpack
+    def test_msgpack_round_trip_keeps_int_keys(self) -> None:
+        codec = CacheCodec("msgpack")
+        value = {1: [1.5, None, "a"], "k": True}
+
+        assert codec.decode(codec.encode(value)) == value
+
+    @needs_zstd
+    def test_payloads_above_threshold_are_compressed(self) -> None:
+        codec = CacheCodec("orjson", compress_min_bytes=256)
+
+        large = codec.encode(PAYLOAD)
+        small = codec.encode({"USD": 32.5})
+
+        assert isinstance(large, bytes) and large[3] & FLAG_ZSTD
+        assert len(large) < len(json.dumps(PAYLOAD))
+        assert isinstance(small, bytes) and not small[3] & FLAG_ZSTD
+        assert codec.decode(large) == PAYLOAD
+        assert codec.decode(small) == {"USD": 32.5}
+
+    @needs_zstd
+    def test_corrupt_compressed_payload_is_rejected(self) -> None:
+        codec = CacheCodec("orjson", compress_min_bytes=256)
+        encoded = codec.encode(PAYLOAD)
+        assert isinstance(encoded, bytes)
+        corrupt = encoded[:4] + b"\x00" * (len(encoded) - 4)
+
+        # CacheService counts ValueError as a miss instead of failing the request
+        with pytest.raises(ValueError):
+            codec.decode(corrupt)
+
+    def test_missing_compressor_disables_compression(self) -> None:
+        codec = CacheCodec("json", compress_min_bytes=256)
+
+        if zstd_available():
+            assert codec.compress_min_bytes == 256
+        else:
+            assert codec.compress_min_bytes == 0
+            assert codec.encode(PAYLOAD) == json.dumps(PAYLOAD)
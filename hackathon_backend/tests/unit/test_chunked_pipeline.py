@@ -0,0 +1,235 @@
+"""
+Unit tests for BasePipeline.execute_chunked.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+import pytest
+
+from app.application.pipelines.base import BasePipeline
+from app.core.patterns.pipeline import BaseStep, PipelineContext
+from app.domain.schemas.analytics.pipeline_dead_letter import PipelineDeadLetterCreate
+
+
+class MockDeadLetterRepository:
+    def __init__(self) -> None:
+        self.entries: List[PipelineDeadLetterCreate] = []
+        self.fail = False
+
+    async def add_many(self, entries: Sequence[PipelineDeadLetterCreate]) -> int:
+        if self.fail:
+            raise RuntimeError("db down")
+        self.entries.extend(entries)
+        return len(entries)
+
+
+class MockUnitOfWork:
+    """Keeps written rows in memory; a savepoint restores them on error."""
+
+    def __init__(self) -> None:
+        self.rows: List[int] = []
+        self.savepoints = 0
+        self.dead_letters = MockDeadLetterRepository()
+
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncIterator[None]:
+        self.savepoints += 1
+        snapshot = list(self.rows)
+        try:
+            yield
+        except BaseException:
+            self.rows = snapshot
+            raise
+
+
+class WriteStep(BaseStep):
+    """Writes every item, doubles its price and reports items flagged as bad."""
+
+    def __init__(self, uow: MockUnitOfWork) -> None:
+        self.uow = uow
+        self.rolled_back: List[List[int]] = []
+
+    async def process(self, context: PipelineContext) -> None:
+        for item in context.data:
+            if item.get("boom"):
+                raise ValueError(f"boom {item['id']}")
+            self.uow.rows.append(item["id"])
+            item["price"] *= 2
+            if item.get("bad"):
+                context.errors.append(f"ID {item['id']}: price eksik.")
+        context.meta["written"] = len(context.data)
+        context.meta["written_ids"] = [item["id"] for item in context.data]
+        context.result = context.data
+
+    async def on_rollback(self, context: PipelineContext) -> None:
+        self.rolled_back.append(context.meta.get("written_ids", []))
+
+
+class OutageStep(BaseStep):
+    """Fails every attempt, like a database outage."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def process(self, context: PipelineContext) -> None:
+        self.calls += 1
+        raise ConnectionError("connection refused")
+
+
+def _pipeline() -> BasePipeline:
+    uow = MockUnitOfWork()
+    pipeline = BasePipeline(uow)  # type: ignore[arg-type]
+    pipeline.add_step(WriteStep(uow))
+    return pipeline
+
+
+def _items(count: int, **flags: List[int]) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = [
+        {"id": i, "price": 10, "provider_id": 4, "external_product_code": i}
+        for i in range(1, count + 1)
+    ]
+    for flag, ids in flags.items():
+        for i in ids:
+            items[i - 1][flag] = True
+    return items
+
+
+class TestExecuteChunked:
+    """Tests for the SAVEPOINT-per-chunk execution mode."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_timed(self) -> None:
+        pipeline = _pipeline()
+
+        context = await pipeline.execute_chunked(_items(5), chunk_size=2)
+
+        assert context.is_valid
+        assert [chunk["size"] for chunk in context.meta["chunks"]] == [2, 2, 1]
+        assert all(chunk["seconds"] >= 0 for chunk in context.meta["chunks"])
+        assert pipeline.uow.rows == [1, 2, 3, 4, 5]  # type: ignore[attr-defined]
+        assert pipeline.uow.savepoints == 3  # type: ignore[attr-defined]
+        # Numeric metrics are summed and lists concatenated across chunks
+        assert context.meta["written"] == 5
+        assert context.meta["written_ids"] == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_failed_items_go_to_dead_letters(self) -> None:
+        pipeline = _pipeline()
+        uow: Any = pipeline.uow
+
+        context = await pipeline.execute_chunked(
+            _items(8, bad=[3], boom=[6]), chunk_size=4
+        )
+
+        assert context.is_valid
+        assert uow.rows == [1, 2, 4, 5, 7, 8]
+        assert [entry.payload["id"] for entry in uow.dead_letters.entries] == [3, 6]
+        assert uow.dead_letters.entries[0].error == "ID 3: price eksik."
+        assert uow.dead_letters.entries[1].error == "ValueError: boom 6"
+        assert uow.dead_letters.entries[1].provider_id == 4
+        assert uow.dead_letters.entries[1].external_product_code == "6"
+        assert context.meta["dead_lettered"] == 2
+        assert [chunk["dead_lettered"] for chunk in context.meta["chunks"]] == [1, 1]
+        assert [item["id"] for item in context.result] == [1, 2, 4, 5, 7, 8]
+
+    @pytest.mark.asyncio
+    async def test_retries_start_from_original_items(self) -> None:
+        """Steps mutate items; a retried item must not be processed twice."""
+        pipeline = _pipeline()
+        items = _items(4, bad=[4])
+
+        context = await pipeline.execute_chunked(items, chunk_size=4)
+
+        assert [item["price"] for item in context.result] == [20, 20, 20]
+        assert [item["price"] for item in items] == [10, 10, 10, 10]
+        assert context.meta["written"] == 3
+        # Dead letters keep the item as it entered the pipeline
+        assert pipeline.uow.dead_letters.entries[0].payload["price"] == 10  # type: ignore[attr-defined]
+
+    @pytest.mark.asyncio
+    async def test_steps_are_notified_of_rollbacks(self) -> None:
+        pipeline = _pipeline()
+        step: Any = pipeline.steps[0]
+
+        await pipeline.execute_chunked(_items(2, bad=[2]), chunk_size=2)
+
+        assert step.rolled_back == [[1, 2], [2]]
+
+    @pytest.mark.asyncio
+    async def test_dead_letter_failure_stops_the_run(self) -> None:
+        pipeline = _pipeline()
+        pipeline.uow.dead_letters.fail = True  # type: ignore[attr-defined]
+
+        context = await pipeline.execute_chunked(_items(4, bad=[1]), chunk_size=2)
+
+        assert context.errors == ["Dead-letter kaydı yazılamadı: db down"]
+        assert len(context.meta["chunks"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_chunk_where_no_item_passes_alone_fails(self) -> None:
+        uow = MockUnitOfWork()
+        pipeline = BasePipeline(uow)  # type: ignore[arg-type]
+        step = OutageStep()
+        pipeline.add_step(step)
+
+        context = await pipeline.execute_chunked(_items(8), chunk_size=4)
+
+        # Chunk, first and last item, then the middle two; the second chunk never runs
+        assert step.calls == 6
+        assert uow.dead_letters.entries == []
+        assert context.errors == ["ConnectionError: connection refused"]
+        assert context.meta["dead_lettered"] == 0
+        assert len(context.meta["chunks"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_first_item_is_isolated_via_last_item_probe(self) -> None:
+        pipeline = _pipeline()
+        uow: Any = pipeline.uow
+
+        context = await pipeline.execute_chunked(_items(4, boom=[1]), chunk_size=4)
+
+        assert context.is_valid
+        assert [entry.payload["id"] for entry in uow.dead_letters.entries] == [1]
+        assert [item["id"] for item in context.result] == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_bad_ends_are_dead_lettered_and_the_middle_committed(
+        self,
+    ) -> None:
+        pipeline = _pipeline()
+        uow: Any = pipeline.uow
+
+        context = await pipeline.execute_chunked(
+            _items(6, boom=[1, 6], bad=[3]), chunk_size=6
+        )
+
+        assert context.is_valid
+        assert [entry.payload["id"] for entry in uow.dead_letters.entries] == [1, 3, 6]
+        assert sorted(uow.rows) == [2, 4, 5]
+        assert [item["id"] for item in context.result] == [2, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_results_keep_item_order_when_the_last_item_passes(self) -> None:
+        pipeline = _pipeline()
+
+        context = await pipeline.execute_chunked(
+            _items(5, boom=[1, 3]), chunk_size=5
+        )
+
+        assert [item["id"] for item in context.result] == [2, 4, 5]
+        assert context.meta["written_ids"] == [2, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_bisection_attempts_are_capped(self) -> None:
+        pipeline = _pipeline()
+        pipeline.max_isolation_attempts = 2
+        uow: Any = pipeline.uow
+
+        context = await pipeline.execute_chunked(
+            _items(8, bad=[2, 4, 6, 8]), chunk_size=8
+        )
+
+        assert context.errors == ["Hatalı item'lar 2 denemede ayıklanamadı."]
+        # Chunk + first-item probe + two bisection attempts
+        assert uow.savepoints == 4
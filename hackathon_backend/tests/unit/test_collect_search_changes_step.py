@@ -0,0 +1,53 @@
+"""
+Unit tests for CollectSearchChangesStep.
+"""
+
+import pytest
+
+from app.application.pipelines.analytics.steps.collect_search_changes_step import (
+    CollectSearchChangesStep,
+)
+from app.core.patterns.pipeline import PipelineContext
+
+
+class TestCollectSearchChangesStep:
+    """Tests for CollectSearchChangesStep."""
+
+    @pytest.mark.asyncio
+    async def test_collects_unique_changed_product_ids(self) -> None:
+        context = PipelineContext(
+            initial_data=[
+                {"product_id": 7, "mapping_id": 1, "price_changed": True},
+                {"product_id": 3, "mapping_id": 2, "price_changed": True},
+                {"product_id": 7, "mapping_id": 3, "price_changed": True},
+                {"product_id": 9, "mapping_id": 6, "price_changed": False},
+                {"product_id": None, "mapping_id": 4, "price_changed": True},
+                {"mapping_id": 5},
+            ]
+        )
+
+        await CollectSearchChangesStep().process(context)
+
+        assert context.meta["search_changed_product_ids"] == [3, 7]
+        assert context.is_valid
+
+    @pytest.mark.asyncio
+    async def test_unchanged_prices_collect_nothing(self) -> None:
+        context = PipelineContext(
+            initial_data=[
+                {"product_id": 7, "mapping_id": 1, "price_changed": False},
+                {"product_id": 3, "mapping_id": 2},
+            ]
+        )
+
+        await CollectSearchChangesStep().process(context)
+
+        assert context.meta["search_changed_product_ids"] == []
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self) -> None:
+        context = PipelineContext(initial_data=[])
+
+        await CollectSearchChangesStep().process(context)
+
+        assert context.meta["search_changed_product_ids"] == []
@@ -0,0 +1,196 @@
+"""
+Unit tests for DagPipelineRunner and step dependency resolution.
+"""
+
+import asyncio
+import time
+from typing import Any, FrozenSet, List, Optional
+
+import pytest
+
+from app.application.pipelines.analytics.product_analysis_pipeline import (
+    ProductAnalysisPipeline,
+)
+from app.core.patterns.pipeline import (
+    BaseStep,
+    DagPipelineRunner,
+    PipelineContext,
+    step_dependencies,
+)
+
+
+class FieldStep(BaseStep):
+    """Copies `source` into `target` for every item after an optional delay."""
+
+    def __init__(
+        self,
+        name: str,
+        reads: Optional[FrozenSet[str]],
+        writes: Optional[FrozenSet[str]],
+        *,
+        uses_session: bool = False,
+        delay: float = 0.0,
+        log: Optional[List[str]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.reads = reads
+        self.writes = writes
+        self.uses_session = uses_session
+        self.delay = delay
+        self.log = log if log is not None else []
+        self.error = error
+
+    async def process(self, context: PipelineContext) -> None:
+        self.log.append(f"start:{self.name}")
+        await asyncio.sleep(self.delay)
+        if self.error:
+            context.errors.append(self.error)
+        for item in context.data:
+            inputs = ",".join(str(item.get(r)) for r in sorted(self.reads or ()))
+            for field in self.writes or ():
+                item[field] = f"{self.name}({inputs})"
+        context.meta[f"{self.name}_count"] = len(context.data)
+        context.result = context.data
+        self.log.append(f"end:{self.name}")
+
+
+def _step(name: str, reads: str = "", writes: str = "", **kwargs: Any) -> FieldStep:
+    return FieldStep(
+        name, frozenset(reads.split()), frozenset(writes.split()), **kwargs
+    )
+
+
+class TestStepDependencies:
+    def test_fields_sessions_and_barriers(self) -> None:
+        steps = [
+            FieldStep("barrier", None, None),
+            _step("a", "x", "y"),
+            _step("b", "x", "z"),
+            _step("c", "y z", "w"),
+            _step("s1", "x", "db.t1", uses_session=True),
+            _step("s2", "x", "db.t2", uses_session=True),
+            _step("d", "q", "x"),
+        ]
+
+        dependencies = step_dependencies(steps)
+
+        assert dependencies[1] == {0}
+        assert dependencies[2] == {0}
+        assert dependencies[3] == {0, 1, 2}
+        assert dependencies[5] == {0, 4}
+        # Writes a field earlier steps read
+        assert dependencies[6] == {0, 1, 2, 4, 5}
+
+    def test_product_analysis_pipeline_graph(self) -> None:
+        pipeline = ProductAnalysisPipeline(uow=object(), currency_service=object())  # type: ignore[arg-type]
+        names = [type(step).__name__ for step in pipeline.steps]
+        dependencies = step_dependencies(pipeline.steps)
+
+        def needs(step: str) -> set:
+            return {names[i] for i in dependencies[names.index(step)]}
+
+        assert needs("ProviderReliabilityStep") == {
+            "NormalizeCurrencyStep",
+            "FindOrCreateMappingStep",
+        }
+        # Reads the price_changed flags, but does not wait for later steps
+        assert "SavePriceHistoryStep" in needs("CollectSearchChangesStep")
+        assert "UpdateCurrentOffersStep" not in needs("CollectSearchChangesStep")
+        assert {"TrendAnalysisStep", "ProviderReliabilityStep"} <= needs(
+            "ReliabilityWeightingStep"
+        )
+        assert "UpdateTrendingStep" not in needs("ReliabilityWeightingStep")
+        assert "SavePriceHistoryStep" in needs("TrendAnalysisStep")
+
+
+class TestDagPipelineRunner:
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self) -> None:
+        steps = [
+            _step("a", "x", "y", delay=0.05),
+            _step("b", "x", "z", delay=0.05),
+            _step("c", "y z", "w"),
+        ]
+        context = PipelineContext(initial_data=[{"x": 1}, {"x": 2}])
+
+        started = time.perf_counter()
+        await DagPipelineRunner(steps, instruments=[]).run(context)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.09
+        assert context.data[1] == {
+            "x": 2,
+            "y": "a(2)",
+            "z": "b(2)",
+            "w": "c(a(2),b(2))",
+        }
+        assert context.result is context.data
+        assert context.meta == {"a_count": 2, "b_count": 2, "c_count": 2}
+
+    @pytest.mark.asyncio
+    async def test_session_steps_do_not_overlap(self) -> None:
+        log: List[str] = []
+        steps = [
+            _step("s1", "x", "db.t1", uses_session=True, delay=0.01, log=log),
+            _step("s2", "x", "db.t2", uses_session=True, delay=0.01, log=log),
+            _step("free", "x", "y", delay=0.005, log=log),
+        ]
+
+        await DagPipelineRunner(steps, instruments=[]).run(PipelineContext([{"x": 1}]))
+
+        assert log.index("end:s1") < log.index("start:s2")
+        assert log.index("start:free") < log.index("end:s1")
+
+    @pytest.mark.asyncio
+    async def test_barrier_only_pipeline_runs_in_order(self) -> None:
+        log: List[str] = []
+        steps = [FieldStep(name, None, None, log=log) for name in ("a", "b", "c")]
+
+        await DagPipelineRunner(steps, instruments=[]).run(PipelineContext([{"x": 1}]))
+
+        assert log == ["start:a", "end:a", "start:b", "end:b", "start:c", "end:c"]
+
+    @pytest.mark.asyncio
+    async def test_no_step_starts_after_an_error(self) -> None:
+        log: List[str] = []
+        steps = [
+            _step("bad", "x", "y", error="fiyat eksik", log=log),
+            _step("slow", "x", "z", delay=0.01, log=log),
+            _step("after", "y", "w", log=log),
+        ]
+        context = PipelineContext([{"x": 1}])
+
+        await DagPipelineRunner(steps, instruments=[]).run(context)
+
+        assert context.errors == ["fiyat eksik"]
+        assert "end:slow" in log
+        assert "start:after" not in log
+
+    @pytest.mark.asyncio
+    async def test_step_exceptions_are_unwrapped(self) -> None:
+        class Boom(BaseStep):
+            reads = frozenset({"x"})
+            writes = frozenset({"y"})
+
+            async def process(self, context: PipelineContext) -> None:
+                raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await DagPipelineRunner([Boom()], instruments=[]).run(
+                PipelineContext([{"x": 1}])
+            )
+
+    @pytest.mark.asyncio
+    async def test_declared_steps_must_keep_items(self) -> None:
+        class Drop(BaseStep):
+            reads = frozenset({"x"})
+            writes = frozenset({"x"})
+
+            async def process(self, context: PipelineContext) -> None:
+                context.data = context.data[1:]
+
+        with pytest.raises(RuntimeError, match="bariyer"):
+            await DagPipelineRunner([Drop()], instruments=[]).run(
+                PipelineContext([{"x": 1}, {"x": 2}])
+            )
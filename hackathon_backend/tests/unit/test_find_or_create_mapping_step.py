@@ -2,7 +2,7 @@
 Unit tests for FindOrCreateMappingStep.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -20,6 +20,7 @@ class MockProductMappingRepository:
     def __init__(self) -> None:
         self.mappings: Dict[str, ProductMapping] = {}
         self.next_id = 1
+        self.bulk_calls = 0
 
     async def find_or_create(
         self, provider_id: int, external_product_code: str, product_url: str | None = None
@@ -35,6 +36,17 @@ class MockProductMappingRepository:
             self.next_id += 1
         return self.mappings[key]
 
+    async def bulk_find_or_create(
+        self, items: List[Tuple[int, str, str | None]]
+    ) -> Dict[Tuple[int, str], ProductMapping]:
+        self.bulk_calls += 1
+        result: Dict[Tuple[int, str], ProductMapping] = {}
+        for provider_id, external_product_code, product_url in items:
+            result[(provider_id, external_product_code)] = await self.find_or_create(
+                provider_id, external_product_code, product_url
+            )
+        return result
+
 
 class MockUnitOfWork:
     """Mock UnitOfWork for testing."""
@@ -188,3 +200,58 @@ class TestFindOrCreateMappingStep:
         # Should reuse existing mapping (id=1), not create new one
         assert context.result[0]["mapping_id"] == 1
         assert mock_uow.product_mappings.next_id == 2  # Only one mapping created
+
+    @pytest.mark.asyncio
+    async def test_batch_resolved_with_single_bulk_call(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        """Test that the whole batch is resolved with one bulk repository call."""
+        products = [
+            {"id": f"ext_{i}", "provider_id": 1 + i % 2, "name": f"P{i}"}
+            for i in range(50)
+        ]
+        step = FindOrCreateMappingStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=products)
+
+        await step.process(context)
+
+        assert mock_uow.product_mappings.bulk_calls == 1
+        assert context.meta["mappings_processed"] == 50
+        assert len({p["mapping_id"] for p in context.result}) == 50
+
+    @pytest.mark.asyncio
+    async def test_duplicate_keys_share_mapping(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        """Test that duplicate offers in one batch resolve to the same mapping."""
+        products = [
+            {"id": "dup", "provider_id": 1, "name": "First"},
+            {"id": "dup", "provider_id": 1, "name": "Second"},
+        ]
+        step = FindOrCreateMappingStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=products)
+
+        await step.process(context)
+
+        assert context.result[0]["mapping_id"] == context.result[1]["mapping_id"]
+        assert context.result[1]["name"] == "Second"
+
+    @pytest.mark.asyncio
+    async def test_bulk_failure_reported_once(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        """Test that a failing bulk call is reported as a single batch error."""
+
+        async def failing_bulk(*args: Any, **kwargs: Any) -> None:
+            raise RuntimeError("db down")
+
+        mock_uow.product_mappings.bulk_find_or_create = failing_bulk  # type: ignore
+        products = [{"id": "a", "provider_id": 1}, {"id": "b", "provider_id": 1}]
+        step = FindOrCreateMappingStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=products)
+
+        await step.process(context)
+
+        assert context.result == []
+        assert context.meta["mapping_errors"] == 1
+        assert "Toplu mapping hatası" in context.errors[0]
@@ -0,0 +1,97 @@
+"""
+Unit tests for keyset (cursor) pagination helpers.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import ValidationException
+from app.infrastructure.repositories.keyset import KeysetOrder
+from app.persistence.models.chat.conversation import Conversation
+from app.persistence.models.products.product import Product
+
+PRODUCT_ORDER = KeysetOrder.of((Product.name, False), (Product.id, False))
+
+
+def _sql(clause: object) -> str:
+    return str(
+        clause.compile(  # type: ignore[attr-defined]
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+class TestKeysetOrder:
+    """Tests for KeysetOrder."""
+
+    def test_cursor_round_trip(self) -> None:
+        """Datetime and Decimal values survive encoding."""
+        order = KeysetOrder.of((Conversation.updated_at, True), (Conversation.id, True))
+        moment = datetime(2026, 3, 20, 14, 37, 5, 123456, tzinfo=timezone.utc)
+
+        assert order.decode(order.encode([moment, 42])) == [moment, 42]
+        assert PRODUCT_ORDER.decode(PRODUCT_ORDER.encode([Decimal("9.90"), 1])) == [
+            Decimal("9.90"),
+            1,
+        ]
+
+    def test_cursor_is_url_safe(self) -> None:
+        """Tokens can be used as query parameters without escaping."""
+        cursor = PRODUCT_ORDER.encode(["Ürün ?&/+ adı", 7])
+
+        assert "=" not in cursor
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize("cursor", ["", "not-base64!", "e30", "W10"])
+    def test_invalid_cursor_rejected(self, cursor: str) -> None:
+        """Malformed tokens raise ValidationException."""
+        with pytest.raises(ValidationException):
+            PRODUCT_ORDER.decode(cursor)
+
+    def test_cursor_from_other_order_rejected(self) -> None:
+        """A cursor issued for another sort order is not accepted."""
+        order = KeysetOrder.of((Conversation.updated_at, True), (Conversation.id, True))
+        cursor = order.encode([datetime(2026, 1, 1, tzinfo=timezone.utc), 1])
+
+        with pytest.raises(ValidationException):
+            PRODUCT_ORDER.after(cursor)
+
+    def test_uniform_direction_uses_row_comparison(self) -> None:
+        """Same-direction keys compile to an index-friendly row comparison."""
+        cursor = PRODUCT_ORDER.encode(["Kazak", 10])
+
+        assert _sql(PRODUCT_ORDER.after(cursor)) == (
+            "(products.name, products.id) > ('Kazak', 10)"
+        )
+
+    def test_descending_row_comparison(self) -> None:
+        """Descending keys compare with <."""
+        order = KeysetOrder.of((Product.name, True), (Product.id, True))
+
+        assert "<" in _sql(order.after(order.encode(["Kazak", 10])))
+
+    def test_mixed_direction_expands(self) -> None:
+        """Mixed directions expand into an OR of prefix-equal comparisons."""
+        order = KeysetOrder.of((Product.name, True), (Product.id, False))
+
+        sql = _sql(order.after(order.encode(["Kazak", 10])))
+
+        assert sql == (
+            "products.name < 'Kazak' OR products.name = 'Kazak' AND products.id > 10"
+        )
+
+    def test_paginate_emits_cursor_only_when_more_rows(self) -> None:
+        """A cursor is returned only when limit + 1 rows were read."""
+        rows = [("a", 1), ("b", 2), ("c", 3)]
+
+        page, cursor = PRODUCT_ORDER.paginate(rows, 2, lambda row: list(row))
+        assert page == rows[:2]
+        assert cursor is not None
+        assert PRODUCT_ORDER.decode(cursor) == ["b", 2]
+
+        page, cursor = PRODUCT_ORDER.paginate(rows, 3, lambda row: list(row))
+        assert page == rows
+        assert cursor is None
@@ -0,0 +1,213 @@
+"""
+Unit tests for MatchProductStep.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from app.application.pipelines.analytics.steps.match_product_step import (
+    MatchProductStep,
+)
+from app.core.patterns.pipeline import PipelineContext
+
+
+class MockProductRepository:
+    """Mock ProductRepository recording batch calls."""
+
+    def __init__(self, existing: Dict[str, int]) -> None:
+        self.existing = existing
+        self.calls: List[str] = []
+        self.created: List[Dict[str, Any]] = []
+        self.variants: List[Dict[str, Any]] = []
+
+    async def get_ids_by_names(self, names: List[str]) -> Dict[str, int]:
+        self.calls.append("get_ids_by_names")
+        return {name: self.existing[name] for name in names if name in self.existing}
+
+    async def get_match_candidates(self) -> List[Tuple[int, str, Optional[str]]]:
+        self.calls.append("get_match_candidates")
+        return [(product_id, name, None) for name, product_id in self.existing.items()]
+
+    async def bulk_create(self, products: List[Dict[str, Any]]) -> Dict[str, int]:
+        self.calls.append("bulk_create")
+        self.created.extend(products)
+        return {p["slug"]: 100 + i for i, p in enumerate(products)}
+
+    async def bulk_create_variants(self, variants: List[Dict[str, Any]]) -> int:
+        self.calls.append("bulk_create_variants")
+        self.variants.extend(variants)
+        return len(variants)
+
+
+class MockProductMappingRepository:
+    """Mock ProductMappingRepository."""
+
+    def __init__(self) -> None:
+        self.assignments: Dict[int, int] = {}
+        self.calls = 0
+
+    async def assign_products(self, assignments: Dict[int, int]) -> int:
+        self.calls += 1
+        self.assignments.update(assignments)
+        return len(assignments)
+
+
+class MockUnitOfWork:
+    """Mock UnitOfWork for testing."""
+
+    def __init__(self, existing: Dict[str, int]) -> None:
+        self.products = MockProductRepository(existing)
+        self.product_mappings = MockProductMappingRepository()
+
+
+class TestMatchProductStep:
+    """Tests for MatchProductStep."""
+
+    @pytest.mark.asyncio
+    async def test_batch_is_set_based(self) -> None:
+        """A batch costs one lookup, one insert, one variant insert, one update."""
+        uow = MockUnitOfWork(existing={"nike air max 90": 7})
+        step = MatchProductStep(uow)  # type: ignore
+        context = PipelineContext(
+            initial_data=[
+                {"mapping_id": 1, "name": "Nike  Air Max 90"},
+                {
+                    "mapping_id": 2,
+                    "name": "Puma RS-X",
+                    "brand": "Puma",
+                    "colors": ["Siyah", "Beyaz"],
+                    "sizes": ["42", "43"],
+                },
+                {"mapping_id": 3, "name": "puma rs-x"},
+                {"mapping_id": 4, "name": "Adidas Samba", "colors": ["Yeşil"]},
+                {"mapping_id": 5, "existing_product_id": 9, "name": "Bağlı"},
+            ]
+        )
+
+        await step.process(context)
+
+        assert uow.products.calls == [
+            "get_ids_by_names",
+            "get_match_candidates",
+            "bulk_create",
+            "bulk_create_variants",
+        ]
+        assert uow.product_mappings.calls == 1
+        assert uow.product_mappings.assignments == {1: 7, 2: 100, 3: 100, 4: 101}
+        assert [p["slug"] for p in uow.products.created] == [
+            "puma-rs-x",
+            "adidas-samba",
+        ]
+        assert uow.products.created[0]["brand"] == "Puma"
+        assert [v["sku"] for v in uow.products.variants] == [
+            "puma-rs-x-siy-42",
+            "puma-rs-x-siy-43",
+            "puma-rs-x-bey-42",
+            "puma-rs-x-bey-43",
+            "adidas-samba-yeş",
+        ]
+        assert [item["product_id"] for item in context.result] == [7, 100, 100, 101, 9]
+        assert context.result[1]["product_name"] == "puma rs-x"
+        assert context.meta["products_created"] == 2
+        assert context.meta["products_matched_existing"] == 3
+        assert context.meta["variants_created"] == 5
+        assert context.is_valid
+
+    @pytest.mark.asyncio
+    async def test_all_existing_skips_inserts(self) -> None:
+        uow = MockUnitOfWork(existing={"kazak": 3})
+        context = PipelineContext(initial_data=[{"mapping_id": 1, "name": "KAZAK"}])
+
+        await MatchProductStep(uow).process(context)  # type: ignore
+
+        assert uow.products.calls == ["get_ids_by_names"]
+        assert uow.product_mappings.assignments == {1: 3}
+
+    @pytest.mark.asyncio
+    async def test_invalid_name_reported(self) -> None:
+        uow = MockUnitOfWork(existing={})
+        context = PipelineContext(initial_data=[{"mapping_id": 1, "name": "   "}])
+
+        await MatchProductStep(uow).process(context)  # type: ignore
+
+        assert uow.products.calls == []
+        assert context.errors == ["Mapping 1: Geçersiz isim '   '"]
+
+    @pytest.mark.asyncio
+    async def test_repository_failure_reported(self) -> None:
+        uow = MockUnitOfWork(existing={})
+
+        async def fail(names: List[str]) -> Dict[str, int]:
+            raise RuntimeError("db down")
+
+        uow.products.get_ids_by_names = fail  # type: ignore[method-assign]
+        context = PipelineContext(initial_data=[{"mapping_id": 1, "name": "Kazak"}])
+
+        await MatchProductStep(uow).process(context)  # type: ignore
+
+        assert context.errors == ["Ürün eşleştirme hatası: db down"]
+
+    @pytest.mark.asyncio
+    async def test_fuzzy_match_to_existing_product(self) -> None:
+        """Another provider's spelling of a known product is not a new product."""
+        uow = MockUnitOfWork(existing={"nike air max 90 koşu ayakkabısı": 7})
+        context = PipelineContext(
+            initial_data=[
+                {"mapping_id": 1, "name": "NIKE Air Max 90 Kosu Ayakkabisi"},
+                {"mapping_id": 2, "name": "Nike Air Max 95 Koşu Ayakkabısı"},
+            ]
+        )
+
+        await MatchProductStep(uow).process(context)  # type: ignore
+
+        # 95 is a different model: the model number must match exactly
+        assert uow.product_mappings.assignments == {1: 7, 2: 100}
+        assert context.result[0]["product_name"] == "nike air max 90 koşu ayakkabısı"
+        assert [p["name"] for p in uow.products.created] == [
+            "nike air max 95 koşu ayakkabısı"
+        ]
+        assert context.meta["products_fuzzy_matched"] == 1
+        assert context.meta["products_created"] == 1
+
+    @pytest.mark.asyncio
+    async def test_near_duplicates_in_batch_create_one_product(self) -> None:
+        """Near-duplicate new names in one batch share the first created product."""
+        uow = MockUnitOfWork(existing={})
+        step = MatchProductStep(uow)  # type: ignore
+        context = PipelineContext(
+            initial_data=[
+                {"mapping_id": 1, "name": "Mavi Jake Slim Fit Jean", "brand": "Mavi"},
+                {
+                    "mapping_id": 2,
+                    "name": "Jake Slim Fit Jean Pantolon",
+                    "brand": "Mavi",
+                },
+            ]
+        )
+
+        await step.process(context)
+
+        assert [p["name"] for p in uow.products.created] == ["mavi jake slim fit jean"]
+        assert uow.product_mappings.assignments == {1: 100, 2: 100}
+
+        # The index is reused for the next batch and knows the created product
+        next_batch = PipelineContext(
+            initial_data=[{"mapping_id": 3, "name": "MAVI JAKE JEAN SLIM FIT"}]
+        )
+        await step.process(next_batch)
+
+        assert uow.products.calls.count("get_match_candidates") == 1
+        assert uow.product_mappings.assignments[3] == 100
+
+    @pytest.mark.asyncio
+    async def test_fuzzy_matching_can_be_disabled(self) -> None:
+        uow = MockUnitOfWork(existing={"nike air max 90": 7})
+        context = PipelineContext(
+            initial_data=[{"mapping_id": 1, "name": "Nike Air Max 90 Erkek"}]
+        )
+
+        await MatchProductStep(uow, fuzzy_threshold=None).process(context)  # type: ignore
+
+        assert "get_match_candidates" not in uow.products.calls
+        assert uow.product_mappings.assignments == {1: 100}
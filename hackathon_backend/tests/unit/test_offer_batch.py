@@ -0,0 +1,107 @@
+"""
+Unit tests for the columnar OfferBatch and its row views.
+"""
+
+import pytest
+
+from app.core.patterns.offer_batch import MISSING, OfferBatch
+from app.core.patterns.pipeline import BaseStep, DagPipelineRunner, PipelineContext
+
+
+def _batch() -> OfferBatch:
+    return OfferBatch.from_records(
+        [
+            {"id": "a", "price": 10},
+            {"id": "b"},
+            {"id": "c", "price": 30, "currency": "USD"},
+        ]
+    )
+
+
+class TestOfferBatch:
+    def test_from_records_marks_absent_fields(self) -> None:
+        batch = _batch()
+
+        assert len(batch) == 3
+        assert batch.column("price") == [10, MISSING, 30]
+        assert batch.column("currency") == [MISSING, MISSING, "USD"]
+        assert batch.values("currency", "TRY") == ["TRY", "TRY", "USD"]
+        assert batch.to_records() == [
+            {"id": "a", "price": 10},
+            {"id": "b"},
+            {"id": "c", "price": 30, "currency": "USD"},
+        ]
+
+    def test_coerce_keeps_batches(self) -> None:
+        batch = _batch()
+
+        assert OfferBatch.coerce(batch) is batch
+        assert len(OfferBatch.coerce(None)) == 0
+
+    def test_rows_behave_like_dicts(self) -> None:
+        batch = _batch()
+        row = batch[1]
+
+        assert "price" not in row
+        assert row.get("price", 0) == 0
+        with pytest.raises(KeyError):
+            row["price"]
+
+        row["price"] = 20
+        del batch[0]["price"]
+
+        assert batch.column("price") == [MISSING, 20, 30]
+        assert batch[-1] == {"id": "c", "price": 30, "currency": "USD"}
+        assert batch == [{"id": "a"}, {"id": "b", "price": 20}, batch[2].copy()]
+
+    def test_set_column_validates_length(self) -> None:
+        batch = _batch()
+
+        batch.set_column("mapping_id", [1, 2, 3])
+
+        assert [row["mapping_id"] for row in batch] == [1, 2, 3]
+        with pytest.raises(ValueError):
+            batch.set_column("mapping_id", [1])
+
+    def test_take_selects_rows_without_copying_identity(self) -> None:
+        batch = _batch()
+
+        assert batch.take([0, 1, 2]) is batch
+        assert batch.take([2, 0]).values("id") == ["c", "a"]
+        assert batch[1:].values("id") == ["b", "c"]
+
+    def test_fork_copies_columns_on_first_row_write(self) -> None:
+        batch = _batch()
+        fork = batch.fork()
+
+        fork[0]["price"] = 99
+        fork.set_column("id", ["x", "y", "z"])
+
+        assert batch.column("price") == [10, MISSING, 30]
+        assert batch.values("id") == ["a", "b", "c"]
+        assert fork.column("price") == [99, MISSING, 30]
+        assert fork.column("currency") is batch.column("currency")
+
+
+class TestDagMergeWithBatches:
+    @pytest.mark.asyncio
+    async def test_only_declared_columns_are_merged(self) -> None:
+        class Enrich(BaseStep):
+            reads = frozenset({"price"})
+            writes = frozenset({"double"})
+
+            async def process(self, context: PipelineContext) -> None:
+                batch = OfferBatch.coerce(context.data)
+                batch.set_column("double", [p * 2 for p in batch.values("price", 0)])
+                for row in batch:
+                    row["price"] = -1
+                context.data = batch
+
+        batch = _batch()
+        context = PipelineContext(initial_data=batch)
+
+        await DagPipelineRunner([Enrich()], instruments=[]).run(context)
+
+        assert context.data is batch
+        assert batch.values("double") == [20, 0, 60]
+        assert batch.column("price") == [10, MISSING, 30]
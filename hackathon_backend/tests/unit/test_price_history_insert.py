@@ -0,0 +1,119 @@
+"""
+Unit tests for PriceHistoryRepository.insert_many (COPY / multi-row INSERT).
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.domain.schemas.price.price_history import PriceHistoryCreate
+from app.infrastructure.repositories.price_history_repository import (
+    PriceHistoryRepository,
+)
+
+
+class MockResult:
+    def __init__(self, values: List[int]) -> None:
+        self.values = values
+
+    def scalars(self) -> "MockResult":
+        return self
+
+    def all(self) -> List[int]:
+        return self.values
+
+
+class MockDriverConnection:
+    def __init__(self) -> None:
+        self.copies: List[Tuple[str, List[Tuple[Any, ...]], Tuple[str, ...]]] = []
+
+    async def copy_records_to_table(
+        self, table: str, *, records: List[Tuple[Any, ...]], columns: Tuple[str, ...]
+    ) -> None:
+        self.copies.append((table, records, columns))
+
+
+class MockConnection:
+    def __init__(self, driver: Any) -> None:
+        self.driver_connection = driver
+
+    async def get_raw_connection(self) -> "MockConnection":
+        return self
+
+
+class MockSession:
+    """Hands out sequential ids for INSERT ... RETURNING and nextval()."""
+
+    def __init__(self, driver: Optional[Any] = None) -> None:
+        self.driver = driver
+        self.statements: List[str] = []
+        self.next_id = 1
+
+    async def connection(self) -> MockConnection:
+        return MockConnection(self.driver)
+
+    async def execute(
+        self, stmt: Any, params: Optional[Dict[str, Any]] = None
+    ) -> MockResult:
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append(str(compiled))
+        count = params["count"] if params else len(compiled.params) // 8
+        ids = list(range(self.next_id, self.next_id + count))
+        self.next_id += count
+        return MockResult(ids)
+
+
+def _items(count: int) -> List[PriceHistoryCreate]:
+    return [
+        PriceHistoryCreate(mapping_id=i, price=Decimal("10.50"), currency_id=1)
+        for i in range(count)
+    ]
+
+
+class TestInsertMany:
+    @pytest.mark.asyncio
+    async def test_small_batches_use_chunked_insert_returning(self) -> None:
+        session = MockSession(MockDriverConnection())
+        repository = PriceHistoryRepository(session)  # type: ignore[arg-type]
+        repository.INSERT_CHUNK_SIZE = 2
+
+        ids = await repository.insert_many(_items(5))
+
+        assert ids == [1, 2, 3, 4, 5]
+        assert len(session.statements) == 3
+        assert all("RETURNING price_histories.id" in s for s in session.statements)
+        assert session.driver.copies == []
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_copied_with_preallocated_ids(self) -> None:
+        driver = MockDriverConnection()
+        session = MockSession(driver)
+        repository = PriceHistoryRepository(session)  # type: ignore[arg-type]
+        repository.COPY_THRESHOLD = 3
+
+        ids = await repository.insert_many(_items(3))
+
+        assert ids == [1, 2, 3]
+        assert "nextval('price_histories_id_seq')" in session.statements[0]
+        table, records, columns = driver.copies[0]
+        assert table == "price_histories"
+        assert columns[:3] == ("id", "mapping_id", "variant_id")
+        assert records[2] == (3, 2, None, Decimal("10.50"), None, None, 1, True, None)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_insert_without_copy_support(self) -> None:
+        session = MockSession(driver=object())
+        repository = PriceHistoryRepository(session)  # type: ignore[arg-type]
+        repository.COPY_THRESHOLD = 1
+
+        assert await repository.insert_many(_items(2)) == [1, 2]
+        assert "INSERT INTO price_histories" in session.statements[0]
+
+    @pytest.mark.asyncio
+    async def test_empty_input_runs_nothing(self) -> None:
+        session = MockSession()
+
+        assert await PriceHistoryRepository(session).insert_many([]) == []  # type: ignore[arg-type]
+        assert session.statements == []
@@ -0,0 +1,195 @@
+"""
+Unit tests for PriceHistoryRetentionService.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Tuple
+
+import pytest
+
+from app.application.services.price.price_history_retention_service import (
+    PriceHistoryRetentionService,
+)
+
+NOW = datetime(2026, 3, 20, 14, 37, tzinfo=timezone.utc)
+
+
+class MockPriceHistoryRepository:
+    """Mock PriceHistoryRepository with partition bookkeeping."""
+
+    def __init__(self, partition_days: List[date]) -> None:
+        self.partition_days = list(partition_days)
+        self.ensured: List[Tuple[date, date]] = []
+        self.dropped: List[date] = []
+        self.calls: List[str] = []
+
+    async def ensure_partitions(self, from_day: date, to_day: date) -> int:
+        self.ensured.append((from_day, to_day))
+        missing = [
+            from_day + timedelta(days=i)
+            for i in range((to_day - from_day).days + 1)
+            if from_day + timedelta(days=i) not in self.partition_days
+        ]
+        self.partition_days.extend(missing)
+        return len(missing)
+
+    async def get_partition_days(self) -> List[date]:
+        return sorted(self.partition_days)
+
+    async def carry_open_intervals(self, day: date) -> int:
+        self.calls.append(f"carry:{day.isoformat()}")
+        return 0
+
+    async def drop_partition(self, day: date) -> None:
+        self.calls.append(f"drop:{day.isoformat()}")
+        self.partition_days.remove(day)
+        self.dropped.append(day)
+
+
+class MockPriceRollupRepository:
+    """Mock PriceRollupRepository recording rollup ranges."""
+
+    def __init__(self, calls: List[str]) -> None:
+        self.calls = calls
+        self.hourly: List[Tuple[datetime, datetime]] = []
+        self.daily: List[Tuple[datetime, datetime]] = []
+        self.deleted_before: List[datetime] = []
+        self.chart_changed: List[int] = []
+
+    async def rollup_hourly(self, since: datetime, until: datetime) -> int:
+        self.calls.append(f"hourly:{since.date().isoformat()}")
+        self.hourly.append((since, until))
+        return 0
+
+    async def rollup_daily(self, since: datetime, until: datetime) -> List[int]:
+        self.calls.append(f"daily:{since.date().isoformat()}")
+        self.daily.append((since, until))
+        return list(self.chart_changed)
+
+    async def delete_hourly_before(self, cutoff: datetime) -> int:
+        self.deleted_before.append(cutoff)
+        return 5
+
+
+class MockUnitOfWork:
+    """Mock UnitOfWork for testing."""
+
+    def __init__(self, partition_days: List[date]) -> None:
+        self.price_histories = MockPriceHistoryRepository(partition_days)
+        self.price_rollups = MockPriceRollupRepository(self.price_histories.calls)
+
+
+def _days(start: date, count: int) -> List[date]:
+    return [start + timedelta(days=i) for i in range(count)]
+
+
+class TestPriceHistoryRetentionService:
+    """Tests for PriceHistoryRetentionService."""
+
+    @pytest.mark.asyncio
+    async def test_creates_future_partitions(self) -> None:
+        """Partitions are ensured from today up to partitions_ahead_days."""
+        uow = MockUnitOfWork([NOW.date()])
+        service = PriceHistoryRetentionService(uow, partitions_ahead_days=3)  # type: ignore
+
+        stats = await service.run(now=NOW)
+
+        assert uow.price_histories.ensured == [
+            (NOW.date(), NOW.date() + timedelta(days=3))
+        ]
+        assert stats["partitions_created"] == 3
+
+    @pytest.mark.asyncio
+    async def test_recent_hours_rolled_up(self) -> None:
+        """The current and lookback hours are rolled up on every run."""
+        uow = MockUnitOfWork([])
+        service = PriceHistoryRetentionService(uow)  # type: ignore
+
+        await service.run(now=NOW)
+
+        since, until = uow.price_rollups.hourly[0]
+        assert since == datetime(2026, 3, 20, 12, 0, tzinfo=timezone.utc)
+        assert until == NOW
+        assert uow.price_rollups.daily[0] == (
+            datetime(2026, 3, 20, tzinfo=timezone.utc),
+            NOW,
+        )
+
+    @pytest.mark.asyncio
+    async def test_chart_changes_reported_once_per_product(self) -> None:
+        """Products whose chart changed are returned for cache invalidation."""
+        uow = MockUnitOfWork(_days(NOW.date() - timedelta(days=9), 10))
+        uow.price_rollups.chart_changed = [7, 3]
+        service = PriceHistoryRetentionService(  # type: ignore
+            uow, raw_retention_days=7, partitions_ahead_days=0
+        )
+
+        stats = await service.run(now=NOW)
+
+        # Reported by the recent and every expired day's rollup, listed once
+        assert stats["chart_changed_product_ids"] == [3, 7]
+
+    @pytest.mark.asyncio
+    async def test_expired_partitions_rolled_up_before_drop(self) -> None:
+        """Partitions older than the retention are downsampled, then dropped."""
+        start = NOW.date() - timedelta(days=10)
+        uow = MockUnitOfWork(_days(start, 11))
+        service = PriceHistoryRetentionService(  # type: ignore
+            uow, raw_retention_days=7, partitions_ahead_days=0
+        )
+
+        stats = await service.run(now=NOW)
+
+        expected = _days(start, 3)
+        assert uow.price_histories.dropped == expected
+        assert stats["partitions_dropped"] == [d.isoformat() for d in expected]
+        for day in expected:
+            calls = uow.price_histories.calls
+            drop_at = calls.index(f"drop:{day.isoformat()}")
+            assert calls.index(f"hourly:{day.isoformat()}") < drop_at
+            assert calls.index(f"daily:{day.isoformat()}") < drop_at
+
+    @pytest.mark.asyncio
+    async def test_open_intervals_carried_forward_before_drop(self) -> None:
+        """A flat price must outlive the partition of the row that recorded it."""
+        start = NOW.date() - timedelta(days=9)
+        uow = MockUnitOfWork(_days(start, 10))
+        service = PriceHistoryRetentionService(  # type: ignore
+            uow, raw_retention_days=7, partitions_ahead_days=0
+        )
+
+        await service.run(now=NOW)
+
+        calls = uow.price_histories.calls
+        for day in _days(start, 2):
+            carry_at = calls.index(f"carry:{day.isoformat()}")
+            assert calls.index(f"daily:{day.isoformat()}") < carry_at
+            assert carry_at < calls.index(f"drop:{day.isoformat()}")
+        # Each day is carried before the next one is rolled up
+        assert calls.index(f"carry:{start.isoformat()}") < calls.index(
+            f"hourly:{(start + timedelta(days=1)).isoformat()}"
+        )
+
+    @pytest.mark.asyncio
+    async def test_partitions_within_retention_kept(self) -> None:
+        """Nothing is dropped while all partitions are within retention."""
+        uow = MockUnitOfWork(_days(NOW.date() - timedelta(days=6), 7))
+        service = PriceHistoryRetentionService(uow, raw_retention_days=7)  # type: ignore
+
+        stats = await service.run(now=NOW)
+
+        assert uow.price_histories.dropped == []
+        assert stats["partitions_dropped"] == []
+
+    @pytest.mark.asyncio
+    async def test_old_hourly_rollups_deleted(self) -> None:
+        """Hourly rollups beyond their retention are removed."""
+        uow = MockUnitOfWork([])
+        service = PriceHistoryRetentionService(uow, hourly_retention_days=90)  # type: ignore
+
+        stats = await service.run(now=NOW)
+
+        assert uow.price_rollups.deleted_before == [
+            datetime(2025, 12, 20, tzinfo=timezone.utc)
+        ]
+        assert stats["hourly_rollups_deleted"] == 5
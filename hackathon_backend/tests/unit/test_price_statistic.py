@@ -0,0 +1,66 @@
+"""
+Unit tests for PriceStatistic incremental updates.
+"""
+
+from decimal import Decimal
+
+from app.domain.schemas.price.price_statistic import PriceStatistic
+
+
+def _d(*values: str) -> list[Decimal]:
+    return [Decimal(v) for v in values]
+
+
+class TestPriceStatistic:
+    """Tests for PriceStatistic.with_samples."""
+
+    def test_first_samples(self) -> None:
+        """A fresh statistic is seeded from the first batch."""
+        stat = PriceStatistic(mapping_id=1).with_samples(_d("100", "80", "120"))
+
+        assert stat.sample_count == 3
+        assert stat.price_sum == Decimal("300")
+        assert stat.min_price == Decimal("80")
+        assert stat.max_price == Decimal("120")
+        assert stat.last_price == Decimal("120")
+        assert stat.recent_prices == _d("120", "80", "100")
+        assert stat.avg_price == Decimal("100")
+
+    def test_incremental_equals_single_batch(self) -> None:
+        """Applying samples one by one equals applying them at once."""
+        prices = _d("10", "12.5", "9", "11", "15", "14")
+        batch = PriceStatistic(mapping_id=1).with_samples(prices)
+
+        stepwise = PriceStatistic(mapping_id=1)
+        for price in prices:
+            stepwise = stepwise.with_samples([price])
+
+        # EWMA her adımda 4 haneye yuvarlanır, küçük sapma olabilir
+        assert stepwise.model_dump(exclude={"ewma_price"}) == batch.model_dump(
+            exclude={"ewma_price"}
+        )
+        assert abs(stepwise.ewma_price - batch.ewma_price) < Decimal("0.001")
+
+    def test_ring_buffer_keeps_last_window(self) -> None:
+        """Only the newest `window` prices are kept, newest first."""
+        stat = PriceStatistic(mapping_id=1)
+        for i in range(1, 8):
+            stat = stat.with_samples([Decimal(i)], window=3)
+
+        assert stat.recent_prices == _d("7", "6", "5")
+        assert stat.sample_count == 7
+        assert stat.min_price == Decimal("1")
+
+    def test_ewma(self) -> None:
+        """EWMA starts at the first price and moves by alpha toward new prices."""
+        stat = PriceStatistic(mapping_id=1).with_samples(
+            _d("100", "200"), alpha=Decimal("0.5")
+        )
+
+        assert stat.ewma_price == Decimal("150.0000")
+
+    def test_empty_samples_is_noop(self) -> None:
+        """No samples leaves the statistic unchanged."""
+        stat = PriceStatistic(mapping_id=1).with_samples(_d("5"))
+
+        assert stat.with_samples([]) == stat
@@ -0,0 +1,165 @@
+"""
+Unit tests for the cached product detail response (ETag + invalidation).
+"""
+
+import asyncio
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+from app.application.cqrs.queries.product_query import (
+    ProductQueryService,
+    detail_etag,
+    etag_matches,
+    invalidate_product_details,
+    product_detail_cache_key,
+)
+from app.domain.schemas.products.product_full_detail import ProductFullDetailResponse
+
+
+class MockCache:
+    def __init__(self) -> None:
+        self.data: Dict[str, Any] = {}
+        self.deleted: List[List[str]] = []
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: Any, expire: int = 60) -> None:
+        self.data[key] = value
+
+    async def set_if_absent(self, key: str, value: Any, expire: int = 60) -> bool:
+        return self.data.setdefault(key, value) == value
+
+    async def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        if key not in self.data or self.data[key] != value:
+            return False
+        del self.data[key]
+        return True
+
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        self.deleted.append(list(keys))
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+class MockUnitOfWork:
+    """Hands out its own session marker and records whether it is open."""
+
+    def __init__(self, opened: List["MockUnitOfWork"]) -> None:
+        self.db = object()
+        self.active = False
+        opened.append(self)
+
+    async def __aenter__(self) -> "MockUnitOfWork":
+        self.active = True
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.active = False
+
+
+class CountingQueryService(ProductQueryService):
+    """Replaces the database build with a canned response."""
+
+    def __init__(self, cache: MockCache, price: str = "899.90") -> None:
+        self.request_db = object()
+        self.opened: List[MockUnitOfWork] = []
+        super().__init__(
+            db=self.request_db,  # type: ignore[arg-type]
+            cache=cache,
+            uow_factory=lambda: MockUnitOfWork(self.opened),  # type: ignore
+        )
+        self.price = price
+        self.builds = 0
+        self.sessions: List[Any] = []
+
+    async def get_product_full_detail(
+        self, product_id: int, db: Any = None
+    ) -> Optional[ProductFullDetailResponse]:
+        self.builds += 1
+        self.sessions.append(db)
+        await asyncio.sleep(0.01)
+        if product_id != 1:
+            return None
+        return ProductFullDetailResponse(
+            id=1,
+            name="Kamp Çadırı",
+            best_price=Decimal(self.price),
+            provider_count=0,
+        )
+
+
+class TestProductDetailCache:
+    @pytest.mark.asyncio
+    async def test_detail_is_built_once_and_served_from_cache(self) -> None:
+        cache = MockCache()
+        service = CountingQueryService(cache)
+
+        first, second = await asyncio.gather(
+            service.get_product_detail_payload(1), service.get_product_detail_payload(1)
+        )
+        third = await service.get_product_detail_payload(1)
+
+        assert service.builds == 1
+        assert first is not None and second is not None and third is not None
+        assert first.etag == second.etag == third.etag
+        assert third.body["name"] == "Kamp Çadırı"
+        assert product_detail_cache_key(1) in cache.data
+
+    @pytest.mark.asyncio
+    async def test_build_runs_in_its_own_unit_of_work(self) -> None:
+        service = CountingQueryService(MockCache())
+
+        await service.get_product_detail_payload(1)
+
+        # Shared builds must not borrow the (possibly closed) request session
+        assert len(service.opened) == 1
+        assert service.sessions == [service.opened[0].db]
+        assert service.sessions[0] is not service.request_db
+        assert not service.opened[0].active
+
+    @pytest.mark.asyncio
+    async def test_missing_product_returns_none(self) -> None:
+        service = CountingQueryService(MockCache())
+
+        assert await service.get_product_detail_payload(404) is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_rebuilds_with_new_etag(self) -> None:
+        cache = MockCache()
+        before = await CountingQueryService(cache).get_product_detail_payload(1)
+
+        assert await invalidate_product_details(cache, [1, 2]) == 1
+        assert cache.deleted == [["product:detail:1", "product:detail:2"]]
+
+        rebuilt = CountingQueryService(cache, price="849.90")
+        after = await rebuilt.get_product_detail_payload(1)
+        assert rebuilt.builds == 1
+        assert before is not None and after is not None
+        assert before.etag != after.etag
+
+    @pytest.mark.asyncio
+    async def test_no_product_ids_skips_cache_round_trip(self) -> None:
+        cache = MockCache()
+
+        assert await invalidate_product_details(cache, []) == 0
+        assert cache.deleted == []
+
+
+class TestETag:
+    def test_etag_ignores_key_order(self) -> None:
+        assert detail_etag({"a": 1, "b": [1, 2]}) == detail_etag({"b": [1, 2], "a": 1})
+        assert detail_etag({"a": 1}) != detail_etag({"a": 2})
+
+    def test_if_none_match_variants(self) -> None:
+        etag = detail_etag({"id": 1})
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
@@ -0,0 +1,201 @@
+"""
+Unit tests for ProductIndexer (incremental indexing and alias-swap rebuilds).
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+import app.application.services.product_indexer as indexer_module
+from app.application.services.product_indexer import IndexingError, ProductIndexer
+from app.core.infrastructure.in_memory_search import InMemorySearchService
+
+
+class MockSession:
+    """Mock AsyncSession context manager."""
+
+    async def __aenter__(self) -> "MockSession":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class Catalog:
+    """In-memory stand-in for load_product_documents / changed_product_ids."""
+
+    def __init__(self, size: int) -> None:
+        self.products: Dict[int, Dict[str, Any]] = {
+            i: {"id": i, "name": f"Ürün {i}", "lowest_price": float(i)}
+            for i in range(1, size + 1)
+        }
+        self.changed: List[int] = []
+        self.loads: List[List[int]] = []
+
+    async def load(
+        self,
+        session: Any,
+        *,
+        product_ids: Optional[Sequence[int]] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        ids = sorted(self.products)
+        if product_ids is not None:
+            ids = [i for i in ids if i in set(product_ids)]
+        if after_id is not None:
+            ids = [i for i in ids if i > after_id]
+        ids = ids[:limit] if limit is not None else ids
+        self.loads.append(list(product_ids) if product_ids is not None else ids)
+        return [dict(self.products[i]) for i in ids]
+
+    async def changed_since(self, session: Any, since: datetime) -> List[int]:
+        return list(self.changed)
+
+
+class FailingSearch(InMemorySearchService):
+    """Drops documents after a number of successful bulk requests."""
+
+    def __init__(self, ok_batches: int) -> None:
+        super().__init__()
+        self.ok_batches = ok_batches
+
+    async def bulk_index(
+        self, index: str, documents: List[Dict[str, Any]], id_field: str = "id"
+    ) -> int:
+        if self.ok_batches == 0:
+            # Yarım kalan chunk: ilk iki doküman yazılır
+            return await super().bulk_index(index, documents[:2], id_field)
+        self.ok_batches -= 1
+        return await super().bulk_index(index, documents, id_field)
+
+
+@pytest.fixture
+def catalog(monkeypatch: pytest.MonkeyPatch) -> Catalog:
+    catalog = Catalog(size=25)
+    monkeypatch.setattr(indexer_module, "AsyncSessionLocal", MockSession)
+    monkeypatch.setattr(indexer_module, "load_product_documents", catalog.load)
+    monkeypatch.setattr(indexer_module, "changed_product_ids", catalog.changed_since)
+    return catalog
+
+
+async def _ids(search: InMemorySearchService, index: str) -> List[int]:
+    result = await search.search(
+        index, {"match_all": {}}, size=1000, sort=[{"id": {"order": "asc"}}]
+    )
+    return [doc["id"] for doc in result["hits"]]
+
+
+class TestProductIndexer:
+    """Tests for ProductIndexer."""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_swaps_alias(self, catalog: Catalog) -> None:
+        """A rebuild fills a new index, points the alias at it and drops the old one."""
+        search = InMemorySearchService()
+        await search.bulk_index("products", [{"id": 999, "name": "Eski"}])
+        indexer = ProductIndexer(search, chunk_size=10)
+
+        indexed = await indexer.rebuild()
+
+        assert indexed == 25
+        (target,) = await search.get_alias("products")
+        assert target.startswith("products-")
+        assert await _ids(search, "products") == list(range(1, 26))
+        assert await search.list_indices("products*") == [target]
+        # Keyset batches of chunk_size
+        assert [len(ids) for ids in catalog.loads] == [10, 10, 5, 0]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_catches_up_changes(self, catalog: Catalog) -> None:
+        """Products changed during the build are re-indexed after the swap."""
+        search = InMemorySearchService()
+        catalog.changed = [3, 30]
+        catalog.products[30] = {"id": 30, "name": "Yeni ürün", "lowest_price": 1.0}
+        indexer = ProductIndexer(search, chunk_size=100)
+
+        await indexer.rebuild()
+
+        assert 30 in await _ids(search, "products")
+
+    @pytest.mark.asyncio
+    async def test_second_rebuild_keeps_old_index_on_request(
+        self, catalog: Catalog
+    ) -> None:
+        search = InMemorySearchService()
+        indexer = ProductIndexer(search, chunk_size=100)
+        await indexer.rebuild()
+        (first,) = await search.get_alias("products")
+        await asyncio.sleep(1)  # index adı saniye çözünürlüklü
+
+        await indexer.rebuild(keep_old=True)
+
+        (second,) = await search.get_alias("products")
+        assert second != first
+        assert await search.list_indices("products-*") == [first, second]
+
+    @pytest.mark.asyncio
+    async def test_resume_after_partial_chunk(self, catalog: Catalog) -> None:
+        """A rebuild that fails mid-chunk resumes without gaps or a second index."""
+        failing = FailingSearch(ok_batches=1)
+        with pytest.raises(IndexingError):
+            await ProductIndexer(failing, chunk_size=10).rebuild()
+        assert await failing.get_alias("products") == []
+        (building,) = await failing.list_indices("products-*")
+        assert await _ids(failing, building) == list(range(1, 13))
+
+        failing.ok_batches = 100
+        indexed = await ProductIndexer(failing, chunk_size=10).rebuild(resume=True)
+
+        assert await failing.get_alias("products") == [building]
+        assert await _ids(failing, "products") == list(range(1, 26))
+        # 12 doküman var; 10 geriden (id 2) sonrası yeniden okunur
+        assert indexed == 23
+
+    @pytest.mark.asyncio
+    async def test_incremental_updates_and_deletes(self, catalog: Catalog) -> None:
+        search = InMemorySearchService()
+        indexer = ProductIndexer(search, chunk_size=2)
+        await indexer.rebuild()
+        catalog.products[5]["name"] = "Güncellenmiş"
+        del catalog.products[6]
+        catalog.loads.clear()
+
+        indexed = await indexer.index_products([6, 5, 5, 7])
+
+        assert indexed == 2
+        assert catalog.loads == [[5, 6], [7]]
+        docs = await search.search("products", {"term": {"id": 5}})
+        assert docs["hits"][0]["name"] == "Güncellenmiş"
+        assert 6 not in await _ids(search, "products")
+
+    @pytest.mark.asyncio
+    async def test_incremental_skips_missing_index(self, catalog: Catalog) -> None:
+        """Without a products index nothing is written (no dynamic-mapping index)."""
+        search = InMemorySearchService()
+
+        assert await ProductIndexer(search).index_products([1, 2]) == 0
+        assert search.indices == {}
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_pending_chunks(self, catalog: Catalog) -> None:
+        """The loader never runs more than max_pending_chunks ahead of bulk writes."""
+        written: List[int] = []
+        lead: List[int] = []
+
+        class SlowSearch(InMemorySearchService):
+            async def bulk_index(
+                self, index: str, documents: List[Dict[str, Any]], id_field: str = "id"
+            ) -> int:
+                lead.append(len(catalog.loads) - len(written))
+                await asyncio.sleep(0.01)
+                written.append(len(documents))
+                return await super().bulk_index(index, documents, id_field)
+
+        await ProductIndexer(SlowSearch(), chunk_size=2, max_pending_chunks=1).rebuild()
+
+        assert sum(written) == 25
+        # Yazılan chunk + kuyrukta 1 + üreticide beklemede 1
+        assert max(lead) <= 3
@@ -0,0 +1,78 @@
+"""
+Unit tests for ProductMatchIndex.
+"""
+
+from app.application.pipelines.analytics.product_matcher import (
+    ProductMatchIndex,
+    fold,
+    trigrams,
+)
+
+CATALOG = [
+    (1, "Nike Air Max 90 Koşu Ayakkabısı", "Nike"),
+    (2, "Nike Air Max 95 Koşu Ayakkabısı", "Nike"),
+    (3, "Adidas Samba OG Sneaker", "Adidas"),
+    (4, "Kapüşonlu Yağmurluk", None),
+    (5, "Columbia Kapüşonlu Yağmurluk", "Columbia"),
+]
+
+
+def _index() -> ProductMatchIndex:
+    return ProductMatchIndex.build(CATALOG)
+
+
+class TestNormalization:
+    def test_fold_turkish_characters(self) -> None:
+        assert fold("KAPÜŞONLU Yağmurluk ıİ") == "kapusonlu yagmurluk ii"
+
+    def test_trigrams_are_padded_per_word(self) -> None:
+        assert trigrams(["ab"]) == {"  a", " ab", "ab "}
+
+
+class TestProductMatchIndex:
+    def test_spelling_variants_match(self) -> None:
+        """Case, Turkish characters, word order and a typo still match."""
+        index = _index()
+
+        for name in (
+            "NIKE AIR MAX 90 KOSU AYAKKABISI",
+            "Air Max 90 Ayakkabısı Koşu",
+            "Nike Air Mx 90 Koşu Ayakkabısı",
+        ):
+            result = index.match(name, "Nike")
+            assert result is not None and result.product_id == 1, name
+
+    def test_model_numbers_must_be_equal(self) -> None:
+        index = _index()
+
+        assert index.match("Nike Air Max 97 Koşu Ayakkabısı", "Nike") is None
+        assert index.match("Nike Air Max Koşu Ayakkabısı", "Nike") is None
+
+    def test_brand_inferred_from_name(self) -> None:
+        result = _index().match("Adidas Samba OG Sneaker Beyaz")
+
+        assert result is not None and result.product_id == 3
+
+    def test_other_brands_are_not_candidates(self) -> None:
+        """Brand buckets: a Puma product never matches an Adidas one."""
+        assert _index().match("Samba OG Sneaker", "Puma") is None
+
+    def test_brandless_products_are_candidates(self) -> None:
+        result = _index().match("Kapüşonlu Yağmurluk", "Koton")
+
+        assert result is not None and result.product_id == 4
+
+    def test_unrelated_name_does_not_match(self) -> None:
+        assert _index().match("Yün Kazak", "Mavi") is None
+        assert _index().match("   ") is None
+
+    def test_added_and_discarded_products(self) -> None:
+        index = _index()
+        index.add(42, "Mavi Jake Slim Fit Jean", "Mavi")
+
+        result = index.match("Jake Slim Fit Jean", "Mavi")
+        assert result is not None and result.product_id == 42
+        assert len(index) == 6
+
+        index.discard([42])
+        assert index.match("Jake Slim Fit Jean", "Mavi") is None
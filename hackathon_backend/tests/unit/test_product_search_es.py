@@ -0,0 +1,206 @@
+"""
+Unit tests for the Elasticsearch product search backend and its fallback.
+"""
+
+from typing import Any, Dict, List
+
+import pytest
+
+import app.application.services.product_search_service as search_module
+from app.application.services.product_search_es import (
+    PRODUCTS_INDEX,
+    ElasticsearchProductSearch,
+)
+from app.application.services.product_search_service import ProductSearchService
+from app.core.infrastructure.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from app.core.infrastructure.in_memory_search import InMemorySearchService
+from app.domain.schemas.products.product_search import (
+    ProductSearchRequest,
+    ProductSearchResponse,
+)
+
+
+def _doc(doc_id: int, name: str, **fields: Any) -> Dict[str, Any]:
+    doc: Dict[str, Any] = {
+        "id": doc_id,
+        "name": name,
+        "brand": "Mavi",
+        "category_id": 1,
+        "category_name": "Kazak",
+        "gender": "unisex",
+        "lowest_price": 500.0,
+        "original_price": None,
+        "in_stock": True,
+        "colors": [],
+        "sizes": [],
+        "variant_attributes": "",
+    }
+    doc.update(fields)
+    return doc
+
+
+CATALOG: List[Dict[str, Any]] = [
+    _doc(1, "Yün Kazak", colors=["lacivert"], sizes=["M", "L"], lowest_price=899.9),
+    _doc(2, "Kazak", brand="Koton", colors=["siyah"], lowest_price=249.9),
+    _doc(3, "Kadın Kazak Yün Karışımlı Uzun", lowest_price=1299.0, in_stock=False),
+    _doc(
+        4, "Erkek Ayakkabı", brand="Nike", category_name="Ayakkabı", lowest_price=None
+    ),
+    _doc(5, "Spor Ayakkabi", brand="Adidas", category_name="Ayakkabı", in_stock=None),
+]
+
+
+@pytest.fixture
+async def backend() -> InMemorySearchService:
+    service = InMemorySearchService()
+    await service.bulk_index(PRODUCTS_INDEX, CATALOG)
+    return service
+
+
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker("test-search", CircuitBreakerConfig(failure_threshold=2))
+
+
+def _ids(response: ProductSearchResponse) -> List[int]:
+    return [product.id for product in response.products]
+
+
+class TestElasticsearchProductSearch:
+    """Tests for query building and response parsing."""
+
+    @pytest.mark.asyncio
+    async def test_bm25_ranks_shorter_match_first(self, backend: Any) -> None:
+        """All query terms must match; denser name matches rank higher."""
+        es = ElasticsearchProductSearch(backend)
+
+        response = await es.search(
+            ProductSearchRequest(q="yün kazak", in_stock_only=False)
+        )
+
+        assert _ids(response) == [1, 3]
+        assert response.total == 2
+
+    @pytest.mark.asyncio
+    async def test_turkish_folding(self, backend: Any) -> None:
+        """'ayakkabi' and 'AYAKKABI' find 'Ayakkabı'."""
+        es = ElasticsearchProductSearch(backend)
+
+        response = await es.search(
+            ProductSearchRequest(q="AYAKKABI", in_stock_only=False)
+        )
+
+        assert sorted(_ids(response)) == [4, 5]
+
+    @pytest.mark.asyncio
+    async def test_price_and_stock_filters_keep_unknown_values(
+        self, backend: Any
+    ) -> None:
+        """Products without price or stock info pass the filters, as in Postgres."""
+        es = ElasticsearchProductSearch(backend)
+
+        response = await es.search(
+            ProductSearchRequest(q="*", min_price=300, max_price=1000)
+        )
+
+        # 2: too cheap, 3: out of stock and too expensive
+        assert _ids(response) == [4, 5, 1]
+
+    @pytest.mark.asyncio
+    async def test_match_all_sorted_by_name(self, backend: Any) -> None:
+        """Without text the order matches the database path (name, id)."""
+        es = ElasticsearchProductSearch(backend)
+
+        response = await es.search(
+            ProductSearchRequest(q="*", in_stock_only=False, page=2, page_size=2)
+        )
+
+        assert _ids(response) == [2, 5]
+        assert response.total == 5
+        assert response.total_pages == 3
+
+    @pytest.mark.asyncio
+    async def test_facets(self, backend: Any) -> None:
+        """Facets count the full match set, not just the page."""
+        es = ElasticsearchProductSearch(backend)
+
+        response = await es.search(
+            ProductSearchRequest(q="kazak", in_stock_only=False, page_size=1)
+        )
+
+        brands = {bucket.value: bucket.count for bucket in response.facets["brands"]}
+        prices = {
+            bucket.value: bucket.count for bucket in response.facets["price_ranges"]
+        }
+        assert brands == {"Mavi": 2, "Koton": 1}
+        assert prices["0-250"] == 1
+        assert prices["500-1000"] == 1
+        assert prices["1000-2500"] == 1
+        assert response.facets["in_stock"][0].value == "true"
+
+    def test_supports(self) -> None:
+        """Cursor pages and pages past the result window stay on Postgres."""
+        es = ElasticsearchProductSearch(InMemorySearchService())
+
+        assert es.supports(ProductSearchRequest(q="kazak"))
+        assert not es.supports(ProductSearchRequest(q="kazak", cursor="abc"))
+        assert not es.supports(ProductSearchRequest(q="kazak", page=501, page_size=20))
+
+
+class TestProductSearchFallback:
+    """Tests for ProductSearchService backend selection."""
+
+    @pytest.fixture
+    def postgres_calls(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> List[ProductSearchRequest]:
+        calls: List[ProductSearchRequest] = []
+
+        async def fake_search_postgres(
+            self: ProductSearchService, request: ProductSearchRequest
+        ) -> ProductSearchResponse:
+            calls.append(request)
+            return ProductSearchResponse(
+                query=request.q, products=[], total=0, page=request.page, page_size=20
+            )
+
+        monkeypatch.setattr(
+            search_module.ProductSearchService, "_search_postgres", fake_search_postgres
+        )
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_uses_elasticsearch(
+        self, backend: Any, postgres_calls: List[Any]
+    ) -> None:
+        service = ProductSearchService(ElasticsearchProductSearch(backend), _breaker())
+
+        response = await service.search_products(ProductSearchRequest(q="kazak"))
+
+        assert _ids(response) == [2, 1]
+        assert postgres_calls == []
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_unavailable(
+        self, backend: Any, postgres_calls: List[Any]
+    ) -> None:
+        """Backend errors fall back to Postgres and eventually open the circuit."""
+        backend.available = False
+        breaker = _breaker()
+        service = ProductSearchService(ElasticsearchProductSearch(backend), breaker)
+
+        for _ in range(3):
+            response = await service.search_products(ProductSearchRequest(q="kazak"))
+            assert response.facets == {}
+
+        assert len(postgres_calls) == 3
+        assert breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_cursor_requests_use_postgres(
+        self, backend: Any, postgres_calls: List[Any]
+    ) -> None:
+        service = ProductSearchService(ElasticsearchProductSearch(backend), _breaker())
+
+        await service.search_products(ProductSearchRequest(q="kazak", cursor="abc"))
+
+        assert len(postgres_calls) == 1
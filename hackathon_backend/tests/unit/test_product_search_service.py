@@ -0,0 +1,199 @@
+"""
+Unit tests for ProductSearchService query shape.
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.application.services.product_search_service as search_module
+from app.application.services.product_search_service import (
+    PRODUCT_ORDER,
+    ProductSearchService,
+)
+from app.core.exceptions import ValidationException
+from app.domain.schemas.products.product_search import ProductSearchRequest
+
+
+class MockResult:
+    """Mock SQLAlchemy result."""
+
+    def __init__(self, rows: List[Any], scalar: int = 0) -> None:
+        self.rows = rows
+        self._scalar = scalar
+
+    def all(self) -> List[Any]:
+        return self.rows
+
+    def scalar(self) -> int:
+        return self._scalar
+
+
+class MockSession:
+    """Mock AsyncSession recording compiled statements."""
+
+    def __init__(self, rows: List[Any], count: int = 0) -> None:
+        self.rows = rows
+        self.count = count
+        self.statements: List[str] = []
+
+    async def __aenter__(self) -> "MockSession":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    async def execute(self, query: Any) -> MockResult:
+        self.statements.append(str(query.compile(dialect=postgresql.dialect())))
+        if len(self.statements) == 1:
+            return MockResult(self.rows)
+        return MockResult([], scalar=self.count)
+
+
+class _Row(tuple):
+    """Tuple row with a named total column."""
+
+    def __new__(cls, values: Any, total: int) -> "_Row":
+        row = super().__new__(cls, values)
+        row.total = total  # type: ignore[attr-defined]
+        return row
+
+
+def _row(product_id: int, total: int) -> _Row:
+    product = SimpleNamespace(
+        id=product_id,
+        name=f"Ürün {product_id}",
+        slug=None,
+        brand="Marka",
+        category_id=1,
+        gender=None,
+        image_url=None,
+        description=None,
+    )
+    summary = SimpleNamespace(
+        lowest_price=Decimal("80"), original_price=Decimal("100"), in_stock=True
+    )
+    return _Row((product, summary, "Kazak", ["mavi"], ["M"], total), total)
+
+
+@pytest.fixture
+def session_factory(monkeypatch: pytest.MonkeyPatch) -> Any:
+    def install(rows: List[Any], count: int = 0) -> MockSession:
+        session = MockSession(rows, count)
+        monkeypatch.setattr(search_module, "AsyncSessionLocal", lambda: session)
+        return session
+
+    return install
+
+
+class TestProductSearchService:
+    """Tests for ProductSearchService.search_products."""
+
+    @pytest.mark.asyncio
+    async def test_single_statement_per_page(self, session_factory: Any) -> None:
+        """A non-empty page is served by one statement with the total inline."""
+        session = session_factory([_row(1, 42), _row(2, 42)])
+
+        response = await ProductSearchService().search_products(
+            ProductSearchRequest(q="kazak", min_price=Decimal("50"))
+        )
+
+        assert len(session.statements) == 1
+        assert response.total == 42
+        assert [p.id for p in response.products] == [1, 2]
+        assert response.products[0].category_name == "Kazak"
+        assert response.products[0].colors == ["mavi"]
+        assert response.products[0].lowest_price == Decimal("80")
+
+    @pytest.mark.asyncio
+    async def test_filters_applied_before_pagination(
+        self, session_factory: Any
+    ) -> None:
+        """Price and stock filters sit inside the paginated subquery."""
+        session = session_factory([_row(1, 1)])
+
+        await ProductSearchService().search_products(
+            ProductSearchRequest(
+                q="*", min_price=Decimal("50"), max_price=Decimal("90")
+            )
+        )
+
+        statement = session.statements[0]
+        page_subquery = statement[statement.index("JOIN (SELECT products.id") :]
+        limit_at = page_subquery.index("LIMIT")
+        assert "count(*) OVER ()" in page_subquery
+        assert page_subquery.index("lowest_price >=") < limit_at
+        assert page_subquery.index("lowest_price <=") < limit_at
+        assert page_subquery.index("in_stock IS true") < limit_at
+        assert "LATERAL" in statement
+
+    @pytest.mark.asyncio
+    async def test_page_past_end_counts_separately(self, session_factory: Any) -> None:
+        """An empty page beyond the end still reports the real total."""
+        session = session_factory([], count=7)
+
+        response = await ProductSearchService().search_products(
+            ProductSearchRequest(q="*", page=5)
+        )
+
+        assert len(session.statements) == 2
+        assert response.total == 7
+        assert response.products == []
+
+    @pytest.mark.asyncio
+    async def test_empty_first_page_skips_count(self, session_factory: Any) -> None:
+        """No extra count query when the first page is already empty."""
+        session = session_factory([])
+
+        response = await ProductSearchService().search_products(
+            ProductSearchRequest(q="yok")
+        )
+
+        assert len(session.statements) == 1
+        assert response.total == 0
+
+    @pytest.mark.asyncio
+    async def test_cursor_mode_uses_keyset(self, session_factory: Any) -> None:
+        """With a cursor the page is read by keyset, without OFFSET or a count."""
+        session = session_factory([_row(i, 0) for i in range(1, 4)])
+        cursor = PRODUCT_ORDER.encode(["Kazak", 10])
+
+        response = await ProductSearchService().search_products(
+            ProductSearchRequest(q="*", page_size=2, cursor=cursor)
+        )
+
+        statement = session.statements[0]
+        assert len(session.statements) == 1
+        assert "(products.name, products.id) >" in statement
+        assert "OFFSET" not in statement
+        assert "OVER ()" not in statement
+        assert response.total is None
+        assert response.total_pages is None
+        assert [p.id for p in response.products] == [1, 2]
+        assert PRODUCT_ORDER.decode(response.next_cursor or "") == ["Ürün 2", 2]
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_on_offset_pages(self, session_factory: Any) -> None:
+        """Offset pages also hand out a cursor to continue by keyset."""
+        session_factory([_row(i, 5) for i in range(1, 4)])
+
+        response = await ProductSearchService().search_products(
+            ProductSearchRequest(q="*", page_size=2)
+        )
+
+        assert response.total == 5
+        assert len(response.products) == 2
+        assert response.next_cursor is not None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self, session_factory: Any) -> None:
+        """Malformed cursors surface as ValidationException."""
+        session_factory([])
+
+        with pytest.raises(ValidationException):
+            await ProductSearchService().search_products(
+                ProductSearchRequest(q="*", cursor="bozuk!")
+            )
@@ -14,24 +14,22 @@ from app.application.pipelines.analytics.steps.profit_margin_step import (
 from app.core.patterns.pipeline import PipelineContext
 
 
-class MockPriceHistory:
-    """Mock PriceHistory record."""
-
-    def __init__(self, price: float) -> None:
-        self.price = Decimal(str(price))
-
-
 class MockPriceHistoryRepository:
     """Mock PriceHistoryRepository for testing."""
 
     def __init__(self, histories: Dict[int, List[float]] | None = None) -> None:
         self.histories = histories or {}
+        self.batch_calls = 0
 
-    async def get_by_mapping_id(
-        self, mapping_id: int, limit: int = 100
-    ) -> List[MockPriceHistory]:
-        prices = self.histories.get(mapping_id, [])
-        return [MockPriceHistory(p) for p in prices[:limit]]
+    async def get_recent_prices_by_mapping_ids(
+        self, mapping_ids: List[int], limit: int = 10
+    ) -> Dict[int, List[Decimal]]:
+        self.batch_calls += 1
+        return {
+            mapping_id: [Decimal(str(p)) for p in self.histories[mapping_id][:limit]]
+            for mapping_id in mapping_ids
+            if self.histories.get(mapping_id)
+        }
 
 
 class MockUnitOfWork:
@@ -218,3 +216,38 @@ class TestProfitMarginStep:
         assert context.result[0]["profit_margin_percent"] == 20.0
         assert context.result[1]["profit_margin_percent"] == 0.0
         assert context.result[2]["profit_margin_percent"] == -10.0
+
+    @pytest.mark.asyncio
+    async def test_history_query_skipped_when_avg_price_present(self) -> None:
+        """Test that no history query runs when TrendAnalysis provided avg_price."""
+        mock_uow = MockUnitOfWork({1: [100.0]})
+        products = [
+            {"mapping_id": 1, "price": 80.0, "avg_price": 100.0},
+            {"mapping_id": 2, "price": 90.0, "avg_price": 100.0},
+        ]
+
+        step = ProfitMarginStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=products)
+
+        await step.process(context)
+
+        assert mock_uow.price_histories.batch_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_db_history_loaded_with_single_batch_query(self) -> None:
+        """Test that missing market averages are loaded in one query."""
+        histories = {1: [100.0, 100.0], 2: [200.0, 200.0], 3: [50.0]}
+        mock_uow = MockUnitOfWork(histories)
+        products = [
+            {"mapping_id": 1, "price": 80.0},
+            {"mapping_id": 2, "price": 180.0},
+            {"mapping_id": 3, "price": 50.0},
+        ]
+
+        step = ProfitMarginStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=products)
+
+        await step.process(context)
+
+        assert mock_uow.price_histories.batch_calls == 1
+        assert [p["market_avg_price"] for p in context.result] == [100.0, 200.0, 50.0]
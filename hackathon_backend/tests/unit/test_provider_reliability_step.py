@@ -0,0 +1,124 @@
+"""
+Unit tests for ProviderReliabilityStep and ReliabilityWeightingStep.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from app.application.pipelines.analytics.steps.provider_reliability_step import (
+    ProviderReliabilityStep,
+)
+from app.application.pipelines.analytics.steps.reliability_weighting_step import (
+    ReliabilityWeightingStep,
+)
+from app.core.patterns.pipeline import PipelineContext
+
+
+class MockProviderRepository:
+    def __init__(self, scores: Dict[int, Tuple[float, Optional[int]]]) -> None:
+        self.scores = scores
+        self.calls: List[List[int]] = []
+
+    async def get_reliability_scores(
+        self, ids: List[int]
+    ) -> Dict[int, Tuple[float, Optional[int]]]:
+        self.calls.append(ids)
+        return {i: self.scores[i] for i in ids if i in self.scores}
+
+
+class MockUnitOfWork:
+    def __init__(self, scores: Dict[int, Tuple[float, Optional[int]]]) -> None:
+        self.providers = MockProviderRepository(scores)
+        self.readers_opened = 0
+
+    def reader(self) -> "MockUnitOfWork":
+        self.readers_opened += 1
+        return self
+
+    async def __aenter__(self) -> "MockUnitOfWork":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def mock_uow() -> MockUnitOfWork:
+    return MockUnitOfWork({1: (0.9, 80), 2: (0.7, None)})
+
+
+class TestProviderReliabilityStep:
+    @pytest.mark.asyncio
+    async def test_adds_scores_with_one_query(self, mock_uow: MockUnitOfWork) -> None:
+        context = PipelineContext(
+            initial_data=[
+                {"provider_id": 1},
+                {"provider_id": 2},
+                {"provider_id": 1},
+                {},
+            ]
+        )
+
+        await ProviderReliabilityStep(mock_uow).process(context)  # type: ignore[arg-type]
+
+        assert mock_uow.providers.calls == [[1, 2]]
+        assert mock_uow.readers_opened == 1
+        assert context.data[0] == {
+            "provider_id": 1,
+            "reliability_score": 0.9,
+            "data_quality_score": 80,
+            "confidence_level": 0.85,
+        }
+        assert context.data[1]["data_quality_score"] == 50
+        assert context.data[3] == {}
+        assert context.meta["provider_scores_loaded"] == 2
+
+    @pytest.mark.asyncio
+    async def test_read_failure_falls_back_to_defaults(self) -> None:
+        class BrokenUnitOfWork:
+            def reader(self) -> Any:
+                raise ConnectionError("pool exhausted")
+
+        context = PipelineContext(initial_data=[{"provider_id": 3}])
+
+        await ProviderReliabilityStep(BrokenUnitOfWork()).process(context)  # type: ignore[arg-type]
+
+        assert context.data[0]["reliability_score"] == 1.0
+        assert context.data[0]["confidence_level"] == 0.75
+
+
+class TestReliabilityWeightingStep:
+    @pytest.mark.asyncio
+    async def test_uses_scores_already_on_items(self, mock_uow: MockUnitOfWork) -> None:
+        context = PipelineContext(
+            initial_data=[
+                {
+                    "provider_id": 1,
+                    "trend_score": 40,
+                    "reliability_score": 0.5,
+                    "data_quality_score": 60,
+                },
+            ]
+        )
+
+        await ReliabilityWeightingStep(mock_uow).process(context)  # type: ignore[arg-type]
+
+        assert mock_uow.providers.calls == []
+        assert context.data[0]["weighted_trend_score"] == 20.0
+        assert context.data[0]["confidence_level"] == 0.55
+
+    @pytest.mark.asyncio
+    async def test_loads_missing_scores(self, mock_uow: MockUnitOfWork) -> None:
+        context = PipelineContext(
+            initial_data=[
+                {"provider_id": 2, "trend_score": 10, "profit_margin_percent": 20}
+            ]
+        )
+
+        await ReliabilityWeightingStep(mock_uow).process(context)  # type: ignore[arg-type]
+
+        assert mock_uow.providers.calls == [[2]]
+        assert context.data[0]["weighted_trend_score"] == 7.0
+        assert context.data[0]["weighted_profit_margin"] == 14.0
+        assert context.meta["reliability_weighted_count"] == 1
@@ -59,8 +59,9 @@ async def test_create_user_pushes_to_redis_via_pipeline(mocker: MockerFixture) -
 
     # Mock CacheService
     mock_cache_service = mocker.MagicMock()
-    mock_cache_service.lpush = AsyncMock()
-    mock_cache_service.ltrim = AsyncMock()
+    # LPUSH/LTRIM go through cache_service.pipeline() as a single round trip
+    mock_pipe = mocker.MagicMock()
+    mock_cache_service.pipeline.return_value.__aenter__.return_value = mock_pipe
 
     # Mock Repository checks (via UoW)
     mock_uow.users.get_by_email = AsyncMock(return_value=None)
@@ -94,8 +95,8 @@ async def test_create_user_pushes_to_redis_via_pipeline(mocker: MockerFixture) -
 
     # 4. Assertions
     # Check if LPUSH was called
-    assert mock_cache_service.lpush.called
-    call_args = mock_cache_service.lpush.call_args
+    assert mock_pipe.lpush.called
+    call_args = mock_pipe.lpush.call_args
     assert call_args[0][0] == "users:recent"  # Key check
 
     pushed_data = json.loads(call_args[0][1])
@@ -103,4 +104,4 @@ async def test_create_user_pushes_to_redis_via_pipeline(mocker: MockerFixture) -
     assert pushed_data["last_name"] == mock_created_user.last_name
 
     # Check LTRIM
-    mock_cache_service.ltrim.assert_called_once_with("users:recent", 0, 9)
+    mock_pipe.ltrim.assert_called_once_with("users:recent", 0, 9)
@@ -2,17 +2,27 @@
 Unit tests for SavePriceHistoryStep.
 """
 
+from datetime import datetime, timezone
 from decimal import Decimal
+from types import SimpleNamespace
 from typing import Any, Dict, List
 from unittest.mock import AsyncMock
 
 import pytest
 
+from app.application.pipelines.analytics.steps.collect_search_changes_step import (
+    CollectSearchChangesStep,
+)
 from app.application.pipelines.analytics.steps.save_price_history_step import (
     SavePriceHistoryStep,
 )
 from app.core.patterns.pipeline import PipelineContext
-from app.domain.schemas.price.price_history import PriceHistory, PriceHistoryCreate
+from app.domain.schemas.price.price_history import (
+    PriceHistory,
+    PriceHistoryCreate,
+    PriceObservation,
+)
+from app.domain.schemas.price.price_statistic import PriceStatistic
 
 
 class MockPriceHistoryRepository:
@@ -20,32 +30,76 @@ class MockPriceHistoryRepository:
 
     def __init__(self) -> None:
         self.records: List[PriceHistory] = []
+        self.touched: List[int] = []
         self.next_id = 1
-        self.create_bulk_called = False
+        self.insert_many_called = False
         self.last_items: List[PriceHistoryCreate] = []
 
-    async def create_bulk(
-        self, *, items: List[PriceHistoryCreate], commit: bool = True
-    ) -> List[PriceHistory]:
-        self.create_bulk_called = True
+    async def get_latest_observations(
+        self, mapping_ids: List[int]
+    ) -> Dict[int, PriceObservation]:
+        latest = {
+            r.mapping_id: PriceObservation(
+                id=r.id,
+                created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                price=r.price,
+                original_price=r.original_price,
+                in_stock=r.in_stock,
+                stock_quantity=r.stock_quantity,
+            )
+            for r in self.records
+        }
+        return {i: latest[i] for i in mapping_ids if i in latest}
+
+    async def touch_last_seen(self, observations: List[PriceObservation]) -> int:
+        self.touched.extend(o.id for o in observations)
+        return len(observations)
+
+    async def insert_many(self, items: List[PriceHistoryCreate]) -> List[int]:
+        self.insert_many_called = True
         self.last_items = items
-        
-        result = []
+
+        ids = []
         for item in items:
-            record = PriceHistory(
-                id=self.next_id,
-                mapping_id=item.mapping_id,
-                price=item.price,
-                original_price=item.original_price,
-                discount_rate=item.discount_rate,
-                currency_id=item.currency_id,
-                in_stock=item.in_stock,
-                stock_quantity=item.stock_quantity,
+            self.records.append(
+                PriceHistory(id=self.next_id, **item.model_dump())
             )
-            self.records.append(record)
-            result.append(record)
+            ids.append(self.next_id)
             self.next_id += 1
-        return result
+        return ids
+
+
+class MockPriceStatisticRepository:
+    """Mock PriceStatisticRepository for testing."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[int, List[Decimal]] = {}
+        self.apply_calls = 0
+        self.fail = False
+
+    async def apply_samples(
+        self, samples: Dict[int, List[Decimal]]
+    ) -> Dict[int, PriceStatistic]:
+        self.apply_calls += 1
+        if self.fail:
+            raise RuntimeError("db down")
+        for mapping_id, prices in samples.items():
+            self.samples.setdefault(mapping_id, []).extend(prices)
+        return {
+            mapping_id: PriceStatistic(mapping_id=mapping_id).with_samples(prices)
+            for mapping_id, prices in self.samples.items()
+            if mapping_id in samples
+        }
+
+
+class MockCurrencyRepository:
+    """Mock CurrencyRepository for testing."""
+
+    async def get_all(self) -> List[SimpleNamespace]:
+        return [
+            SimpleNamespace(id=1, code="TRY"),
+            SimpleNamespace(id=2, code="USD"),
+        ]
 
 
 class MockUnitOfWork:
@@ -53,6 +107,8 @@ class MockUnitOfWork:
 
     def __init__(self) -> None:
         self.price_histories = MockPriceHistoryRepository()
+        self.price_statistics = MockPriceStatisticRepository()
+        self.currencies = MockCurrencyRepository()
 
 
 @pytest.fixture
@@ -99,7 +155,7 @@ class TestSavePriceHistoryStep:
 
         await step.process(context)
 
-        assert mock_uow.price_histories.create_bulk_called
+        assert mock_uow.price_histories.insert_many_called
         assert len(mock_uow.price_histories.records) == 2
         assert context.meta["saved_price_records"] == 2
         assert context.meta["price_save_errors"] == 0
@@ -174,7 +230,7 @@ class TestSavePriceHistoryStep:
 
         await step.process(context)
 
-        assert not mock_uow.price_histories.create_bulk_called
+        assert not mock_uow.price_histories.insert_many_called
         assert context.meta.get("saved_price_records") is None or context.meta["saved_price_records"] == 0
 
     @pytest.mark.asyncio
@@ -246,3 +302,152 @@ class TestSavePriceHistoryStep:
         await step.process(context)
 
         assert context.result == sample_products_with_mappings
+
+    @pytest.mark.asyncio
+    async def test_statistics_updated_with_saved_prices(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        """Saved prices are applied to rolling statistics in insertion order."""
+        products = [
+            {"mapping_id": 1, "price": 100.0},
+            {"mapping_id": 2, "price": 50.0},
+            {"mapping_id": 1, "price": 120.0},
+        ]
+        step = SavePriceHistoryStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=products)
+
+        await step.process(context)
+
+        assert mock_uow.price_statistics.apply_calls == 1
+        assert mock_uow.price_statistics.samples == {
+            1: [Decimal("100.0"), Decimal("120.0")],
+            2: [Decimal("50.0")],
+        }
+        assert context.meta["updated_price_statistics"] == 2
+
+    @pytest.mark.asyncio
+    async def test_statistics_failure_reported(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        """A failing statistics update is reported as a step error."""
+        mock_uow.price_statistics.fail = True
+        step = SavePriceHistoryStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=[{"mapping_id": 1, "price": 100.0}])
+
+        await step.process(context)
+
+        assert context.meta["saved_price_records"] == 1
+        assert context.meta["updated_price_statistics"] == 0
+        assert "istatistik" in context.errors[0]
+
+    @pytest.mark.asyncio
+    async def test_statistics_skipped_when_nothing_saved(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        """No statistics update without saved records."""
+        step = SavePriceHistoryStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=[{"mapping_id": 1}])
+
+        await step.process(context)
+
+        assert mock_uow.price_statistics.apply_calls == 0
+
+
+class TestChangeOnlyIngest:
+    """Unchanged observations bump last_seen_at instead of writing new rows."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_observation_is_not_written(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        products = [{"mapping_id": 1, "price": 100.0, "stock_quantity": 10}]
+        step = SavePriceHistoryStep(mock_uow)  # type: ignore
+
+        await step.process(PipelineContext(initial_data=products))
+        context = PipelineContext(
+            initial_data=[{"mapping_id": 1, "price": 100.0, "stock_quantity": 12}]
+        )
+        await step.process(context)
+
+        assert len(mock_uow.price_histories.records) == 1
+        assert mock_uow.price_histories.touched == [1]
+        assert context.meta["saved_price_records"] == 0
+        assert context.meta["unchanged_price_records"] == 1
+        # A run of unchanged observations is one statistics sample
+        assert mock_uow.price_statistics.samples == {1: [Decimal("100.0")]}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"price": 101.0},
+            {"original_price": 150.0},
+            {"original_price": None},
+            {"in_stock": False},
+            {"stock_quantity": 3},
+            {"stock_quantity": None},
+        ],
+    )
+    async def test_changes_write_new_rows(
+        self, mock_uow: MockUnitOfWork, change: Dict[str, Any]
+    ) -> None:
+        step = SavePriceHistoryStep(mock_uow)  # type: ignore
+        first = {
+            "mapping_id": 1,
+            "price": 100.0,
+            "original_price": 120.0,
+            "in_stock": True,
+            "stock_quantity": 10,
+        }
+
+        await step.process(PipelineContext(initial_data=[first]))
+        await step.process(PipelineContext(initial_data=[{**first, **change}]))
+
+        assert len(mock_uow.price_histories.records) == 2
+        assert mock_uow.price_histories.touched == []
+
+    @pytest.mark.asyncio
+    async def test_repeats_within_a_batch_are_written_once(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        step = SavePriceHistoryStep(mock_uow)  # type: ignore
+        context = PipelineContext(
+            initial_data=[
+                {"mapping_id": 1, "price": 100.0},
+                {"mapping_id": 1, "price": 100.0},
+                {"mapping_id": 1, "price": 90.0},
+            ]
+        )
+
+        await step.process(context)
+
+        assert [r.price for r in mock_uow.price_histories.records] == [
+            Decimal("100.0"),
+            Decimal("90.0"),
+        ]
+        assert mock_uow.price_histories.touched == []
+        assert context.meta["unchanged_price_records"] == 1
+        assert [p["price_changed"] for p in context.data] == [True, False, True]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_beat_marks_no_product_as_changed(
+        self, mock_uow: MockUnitOfWork
+    ) -> None:
+        step = SavePriceHistoryStep(mock_uow)  # type: ignore
+        collect = CollectSearchChangesStep()
+        beat = [
+            {"mapping_id": 1, "product_id": 10, "price": 100.0},
+            {"mapping_id": 2, "product_id": 20, "price": 50.0},
+        ]
+
+        first = PipelineContext(initial_data=[dict(row) for row in beat])
+        await step.process(first)
+        await collect.process(first)
+        second = PipelineContext(initial_data=[dict(row) for row in beat])
+        await step.process(second)
+        await collect.process(second)
+
+        assert first.meta["search_changed_product_ids"] == [10, 20]
+        # Nothing to invalidate or reindex when no observation changed
+        assert second.meta["search_changed_product_ids"] == []
+        assert [p["price_changed"] for p in second.data] == [False, False]
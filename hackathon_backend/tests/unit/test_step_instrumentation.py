@@ -0,0 +1,172 @@
+"""
+Unit tests for pipeline step instrumentation, metrics rendering and profiling.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app.application.services.pipeline_metrics import (
+    collect_step_metrics,
+    process_source,
+    publish_step_metrics,
+)
+from app.core.infrastructure.profiling import capture_profile
+from app.core.patterns.instrumentation import (
+    StepMetricsRegistry,
+    StepSample,
+    record_db_statement,
+    render_prometheus,
+    step_metrics,
+)
+from app.core.patterns.pipeline import BaseStep, PipelineContext, PipelineRunner
+
+
+class FilterStep(BaseStep):
+    """Runs one query per item and keeps only even items."""
+
+    async def process(self, context: PipelineContext) -> None:
+        for _ in context.data:
+            record_db_statement()
+            await asyncio.sleep(0)
+        context.data = [item for item in context.data if item % 2 == 0]
+
+
+class FailingStep(BaseStep):
+    async def process(self, context: PipelineContext) -> None:
+        context.errors.append("fiyat eksik")
+
+
+class MockCache:
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+        self.lists: Dict[str, List[str]] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: Any, expire: int = 60) -> None:
+        self.values[key] = json.loads(json.dumps(value))
+
+    async def lpush(self, key: str, value: str) -> None:
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def lrange(self, key: str, start: int, end: int) -> List[Any]:
+        items = self.lists.get(key, [])
+        return items[start:] if end == -1 else items[start : end + 1]
+
+    async def ltrim(self, key: str, start: int, end: int) -> None:
+        self.lists[key] = self.lists.get(key, [])[start : end + 1]
+
+
+@pytest.fixture(autouse=True)
+def clean_registry() -> None:
+    step_metrics.reset()
+
+
+def _series(pipeline: str) -> Dict[str, Dict[str, Any]]:
+    return {s["step"]: s for s in step_metrics.snapshot() if s["pipeline"] == pipeline}
+
+
+class TestPipelineRunnerInstrumentation:
+    """Tests for the per-step samples recorded by PipelineRunner."""
+
+    @pytest.mark.asyncio
+    async def test_records_rows_statements_and_time(self) -> None:
+        runner = PipelineRunner([FilterStep(), FilterStep()], name="test")
+
+        await runner.run(PipelineContext(initial_data=[1, 2, 3, 4]))
+
+        series = _series("test")["FilterStep"]
+        assert series["runs"] == 2
+        assert series["rows_in"] == 4 + 2
+        assert series["rows_out"] == 2 + 2
+        assert series["db_statements"] == 4 + 2
+        assert series["wall_seconds"] >= series["wall_seconds_max"] > 0
+        assert series["failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_steps_are_counted(self) -> None:
+        runner = PipelineRunner([FailingStep(), FilterStep()], name="test")
+
+        await runner.run(PipelineContext(initial_data=[1]))
+
+        series = _series("test")
+        assert series["FailingStep"]["failures"] == 1
+        assert "FilterStep" not in series
+
+    @pytest.mark.asyncio
+    async def test_statement_counters_are_isolated_per_task(self) -> None:
+        runners = [PipelineRunner([FilterStep()], name=f"p{i}") for i in range(2)]
+
+        await asyncio.gather(
+            runners[0].run(PipelineContext(initial_data=list(range(3)))),
+            runners[1].run(PipelineContext(initial_data=list(range(5)))),
+        )
+
+        assert _series("p0")["FilterStep"]["db_statements"] == 3
+        assert _series("p1")["FilterStep"]["db_statements"] == 5
+
+    @pytest.mark.asyncio
+    async def test_instrumentation_can_be_disabled(self) -> None:
+        runner = PipelineRunner([FilterStep()], name="test", instruments=[])
+
+        context = await runner.run(PipelineContext(initial_data=[1, 2]))
+
+        assert context.data == [2]
+        assert step_metrics.snapshot() == []
+
+
+class TestPrometheusRendering:
+    def test_renders_counters_and_gauges_per_source(self) -> None:
+        registry = StepMetricsRegistry()
+        registry.record(
+            StepSample("P", "S", wall_seconds=0.5, rows_in=3, peak_memory_bytes=1024)
+        )
+        registry.record(StepSample("P", "S", wall_seconds=0.25, failed=True))
+
+        text = render_prometheus({"worker:1": registry.snapshot()})
+
+        labels = 'source="worker:1",pipeline="P",step="S"'
+        assert "# TYPE pipeline_step_runs_total counter" in text
+        assert f"pipeline_step_runs_total{{{labels}}} 2" in text
+        assert f"pipeline_step_failures_total{{{labels}}} 1" in text
+        assert f"pipeline_step_wall_seconds_total{{{labels}}} 0.75" in text
+        assert f"pipeline_step_wall_seconds_max{{{labels}}} 0.5" in text
+        assert f"pipeline_step_peak_memory_bytes{{{labels}}} 1024" in text
+
+
+class TestPublishedMetrics:
+    @pytest.mark.asyncio
+    async def test_worker_snapshots_are_collected_once(self) -> None:
+        cache = MockCache()
+        step_metrics.record(StepSample("P", "S", rows_in=2))
+
+        await publish_step_metrics(cache)
+        await publish_step_metrics(cache)
+        cache.values["pipeline_metrics:other:7"] = [
+            {"pipeline": "P", "step": "S", "runs": 5}
+        ]
+        await cache.lpush("pipeline_metrics:sources", "other:7")
+
+        snapshots = await collect_step_metrics(cache)
+
+        assert cache.lists["pipeline_metrics:sources"] == ["other:7", process_source()]
+        assert snapshots[process_source()][0]["rows_in"] == 2
+        assert snapshots["other:7"][0]["runs"] == 5
+
+
+class TestCaptureProfile:
+    @pytest.mark.asyncio
+    async def test_cprofile_report_and_peak_memory(self, tmp_path: Path) -> None:
+        runner = PipelineRunner([FilterStep()], name="profiled")
+
+        with capture_profile("run", output_dir=str(tmp_path)) as capture:
+            await runner.run(PipelineContext(initial_data=list(range(100))))
+
+        assert capture.path is not None and capture.path.endswith(".prof")
+        assert Path(capture.path).stat().st_size > 0
+        assert _series("profiled")["FilterStep"]["peak_memory_bytes"] > 0
@@ -0,0 +1,105 @@
+"""
+Unit tests for StreamingCollector.
+"""
+
+import asyncio
+from typing import AsyncGenerator, List
+
+import pytest
+
+from app.application.services.streaming_collector import ChunkResult, StreamingCollector
+
+
+def _source(chunks: List[List[int]], delay: float = 0.0):
+    async def stream() -> AsyncGenerator[List[int], None]:
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield chunk
+
+    return stream
+
+
+class TestStreamingCollector:
+    """Tests for the per-provider queue and concurrent chunk workers."""
+
+    @pytest.mark.asyncio
+    async def test_slow_provider_does_not_block_fast_one(self) -> None:
+        processed: List[str] = []
+
+        async def handler(provider: str, chunk: List[int]) -> ChunkResult:
+            processed.append(provider)
+            return ChunkResult(committed=True)
+
+        collector: StreamingCollector[int] = StreamingCollector(
+            {
+                "slow": _source([[1]], delay=0.05),
+                "fast": _source([[1], [2], [3]]),
+            },
+            handler,
+        )
+        metrics = await collector.run()
+
+        assert processed == ["fast", "fast", "fast", "slow"]
+        assert metrics["fast"].chunks == 3
+        assert metrics["slow"].committed_items == 1
+        assert metrics["slow"].fetch_seconds >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_workers_run_concurrently_with_bounded_queue(self) -> None:
+        produced = 0
+        running = 0
+        max_running = 0
+        max_outstanding = 0
+        done = 0
+
+        async def stream() -> AsyncGenerator[List[int], None]:
+            nonlocal produced, max_outstanding
+            for i in range(20):
+                produced += 1
+                max_outstanding = max(max_outstanding, produced - done)
+                yield [i]
+
+        async def handler(provider: str, chunk: List[int]) -> ChunkResult:
+            nonlocal running, max_running, done
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+            done += 1
+            return ChunkResult(committed=True)
+
+        collector: StreamingCollector[int] = StreamingCollector(
+            {"p": stream}, handler, workers=3, queue_size=2
+        )
+        metrics = await collector.run()
+
+        assert metrics["p"].items == 20
+        assert max_running == 3
+        # Queue + chunks held by workers + the one waiting in put()
+        assert max_outstanding <= 2 + 3 + 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_isolated_per_chunk_and_provider(self) -> None:
+        async def broken() -> AsyncGenerator[List[int], None]:
+            yield [1, 2]
+            raise ConnectionError("timeout")
+
+        async def handler(provider: str, chunk: List[int]) -> ChunkResult:
+            if chunk == [3]:
+                raise RuntimeError("deadlock")
+            if chunk == [4]:
+                return ChunkResult(committed=False, errors=["Geçersiz fiyat"])
+            return ChunkResult(committed=True, meta={"saved": len(chunk)})
+
+        collector: StreamingCollector[int] = StreamingCollector(
+            {"broken": broken, "ok": _source([[3], [4], [5, 6]])}, handler, workers=1
+        )
+        metrics = await collector.run()
+
+        assert metrics["broken"].committed_items == 2
+        assert metrics["broken"].errors == ["Sağlayıcı okunamadı: timeout"]
+        assert metrics["ok"].chunks == 3
+        assert metrics["ok"].failed_chunks == 2
+        assert metrics["ok"].committed_items == 2
+        assert metrics["ok"].errors == ["deadlock", "Geçersiz fiyat"]
+        assert len(collector.results) == 4
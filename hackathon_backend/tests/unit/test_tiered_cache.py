@@ -0,0 +1,193 @@
+"""
+Unit tests for TieredCacheService (in-process LRU in front of Redis).
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from app.core.infrastructure.tiered_cache import (
+    CACHE_INVALIDATION_CHANNEL,
+    LocalCache,
+    TieredCacheService,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MockRedis:
+    def __init__(self) -> None:
+        self.published: List[Tuple[str, str]] = []
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, message))
+
+
+class MockRemoteCache:
+    """Stands in for CacheService; counts reads that reach Redis."""
+
+    def __init__(self) -> None:
+        self.redis = MockRedis()
+        self.data: Dict[str, Any] = {}
+        self.gets = 0
+        self.mget_calls: List[List[str]] = []
+
+    async def get(self, key: str) -> Optional[Any]:
+        self.gets += 1
+        return self.data.get(key)
+
+    async def set(self, key: str, value: Any, expire: int = 60) -> None:
+        self.data[key] = value
+
+    async def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        self.mget_calls.append(list(keys))
+        return [self.data.get(key) for key in keys]
+
+    async def mset(self, items: Dict[str, Any], expire: int = 60) -> None:
+        self.data.update(items)
+
+
+def _service(
+    clock: FakeClock, max_entries: int = 10
+) -> Tuple[TieredCacheService, MockRemoteCache]:
+    remote = MockRemoteCache()
+    service = TieredCacheService(
+        remote,  # type: ignore[arg-type]
+        local_ttls={"exchange_rates": 60, "product:*": 5},
+        max_entries=max_entries,
+        clock=clock,
+    )
+    return service, remote
+
+
+class TestLocalCache:
+    def test_evicts_least_recently_used(self) -> None:
+        local = LocalCache(max_entries=2, clock=FakeClock())
+        local.set("a", 1, ttl=10)
+        local.set("b", 2, ttl=10)
+        local.get("a")
+        local.set("c", 3, ttl=10)
+
+        assert local.get("b") == (False, None)
+        assert local.get("a") == (True, 1)
+        assert local.evictions == 1
+
+    def test_entries_expire_per_key(self) -> None:
+        clock = FakeClock()
+        local = LocalCache(max_entries=10, clock=clock)
+        local.set("short", 1, ttl=1)
+        local.set("long", 2, ttl=10)
+
+        clock.now = 5
+        assert local.get("short") == (False, None)
+        assert local.get("long") == (True, 2)
+        assert len(local) == 1
+
+
+class TestTieredCacheService:
+    @pytest.mark.asyncio
+    async def test_hot_keys_are_served_from_local_tier(self) -> None:
+        clock = FakeClock()
+        service, remote = _service(clock)
+        remote.data["exchange_rates"] = {"USD": 32.5}
+
+        assert await service.get("exchange_rates") == {"USD": 32.5}
+        assert await service.get("exchange_rates") == {"USD": 32.5}
+
+        assert remote.gets == 1
+        stats = service.stats()
+        assert (stats["local"]["hits"], stats["local"]["misses"]) == (1, 1)
+        assert (stats["redis"]["hits"], stats["redis"]["misses"]) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_local_entry_expires_and_rereads_redis(self) -> None:
+        clock = FakeClock()
+        service, remote = _service(clock)
+        remote.data["product:7"] = {"id": 7}
+
+        await service.get("product:7")
+        clock.now = 6
+        await service.get("product:7")
+
+        assert remote.gets == 2
+
+    @pytest.mark.asyncio
+    async def test_keys_without_policy_bypass_local_tier(self) -> None:
+        service, remote = _service(FakeClock())
+        remote.data["users:1"] = {"id": 1}
+
+        await service.get("users:1")
+        await service.get("users:1")
+        await service.get("missing")
+
+        assert remote.gets == 3
+        assert service.stats()["local"]["misses"] == 0
+        assert service.stats()["redis"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_set_updates_local_tier_and_publishes_invalidation(self) -> None:
+        service, remote = _service(FakeClock())
+
+        await service.set("exchange_rates", {"USD": 33.0}, expire=300)
+        await service.set("users:1", {"id": 1})
+
+        assert await service.get("exchange_rates") == {"USD": 33.0}
+        assert remote.gets == 0
+        assert len(remote.redis.published) == 1
+        channel, message = remote.redis.published[0]
+        assert channel == CACHE_INVALIDATION_CHANNEL
+        assert json.loads(message)["keys"] == ["exchange_rates"]
+
+    @pytest.mark.asyncio
+    async def test_invalidation_from_other_worker_drops_local_entry(self) -> None:
+        service, remote = _service(FakeClock())
+        other, _ = _service(FakeClock())
+        other.remote = remote
+        remote.data["exchange_rates"] = {"USD": 32.5}
+        await service.get("exchange_rates")
+
+        await other.set("exchange_rates", {"USD": 34.0})
+        for _, message in remote.redis.published:
+            service.handle_invalidation(message)
+            # Own messages are ignored
+            other.handle_invalidation(message)
+
+        assert await service.get("exchange_rates") == {"USD": 34.0}
+        assert service.invalidations == 1
+        assert other.invalidations == 0
+
+    @pytest.mark.asyncio
+    async def test_mget_reads_only_local_misses_from_redis(self) -> None:
+        service, remote = _service(FakeClock())
+        remote.data.update(
+            {"product:1": {"id": 1}, "product:2": {"id": 2}, "users:1": {"id": 9}}
+        )
+        await service.get("product:1")
+
+        values = await service.mget(["product:1", "product:2", "users:1", "product:3"])
+
+        assert values == [{"id": 1}, {"id": 2}, {"id": 9}, None]
+        assert remote.mget_calls == [["product:2", "users:1", "product:3"]]
+        assert service.local.get("product:2") == (True, {"id": 2})
+
+    @pytest.mark.asyncio
+    async def test_mset_publishes_one_invalidation_for_local_keys(self) -> None:
+        service, remote = _service(FakeClock())
+
+        await service.mset({"product:1": 1, "product:2": 2, "users:1": 3})
+
+        assert len(remote.redis.published) == 1
+        assert json.loads(remote.redis.published[0][1])["keys"] == [
+            "product:1",
+            "product:2",
+        ]
@@ -12,34 +12,38 @@ from app.application.pipelines.analytics.steps.trend_analysis_step import (
     TrendAnalysisStep,
 )
 from app.core.patterns.pipeline import PipelineContext
+from app.domain.schemas.price.price_statistic import PriceStatistic
 
 
-class MockPriceHistory:
-    """Mock PriceHistory record."""
-
-    def __init__(self, price: float) -> None:
-        self.price = Decimal(str(price))
-
-
-class MockPriceHistoryRepository:
-    """Mock PriceHistoryRepository for testing."""
+class MockPriceStatisticRepository:
+    """Mock PriceStatisticRepository for testing."""
 
     def __init__(self, histories: Dict[int, List[float]] | None = None) -> None:
         # mapping_id -> list of prices (newest first)
         self.histories = histories or {}
-
-    async def get_by_mapping_id(
-        self, mapping_id: int, limit: int = 100
-    ) -> List[MockPriceHistory]:
-        prices = self.histories.get(mapping_id, [])
-        return [MockPriceHistory(p) for p in prices[:limit]]
+        self.batch_calls = 0
+
+    async def get_by_mapping_ids(
+        self, mapping_ids: List[int]
+    ) -> Dict[int, PriceStatistic]:
+        self.batch_calls += 1
+        result: Dict[int, PriceStatistic] = {}
+        for mapping_id in mapping_ids:
+            prices = self.histories.get(mapping_id)
+            if not prices:
+                continue
+            # Eskiden yeniye işleyerek istatistiği oluştur
+            result[mapping_id] = PriceStatistic(mapping_id=mapping_id).with_samples(
+                [Decimal(str(p)) for p in reversed(prices)]
+            )
+        return result
 
 
 class MockUnitOfWork:
     """Mock UnitOfWork for testing."""
 
     def __init__(self, histories: Dict[int, List[float]] | None = None) -> None:
-        self.price_histories = MockPriceHistoryRepository(histories)
+        self.price_statistics = MockPriceStatisticRepository(histories)
 
 
 @pytest.fixture
@@ -214,3 +218,35 @@ class TestTrendAnalysisStep:
 
         assert context.meta["trend_analyzed_count"] == 1
         assert context.meta["trend_analysis_errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_history_loaded_with_single_batch_query(self) -> None:
+        """Test that the whole batch shares one statistics query."""
+        histories = {i: [100.0, 90.0, 80.0] for i in range(1, 21)}
+        mock_uow = MockUnitOfWork(histories)
+        products = [{"mapping_id": i, "price": 110.0} for i in range(1, 21)]
+
+        step = TrendAnalysisStep(mock_uow)  # type: ignore
+        context = PipelineContext(initial_data=products)
+
+        await step.process(context)
+
+        assert mock_uow.price_statistics.batch_calls == 1
+        assert context.meta["trend_analyzed_count"] == 20
+        assert all(p["has_sufficient_data"] for p in context.result)
+
+    @pytest.mark.asyncio
+    async def test_history_capped_by_limit(self) -> None:
+        """Only the newest history_limit prices from the ring buffer are used."""
+        histories = {1: [100.0, 100.0, 100.0, 1000.0, 1000.0]}
+        mock_uow = MockUnitOfWork(histories)
+        products = [{"mapping_id": 1, "price": 100.0}]
+
+        step = TrendAnalysisStep(mock_uow, history_limit=3)  # type: ignore
+        context = PipelineContext(initial_data=products)
+
+        await step.process(context)
+
+        result = context.result[0]
+        assert result["avg_price"] == 100.0
+        assert result["max_price"] == 100.0
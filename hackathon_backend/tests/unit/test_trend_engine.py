@@ -0,0 +1,108 @@
+"""
+Unit tests for VectorizedTrendEngine.
+Parity against the scalar TrendAnalysisStep implementation.
+"""
+
+import random
+from typing import List
+
+import numpy as np
+import pytest
+
+from app.application.pipelines.analytics.steps.trend_analysis_step import (
+    DEFAULT_RELIABILITY_WEIGHT,
+    PROVIDER_RELIABILITY_WEIGHTS,
+    TrendAnalysisStep,
+)
+from app.application.pipelines.analytics.trend_engine import VectorizedTrendEngine
+
+WEIGHTS = [*PROVIDER_RELIABILITY_WEIGHTS.values(), DEFAULT_RELIABILITY_WEIGHT, 1.0]
+
+
+def _random_history(rng: random.Random) -> List[float]:
+    """Rastgele fiyat geçmişi: bazen sabit, bazen sıfır, bazen gürültülü."""
+    length = rng.randint(0, 14)
+    kind = rng.random()
+    base = round(rng.uniform(1, 5000), 2)
+    if kind < 0.15:
+        return [base] * length
+    if kind < 0.2:
+        return [0.0] * length
+    return [round(base * rng.uniform(0.7, 1.3), 2) for _ in range(length)]
+
+
+@pytest.fixture
+def step() -> TrendAnalysisStep:
+    return TrendAnalysisStep(uow=None)  # type: ignore
+
+
+class TestVectorizedTrendEngine:
+    """Tests for VectorizedTrendEngine."""
+
+    def test_parity_with_scalar_implementation(self, step: TrendAnalysisStep) -> None:
+        """Engine output must match _analyze_trend bit for bit."""
+        rng = random.Random(42)
+        count = 5000
+        histories = [_random_history(rng) for _ in range(count)]
+        current = [round(rng.uniform(1, 6000), 2) for _ in range(count)]
+        weights = [rng.choice(WEIGHTS) for _ in range(count)]
+
+        matrix, lengths = VectorizedTrendEngine.build_price_matrix(
+            histories, step.history_limit
+        )
+        result = VectorizedTrendEngine().analyze(
+            np.asarray(current), matrix, lengths, np.asarray(weights)
+        )
+        vectorized = result.to_dicts()
+
+        for i in range(count):
+            expected = step._analyze_trend(
+                current[i], histories[i][: step.history_limit], weights[i]
+            )
+            assert vectorized[i] == expected, f"row {i}: {histories[i]}"
+            assert type(vectorized[i]["trend_score"]) is int
+            assert type(vectorized[i]["weighted_trend_score"]) is int
+
+    @pytest.mark.parametrize(
+        "history",
+        [
+            [],
+            [100.0],
+            [100.0, 100.0],
+            [100.0, 100.0, 100.0],
+            [80.0, 90.0, 100.0],
+            [100.0, 90.0, 80.0],
+            [90.0, 100.0, 80.0],
+            [0.0, 0.0, 0.0],
+            [10.0, 10.0, 10.0],
+        ],
+    )
+    def test_edge_cases_match_scalar(
+        self, step: TrendAnalysisStep, history: List[float]
+    ) -> None:
+        """Momentum, zero average and short histories behave like the scalar code."""
+        for current in (0.0, 9.5, 100.0, 1000.0):
+            matrix, lengths = VectorizedTrendEngine.build_price_matrix([history], 10)
+            result = VectorizedTrendEngine().analyze(
+                np.asarray([current]), matrix, lengths, np.asarray([0.7])
+            )
+            assert result.to_dicts()[0] == step._analyze_trend(current, history, 0.7)
+
+    def test_build_price_matrix_pads_and_truncates(self) -> None:
+        """Histories are left-aligned, padded with zeros and cut to width."""
+        matrix, lengths = VectorizedTrendEngine.build_price_matrix(
+            [[1.0, 2.0], [], [3.0, 4.0, 5.0, 6.0]], 3
+        )
+
+        assert lengths.tolist() == [2, 0, 3]
+        assert matrix.tolist() == [[1.0, 2.0, 0.0], [0.0, 0.0, 0.0], [3.0, 4.0, 5.0]]
+
+    def test_empty_batch(self) -> None:
+        """An empty batch yields an empty result."""
+        matrix, lengths = VectorizedTrendEngine.build_price_matrix([], 10)
+        result = VectorizedTrendEngine().analyze(
+            np.zeros(0), matrix, lengths, np.zeros(0)
+        )
+
+        assert len(result) == 0
+        assert result.to_dicts() == []
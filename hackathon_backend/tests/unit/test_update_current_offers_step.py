@@ -0,0 +1,137 @@
+"""
+Unit tests for UpdateCurrentOffersStep.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import pytest
+
+from app.application.pipelines.analytics.steps.update_current_offers_step import (
+    UpdateCurrentOffersStep,
+)
+from app.core.patterns.pipeline import PipelineContext
+from app.domain.schemas.price.current_offer import CurrentOfferCreate
+
+
+class MockCurrentOfferRepository:
+    """Mock CurrentOfferRepository for testing."""
+
+    def __init__(self) -> None:
+        self.upserted: List[CurrentOfferCreate] = []
+        self.summarized_product_ids: List[int] = []
+        self.fail = False
+
+    async def upsert_many(self, offers: List[CurrentOfferCreate]) -> int:
+        if self.fail:
+            raise RuntimeError("db down")
+        self.upserted.extend(offers)
+        return len(offers)
+
+    async def refresh_price_summaries(self, product_ids: List[int]) -> int:
+        self.summarized_product_ids.extend(product_ids)
+        return len(set(product_ids))
+
+
+class MockUnitOfWork:
+    """Mock UnitOfWork for testing."""
+
+    def __init__(self) -> None:
+        self.current_offers = MockCurrentOfferRepository()
+
+
+def _product(
+    mapping_id: int, product_id: int, price: float, **extra: Any
+) -> Dict[str, Any]:
+    return {"mapping_id": mapping_id, "product_id": product_id, "price": price, **extra}
+
+
+class TestUpdateCurrentOffersStep:
+    """Tests for UpdateCurrentOffersStep."""
+
+    @pytest.mark.asyncio
+    async def test_upserts_offers(self) -> None:
+        """Each product with a mapping becomes a current offer."""
+        uow = MockUnitOfWork()
+        step = UpdateCurrentOffersStep(uow)  # type: ignore
+        context = PipelineContext(
+            initial_data=[
+                _product(
+                    1, 10, 99.9, original_price=120, in_stock=False, stock_quantity=0
+                ),
+                _product(2, 10, 89.5),
+            ]
+        )
+
+        await step.process(context)
+
+        offers = uow.current_offers.upserted
+        assert [o.mapping_id for o in offers] == [1, 2]
+        assert offers[0].price == Decimal("99.9")
+        assert offers[0].original_price == Decimal("120")
+        assert offers[0].in_stock is False
+        assert offers[0].stock_quantity == 0
+        assert offers[1].original_price is None
+        assert offers[1].in_stock is True
+        assert context.meta["current_offers_updated"] == 2
+        assert context.result == context.data
+
+    @pytest.mark.asyncio
+    async def test_refreshes_summaries_for_touched_products(self) -> None:
+        """Price summaries are refreshed for the products in the batch."""
+        uow = MockUnitOfWork()
+        step = UpdateCurrentOffersStep(uow)  # type: ignore
+        context = PipelineContext(
+            initial_data=[_product(1, 10, 5), _product(2, 10, 6), _product(3, 11, 7)]
+        )
+
+        await step.process(context)
+
+        assert uow.current_offers.summarized_product_ids == [10, 10, 11]
+        assert context.meta["price_summaries_updated"] == 2
+
+    @pytest.mark.asyncio
+    async def test_skips_items_without_mapping_or_price(self) -> None:
+        """Items missing mapping_id or price are not written."""
+        uow = MockUnitOfWork()
+        step = UpdateCurrentOffersStep(uow)  # type: ignore
+        context = PipelineContext(
+            initial_data=[
+                {"product_id": 10, "price": 5},
+                {"mapping_id": 2, "product_id": 10},
+                _product(3, 11, 7),
+            ]
+        )
+
+        await step.process(context)
+
+        assert [o.mapping_id for o in uow.current_offers.upserted] == [3]
+        assert context.errors == []
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_write(self) -> None:
+        """Counters are zero when no item is eligible."""
+        uow = MockUnitOfWork()
+        step = UpdateCurrentOffersStep(uow)  # type: ignore
+        context = PipelineContext(initial_data=[{"product_id": 10, "price": 5}])
+
+        await step.process(context)
+
+        assert uow.current_offers.upserted == []
+        assert context.meta["current_offers_updated"] == 0
+        assert context.meta["price_summaries_updated"] == 0
+
+    @pytest.mark.asyncio
+    async def test_repository_error_reported(self) -> None:
+        """Repository failures are reported without stopping the pipeline."""
+        uow = MockUnitOfWork()
+        uow.current_offers.fail = True
+        step = UpdateCurrentOffersStep(uow)  # type: ignore
+        context = PipelineContext(initial_data=[_product(1, 10, 5)])
+
+        await step.process(context)
+
+        assert len(context.errors) == 1
+        assert "Güncel teklifler güncellenemedi" in context.errors[0]
+        assert context.meta["current_offers_updated"] == 0
+        assert context.result == context.data
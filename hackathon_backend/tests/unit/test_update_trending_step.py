@@ -0,0 +1,63 @@
+"""
+Unit tests for UpdateTrendingStep and top_trending.
+"""
+
+import pytest
+
+from app.application.pipelines.analytics.steps.update_trending_step import (
+    UpdateTrendingStep,
+    top_trending,
+)
+from app.core.patterns.pipeline import PipelineContext
+
+
+class TestTopTrending:
+    def test_ranks_by_absolute_score(self) -> None:
+        top = top_trending([(1, 10), (2, -40), (3, 25.6), (4, 0)], n=3)
+
+        assert [(e.product_id, e.trend_score) for e in top] == [
+            (2, -40),
+            (3, 26),
+            (1, 10),
+        ]
+
+    def test_strongest_offer_per_product_wins(self) -> None:
+        top = top_trending([(1, 10), (1, -30), (2, 20), (1, 5)])
+
+        assert [(e.product_id, e.trend_score) for e in top] == [(1, -30), (2, 20)]
+
+    def test_ties_are_stable(self) -> None:
+        top = top_trending([(3, 10), (1, -10), (2, 10)], n=2)
+
+        assert [e.product_id for e in top] == [1, 2]
+
+
+class TestUpdateTrendingStep:
+    @pytest.mark.asyncio
+    async def test_publishes_batch_candidates(self) -> None:
+        products = [
+            {"product_id": i, "trend_score": score}
+            for i, score in enumerate([5, -70, 30, 12, 90, -8, 1], start=1)
+        ]
+        products.append({"product_id": 99})
+        products.append({"trend_score": 100})
+        context = PipelineContext(initial_data=products)
+
+        await UpdateTrendingStep().process(context)
+
+        assert context.meta["trending_candidates"] == [
+            [5, 90],
+            [2, -70],
+            [3, 30],
+            [4, 12],
+            [6, -8],
+        ]
+        assert context.errors == []
+
+    @pytest.mark.asyncio
+    async def test_no_scores_no_candidates(self) -> None:
+        context = PipelineContext(initial_data=[{"product_id": 1}])
+
+        await UpdateTrendingStep().process(context)
+
+        assert context.meta["trending_candidates"] == []
@@ -18,8 +18,9 @@ async def test_user_command_create_via_pipeline(mocker: MockerFixture) -> None:
 
     # Mock CacheService
     mock_cache_service = mocker.MagicMock()
-    mock_cache_service.lpush = AsyncMock()
-    mock_cache_service.ltrim = AsyncMock()
+    # LPUSH/LTRIM go through cache_service.pipeline() as a single round trip
+    mock_pipe = mocker.MagicMock()
+    mock_cache_service.pipeline.return_value.__aenter__.return_value = mock_pipe
 
     # Mock Repository checks (via UoW)
     mock_uow.users.get_by_email = AsyncMock(return_value=None)
@@ -59,4 +60,4 @@ async def test_user_command_create_via_pipeline(mocker: MockerFixture) -> None:
     assert result.email == mock_created_user.email
 
     # Verify Redis Push
-    assert mock_cache_service.lpush.called
+    assert mock_pipe.lpush.called